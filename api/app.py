@@ -21,10 +21,11 @@ import secrets
 import hashlib
 import base64
 from cryptography.fernet import Fernet
-import time
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.datastructures import UploadFile as StarletteUploadFile
 
+from common.rate_limiter import RateLimiter, RateLimitStore, create_rate_limit_store
+
 # Load configuration
 config_path = Path('.config/environment/env.dev')
 with open(config_path, 'r') as f:
@@ -60,32 +61,21 @@ app.add_middleware(
 
 # Rate limiting
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, max_requests: int = 100, window_seconds: int = 60):
+    def __init__(self, app, max_requests: int = 100, window_seconds: int = 60, store: Optional[RateLimitStore] = None):
         super().__init__(app)
-        self.max_requests = max_requests
-        self.window_seconds = window_seconds
-        self.requests = {}
+        self.limiter = RateLimiter(max_requests, window_seconds, store, namespace="api")
 
     async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host
-        now = time.time()
-
-        # Clean old requests
-        self.requests = {
-            ip: reqs for ip, reqs in self.requests.items()
-            if now - reqs["timestamp"] < self.window_seconds
-        }
+        client_ip = request.client.host if request.client else "unknown"
 
         # Check rate limit
-        if client_ip in self.requests:
-            if self.requests[client_ip]["count"] >= self.max_requests:
-                return JSONResponse(
-                    status_code=429,
-                    content={"detail": "Too many requests"}
-                )
-            self.requests[client_ip]["count"] += 1
-        else:
-            self.requests[client_ip] = {"count": 1, "timestamp": now}
+        result = await self.limiter.hit_async(client_ip)
+        if not result.allowed:
+            return JSONResponse(
+                status_code=429,
+                content={"detail": "Too many requests"},
+                headers=result.headers()
+            )
 
         response = await call_next(request)
         return response
@@ -93,7 +83,12 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 app.add_middleware(
     RateLimitMiddleware,
     max_requests=int(config['RATE_LIMIT_REQUESTS']),
-    window_seconds=int(config['RATE_LIMIT_PERIOD'])
+    window_seconds=int(config['RATE_LIMIT_PERIOD']),
+    store=create_rate_limit_store(
+        backend=config.get('RATE_LIMIT_BACKEND', 'memory'),
+        max_keys=int(config.get('RATE_LIMIT_MAX_KEYS', 100000)),
+        path=config.get('RATE_LIMIT_DB_PATH')
+    )
 )
 
 # Security headers middleware
@@ -1,18 +1,19 @@
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from typing import Optional
 
-from app.core.security import get_password_hash, verify_password
+from app.core.password_pool import PoolSaturated, get_password_pool
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.models import User
 from app.schemas.auth import UserCreate, UserResponse
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserResponse)
-async def register(user_in: UserCreate, db: Session = Depends(get_db)):
+async def register(user_in: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Register a new user.
     
@@ -24,27 +25,38 @@ async def register(user_in: UserCreate, db: Session = Depends(get_db)):
         Created user information
         
     Raises:
-        HTTPException: If username or email already exists
+        HTTPException: If username or email already exists, or the
+            password pool is saturated
     """
     # Check if username exists
-    if db.query(User).filter(User.username == user_in.username).first():
+    if await db.scalar(select(User.id).where(User.username == user_in.username).limit(1)):
         raise HTTPException(
             status_code=400,
             detail="Username already registered"
         )
         
     # Check if email exists
-    if db.query(User).filter(User.email == user_in.email).first():
+    if await db.scalar(select(User.id).where(User.email == user_in.email).limit(1)):
         raise HTTPException(
             status_code=400,
             detail="Email already registered"
         )
         
+    # Hash off the event loop
+    try:
+        password_hash = await get_password_pool().hash(user_in.password)
+    except PoolSaturated:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many authentication requests",
+            headers={"Retry-After": "1"}
+        )
+        
     # Create user
     user = User(
         username=user_in.username,
         email=user_in.email,
-        password_hash=get_password_hash(user_in.password),
+        password_hash=password_hash,
         is_active=True,
         is_admin=False,
         created_at=datetime.utcnow(),
@@ -53,11 +65,11 @@ async def register(user_in: UserCreate, db: Session = Depends(get_db)):
     
     try:
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
         return user
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail="Error creating user"
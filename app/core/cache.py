@@ -0,0 +1,270 @@
+"""In-process cache engine with TTL expiry and bounded LRU eviction."""
+
+import heapq
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Marks a missing key in bulk lookups, where None is a valid value
+MISSING = object()
+
+def estimate_size(key: str, value: Any) -> int:
+    """Estimate the memory an entry accounts for.
+
+    Values arrive as JSON, so their encoded length is a cheap, stable
+    measure that tracks what a client can make the cache hold.
+
+    Args:
+        key: Cache key
+        value: JSON-serializable value
+
+    Returns:
+        Size in bytes
+    """
+    return len(key.encode()) + len(json.dumps(value, separators=(",", ":"), default=str).encode())
+
+class CacheEngine:
+    """LRU cache with per-key TTL and entry-count and byte-size caps.
+
+    Entries live in an ``OrderedDict`` in recency order, so lookups,
+    recency updates and evicting the least recently used entry are all
+    O(1). Expired entries are dropped lazily when read, and periodically by
+    ``purge_expired``, which pops a heap of expiry times instead of
+    scanning every key. Heap items of overwritten or deleted entries are
+    skipped when popped, and the heap is rebuilt once they outnumber the
+    live entries.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: Optional[float] = 3600.0
+    ):
+        """Initialize cache engine.
+
+        Args:
+            max_entries: Maximum number of entries
+            max_bytes: Maximum total estimated size of entries
+            default_ttl: Seconds entries live when set without a TTL, or None
+                to keep them until evicted
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.default_ttl = default_ttl
+        # key -> (value, size, expires_at or None)
+        self._entries: "OrderedDict[str, Tuple[Any, int, Optional[float]]]" = OrderedDict()
+        self._expiries: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self.bytes = 0
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def _lookup(self, key: str, now: float) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        value, _, expires_at = entry
+        if expires_at is not None and now >= expires_at:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def _store(self, key: str, value: Any, ttl: Optional[float], now: float) -> None:
+        size = estimate_size(key, value)
+        if size > self.max_bytes:
+            raise ValueError(f"Value for {key!r} is {size} bytes, over the cache limit of {self.max_bytes}")
+
+        if key in self._entries:
+            self._remove(key)
+        expires_at = now + ttl if ttl is not None else None
+        self._entries[key] = (value, size, expires_at)
+        self.bytes += size
+        if expires_at is not None:
+            heapq.heappush(self._expiries, (expires_at, key))
+
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+        if len(self._expiries) > 2 * len(self._entries) + 64:
+            self._expiries = [
+                (entry[2], k) for k, entry in self._entries.items() if entry[2] is not None
+            ]
+            heapq.heapify(self._expiries)
+
+    def _ttl(self, ttl: Optional[float]) -> Optional[float]:
+        return self.default_ttl if ttl is None else ttl
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a value.
+
+        Args:
+            key: Cache key
+            default: Value returned for missing or expired keys
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            value = self._lookup(key, time.monotonic())
+        return default if value is MISSING else value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Set a value, evicting least recently used entries over the caps.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            ttl: Seconds the entry lives, or None for the default TTL
+
+        Raises:
+            ValueError: If the value alone exceeds the byte cap
+        """
+        with self._lock:
+            self._store(key, value, self._ttl(ttl), time.monotonic())
+
+    def delete(self, key: str) -> bool:
+        """Delete a value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if the key was cached
+        """
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get several values under one lock acquisition.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Values of the keys that are cached; missing keys are left out
+        """
+        found = {}
+        with self._lock:
+            now = time.monotonic()
+            for key in keys:
+                value = self._lookup(key, now)
+                if value is not MISSING:
+                    found[key] = value
+        return found
+
+    def set_many(self, items: Mapping[str, Any], ttl: Optional[float] = None) -> None:
+        """Set several values under one lock acquisition.
+
+        Args:
+            items: Values by key
+            ttl: Seconds the entries live, or None for the default TTL
+
+        Raises:
+            ValueError: If any value alone exceeds the byte cap; no value
+                is stored in that case
+        """
+        sizes = {key: estimate_size(key, value) for key, value in items.items()}
+        too_large = [key for key, size in sizes.items() if size > self.max_bytes]
+        if too_large:
+            raise ValueError(f"Values for {too_large} exceed the cache limit of {self.max_bytes} bytes")
+
+        ttl = self._ttl(ttl)
+        with self._lock:
+            now = time.monotonic()
+            for key, value in items.items():
+                self._store(key, value, ttl, now)
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete several values under one lock acquisition.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Number of keys that were cached
+        """
+        deleted = 0
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+                    deleted += 1
+        return deleted
+
+    def purge_expired(self, limit: Optional[int] = None) -> int:
+        """Drop expired entries.
+
+        Args:
+            limit: Maximum entries to drop in this call, to bound the time
+                the lock is held
+
+        Returns:
+            Number of entries dropped
+        """
+        purged = 0
+        with self._lock:
+            now = time.monotonic()
+            while self._expiries and self._expiries[0][0] <= now:
+                if limit is not None and purged >= limit:
+                    break
+                expires_at, key = heapq.heappop(self._expiries)
+                entry = self._entries.get(key)
+                # Skip heap items of entries overwritten or deleted since
+                if entry is not None and entry[2] == expires_at:
+                    self._remove(key)
+                    purged += 1
+            self.expirations += purged
+        return purged
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._expiries.clear()
+            self.bytes = 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache metrics.
+
+        Returns:
+            Dictionary of cache metrics
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
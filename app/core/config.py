@@ -21,12 +21,24 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: Optional[str] = None
+    # Connection pool of the async engine, per worker process
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
 
     # Security
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300  # Longest a verified token is trusted without re-verifying
+
+    # Password hashing runs on its own bounded pool
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32  # Calls waiting beyond this are rejected with 429
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # or "process"
 
     # Public endpoints that don't require authentication
     PUBLIC_ENDPOINTS: List[str] = [
@@ -57,6 +69,18 @@ class Settings(BaseSettings):
 
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 100
+    RATE_LIMIT_BACKEND: str = "memory"  # "sqlite" shares counts between workers
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_SHARDS: int = 16
+    RATE_LIMIT_DB_PATH: str = "rate_limits.db"
+
+    # Cache
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Estimated from the JSON size of keys and values
+    CACHE_DEFAULT_TTL_SECONDS: int = 3600  # 0 keeps entries until evicted
+    CACHE_EXPIRY_INTERVAL_SECONDS: int = 60
+    CACHE_EXPIRY_BATCH: int = 1000  # Most expired entries purged per interval
+    CACHE_MAX_BULK_KEYS: int = 1000
 
     # File Upload
     UPLOAD_DIR: str = "uploads"
@@ -1,9 +1,84 @@
-from sqlalchemy import create_engine
+from typing import Any, AsyncIterator, Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 
+# Async drivers for the synchronous URL schemes
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql"
+}
+
+def pool_options(url: str) -> Dict[str, Any]:
+    """Get connection pool options for a database URL.
+
+    In-memory SQLite databases live in a single connection, so they keep
+    SQLAlchemy's default pool.
+
+    Args:
+        url: Database URL
+
+    Returns:
+        Keyword arguments for engine creation
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True
+    }
+
+def get_async_database_url(url: str) -> str:
+    """Get the async driver URL for a database URL.
+
+    Args:
+        url: Database URL, with or without an async driver
+
+    Returns:
+        URL using an async driver
+    """
+    parsed = make_url(url)
+    if parsed.drivername in ASYNC_DRIVERS:
+        parsed = parsed.set(drivername=ASYNC_DRIVERS[parsed.drivername])
+    return parsed.render_as_string(hide_password=False)
+
+def create_async_database(url: str) -> async_sessionmaker:
+    """Create an async engine and its session factory.
+
+    SQLite connections use WAL mode and a busy timeout, so concurrent
+    sessions read while another writes and wait for a writer instead of
+    failing.
+
+    Args:
+        url: Database URL
+
+    Returns:
+        Async session factory bound to a new engine
+    """
+    async_url = get_async_database_url(url)
+    connect_args = {"timeout": settings.DB_POOL_TIMEOUT} if async_url.startswith("sqlite") else {}
+    async_engine = create_async_engine(async_url, connect_args=connect_args, **pool_options(url))
+
+    if async_url.startswith("sqlite"):
+        @event.listens_for(async_engine.sync_engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+
+    return async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
@@ -13,6 +88,10 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async session factory, created on first use so the driver is only
+# imported by applications that use it
+AsyncSessionLocal: Optional[async_sessionmaker] = None
+
 # Create base class for models
 Base = declarative_base()
 
@@ -22,4 +101,46 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    """Get the async session factory for the configured database.
+
+    Returns:
+        Async session factory
+    """
+    global AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        AsyncSessionLocal = create_async_database(settings.DATABASE_URL)
+    return AsyncSessionLocal
+
+def get_async_engine() -> AsyncEngine:
+    """Get the async engine for the configured database.
+
+    Returns:
+        Async engine
+    """
+    return get_async_sessionmaker().kw["bind"]
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Get an async database session for one request.
+
+    The session is rolled back if the request fails before committing,
+    and its connection returned to the pool when the request ends.
+
+    Yields:
+        Async database session
+    """
+    async with get_async_sessionmaker()() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+
+async def dispose_async_engine() -> None:
+    """Close the async engine's pooled connections, for application shutdown."""
+    global AsyncSessionLocal
+    if AsyncSessionLocal is not None:
+        await get_async_engine().dispose()
+        AsyncSessionLocal = None
@@ -4,7 +4,7 @@ import os
 import secrets
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -12,6 +12,32 @@ logger = logging.getLogger(__name__)
 class KeyRotation:
     """Handle key rotation for security."""
     
+    # Called with the key name after any key is rotated
+    _rotation_listeners: List[Callable[[str], None]] = []
+    
+    @classmethod
+    def add_rotation_listener(cls, listener: Callable[[str], None]) -> None:
+        """Register a callback for key rotations.
+        
+        Caches of anything verified with a key use this to drop entries
+        that the rotated key may no longer vouch for.
+        
+        Args:
+            listener: Callback receiving the rotated key's name
+        """
+        if listener not in cls._rotation_listeners:
+            cls._rotation_listeners.append(listener)
+            
+    @classmethod
+    def remove_rotation_listener(cls, listener: Callable[[str], None]) -> None:
+        """Unregister a rotation callback.
+        
+        Args:
+            listener: Previously registered callback
+        """
+        if listener in cls._rotation_listeners:
+            cls._rotation_listeners.remove(listener)
+    
     def __init__(self, key_file: str = ".security/keys.json"):
         """Initialize key rotation.
         
@@ -75,6 +101,13 @@ class KeyRotation:
         }
         
         self.save_keys()
+        
+        for listener in list(self._rotation_listeners):
+            try:
+                listener(key_name)
+            except Exception as e:
+                logger.error(f"Key rotation listener failed: {e}")
+                
         return new_key, self.current_keys[key_name]['previous']
         
     def get_key(self, key_name: str, include_previous: bool = False) -> Optional[str]:
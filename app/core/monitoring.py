@@ -29,6 +29,24 @@ ACTIVE_SESSIONS = Gauge(
     'Number of active user sessions'
 )
 
+PASSWORD_POOL_QUEUE_WAIT = Histogram(
+    'password_pool_queue_wait_seconds',
+    'Time password operations wait for a worker',
+    ['operation']
+)
+
+PASSWORD_POOL_WORK_TIME = Histogram(
+    'password_pool_work_seconds',
+    'Time password operations spend hashing',
+    ['operation']
+)
+
+PASSWORD_POOL_REJECTED = Counter(
+    'password_pool_rejected_total',
+    'Password operations shed because the pool was saturated',
+    ['operation']
+)
+
 @dataclass
 class SecurityEvent:
     """Security event data."""
@@ -0,0 +1,210 @@
+"""Bounded work pool for password hashing and verification."""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.monitoring import PASSWORD_POOL_QUEUE_WAIT, PASSWORD_POOL_REJECTED, PASSWORD_POOL_WORK_TIME
+from app.core.security import get_password_hash, verify_password
+
+logger = logging.getLogger(__name__)
+
+class PoolSaturated(Exception):
+    """The pool has no room for more work."""
+    pass
+
+def _timed(func: Callable[..., Any], *args: Any) -> Tuple[Any, float, float]:
+    """Run a function in a worker, timing it.
+
+    Args:
+        func: Function to run
+        *args: Function arguments
+
+    Returns:
+        Tuple of result, start time and end time on the monotonic clock
+    """
+    started = time.monotonic()
+    result = func(*args)
+    return result, started, time.monotonic()
+
+class PasswordHashPool:
+    """Runs bcrypt off the event loop with bounded concurrency.
+
+    A bcrypt round takes hundreds of milliseconds of CPU. Run on the event
+    loop it blocks every other request; run on the default executor a login
+    storm fills it and starves everything else using it. This pool has its
+    own workers, and admits at most ``workers + max_queue`` calls at once:
+    further calls are rejected immediately with ``PoolSaturated``, which
+    routes turn into 429 responses, rather than queueing for ever longer.
+
+    bcrypt releases the GIL while hashing, so threads run hashes in
+    parallel; a process pool is available for backends that do not.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 32, executor: str = "thread"):
+        """Initialize password hash pool.
+
+        Args:
+            workers: Number of worker threads or processes
+            max_queue: Calls allowed to wait for a worker
+            executor: "thread" or "process"
+        """
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.executor_type = executor
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+
+        # Metrics
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_seconds = 0.0
+        self.work_seconds = 0.0
+        self.max_queue_wait = 0.0
+        self.max_work = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def run(self, operation: str, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a function on the pool.
+
+        Args:
+            operation: Operation name for metrics
+            func: Function to run
+            *args: Function arguments
+
+        Returns:
+            Function result
+
+        Raises:
+            PoolSaturated: If the pool is already at capacity
+        """
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                PASSWORD_POOL_REJECTED.labels(operation=operation).inc()
+                raise PoolSaturated(f"Password pool is saturated ({self.in_flight} in flight)")
+            self.in_flight += 1
+
+        submitted = time.monotonic()
+        try:
+            result, started, finished = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(),
+                _timed,
+                func,
+                *args
+            )
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+        queue_wait = max(0.0, started - submitted)
+        work = finished - started
+        with self._lock:
+            self.completed += 1
+            self.queue_wait_seconds += queue_wait
+            self.work_seconds += work
+            self.max_queue_wait = max(self.max_queue_wait, queue_wait)
+            self.max_work = max(self.max_work, work)
+        PASSWORD_POOL_QUEUE_WAIT.labels(operation=operation).observe(queue_wait)
+        PASSWORD_POOL_WORK_TIME.labels(operation=operation).observe(work)
+        return result
+
+    async def hash(self, password: str) -> str:
+        """Hash a password.
+
+        Args:
+            password: Plain password
+
+        Returns:
+            Password hash
+
+        Raises:
+            PoolSaturated: If the pool is already at capacity
+        """
+        return await self.run("hash", get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash.
+
+        Args:
+            plain_password: Plain password
+            hashed_password: Stored hash
+
+        Returns:
+            True if the password matches
+
+        Raises:
+            PoolSaturated: If the pool is already at capacity
+        """
+        return await self.run("verify", verify_password, plain_password, hashed_password)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get pool metrics.
+
+        Returns:
+            Dictionary of pool metrics
+        """
+        return {
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "mean_queue_wait_seconds": self.queue_wait_seconds / self.completed if self.completed else 0.0,
+            "mean_work_seconds": self.work_seconds / self.completed if self.completed else 0.0,
+            "max_queue_wait_seconds": self.max_queue_wait,
+            "max_work_seconds": self.max_work
+        }
+
+    def shutdown(self) -> None:
+        """Stop the workers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+_pool: Optional[PasswordHashPool] = None
+_pool_lock = threading.Lock()
+
+def get_password_pool() -> PasswordHashPool:
+    """Get the password hash pool configured in the application settings.
+
+    Returns:
+        Pool shared by this process
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from app.core.config import settings
+            _pool = PasswordHashPool(
+                workers=settings.PASSWORD_HASH_WORKERS,
+                max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+                executor=settings.PASSWORD_HASH_EXECUTOR
+            )
+        return _pool
+
+def shutdown_password_pool() -> None:
+    """Stop the workers of the password hash pool, for application shutdown."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
@@ -0,0 +1,46 @@
+"""Rate limiting configured from the application settings."""
+
+import threading
+from typing import Optional
+
+from common.rate_limiter import (
+    MemoryRateLimitStore,
+    RateLimiter,
+    RateLimitResult,
+    RateLimitStore,
+    SQLiteRateLimitStore,
+    create_rate_limit_store,
+    slide_window
+)
+
+__all__ = [
+    "MemoryRateLimitStore",
+    "RateLimitResult",
+    "RateLimitStore",
+    "RateLimiter",
+    "SQLiteRateLimitStore",
+    "create_rate_limit_store",
+    "get_rate_limit_store",
+    "slide_window"
+]
+
+_store: Optional[RateLimitStore] = None
+_store_lock = threading.Lock()
+
+def get_rate_limit_store() -> RateLimitStore:
+    """Get the rate limit store configured in the application settings.
+
+    Returns:
+        Store shared by the limiters of this process
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            from app.core.config import settings
+            _store = create_rate_limit_store(
+                backend=settings.RATE_LIMIT_BACKEND,
+                max_keys=settings.RATE_LIMIT_MAX_KEYS,
+                shards=settings.RATE_LIMIT_SHARDS,
+                path=settings.RATE_LIMIT_DB_PATH
+            )
+        return _store
@@ -0,0 +1,150 @@
+"""Bounded cache of verified JWT payloads."""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.key_rotation import KeyRotation
+
+logger = logging.getLogger(__name__)
+
+class TokenCache:
+    """LRU cache of verified token payloads keyed by token digest.
+
+    Verifying a JWT means decoding it and checking its HMAC on every
+    request, although clients send the same token for its whole lifetime.
+    A verified payload is cached until the token's ``exp``, and at most
+    ``max_ttl`` seconds so a rotation in another process, which this one
+    is not notified of, takes effect within that time. Tokens are keyed by
+    their SHA-256 digest so the cache does not hold bearer credentials.
+    Key rotations in this process clear the cache.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_ttl: float = 300.0):
+        """Initialize token cache.
+
+        Args:
+            max_entries: Maximum number of cached tokens
+            max_ttl: Maximum seconds a verification is trusted
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Get the payload of a verified token.
+
+        Args:
+            token: Encoded token
+
+        Returns:
+            Payload, or None if the token is not cached or has expired
+        """
+        digest = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            payload, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return payload
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        """Cache the payload of a token that passed verification.
+
+        Args:
+            token: Encoded token
+            payload: Verified payload
+        """
+        expires_at = time.time() + self.max_ttl
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+
+        digest = self._digest(token)
+        with self._lock:
+            self._entries[digest] = (payload, expires_at)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, token: str) -> None:
+        """Forget one token, for example on logout.
+
+        Args:
+            token: Encoded token
+        """
+        with self._lock:
+            self._entries.pop(self._digest(token), None)
+
+    def clear(self, key_name: Optional[str] = None) -> None:
+        """Forget all tokens.
+
+        Args:
+            key_name: Optional name of the rotated key that caused the clear
+        """
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+        if key_name:
+            logger.info(f"Cleared verified tokens after rotation of {key_name}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache metrics.
+
+        Returns:
+            Dictionary of cache metrics
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+_cache: Optional[TokenCache] = None
+_cache_lock = threading.Lock()
+
+def get_token_cache() -> TokenCache:
+    """Get the token cache configured in the application settings.
+
+    The cache is cleared whenever a key is rotated in this process.
+
+    Returns:
+        Token cache shared by this process
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from app.core.config import settings
+            _cache = TokenCache(
+                max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+                max_ttl=settings.TOKEN_CACHE_TTL_SECONDS
+            )
+            KeyRotation.add_rotation_listener(_cache.clear)
+        return _cache
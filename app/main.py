@@ -5,14 +5,18 @@ Legal Study API application.
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
+import asyncio
 import os
 
 from app.core.config import settings
+from app.core.database import dispose_async_engine
+from app.core.password_pool import shutdown_password_pool
 from app.auth.routes import router as auth_router
 from app.routes.ai_routes import router as ai_router
 from app.routes.notification_routes import router as notification_router
 from app.routes.monitoring_routes import router as monitoring_router
 from app.routes.cache_routes import router as cache_router
+from app.services.cache_service import CacheService
 from app.middleware.rate_limit import RateLimitMiddleware
 from app.middleware.auth import AuthMiddleware
 
@@ -83,6 +87,23 @@ app.include_router(
     tags=["cache"]
 )
 
+@app.on_event("startup")
+async def start_cache_expiry():
+    """Start purging expired cache entries."""
+    CacheService.start_expiry()
+
+@app.on_event("shutdown")
+async def stop_cache_expiry():
+    """Stop purging expired cache entries."""
+    await CacheService.stop_expiry()
+
+@app.on_event("shutdown")
+async def close_database():
+    """Close pooled database connections and stop password hash workers."""
+    await dispose_async_engine()
+    # Waits for hashes in progress, so keep it off the event loop
+    await asyncio.get_running_loop().run_in_executor(None, shutdown_password_pool)
+
 # Wrap the app with AuthMiddleware as the last step
 app = AuthMiddleware(app)
 
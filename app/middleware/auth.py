@@ -1,6 +1,6 @@
 """Authentication middleware."""
 
-from fastapi import Request, HTTPException, Response
+from fastapi import HTTPException, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from app.core.config import settings
@@ -10,6 +10,8 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 
 from app.core.security import verify_token
+from app.core.rate_limiter import RateLimiter, get_rate_limit_store
+from app.core.token_cache import TokenCache, get_token_cache
 
 security = HTTPBearer()
 
@@ -47,48 +49,64 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = None) ->
     token = credentials.credentials
     return verify_token(token)
 
+# Added to every authenticated response, replacing any the app set
+SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+]
+SECURITY_HEADER_NAMES = frozenset(name for name, _ in SECURITY_HEADERS)
+
+PUBLIC_PATHS = frozenset(["/api/v1/public", "/api/v1/health", "/", "/docs", "/openapi.json"])
+
+def get_bearer_token(scope) -> str:
+    """Get the bearer token of a request, as HTTPBearer does."""
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, credentials = value.decode("latin-1").partition(" ")
+            if not scheme or not credentials:
+                break
+            if scheme.lower() != "bearer":
+                raise HTTPException(status_code=403, detail="Invalid authentication credentials")
+            return credentials
+    raise HTTPException(status_code=403, detail="Not authenticated")
+
 class AuthMiddleware:
-    def __init__(self, app):
+    def __init__(self, app, limiter: Optional[RateLimiter] = None, token_cache: Optional[TokenCache] = None):
         self.app = app
-        self.security = HTTPBearer()
-        self.rate_limit = {}
-        self.rate_limit_window = 60  # 1 minute window
-        self.max_requests = 100  # Maximum requests per window
+        # 100 requests per minute, sharing the application's counter store
+        self.rate_limiter = limiter or RateLimiter(100, 60, get_rate_limit_store(), namespace="auth")
+        self.token_cache = token_cache or get_token_cache()
+
+    def verify(self, token: str) -> Dict[str, str]:
+        """Verify a token, reusing earlier verifications of it."""
+        payload = self.token_cache.get(token)
+        if payload is None:
+            payload = verify_token(token)
+            self.token_cache.put(token, payload)
+        return payload
 
     async def __call__(self, scope, receive, send):
         if scope["type"] != "http":
             await self.app(scope, receive, send)
             return
-        request = Request(scope, receive=receive)
         path = scope.get("path", "")
         # Skip auth for public endpoints
-        if path in ["/api/v1/public", "/api/v1/health", "/", "/docs", "/openapi.json"]:
+        if path in PUBLIC_PATHS:
             await self.app(scope, receive, send)
             return
         try:
             # Rate limiting
             client_ip = scope.get("client")[0] if scope.get("client") else "unknown"
-            current_time = datetime.now()
-            if client_ip in self.rate_limit:
-                window_start, count = self.rate_limit[client_ip]
-                if (current_time - window_start).total_seconds() > self.rate_limit_window:
-                    self.rate_limit[client_ip] = (current_time, 1)
-                elif count >= self.max_requests:
-                    response = JSONResponse(status_code=429, content={"detail": "Too many requests"})
-                    await response(scope, receive, send)
-                    return
-                else:
-                    self.rate_limit[client_ip] = (window_start, count + 1)
-            else:
-                self.rate_limit[client_ip] = (current_time, 1)
-            # Auth
-            auth = await self.security(request)
-            if not auth:
-                response = JSONResponse(status_code=401, content={"detail": "Not authenticated"}, headers={"WWW-Authenticate": "Bearer"})
+            limit = await self.rate_limiter.hit_async(client_ip)
+            if not limit.allowed:
+                response = JSONResponse(status_code=429, content={"detail": "Too many requests"}, headers=limit.headers())
                 await response(scope, receive, send)
                 return
+            # Auth
             try:
-                payload = verify_token(auth.credentials)
+                payload = self.verify(get_bearer_token(scope))
                 # request.state.user = payload  # Not available in ASGI middleware
             except JWTError:
                 response = JSONResponse(status_code=401, content={"detail": "Invalid token"}, headers={"WWW-Authenticate": "Bearer"})
@@ -97,12 +115,10 @@ class AuthMiddleware:
             # Call downstream app and add security headers
             async def send_wrapper(message):
                 if message["type"] == "http.response.start":
-                    headers = dict(message.get("headers", []))
-                    headers[b"x-content-type-options"] = b"nosniff"
-                    headers[b"x-frame-options"] = b"DENY"
-                    headers[b"x-xss-protection"] = b"1; mode=block"
-                    headers[b"strict-transport-security"] = b"max-age=31536000; includeSubDomains"
-                    message["headers"] = list(headers.items())
+                    message["headers"] = [
+                        header for header in message.get("headers", [])
+                        if header[0] not in SECURITY_HEADER_NAMES
+                    ] + SECURITY_HEADERS
                 await send(message)
             await self.app(scope, receive, send_wrapper)
         except HTTPException as e:
@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Any
+from typing import Any, Dict, List, Optional
 from app.services.cache_service import CacheService
 
 router = APIRouter()
@@ -11,16 +11,31 @@ class CacheSetRequest(BaseModel):
     """Cache set request model."""
     key: str
     value: Any
+    ttl: Optional[float] = None
+
+class CacheKeysRequest(BaseModel):
+    """Cache bulk get and delete request model."""
+    keys: List[str]
+
+class CacheMultiSetRequest(BaseModel):
+    """Cache bulk set request model."""
+    items: Dict[str, Any]
+    ttl: Optional[float] = None
 
 @router.get("/health")
 async def health_check():
     """Check cache service health."""
     return await CacheService.health_check()
 
+@router.get("/metrics")
+async def get_metrics():
+    """Get cache metrics."""
+    return await CacheService.get_metrics()
+
 @router.post("/set")
 async def set_cache(request: CacheSetRequest):
     """Set cache value."""
-    return await CacheService.set(request.key, request.value)
+    return await CacheService.set(request.key, request.value, request.ttl)
 
 @router.get("/get/{key}")
 async def get_cache(key: str):
@@ -30,4 +45,19 @@ async def get_cache(key: str):
 @router.delete("/delete/{key}")
 async def delete_cache(key: str):
     """Delete cache value."""
-    return await CacheService.delete(key) 
\ No newline at end of file
+    return await CacheService.delete(key)
+
+@router.post("/mget")
+async def mget_cache(request: CacheKeysRequest):
+    """Get several cache values in one request."""
+    return await CacheService.mget(request.keys)
+
+@router.post("/mset")
+async def mset_cache(request: CacheMultiSetRequest):
+    """Set several cache values in one request."""
+    return await CacheService.mset(request.items, request.ttl)
+
+@router.post("/mdelete")
+async def mdelete_cache(request: CacheKeysRequest):
+    """Delete several cache values in one request."""
+    return await CacheService.mdelete(request.keys)
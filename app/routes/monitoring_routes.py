@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter
 from app.services.monitoring_service import MonitoringService
+from app.core.password_pool import get_password_pool
 
 router = APIRouter()
 
@@ -18,4 +19,9 @@ async def get_errors():
 @router.get("/health")
 async def get_health():
     """Get health metrics."""
-    return MonitoringService.get_health_metrics() 
\ No newline at end of file
+    return MonitoringService.get_health_metrics() 
+
+@router.get("/password-pool")
+async def get_password_pool_metrics():
+    """Get password hashing pool metrics."""
+    return get_password_pool().get_metrics()
@@ -1,44 +1,122 @@
 """Cache service module."""
 
-from typing import Dict, Any, Optional
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
 from fastapi import HTTPException
 
+from app.core.cache import MISSING, CacheEngine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
 class CacheService:
     """Cache service class."""
-    _cache: Dict[str, Any] = {}
+    _engine: Optional[CacheEngine] = None
+    _expiry_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def engine(cls) -> CacheEngine:
+        """Get the cache engine, created from the application settings."""
+        if cls._engine is None:
+            cls._engine = CacheEngine(
+                max_entries=settings.CACHE_MAX_ENTRIES,
+                max_bytes=settings.CACHE_MAX_BYTES,
+                default_ttl=settings.CACHE_DEFAULT_TTL_SECONDS or None
+            )
+        return cls._engine
+
+    @staticmethod
+    def _check_bulk(count: int) -> None:
+        if count > settings.CACHE_MAX_BULK_KEYS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {settings.CACHE_MAX_BULK_KEYS} keys per request"
+            )
 
     @classmethod
-    async def set(cls, key: str, value: Any) -> Dict[str, str]:
+    async def set(cls, key: str, value: Any, ttl: Optional[float] = None) -> Dict[str, str]:
         """Set cache value."""
         try:
-            cls._cache[key] = value
-            return {"status": "success"}
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+            cls.engine().set(key, value, ttl)
+        except ValueError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        return {"status": "success"}
 
     @classmethod
     async def get(cls, key: str) -> Dict[str, Any]:
         """Get cache value."""
-        try:
-            value = cls._cache.get(key)
-            if value is None:
-                raise HTTPException(status_code=404, detail="Key not found")
-            return {"value": value}
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+        value = cls.engine().get(key, MISSING)
+        if value is MISSING:
+            raise HTTPException(status_code=404, detail="Key not found")
+        return {"value": value}
 
     @classmethod
     async def delete(cls, key: str) -> Dict[str, str]:
         """Delete cache value."""
-        try:
-            if key in cls._cache:
-                del cls._cache[key]
-                return {"status": "success"}
+        if not cls.engine().delete(key):
             raise HTTPException(status_code=404, detail="Key not found")
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+        return {"status": "success"}
+
+    @classmethod
+    async def mget(cls, keys: List[str]) -> Dict[str, Any]:
+        """Get several cache values."""
+        cls._check_bulk(len(keys))
+        values = cls.engine().get_many(keys)
+        return {"values": values, "missing": [key for key in keys if key not in values]}
+
+    @classmethod
+    async def mset(cls, items: Dict[str, Any], ttl: Optional[float] = None) -> Dict[str, Any]:
+        """Set several cache values."""
+        cls._check_bulk(len(items))
+        try:
+            cls.engine().set_many(items, ttl)
+        except ValueError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        return {"status": "success", "count": len(items)}
+
+    @classmethod
+    async def mdelete(cls, keys: List[str]) -> Dict[str, Any]:
+        """Delete several cache values."""
+        cls._check_bulk(len(keys))
+        return {"status": "success", "deleted": cls.engine().delete_many(keys)}
+
+    @classmethod
+    async def get_metrics(cls) -> Dict[str, Any]:
+        """Get cache metrics."""
+        return cls.engine().get_metrics()
+
+    @classmethod
+    async def _expire_periodically(cls, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                purged = cls.engine().purge_expired(limit=settings.CACHE_EXPIRY_BATCH)
+                if purged:
+                    logger.debug(f"Purged {purged} expired cache entries")
+            except Exception as e:
+                logger.error(f"Error purging expired cache entries: {str(e)}")
+
+    @classmethod
+    def start_expiry(cls) -> None:
+        """Start purging expired entries in the background."""
+        if cls._expiry_task is None and settings.CACHE_EXPIRY_INTERVAL_SECONDS > 0:
+            cls._expiry_task = asyncio.get_running_loop().create_task(
+                cls._expire_periodically(settings.CACHE_EXPIRY_INTERVAL_SECONDS)
+            )
+
+    @classmethod
+    async def stop_expiry(cls) -> None:
+        """Stop purging expired entries in the background."""
+        if cls._expiry_task is not None:
+            cls._expiry_task.cancel()
+            try:
+                await cls._expiry_task
+            except asyncio.CancelledError:
+                pass
+            cls._expiry_task = None
 
     @staticmethod
     async def health_check() -> Dict[str, str]:
         """Check cache service health."""
-        return {"status": "healthy"} 
\ No newline at end of file
+        return {"status": "healthy"}
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""
+Code shared by the app and api services.
+"""
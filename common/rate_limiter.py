@@ -0,0 +1,438 @@
+"""Sliding-window rate limiting with bounded, pluggable storage.
+
+Shared by the app and api services, so it must not import either of them.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Window start, requests in the current window, requests in the previous one
+WindowState = Tuple[float, int, int]
+
+@dataclass
+class RateLimitResult:
+    """Outcome of one rate-limited request."""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: float
+    retry_after: float
+
+    def headers(self) -> Dict[str, str]:
+        """Get the rate limit response headers.
+
+        Returns:
+            Header name to value
+        """
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(int(self.reset))
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, int(self.retry_after + 0.999)))
+        return headers
+
+def slide_window(
+    state: Optional[WindowState],
+    now: float,
+    window: float,
+    limit: int
+) -> Tuple[WindowState, bool, float]:
+    """Count a request against a sliding window.
+
+    The window is approximated from fixed windows: requests in the previous
+    window are weighted by how much of it still overlaps the sliding one.
+    This needs two counters per key instead of a log of timestamps, and
+    avoids the burst of up to twice the limit a fixed window allows at its
+    boundary.
+
+    Args:
+        state: Current state of the key, None if unseen
+        now: Current time in seconds
+        window: Window length in seconds
+        limit: Requests allowed per window
+
+    Returns:
+        Tuple of new state, whether the request is allowed and the
+        estimated number of requests in the window including it
+    """
+    start = now - now % window
+    if state is None:
+        current = previous = 0
+    else:
+        last_start, current, previous = state
+        elapsed = int((start - last_start) // window)
+        if elapsed == 1:
+            current, previous = 0, current
+        elif elapsed > 1:
+            current = previous = 0
+
+    weight = 1.0 - (now - start) / window
+    estimate = previous * weight + current
+    if estimate + 1 > limit:
+        return (start, current, previous), False, estimate
+    return (start, current + 1, previous), True, estimate + 1
+
+def _result(
+    state: WindowState,
+    allowed: bool,
+    estimate: float,
+    now: float,
+    window: float,
+    limit: int
+) -> RateLimitResult:
+    """Build the result of a request from its window state.
+
+    Args:
+        state: Window state after the request
+        allowed: Whether the request is allowed
+        estimate: Estimated requests in the window
+        now: Current time in seconds
+        window: Window length in seconds
+        limit: Requests allowed per window
+
+    Returns:
+        Rate limit result
+    """
+    start, current, previous = state
+    reset = start + window
+    retry_after = 0.0
+    if not allowed:
+        retry_after = reset - now
+        if previous and current < limit:
+            # Time until enough of the previous window slides out
+            excess = estimate + 1 - limit
+            retry_after = min(retry_after, excess / previous * window)
+    return RateLimitResult(
+        allowed=allowed,
+        limit=limit,
+        remaining=max(0, int(limit - estimate)),
+        reset=reset,
+        retry_after=retry_after
+    )
+
+class RateLimitStore(ABC):
+    """Storage of sliding-window counters."""
+
+    # Whether hits can wait on I/O and must be kept off the event loop
+    blocking = False
+
+    @abstractmethod
+    def hit(self, key: str, window: float, limit: int, now: float) -> RateLimitResult:
+        """Count a request for a key.
+
+        Args:
+            key: Client key, including the limiter namespace
+            window: Window length in seconds
+            limit: Requests allowed per window
+            now: Current time in seconds
+
+        Returns:
+            Rate limit result
+        """
+        pass
+
+    @abstractmethod
+    def size(self) -> int:
+        """Get the number of tracked keys.
+
+        Returns:
+            Number of keys
+        """
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Forget all keys."""
+        pass
+
+class MemoryRateLimitStore(RateLimitStore):
+    """In-process store with sharded LRU eviction and a hard key cap.
+
+    Keys are hashed onto shards, each an ordered dictionary with its own
+    lock and an equal share of ``max_keys``. A request moves its key to the
+    end of its shard; inserting into a full shard evicts the least recently
+    seen key. A spray of one-off client addresses therefore evicts other
+    one-off addresses, and memory stays bounded however many clients
+    appear. An evicted client starts again with an empty window.
+    """
+
+    def __init__(self, max_keys: int = 100000, shards: int = 16):
+        """Initialize memory store.
+
+        Args:
+            max_keys: Maximum number of tracked keys
+            shards: Number of shards
+        """
+        self.shards = max(1, shards)
+        self.shard_size = max(1, max_keys // self.shards)
+        self.max_keys = self.shard_size * self.shards
+        self._shards: List["OrderedDict[str, WindowState]"] = [
+            OrderedDict() for _ in range(self.shards)
+        ]
+        self._locks = [threading.Lock() for _ in range(self.shards)]
+        self.evictions = 0
+
+    def hit(self, key: str, window: float, limit: int, now: float) -> RateLimitResult:
+        index = zlib.crc32(key.encode()) % self.shards
+        shard = self._shards[index]
+        with self._locks[index]:
+            state = shard.get(key)
+            if state is None and len(shard) >= self.shard_size:
+                shard.popitem(last=False)
+                self.evictions += 1
+            state, allowed, estimate = slide_window(state, now, window, limit)
+            shard[key] = state
+            shard.move_to_end(key)
+        return _result(state, allowed, estimate, now, window, limit)
+
+    def size(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def clear(self) -> None:
+        for index, shard in enumerate(self._shards):
+            with self._locks[index]:
+                shard.clear()
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """Store shared by the worker processes of one host through SQLite.
+
+    Each request updates its key in an immediate transaction, so workers
+    never lose each other's counts. Rows carry the time they were last seen;
+    once more than ``max_keys`` rows exist the least recently seen are
+    deleted, checked every ``prune_every`` inserts.
+
+    Waiting for the database lock is bounded by a short ``timeout``; a
+    request that cannot get it in time is allowed rather than stalled or
+    failed, and counted in ``failures``.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        path: str,
+        max_keys: int = 100000,
+        prune_every: int = 1000,
+        timeout: float = 0.25
+    ):
+        """Initialize SQLite store.
+
+        Args:
+            path: Database file
+            max_keys: Maximum number of tracked keys
+            prune_every: Inserts between checks of the key cap
+            timeout: Seconds to wait for the database lock
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_keys = max_keys
+        self.prune_every = max(1, prune_every)
+        self.timeout = timeout
+        self.evictions = 0
+        self.failures = 0
+        self._inserts = 0
+        self._local = threading.local()
+
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    key TEXT PRIMARY KEY,
+                    window_start REAL NOT NULL,
+                    current INTEGER NOT NULL,
+                    previous INTEGER NOT NULL,
+                    seen REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS rate_limits_seen ON rate_limits (seen)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection.
+
+        Returns:
+            SQLite connection
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key: str, window: float, limit: int, now: float) -> RateLimitResult:
+        try:
+            return self._hit(self._connect(), key, window, limit, now)
+        except sqlite3.OperationalError as e:
+            # Fail open, a busy database must not stall or reject requests
+            self.failures += 1
+            logger.warning(f"Rate limit store unavailable, allowing request: {e}")
+            return RateLimitResult(
+                allowed=True,
+                limit=limit,
+                remaining=limit,
+                reset=now + window,
+                retry_after=0.0
+            )
+
+    def _hit(
+        self,
+        conn: sqlite3.Connection,
+        key: str,
+        window: float,
+        limit: int,
+        now: float
+    ) -> RateLimitResult:
+        """Count a request for a key in an immediate transaction.
+
+        Args:
+            conn: Connection of this thread
+            key: Client key, including the limiter namespace
+            window: Window length in seconds
+            limit: Requests allowed per window
+            now: Current time in seconds
+
+        Returns:
+            Rate limit result
+        """
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT window_start, current, previous FROM rate_limits WHERE key = ?",
+                (key,)
+            ).fetchone()
+            state, allowed, estimate = slide_window(row, now, window, limit)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits VALUES (?, ?, ?, ?, ?)",
+                (key, *state, now)
+            )
+            if row is None:
+                self._inserts += 1
+                if self._inserts % self.prune_every == 0:
+                    self._prune(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return _result(state, allowed, estimate, now, window, limit)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Delete the least recently seen keys over the cap.
+
+        Args:
+            conn: Connection inside a transaction
+        """
+        excess = self.size(conn) - self.max_keys
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM rate_limits WHERE key IN "
+                "(SELECT key FROM rate_limits ORDER BY seen LIMIT ?)",
+                (excess,)
+            )
+            self.evictions += excess
+
+    def size(self, conn: Optional[sqlite3.Connection] = None) -> int:
+        conn = conn or self._connect()
+        return conn.execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM rate_limits")
+
+class RateLimiter:
+    """Sliding-window rate limit on one namespace of a store.
+
+    Limiters with different limits can share a store, and with it one
+    memory cap, by using different namespaces.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        window: float = 60.0,
+        store: Optional[RateLimitStore] = None,
+        namespace: str = "default"
+    ):
+        """Initialize rate limiter.
+
+        Args:
+            limit: Requests allowed per window
+            window: Window length in seconds
+            store: Counter store, a private memory store if not given
+            namespace: Prefix separating this limiter's keys in the store
+        """
+        self.limit = limit
+        self.window = window
+        self.store = store or MemoryRateLimitStore()
+        self.namespace = namespace
+
+    def hit(self, key: str, now: Optional[float] = None) -> RateLimitResult:
+        """Count a request for a client.
+
+        Args:
+            key: Client key, usually its address
+            now: Optional current time in seconds
+
+        Returns:
+            Rate limit result
+        """
+        return self.store.hit(
+            f"{self.namespace}:{key}",
+            self.window,
+            self.limit,
+            time.time() if now is None else now
+        )
+
+    async def hit_async(self, key: str, now: Optional[float] = None) -> RateLimitResult:
+        """Count a request for a client without blocking the event loop.
+
+        Hits on a blocking store run on the default executor.
+
+        Args:
+            key: Client key, usually its address
+            now: Optional current time in seconds
+
+        Returns:
+            Rate limit result
+        """
+        if not self.store.blocking:
+            return self.hit(key, now)
+        return await asyncio.get_running_loop().run_in_executor(None, self.hit, key, now)
+
+def create_rate_limit_store(
+    backend: str = "memory",
+    max_keys: int = 100000,
+    shards: int = 16,
+    path: Optional[str] = None
+) -> RateLimitStore:
+    """Create a rate limit store.
+
+    Args:
+        backend: "memory" for one process, "sqlite" to share counts between
+            the worker processes of a host
+        max_keys: Maximum number of tracked keys
+        shards: Number of shards of the memory store
+        path: Database file of the SQLite store
+
+    Returns:
+        Rate limit store
+    """
+    if backend == "sqlite":
+        return SQLiteRateLimitStore(path or "rate_limits.db", max_keys)
+    if backend != "memory":
+        logger.warning(f"Unknown rate limit backend {backend}, using memory")
+    return MemoryRateLimitStore(max_keys, shards)
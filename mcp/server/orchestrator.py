@@ -2,18 +2,34 @@
 MCP orchestrator for test scheduling and management.
 """
 import asyncio
+import heapq
+import itertools
 import logging
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from ..utils.config import MCPConfig
 from ..utils.logging import setup_logger
 
 logger = logging.getLogger("mcp_orchestrator")
 
+class JobCancelled(Exception):
+    """Raised inside a job when it has been cancelled."""
+
 class MCPOrchestrator:
-    """Orchestrator for test scheduling and management."""
+    """Orchestrator for test scheduling and management.
+
+    Queued jobs are kept in a heap ordered by priority with aging: a job
+    gains one priority level for every ``aging_interval`` seconds it waits,
+    so low-priority jobs are not starved. Because every queued job ages at
+    the same rate, the aged order never changes while jobs wait and can be
+    encoded once in the heap key; ties are broken by submission order. A
+    pool of workers runs jobs concurrently, and ``reserved_workers`` of them
+    only take interactive jobs so a single-file request never waits behind
+    a full-repo scan.
+    """
 
     def __init__(self, config: MCPConfig):
         """Initialize orchestrator.
@@ -23,8 +39,26 @@ class MCPOrchestrator:
         """
         self.config = config
         self.active_jobs: Set[str] = set()
-        self.job_queue: asyncio.Queue = asyncio.Queue()
+        self.queued_jobs: Set[str] = set()
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.job_queue: List[Tuple[float, int, str]] = []
         self.metrics: Dict[str, Any] = {}
+        self.job_counts: Dict[str, int] = {}
+
+        scheduler_config = config.scheduler_config
+        self.workers = max(1, scheduler_config.get("workers", config.parallel_jobs))
+        self.reserved_workers = min(
+            scheduler_config.get("reserved_workers", 1),
+            self.workers - 1
+        )
+        self.interactive_priority = scheduler_config.get("interactive_priority", 7)
+        self.aging_interval = scheduler_config.get("aging_interval", 60)
+
+        self._sequence = itertools.count()
+        self._queue_condition: Optional[asyncio.Condition] = None
+        self._job_tasks: Dict[str, asyncio.Task] = {}
+        self._cancelled: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
         self._setup_logging()
 
     def _setup_logging(self) -> None:
@@ -43,8 +77,15 @@ class MCPOrchestrator:
         try:
             logger.info("Starting MCP orchestrator...")
             await self._initialize()
-            await self._start_job_processor()
-            await self._start_metrics_collection()
+
+            # Start workers, the first reserved ones only for interactive jobs
+            for index in range(self.workers):
+                min_priority = self.interactive_priority if index < self.reserved_workers else None
+                self._tasks.append(
+                    asyncio.create_task(self._start_job_processor(min_priority))
+                )
+            self._tasks.append(asyncio.create_task(self._start_metrics_collection()))
+
             logger.info("MCP orchestrator started successfully")
 
         except Exception as e:
@@ -55,6 +96,15 @@ class MCPOrchestrator:
         """Stop the orchestrator."""
         try:
             logger.info("Stopping MCP orchestrator...")
+
+            # Cancel running jobs, then the workers
+            for job_id in list(self.active_jobs):
+                await self.cancel_job(job_id)
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks.clear()
+
             await self._cleanup()
             self.active_jobs.clear()
             self.metrics.clear()
@@ -84,7 +134,8 @@ class MCPOrchestrator:
         """
         try:
             # Create job
-            job_id = f"{job_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            sequence = next(self._sequence)
+            job_id = f"{job_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{sequence}"
             job = {
                 "id": job_id,
                 "type": job_type,
@@ -95,8 +146,16 @@ class MCPOrchestrator:
                 "timestamp": datetime.now()
             }
 
-            # Add to queue
-            await self.job_queue.put((priority, job))
+            # Add to queue; waiting aging_interval seconds is worth one level
+            waited = time.monotonic() / self.aging_interval if self.aging_interval else 0
+            key = waited - priority
+            condition = self._get_queue_condition()
+            async with condition:
+                self.jobs[job_id] = job
+                self.queued_jobs.add(job_id)
+                heapq.heappush(self.job_queue, (key, sequence, job_id))
+                condition.notify_all()
+
             logger.info(f"Scheduled job: {job_id}")
 
             return job_id
@@ -115,11 +174,12 @@ class MCPOrchestrator:
             Job status dictionary
         """
         try:
-            # Check active jobs
-            if job_id in self.active_jobs:
+            # Check queued and active jobs
+            if job_id in self.queued_jobs or job_id in self.active_jobs:
                 return {
                     "id": job_id,
-                    "status": "running",
+                    "status": self.jobs[job_id]["status"],
+                    "priority": self.jobs[job_id]["priority"],
                     "timestamp": datetime.now()
                 }
 
@@ -157,11 +217,24 @@ class MCPOrchestrator:
             Whether job was cancelled
         """
         try:
-            # Check active jobs
+            # Queued jobs are dropped when a worker reaches them
+            if job_id in self.queued_jobs:
+                self.queued_jobs.discard(job_id)
+                job = self.jobs.pop(job_id)
+                job["status"] = "cancelled"
+                job["end_time"] = datetime.now()
+                self._count_job("cancelled")
+                await self._save_job_results(job)
+                logger.info(f"Cancelled queued job: {job_id}")
+                return True
+
+            # Running jobs stop at their next checkpoint or await
             if job_id in self.active_jobs:
-                # TODO: Implement job cancellation
-                self.active_jobs.remove(job_id)
-                logger.info(f"Cancelled job: {job_id}")
+                self._cancelled.add(job_id)
+                task = self._job_tasks.get(job_id)
+                if task:
+                    task.cancel()
+                logger.info(f"Cancelling running job: {job_id}")
                 return True
 
             return False
@@ -191,34 +264,129 @@ class MCPOrchestrator:
             logger.error(f"Error cleaning up orchestrator: {e}")
             raise
 
-    async def _start_job_processor(self) -> None:
-        """Start job processing loop."""
-        try:
-            while True:
+    def _get_queue_condition(self) -> asyncio.Condition:
+        """Get the condition guarding the job queue.
+
+        Created lazily so it binds to the running event loop.
+
+        Returns:
+            Queue condition
+        """
+        if self._queue_condition is None:
+            self._queue_condition = asyncio.Condition()
+        return self._queue_condition
+
+    def _pop_job(self, min_priority: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Take the next runnable job off the queue.
+
+        Args:
+            min_priority: Minimum job priority the worker accepts, if any
+
+        Returns:
+            Next job, or None if there is no eligible job
+        """
+        # Drop entries of jobs cancelled or taken while queued
+        while self.job_queue and self.job_queue[0][2] not in self.queued_jobs:
+            heapq.heappop(self.job_queue)
+
+        if min_priority is None:
+            if not self.job_queue:
+                return None
+            _, _, job_id = heapq.heappop(self.job_queue)
+        else:
+            eligible = [
+                entry for entry in self.job_queue
+                if entry[2] in self.queued_jobs
+                and self.jobs[entry[2]]["priority"] >= min_priority
+            ]
+            if not eligible:
+                return None
+            job_id = min(eligible)[2]
+
+        self.queued_jobs.discard(job_id)
+        return self.jobs[job_id]
+
+    async def _start_job_processor(self, min_priority: Optional[int] = None) -> None:
+        """Run a job processing worker.
+
+        Args:
+            min_priority: Minimum job priority the worker accepts, if any
+        """
+        condition = self._get_queue_condition()
+        while True:
+            try:
                 # Get next job
-                priority, job = await self.job_queue.get()
+                async with condition:
+                    job = self._pop_job(min_priority)
+                    while job is None:
+                        await condition.wait()
+                        job = self._pop_job(min_priority)
+
                 job_id = job["id"]
+                self.active_jobs.add(job_id)
+                task = asyncio.create_task(self._process_job(job))
+                self._job_tasks[job_id] = task
 
                 try:
-                    # Process job
-                    self.active_jobs.add(job_id)
-                    await self._process_job(job)
+                    # Process job; waiting does not propagate the job's cancellation
+                    await asyncio.wait([task])
+                    if task.cancelled() and job["status"] != "cancelled":
+                        # Cancelled before it started running
+                        await self._record_cancelled(job)
 
                 finally:
-                    self.active_jobs.remove(job_id)
-                    self.job_queue.task_done()
+                    self._job_tasks.pop(job_id, None)
+                    self._cancelled.discard(job_id)
+                    self.active_jobs.discard(job_id)
+                    self.jobs.pop(job_id, None)
 
-        except Exception as e:
-            logger.error(f"Error processing jobs: {e}")
-            if not self.active_jobs:
-                # Restart job processor
-                asyncio.create_task(self._start_job_processor())
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                logger.error(f"Error processing jobs: {e}")
+
+    def _check_cancelled(self, job: Dict[str, Any]) -> None:
+        """Stop a job at a checkpoint if it has been cancelled.
+
+        Args:
+            job: Running job
+
+        Raises:
+            JobCancelled: If the job has been cancelled
+        """
+        if job["id"] in self._cancelled:
+            raise JobCancelled(job["id"])
+
+    def _count_job(self, status: str) -> None:
+        """Count a finished job by status.
+
+        Args:
+            status: Final job status
+        """
+        self.job_counts[status] = self.job_counts.get(status, 0) + 1
+
+    async def _record_cancelled(self, job: Dict[str, Any]) -> None:
+        """Record that a job was cancelled.
+
+        Args:
+            job: Cancelled job
+        """
+        logger.info(f"Cancelled job: {job['id']}")
+        job["status"] = "cancelled"
+        job["end_time"] = datetime.now()
+        self._count_job("cancelled")
+        await self._save_job_results(job)
 
     async def _process_job(self, job: Dict[str, Any]) -> None:
         """Process a job.
 
         Args:
             job: Job to process
+
+        Raises:
+            asyncio.CancelledError: If the job task was cancelled, after the
+                cancellation has been recorded
         """
         try:
             job_id = job["id"]
@@ -242,17 +410,27 @@ class MCPOrchestrator:
             job["status"] = "completed"
             job["end_time"] = datetime.now()
             job["results"] = results
+            self._count_job("completed")
 
             # Save results
             await self._save_job_results(job)
 
             logger.info(f"Completed job: {job_id}")
 
+        except JobCancelled:
+            await self._record_cancelled(job)
+
+        except asyncio.CancelledError:
+            # Record the status, then let the task end as cancelled
+            await self._record_cancelled(job)
+            raise
+
         except Exception as e:
             logger.error(f"Error processing job: {e}")
             job["status"] = "failed"
             job["error"] = str(e)
             job["end_time"] = datetime.now()
+            self._count_job("failed")
             await self._save_job_results(job)
 
     async def _run_sniffing(self, job: Dict[str, Any]) -> Dict[str, Any]:
@@ -273,6 +451,7 @@ class MCPOrchestrator:
 
             # Run each domain
             for domain in job["domains"]:
+                self._check_cancelled(job)
                 domain_results = await self._run_domain_sniffing(
                     domain,
                     job["files"]
@@ -284,6 +463,9 @@ class MCPOrchestrator:
 
             return results
 
+        except JobCancelled:
+            raise
+
         except Exception as e:
             logger.error(f"Error running sniffing: {e}")
             return {
@@ -340,6 +522,7 @@ class MCPOrchestrator:
 
             # Run each domain
             for domain in job["domains"]:
+                self._check_cancelled(job)
                 domain_results = await self._run_domain_analysis(
                     domain,
                     job["files"]
@@ -351,6 +534,9 @@ class MCPOrchestrator:
 
             return results
 
+        except JobCancelled:
+            raise
+
         except Exception as e:
             logger.error(f"Error running analysis: {e}")
             return {
@@ -407,6 +593,7 @@ class MCPOrchestrator:
 
             # Run each domain
             for domain in job["domains"]:
+                self._check_cancelled(job)
                 domain_results = await self._run_domain_fixes(
                     domain,
                     job["files"]
@@ -418,6 +605,9 @@ class MCPOrchestrator:
 
             return results
 
+        except JobCancelled:
+            raise
+
         except Exception as e:
             logger.error(f"Error running fixes: {e}")
             return {
@@ -486,8 +676,10 @@ class MCPOrchestrator:
                 # Update metrics
                 self.metrics = {
                     "active_jobs": len(self.active_jobs),
-                    "queued_jobs": self.job_queue.qsize(),
-                    "total_jobs": len(self.active_jobs) + self.job_queue.qsize(),
+                    "queued_jobs": len(self.queued_jobs),
+                    "total_jobs": len(self.active_jobs) + len(self.queued_jobs),
+                    "workers": self.workers,
+                    "reserved_workers": self.reserved_workers,
                     "timestamp": datetime.now()
                 }
 
@@ -524,7 +716,7 @@ class MCPOrchestrator:
                 "checks": {
                     "metrics": metrics_health,
                     "active_jobs": len(self.active_jobs),
-                    "queued_jobs": self.job_queue.qsize()
+                    "queued_jobs": len(self.queued_jobs)
                 },
                 "metrics": self.metrics
             }
@@ -546,6 +738,11 @@ class MCPOrchestrator:
         try:
             return {
                 "metrics": self.metrics,
+                "jobs": {
+                    "queued": len(self.queued_jobs),
+                    "active": len(self.active_jobs),
+                    **self.job_counts
+                },
                 "labels": {
                     "component": "orchestrator",
                     "version": "1.0.0"
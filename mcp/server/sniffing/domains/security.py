@@ -9,6 +9,7 @@ from typing import Any, Dict, List, Optional, Set
 
 from ....utils.config import MCPConfig
 from ....utils.logging import setup_logger
+from ....utils.sniffing_core import SafePattern, create_rule_cost_tracker, create_safe_pattern
 from ..base import BaseSniffer
 
 logger = logging.getLogger("security_sniffer")
@@ -23,7 +24,14 @@ class SecuritySniffer(BaseSniffer):
             config: MCP configuration
         """
         super().__init__(config, "security")
+        sniffer_config = self.config.get_sniffer_config("security")
+        self.rule_costs = create_rule_cost_tracker(
+            sniffer_config.get("rule_costs", {}),
+            "security"
+        )
+        self.regex_safety = sniffer_config.get("regex_safety", {})
         self.patterns = self._load_patterns()
+        self.safe_patterns = self._compile_patterns()
         self.rules = self._load_rules()
         self.simulations = self._load_simulations()
 
@@ -51,6 +59,30 @@ class SecuritySniffer(BaseSniffer):
             logger.error(f"Error loading security patterns: {e}")
             return {}
 
+    def _compile_patterns(self) -> Dict[str, SafePattern]:
+        """Vet and compile the loaded security patterns.
+
+        Returns:
+            Mapping of rule name to safe pattern
+        """
+        compiled = {}
+        for pattern_file, file_patterns in self.patterns.items():
+            for pattern_name, pattern in (file_patterns or {}).items():
+                rule = f"{pattern_file}.{pattern_name}"
+                try:
+                    safe = create_safe_pattern(pattern["regex"], config=self.regex_safety)
+                except Exception as e:
+                    logger.error(f"Error compiling pattern {rule}: {e}")
+                    continue
+
+                if safe.warnings:
+                    logger.warning(
+                        f"Pattern {rule} can backtrack catastrophically: {'; '.join(safe.warnings)}"
+                    )
+                compiled[rule] = safe
+
+        return compiled
+
     def _load_rules(self) -> Dict[str, Any]:
         """Load security rules.
 
@@ -280,23 +312,31 @@ class SecuritySniffer(BaseSniffer):
         try:
             issues = []
 
-            # Check each pattern
-            for pattern_name, pattern in self.patterns.items():
-                try:
-                    import re
-                    matches = re.finditer(pattern["regex"], content)
-                    for match in matches:
-                        issues.append({
-                            "type": "pattern",
-                            "name": pattern_name,
-                            "severity": pattern.get("severity", "medium"),
-                            "description": pattern.get("description", ""),
-                            "line": content.count("\n", 0, match.start()) + 1,
-                            "match": match.group(0)
-                        })
+            # Check each pattern of each pattern file
+            for pattern_file, file_patterns in self.patterns.items():
+                for pattern_name, pattern in (file_patterns or {}).items():
+                    rule = f"{pattern_file}.{pattern_name}"
+                    safe = self.safe_patterns.get(rule)
+                    if safe is None or self.rule_costs.is_quarantined(rule):
+                        continue
 
-                except Exception as e:
-                    logger.error(f"Error checking pattern {pattern_name}: {e}")
+                    try:
+                        with self.rule_costs.measure(rule, len(content)) as run:
+                            spans = await safe.spans_async(content)
+                            run.matches = len(spans)
+
+                        for start, end in spans:
+                            issues.append({
+                                "type": "pattern",
+                                "name": pattern_name,
+                                "severity": pattern.get("severity", "medium"),
+                                "description": pattern.get("description", ""),
+                                "line": content.count("\n", 0, start) + 1,
+                                "match": content[start:end]
+                            })
+
+                    except Exception as e:
+                        logger.error(f"Error checking pattern {rule}: {e}")
 
             return issues
 
@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Optional, Set
 from ...utils.config import MCPConfig
 from ...utils.logging import setup_logger
 from ...utils.metrics import record_job_start, record_job_end
+from ...utils.sniffing_core import JobHistory, create_job_history
 from ..domains import get_analyzer
 
 logger = logging.getLogger("result_manager")
@@ -24,13 +25,26 @@ class ResultManager:
             config: MCP configuration
         """
         self.config = config
-        self.results = {}
-        self.reports = {}
+        self.results = self._create_history("results")
+        self.reports = self._create_history("reports")
         self.active_jobs = set()
         self.report_queue = asyncio.Queue()
         self.is_running = False
         self._setup_logging()
 
+    def _create_history(self, name: str) -> JobHistory:
+        """Create a bounded store for results or reports.
+
+        Args:
+            name: Store name, used as the spill directory name
+
+        Returns:
+            JobHistory instance
+        """
+        history_config = dict(self.config.history_config)
+        history_path = Path(history_config.pop("path", Path(self.config.report_path) / "history"))
+        return create_job_history(history_config, str(history_path / name))
+
     def _setup_logging(self) -> None:
         """Set up logging for result manager."""
         setup_logger(logger, self.config.logging_config, "result_manager")
@@ -80,10 +94,11 @@ class ResultManager:
         """
         try:
             # Store result
-            self.results[result_id] = {
-                "data": result,
-                "timestamp": datetime.now()
-            }
+            await self.results.put_async(
+                result_id,
+                {"timestamp": datetime.now().isoformat()},
+                result
+            )
 
             # Add to report queue
             await self.report_queue.put({
@@ -111,10 +126,11 @@ class ResultManager:
         """
         try:
             # Store report
-            self.reports[report_id] = {
-                "data": report,
-                "timestamp": datetime.now()
-            }
+            await self.reports.put_async(
+                report_id,
+                {"timestamp": datetime.now().isoformat(), "status": report.get("status")},
+                report
+            )
 
             # Add to report queue
             await self.report_queue.put({
@@ -139,8 +155,7 @@ class ResultManager:
             Result data or None
         """
         try:
-            result = self.results.get(result_id)
-            return result["data"] if result else None
+            return await self.results.get_payload_async(result_id)
 
         except Exception as e:
             logger.error(f"Error getting result: {e}")
@@ -156,8 +171,7 @@ class ResultManager:
             Report data or None
         """
         try:
-            report = self.reports.get(report_id)
-            return report["data"] if report else None
+            return await self.reports.get_payload_async(report_id)
 
         except Exception as e:
             logger.error(f"Error getting report: {e}")
@@ -423,6 +437,9 @@ class ResultManager:
             return {
                 "stored_results": len(self.results),
                 "stored_reports": len(self.reports),
+                "resident_bytes": self.results.resident_bytes + self.reports.resident_bytes,
+                "results_history": self.results.get_stats(),
+                "reports_history": self.reports.get_stats(),
                 "queued_items": self.report_queue.qsize(),
                 "active_jobs": len(self.active_jobs)
             }
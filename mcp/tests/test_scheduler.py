@@ -0,0 +1,196 @@
+"""
+Tests for the orchestrator job scheduler.
+"""
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from ..server import orchestrator as orchestrator_module
+from ..server.orchestrator import MCPOrchestrator
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+class SchedulerConfig:
+    """Minimal configuration for the scheduler."""
+
+    def __init__(self, job_path: Path, scheduler: Dict[str, Any]):
+        self.job_path = str(job_path)
+        self.scheduler_config = scheduler
+        self.parallel_jobs = scheduler.get("workers", 2)
+        self.logging_config = {}
+        self.monitoring_config = {"collection_interval": 60}
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    """Replace the clock the scheduler ages jobs with.
+
+    Returns:
+        Fake clock
+    """
+    clock = FakeClock()
+    # Patch the module's reference only, the event loop keeps the real clock
+    monkeypatch.setattr(orchestrator_module, "time", clock)
+    return clock
+
+def create_orchestrator(tmp_path: Path, **scheduler: Any) -> MCPOrchestrator:
+    """Create an orchestrator whose sniffing jobs wait on a gate.
+
+    Args:
+        tmp_path: Directory for job results
+        **scheduler: Scheduler configuration
+
+    Returns:
+        Orchestrator with ``gate`` and ``started`` attributes
+    """
+    orchestrator = MCPOrchestrator(SchedulerConfig(tmp_path / "jobs", scheduler))
+    orchestrator.gate = asyncio.Event()
+    orchestrator.started: List[str] = []
+
+    async def run_sniffing(job: Dict[str, Any]) -> Dict[str, Any]:
+        orchestrator.started.append(job["id"])
+        if job["priority"] < orchestrator.interactive_priority:
+            await orchestrator.gate.wait()
+        return {"status": "completed"}
+
+    orchestrator._run_sniffing = run_sniffing
+    return orchestrator
+
+def pop_order(orchestrator: MCPOrchestrator, min_priority: Any = None) -> List[str]:
+    """Pop every eligible job.
+
+    Args:
+        orchestrator: Orchestrator to pop from
+        min_priority: Minimum job priority, if any
+
+    Returns:
+        Job identifiers in pop order
+    """
+    order = []
+    job = orchestrator._pop_job(min_priority)
+    while job is not None:
+        order.append(job["id"])
+        job = orchestrator._pop_job(min_priority)
+    return order
+
+async def wait_for(predicate, timeout: float = 5) -> None:
+    """Wait until a predicate holds.
+
+    Args:
+        predicate: Condition to wait for
+        timeout: Seconds to wait
+    """
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+@pytest.mark.asyncio
+async def test_aging(tmp_path: Path, clock: FakeClock):
+    """Test that a job waiting long enough overtakes higher priorities."""
+    orchestrator = create_orchestrator(tmp_path, aging_interval=10)
+
+    old = await orchestrator.schedule_job("sniff", ["a.py"], ["security"], priority=0)
+    clock.now += 100
+    # Ten intervals of waiting are worth ten levels, more than either gap
+    normal = await orchestrator.schedule_job("sniff", ["b.py"], ["security"], priority=5)
+    urgent = await orchestrator.schedule_job("sniff", ["c.py"], ["security"], priority=9)
+    clock.now += 100
+    newest = await orchestrator.schedule_job("sniff", ["d.py"], ["security"], priority=9)
+
+    assert pop_order(orchestrator) == [old, urgent, normal, newest]
+
+@pytest.mark.asyncio
+async def test_sequence_breaks_ties(tmp_path: Path, clock: FakeClock):
+    """Test that equally ranked jobs run in submission order."""
+    orchestrator = create_orchestrator(tmp_path, aging_interval=10)
+
+    jobs = [
+        await orchestrator.schedule_job("sniff", [f"{i}.py"], ["security"], priority=3)
+        for i in range(5)
+    ]
+
+    assert pop_order(orchestrator) == jobs
+
+@pytest.mark.asyncio
+async def test_reserved_workers_only_take_interactive_jobs(tmp_path: Path, clock: FakeClock):
+    """Test that reserved workers run interactive jobs behind a long scan."""
+    orchestrator = create_orchestrator(
+        tmp_path,
+        workers=2,
+        reserved_workers=1,
+        interactive_priority=7
+    )
+    await orchestrator.start()
+    try:
+        scan = await orchestrator.schedule_job("sniff", ["repo"], ["security"], priority=1)
+        await wait_for(lambda: scan in orchestrator.started)
+        waiting = await orchestrator.schedule_job("sniff", ["repo"], ["security"], priority=1)
+        interactive = await orchestrator.schedule_job("sniff", ["a.py"], ["security"], priority=8)
+
+        await wait_for(lambda: orchestrator.job_counts.get("completed") == 1)
+        assert orchestrator.started == [scan, interactive]
+        assert waiting in orchestrator.queued_jobs
+
+        orchestrator.gate.set()
+        await wait_for(lambda: orchestrator.job_counts.get("completed") == 3)
+        assert orchestrator.started == [scan, interactive, waiting]
+
+    finally:
+        await orchestrator.stop()
+
+@pytest.mark.asyncio
+async def test_cancel_running_job(tmp_path: Path, clock: FakeClock):
+    """Test that cancelling a running job records it once and ends its task."""
+    orchestrator = create_orchestrator(tmp_path, workers=1, reserved_workers=0)
+    await orchestrator.start()
+    try:
+        job_id = await orchestrator.schedule_job("sniff", ["repo"], ["security"], priority=1)
+        await wait_for(lambda: job_id in orchestrator.started)
+        task = orchestrator._job_tasks[job_id]
+
+        assert await orchestrator.cancel_job(job_id)
+        await wait_for(lambda: not orchestrator.active_jobs)
+
+        assert task.cancelled()
+        assert orchestrator.job_counts == {"cancelled": 1}
+        status = await orchestrator.get_job_status(job_id)
+        assert status["status"] == "cancelled"
+
+    finally:
+        await orchestrator.stop()
+
+@pytest.mark.asyncio
+async def test_process_job_reraises_cancellation(tmp_path: Path, clock: FakeClock):
+    """Test that a cancelled job task records its status before ending."""
+    orchestrator = create_orchestrator(tmp_path)
+    job = {"id": "sniff_1", "type": "sniff", "files": [], "domains": [], "priority": 1}
+
+    task = asyncio.create_task(orchestrator._process_job(job))
+    await wait_for(lambda: job["id"] in orchestrator.started)
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert job["status"] == "cancelled"
+    assert (tmp_path / "jobs" / job["id"] / "status.json").exists()
+
+@pytest.mark.asyncio
+async def test_cancel_queued_job(tmp_path: Path, clock: FakeClock):
+    """Test that a cancelled queued job is skipped by workers."""
+    orchestrator = create_orchestrator(tmp_path)
+
+    cancelled = await orchestrator.schedule_job("sniff", ["a.py"], ["security"], priority=9)
+    kept = await orchestrator.schedule_job("sniff", ["b.py"], ["security"], priority=1)
+    assert await orchestrator.cancel_job(cancelled)
+
+    assert pop_order(orchestrator) == [kept]
+    assert orchestrator.job_counts == {"cancelled": 1}
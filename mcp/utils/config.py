@@ -229,6 +229,24 @@ class MCPConfig:
         """
         return self.config["model"]
 
+    @property
+    def scheduler_config(self) -> Dict[str, Any]:
+        """Get job scheduler configuration.
+
+        Returns:
+            Scheduler configuration dictionary
+        """
+        return self.config.get("scheduler", {})
+
+    @property
+    def history_config(self) -> Dict[str, Any]:
+        """Get result and report history configuration.
+
+        Returns:
+            History configuration dictionary
+        """
+        return self.config.get("history", {})
+
     @property
     def workspace_path(self) -> str:
         """Get workspace path.
@@ -0,0 +1,26 @@
+"""
+Shared sniffing utilities used by the MCP server.
+
+The MCP server reuses the regex safety, rule cost and job history helpers of
+the ``sniffing`` package rather than keeping copies of them. This module is
+the single place that dependency is declared, so it fails with a clear
+message when ``sniffing`` is not importable.
+"""
+try:
+    from sniffing.core.utils.job_history import JobHistory, create_job_history
+    from sniffing.core.utils.regex_safety import SafePattern, create_safe_pattern
+    from sniffing.core.utils.rule_costs import RuleCostTracker, create_rule_cost_tracker
+except ImportError as e:
+    raise ImportError(
+        "The MCP server requires the sniffing package; run it from the "
+        "repository root or install the repository with `pip install -e .`"
+    ) from e
+
+__all__ = [
+    "JobHistory",
+    "RuleCostTracker",
+    "SafePattern",
+    "create_job_history",
+    "create_rule_cost_tracker",
+    "create_safe_pattern"
+]
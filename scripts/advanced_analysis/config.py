@@ -231,6 +231,11 @@ MCP_CONFIG = {
             "performance": 300,  # seconds
             "security": 3600    # seconds
         },
+        "file_watch": {
+            "debounce": 0.2,     # seconds without changes before analyzing
+            "max_pending": 10000,  # changed files tracked before a full rescan
+            "ignore_patterns": [".git", "__pycache__", "*.pyc", "venv", "node_modules"]
+        },
         "retention": {
             "logs": 30,        # days
             "metrics": 90,     # days
@@ -17,8 +17,6 @@ from typing import Dict, List, Optional, Any, Set
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
 
 from .config import (
     ANALYSIS_CONFIG,
@@ -30,6 +28,7 @@ from .config import (
     AI_FEEDBACK
 )
 from .sniffing import SniffingSystem, SniffResult
+from sniffing.core.utils.file_watcher import FileWatcher
 
 # Configure logging
 logging.basicConfig(
@@ -104,13 +103,24 @@ class MasterControlProgram:
         # Implementation would load from configuration
         return {}
 
-    async def run_sniffing(self, target: str = ".", specific_file: Optional[str] = None, domains: Optional[List[str]] = None):
+    async def run_sniffing(
+        self,
+        target: str = ".",
+        specific_file: Optional[str] = None,
+        domains: Optional[List[str]] = None,
+        specific_files: Optional[List[str]] = None
+    ):
         """Run comprehensive sniffing"""
-        logger.info(f"Starting sniffing on {'specific file: ' + specific_file if specific_file else 'entire codebase'}")
+        if specific_file:
+            specific_files = [specific_file]
+        logger.info(f"Starting sniffing on {f'{len(specific_files)} files' if specific_files else 'entire codebase'}")
 
         try:
-            if specific_file:
-                results = {specific_file: await self.sniffing_system.sniff_file(specific_file, domains)}
+            if specific_files:
+                results = {
+                    path: await self.sniffing_system.sniff_file(path, domains)
+                    for path in specific_files
+                }
             else:
                 results = await self.sniffing_system.sniff_directory(target, domains)
 
@@ -159,26 +169,33 @@ class MasterControlProgram:
                 await self._update_git_hook(hook, results)
 
     async def monitor_file_changes(self):
-        """Monitor for file changes and trigger analysis"""
-        class ChangeHandler(FileSystemEventHandler):
-            def __init__(self, mcp):
-                self.mcp = mcp
-
-            async def on_modified(self, event):
-                if not event.is_directory and self.mcp._should_analyze_file(event.src_path):
-                    await self.mcp.run_sniffing(specific_file=event.src_path)
-
-        observer = Observer()
-        handler = ChangeHandler(self)
-        observer.schedule(handler, ".", recursive=True)
-        observer.start()
+        """Monitor for file changes and analyze them in debounced batches"""
+        monitoring = MCP_CONFIG["monitoring"]
+        watch_config = monitoring["file_watch"]
+
+        async def analyze(files: List[str]):
+            await self.run_sniffing(specific_files=files)
+
+        # Watchdog events arrive on the observer thread; the watcher hands
+        # them to this loop and coalesces save bursts into one batch
+        watcher = FileWatcher(
+            ".",
+            analyze,
+            ignore_patterns=watch_config["ignore_patterns"],
+            extensions=tuple(pattern.rsplit("*", 1)[-1] for pattern in FILE_CONFIGS),
+            debounce=watch_config["debounce"],
+            max_delay=monitoring["intervals"]["file_watch"],
+            max_pending=watch_config["max_pending"]
+        )
+        await watcher.start()
 
         try:
             while True:
-                await asyncio.sleep(1)
-        except KeyboardInterrupt:
-            observer.stop()
-        observer.join()
+                await asyncio.sleep(monitoring["intervals"]["file_watch"])
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            pass
+        finally:
+            await watcher.stop()
 
     async def run_security_simulation(self):
         """Run security attack simulations"""
@@ -0,0 +1,187 @@
+"""
+Script to benchmark batched, cached AI inference against per-issue encoding.
+
+A tiny randomly initialized BERT stands in for CodeBERT so the benchmark
+runs on CPU without downloading weights.
+"""
+import argparse
+import logging
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+import torch
+from transformers import BertConfig, BertModel
+
+from sniffing.core.ai.inference import InferenceEngine
+
+logger = logging.getLogger("benchmark_ai_inference")
+
+ISSUE_TYPES = ["sql_injection", "xss", "missing_docstring", "hardcoded_secret", "eval_usage"]
+WORDS = ["user", "input", "query", "password", "render", "template", "request", "unsafe", "call"]
+
+class HashTokenizer:
+    """Whitespace tokenizer hashing words into a fixed vocabulary."""
+
+    def __init__(self, vocab_size: int):
+        """Initialize tokenizer.
+
+        Args:
+            vocab_size: Vocabulary size of the model
+        """
+        self.vocab_size = vocab_size
+
+    def __call__(
+        self,
+        texts: List[str],
+        padding: bool = True,
+        truncation: bool = True,
+        max_length: int = 512,
+        return_tensors: str = "pt"
+    ) -> Dict[str, torch.Tensor]:
+        """Tokenize texts into padded tensors.
+
+        Args:
+            texts: Texts to tokenize
+            padding: Ignored, batches are always padded
+            truncation: Ignored, texts are always truncated
+            max_length: Maximum number of tokens per text
+            return_tensors: Ignored, tensors are always returned
+
+        Returns:
+            Input ids and attention mask
+        """
+        if isinstance(texts, str):
+            texts = [texts]
+
+        # Token 0 is padding, 1 stands in for [CLS]
+        ids = [
+            [1] + [2 + hash(word) % (self.vocab_size - 2) for word in text.split()][:max_length - 1]
+            for text in texts
+        ]
+        width = max(len(row) for row in ids)
+        input_ids = torch.zeros(len(ids), width, dtype=torch.long)
+        attention_mask = torch.zeros(len(ids), width, dtype=torch.long)
+        for i, row in enumerate(ids):
+            input_ids[i, :len(row)] = torch.tensor(row)
+            attention_mask[i, :len(row)] = 1
+
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+def build_model(hidden_size: int, layers: int) -> Tuple[Any, HashTokenizer]:
+    """Build a tiny randomly initialized encoder.
+
+    Args:
+        hidden_size: Hidden size
+        layers: Number of layers
+
+    Returns:
+        Tuple of model and tokenizer
+    """
+    config = BertConfig(
+        vocab_size=4096,
+        hidden_size=hidden_size,
+        num_hidden_layers=layers,
+        num_attention_heads=4,
+        intermediate_size=hidden_size * 4,
+        max_position_embeddings=512
+    )
+    model = BertModel(config)
+    model.eval()
+    return model, HashTokenizer(config.vocab_size)
+
+def make_issues(count: int, distinct: int, seed: int = 0) -> List[str]:
+    """Generate issue texts, with repeats as across files of one codebase.
+
+    Args:
+        count: Number of issues
+        distinct: Number of distinct issue texts
+        seed: Random seed
+
+    Returns:
+        Issue texts
+    """
+    rng = random.Random(seed)
+    texts = [
+        f"{rng.choice(ISSUE_TYPES)} " + " ".join(rng.choices(WORDS, k=rng.randint(4, 60)))
+        for _ in range(distinct)
+    ]
+    return [rng.choice(texts) for _ in range(count)]
+
+def run_per_issue(model: Any, tokenizer: HashTokenizer, texts: List[str]) -> float:
+    """Encode issues one at a time, as the analyzer used to.
+
+    Args:
+        model: Encoder model
+        tokenizer: Tokenizer
+        texts: Issue texts
+
+    Returns:
+        Elapsed seconds
+    """
+    start = time.perf_counter()
+    with torch.no_grad():
+        for text in texts:
+            outputs = model(**tokenizer([text]))
+            outputs.last_hidden_state[:, 0, :].cpu()
+    return time.perf_counter() - start
+
+def run_engine(engine: InferenceEngine, texts: List[str]) -> float:
+    """Embed issues with the batched engine.
+
+    Args:
+        engine: Inference engine
+        texts: Issue texts
+
+    Returns:
+        Elapsed seconds
+    """
+    start = time.perf_counter()
+    engine.embed(texts)
+    return time.perf_counter() - start
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--issues", type=int, default=2000, help="Number of issues")
+    parser.add_argument("--distinct", type=int, default=500, help="Number of distinct issues")
+    parser.add_argument("--batch-size", type=int, default=32, help="Texts per batch")
+    parser.add_argument("--hidden-size", type=int, default=128, help="Model hidden size")
+    parser.add_argument("--layers", type=int, default=2, help="Model layers")
+    parser.add_argument("--threads", type=int, default=0, help="Torch CPU threads (0 for default)")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    torch.manual_seed(0)
+
+    model, tokenizer = build_model(args.hidden_size, args.layers)
+    texts = make_issues(args.issues, args.distinct)
+    logger.info(f"Embedding {len(texts)} issues ({args.distinct} distinct)")
+
+    old_time = run_per_issue(model, tokenizer, texts)
+    logger.info(f"Per-issue encoding: {old_time:.3f}s")
+
+    engine = InferenceEngine(model, tokenizer, batch_size=args.batch_size)
+    cold_time = run_engine(engine, texts)
+    logger.info(f"Batched, cold cache: {cold_time:.3f}s ({engine.batches} batches)")
+
+    warm_time = run_engine(engine, texts)
+    logger.info(f"Batched, warm cache: {warm_time:.3f}s")
+
+    quantized = InferenceEngine(model, tokenizer, batch_size=args.batch_size, quantize=True)
+    quantized_time = run_engine(quantized, texts)
+    logger.info(f"Batched, quantized, cold cache: {quantized_time:.3f}s")
+
+    if cold_time > 0:
+        logger.info(f"Speedup (cold): {old_time / cold_time:.1f}x")
+    if quantized_time > 0:
+        logger.info(f"Speedup (quantized): {old_time / quantized_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
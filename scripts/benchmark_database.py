@@ -0,0 +1,258 @@
+"""
+Script to benchmark the synchronous and async database layers under load.
+
+Runs the queries of the auth endpoints (user lookup and registration) and of
+a document listing from many concurrent coroutines, once with blocking
+``Session`` calls made directly in the coroutines, as the routes used to,
+and once with ``AsyncSession``. Besides throughput it reports event loop
+lag: how late a 1ms ticker wakes while the load runs, which is what every
+other request on the worker experiences.
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    create_engine,
+    insert,
+    select
+)
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import create_async_database
+
+logger = logging.getLogger("benchmark_database")
+
+metadata = MetaData()
+
+# Columns the benchmarked queries touch, as in app/models.py
+users = Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("username", String(64), unique=True, nullable=False),
+    Column("email", String(120), unique=True, nullable=False),
+    Column("password_hash", String(128), nullable=False),
+    Column("is_active", Boolean, default=True)
+)
+
+documents = Table(
+    "documents",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("title", String(200), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("owner_id", Integer, ForeignKey("users.id"), nullable=False, index=True),
+    Column("is_public", Boolean, default=False)
+)
+
+# Precomputed so the benchmark measures the database, not bcrypt
+PASSWORD_HASH = "$2b$12$" + "x" * 53
+
+def seed(url: str, user_count: int, documents_per_user: int) -> None:
+    """Create and fill the benchmark tables.
+
+    Args:
+        url: Database URL
+        user_count: Number of users
+        documents_per_user: Documents owned by each user
+    """
+    engine = create_engine(url)
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(users), [
+            {"username": f"user{i}", "email": f"user{i}@example.com", "password_hash": PASSWORD_HASH}
+            for i in range(user_count)
+        ])
+        conn.execute(insert(documents), [
+            {"title": f"Document {i}.{j}", "content": "text " * 200, "owner_id": i + 1}
+            for i in range(user_count)
+            for j in range(documents_per_user)
+        ])
+    engine.dispose()
+
+def sync_handlers(url: str, user_count: int) -> Dict[str, Callable[[int], Awaitable[None]]]:
+    """Build endpoint handlers using blocking sessions inside coroutines.
+
+    Args:
+        url: Database URL
+        user_count: Number of seeded users
+
+    Returns:
+        Mapping of endpoint name to handler
+    """
+    Session = sessionmaker(bind=create_engine(url, connect_args={"check_same_thread": False}))
+
+    async def login(i: int) -> None:
+        with Session() as db:
+            db.execute(select(users.c.password_hash).where(users.c.username == f"user{i % user_count}")).first()
+
+    async def register(i: int) -> None:
+        with Session() as db:
+            username = f"sync{i}"
+            if db.execute(select(users.c.id).where(users.c.username == username)).first() is None:
+                db.execute(insert(users).values(
+                    username=username,
+                    email=f"{username}@example.com",
+                    password_hash=PASSWORD_HASH
+                ))
+                db.commit()
+
+    async def list_documents(i: int) -> None:
+        with Session() as db:
+            db.execute(
+                select(documents.c.id, documents.c.title)
+                .where(documents.c.owner_id == i % user_count + 1)
+                .order_by(documents.c.id)
+                .limit(20)
+            ).all()
+
+    return {"login": login, "register": register, "documents": list_documents}
+
+def async_handlers(url: str, user_count: int) -> Dict[str, Callable[[int], Awaitable[None]]]:
+    """Build endpoint handlers using async sessions.
+
+    Args:
+        url: Database URL
+        user_count: Number of seeded users
+
+    Returns:
+        Mapping of endpoint name to handler
+    """
+    Session = create_async_database(url)
+
+    async def login(i: int) -> None:
+        async with Session() as db:
+            (await db.execute(
+                select(users.c.password_hash).where(users.c.username == f"user{i % user_count}")
+            )).first()
+
+    async def register(i: int) -> None:
+        async with Session() as db:
+            username = f"async{i}"
+            if await db.scalar(select(users.c.id).where(users.c.username == username)) is None:
+                await db.execute(insert(users).values(
+                    username=username,
+                    email=f"{username}@example.com",
+                    password_hash=PASSWORD_HASH
+                ))
+                await db.commit()
+
+    async def list_documents(i: int) -> None:
+        async with Session() as db:
+            (await db.execute(
+                select(documents.c.id, documents.c.title)
+                .where(documents.c.owner_id == i % user_count + 1)
+                .order_by(documents.c.id)
+                .limit(20)
+            )).all()
+
+    return {"login": login, "register": register, "documents": list_documents}
+
+async def run_load(
+    handler: Callable[[int], Awaitable[None]],
+    requests: int,
+    concurrency: int
+) -> Dict[str, float]:
+    """Run requests against a handler from concurrent coroutines.
+
+    Args:
+        handler: Endpoint handler
+        requests: Total number of requests
+        concurrency: Number of concurrent clients
+
+    Returns:
+        Throughput, latency and event loop lag statistics
+    """
+    latencies: List[float] = []
+    lags: List[float] = []
+    counter = iter(range(requests))
+    done = asyncio.Event()
+
+    async def client() -> None:
+        for i in counter:
+            start = time.perf_counter()
+            await handler(i)
+            latencies.append(time.perf_counter() - start)
+
+    async def ticker() -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    tick = asyncio.ensure_future(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+
+    latencies.sort()
+    return {
+        "requests_per_second": requests / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "loop_lag_mean_ms": statistics.mean(lags) * 1000 if lags else 0.0,
+        "loop_lag_max_ms": max(lags) * 1000 if lags else 0.0
+    }
+
+async def run_all(url: str, user_count: int, requests: int, concurrency: int) -> None:
+    """Benchmark each endpoint on both layers.
+
+    Both layers run on one event loop, which the async engine's pooled
+    connections are bound to.
+
+    Args:
+        url: Database URL
+        user_count: Number of seeded users
+        requests: Requests per endpoint
+        concurrency: Number of concurrent clients
+    """
+    layers = {"sync": sync_handlers(url, user_count), "async": async_handlers(url, user_count)}
+    for endpoint in ("login", "register", "documents"):
+        for layer, handlers in layers.items():
+            stats = await run_load(handlers[endpoint], requests, concurrency)
+            logger.info(
+                f"{endpoint:<10} {layer:<5} "
+                f"{stats['requests_per_second']:8.0f} req/s  "
+                f"p50 {stats['p50_ms']:6.2f}ms  p99 {stats['p99_ms']:7.2f}ms  "
+                f"loop lag mean {stats['loop_lag_mean_ms']:6.2f}ms max {stats['loop_lag_max_ms']:7.2f}ms"
+            )
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent clients")
+    parser.add_argument("--users", type=int, default=1000, help="Seeded users")
+    parser.add_argument("--documents", type=int, default=20, help="Seeded documents per user")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "benchmark.db"
+        url = f"sqlite:///{path}"
+        seed(url, args.users, args.documents)
+        logger.info(f"Seeded {args.users} users and {args.users * args.documents} documents")
+        asyncio.run(run_all(url, args.users, args.requests, args.concurrency))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Script to benchmark import time of the sniffing entry points.
+
+Each module is imported in a fresh interpreter with ``-X importtime``. The
+script fails when an entry point imports a heavy optional dependency that
+should only load on first use, or when its import time regresses beyond the
+baseline committed next to it, ``benchmark_startup_baseline.json``.
+
+After an intended change in import time, refresh the baseline with::
+
+    python scripts/benchmark_startup.py --save-baseline scripts/benchmark_startup_baseline.json
+"""
+import argparse
+import json
+import logging
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+logger = logging.getLogger("benchmark_startup")
+
+ENTRY_POINTS = [
+    "sniffing",
+    "sniffing.run",
+    "sniffing.mcp.server.mcp_server",
+    "sniffing.mcp.orchestration.test_orchestrator",
+    "sniffing.git.hooks.pre_commit"
+]
+
+# Dependencies only domains or features that need them may import
+DEFERRED_MODULES = ["torch", "transformers", "selenium", "weasyprint", "git"]
+
+DEFAULT_BASELINE = Path(__file__).with_name("benchmark_startup_baseline.json")
+
+IMPORT_TIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+def measure(module: str) -> Tuple[float, Dict[str, float], Set[str]]:
+    """Import a module in a fresh interpreter.
+
+    Args:
+        module: Module to import
+
+    Returns:
+        Tuple of cumulative import milliseconds, self milliseconds of every
+        imported module, and the set of imported top-level packages
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True
+    )
+    if process.returncode != 0:
+        error = process.stderr.strip().splitlines()[-1] if process.stderr.strip() else ""
+        raise RuntimeError(f"import {module} failed: {error}")
+
+    total = 0.0
+    self_times = {}
+    for line in process.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        self_times[name] = int(match.group(1)) / 1000
+        if name == module:
+            total = int(match.group(2)) / 1000
+
+    packages = {name.split(".")[0] for name in self_times}
+    return total, self_times, packages
+
+def best_of(module: str, repeat: int) -> Tuple[float, Dict[str, float], Set[str]]:
+    """Measure a module several times and keep the fastest run.
+
+    Args:
+        module: Module to import
+        repeat: Number of runs
+
+    Returns:
+        Fastest measurement
+    """
+    runs = [measure(module) for _ in range(max(1, repeat))]
+    return min(runs, key=lambda run: run[0])
+
+def main() -> int:
+    """Run the benchmark.
+
+    Returns:
+        Exit code (0 for success, 1 for regressions)
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS, help="Modules to import")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per module")
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports to list per module")
+    parser.add_argument(
+        "--baseline",
+        default=str(DEFAULT_BASELINE),
+        help="Baseline file to compare against"
+    )
+    parser.add_argument("--save-baseline", help="Write measured times to a baseline file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative regression over the baseline"
+    )
+    parser.add_argument(
+        "--slack-ms",
+        type=float,
+        default=20.0,
+        help="Allowed absolute regression over the baseline in milliseconds"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    baseline = {}
+    if Path(args.baseline).exists():
+        baseline = json.loads(Path(args.baseline).read_text())
+    elif not args.save_baseline:
+        logger.warning(f"No baseline at {args.baseline}, import times are not checked")
+
+    failures: List[str] = []
+    measured = {}
+    for module in args.modules:
+        try:
+            total, self_times, packages = best_of(module, args.repeat)
+        except RuntimeError as e:
+            failures.append(str(e))
+            logger.error(str(e))
+            continue
+
+        measured[module] = total
+        logger.info(f"{module}: {total:.1f}ms")
+        slowest = sorted(self_times.items(), key=lambda item: item[1], reverse=True)
+        for name, ms in slowest[:args.top]:
+            logger.info(f"    {ms:8.1f}ms  {name}")
+
+        eager = sorted(set(DEFERRED_MODULES) & packages)
+        if eager:
+            failures.append(f"{module} eagerly imports {', '.join(eager)}")
+
+        if module in baseline:
+            limit = baseline[module] * (1 + args.tolerance) + args.slack_ms
+            if total > limit:
+                failures.append(
+                    f"{module} import time {total:.1f}ms exceeds {limit:.1f}ms "
+                    f"(baseline {baseline[module]:.1f}ms)"
+                )
+
+    if args.save_baseline:
+        Path(args.save_baseline).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.save_baseline).write_text(json.dumps(measured, indent=2) + "\n")
+        logger.info(f"Baseline saved to {args.save_baseline}")
+
+    for failure in failures:
+        logger.error(f"Startup regression: {failure}")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
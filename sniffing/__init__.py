@@ -1,11 +1,8 @@
 """
 Sniffing package for code analysis and testing
 """
-from .core.base_sniffer import BaseSniffer
-from .core.types import SnifferType, SniffingResult
-from .continuous_improvement import ContinuousImprovement, ImprovementSession
-from .git_integration import GitIntegration
-from .functional_sniffer import FunctionalSniffer
+import importlib
+from typing import Any
 
 __version__ = "0.1.0"
 __author__ = "Your Name"
@@ -20,3 +17,23 @@ __all__ = [
     "GitIntegration",
     "FunctionalSniffer"
 ]
+
+# Exports imported on first access, so hook clients importing a submodule
+# stay fast; some pull in GitPython, pytest and coverage
+_LAZY_EXPORTS = {
+    "BaseSniffer": ".core.base_sniffer",
+    "SnifferType": ".core.types",
+    "SniffingResult": ".core.types",
+    "ContinuousImprovement": ".continuous_improvement",
+    "ImprovementSession": ".continuous_improvement",
+    "GitIntegration": ".git_integration",
+    "FunctionalSniffer": ".functional_sniffer"
+}
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -10,6 +10,8 @@ from typing import Any, Dict, List, Optional
 import torch
 from transformers import AutoModel, AutoTokenizer
 
+from .inference import InferenceEngine
+
 logger = logging.getLogger("ai_analyzer")
 
 class AIAnalyzer:
@@ -39,6 +41,15 @@ class AIAnalyzer:
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
             self.model = AutoModel.from_pretrained(self.model_name).to(self.device)
             self.model.eval()
+            self.inference = InferenceEngine(
+                self.model,
+                self.tokenizer,
+                self.device,
+                batch_size=self.batch_size,
+                max_sequence_length=self.max_sequence_length,
+                cache_size=self.config.get("embedding_cache_size", 10000),
+                quantize=self.config.get("quantize", False)
+            )
 
         except Exception as e:
             logger.error(f"Error loading model: {e}")
@@ -126,10 +137,13 @@ class AIAnalyzer:
             List of fix suggestions
         """
         try:
+            # Embed all issues in batches
+            embeddings = self.inference.embed([self._issue_text(issue) for issue in issues])
+
             suggestions = []
-            for issue in issues:
+            for issue, embedding in zip(issues, embeddings):
                 # Generate fix suggestion
-                suggestion = await self._generate_fix(issue)
+                suggestion = await self._generate_fix(issue, embedding.unsqueeze(0))
 
                 # Add to suggestions if confidence is high enough
                 if suggestion["confidence"] >= self.confidence_threshold:
@@ -162,16 +176,16 @@ class AIAnalyzer:
                     issue_groups[issue_type] = []
                 issue_groups[issue_type].append(issue)
 
+            # Embed issues of all groups in batches
+            grouped = [issue for group in issue_groups.values() for issue in group]
+            all_embeddings = self.inference.embed([self._issue_text(issue) for issue in grouped])
+
             # Analyze each group
             analysis = {}
+            offset = 0
             for issue_type, group in issue_groups.items():
-                # Encode issues
-                encodings = self._encode_issues(group)
-
-                # Get model predictions
-                with torch.no_grad():
-                    outputs = self.model(**encodings)
-                    embeddings = outputs.last_hidden_state[:, 0, :].cpu()
+                embeddings = all_embeddings[offset:offset + len(group)]
+                offset += len(group)
 
                 # Analyze embeddings
                 group_analysis = {
@@ -199,13 +213,8 @@ class AIAnalyzer:
             Dictionary containing pattern analysis
         """
         try:
-            # Encode patterns
-            encodings = self._encode_patterns(patterns)
-
-            # Get model predictions
-            with torch.no_grad():
-                outputs = self.model(**encodings)
-                embeddings = outputs.last_hidden_state[:, 0, :].cpu()
+            # Embed patterns in batches
+            embeddings = self.inference.embed([pattern.get("code", "") for pattern in patterns])
 
             # Analyze embeddings
             analysis = {
@@ -286,24 +295,21 @@ class AIAnalyzer:
             logger.error(f"Error generating recommendations: {e}")
             return []
 
-    async def _generate_fix(self, issue: Dict[str, Any]) -> Dict[str, Any]:
+    async def _generate_fix(
+        self,
+        issue: Dict[str, Any],
+        embedding: torch.Tensor
+    ) -> Dict[str, Any]:
         """Generate fix suggestion for an issue.
 
         Args:
             issue: Issue to generate fix for
+            embedding: Issue embedding of shape (1, hidden size)
 
         Returns:
             Dictionary containing fix suggestion
         """
         try:
-            # Encode issue
-            encodings = self._encode_issue(issue)
-
-            # Get model prediction
-            with torch.no_grad():
-                outputs = self.model(**encodings)
-                embedding = outputs.last_hidden_state[:, 0, :].cpu()
-
             # Generate fix
             fix = {
                 "issue_id": issue.get("id"),
@@ -324,89 +330,16 @@ class AIAnalyzer:
                 "confidence": 0.0
             }
 
-    def _encode_issues(self, issues: List[Dict[str, Any]]) -> Dict[str, torch.Tensor]:
-        """Encode issues for model input.
+    def _issue_text(self, issue: Dict[str, Any]) -> str:
+        """Get the text an issue is embedded from.
 
         Args:
-            issues: List of issues to encode
+            issue: Issue to describe
 
         Returns:
-            Dictionary of encoded tensors
+            Issue text
         """
-        try:
-            texts = [
-                f"{issue.get('type', '')} {issue.get('description', '')}"
-                for issue in issues
-            ]
-
-            encodings = self.tokenizer(
-                texts,
-                padding=True,
-                truncation=True,
-                max_length=self.max_sequence_length,
-                return_tensors="pt"
-            )
-
-            return {k: v.to(self.device) for k, v in encodings.items()}
-
-        except Exception as e:
-            logger.error(f"Error encoding issues: {e}")
-            return {}
-
-    def _encode_patterns(self, patterns: List[Dict[str, Any]]) -> Dict[str, torch.Tensor]:
-        """Encode code patterns for model input.
-
-        Args:
-            patterns: List of patterns to encode
-
-        Returns:
-            Dictionary of encoded tensors
-        """
-        try:
-            texts = [
-                pattern.get("code", "")
-                for pattern in patterns
-            ]
-
-            encodings = self.tokenizer(
-                texts,
-                padding=True,
-                truncation=True,
-                max_length=self.max_sequence_length,
-                return_tensors="pt"
-            )
-
-            return {k: v.to(self.device) for k, v in encodings.items()}
-
-        except Exception as e:
-            logger.error(f"Error encoding patterns: {e}")
-            return {}
-
-    def _encode_issue(self, issue: Dict[str, Any]) -> Dict[str, torch.Tensor]:
-        """Encode single issue for model input.
-
-        Args:
-            issue: Issue to encode
-
-        Returns:
-            Dictionary of encoded tensors
-        """
-        try:
-            text = f"{issue.get('type', '')} {issue.get('description', '')}"
-
-            encodings = self.tokenizer(
-                text,
-                padding=True,
-                truncation=True,
-                max_length=self.max_sequence_length,
-                return_tensors="pt"
-            )
-
-            return {k: v.to(self.device) for k, v in encodings.items()}
-
-        except Exception as e:
-            logger.error(f"Error encoding issue: {e}")
-            return {}
+        return f"{issue.get('type', '')} {issue.get('description', '')}"
 
     def _save_analysis(self, analysis: Dict[str, Any]) -> None:
         """Save analysis results to file.
@@ -449,6 +382,8 @@ class AIAnalyzer:
     def cleanup(self) -> None:
         """Clean up resources."""
         try:
+            self.inference.clear_cache()
+
             # Clear CUDA cache if using GPU
             if torch.cuda.is_available():
                 torch.cuda.empty_cache()
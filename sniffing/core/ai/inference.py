@@ -0,0 +1,170 @@
+"""
+Batched, cached encoder inference for AI analysis.
+"""
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import torch
+
+logger = logging.getLogger("ai_inference")
+
+class InferenceEngine:
+    """Batched encoder inference with an embedding cache.
+
+    Texts are deduplicated, looked up in an LRU cache keyed by their hash,
+    and only the misses are run through the model. Misses are sorted by
+    length before batching so each padded batch holds texts of similar
+    length, which keeps padding, and wasted compute, to a minimum.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        tokenizer: Any,
+        device: Optional[torch.device] = None,
+        batch_size: int = 32,
+        max_sequence_length: int = 512,
+        cache_size: int = 10000,
+        quantize: bool = False
+    ):
+        """Initialize inference engine.
+
+        Args:
+            model: Encoder model returning ``last_hidden_state``
+            tokenizer: Tokenizer for the model
+            device: Device to run the model on
+            batch_size: Number of texts per forward pass
+            max_sequence_length: Maximum number of tokens per text
+            cache_size: Maximum number of cached embeddings
+            quantize: Whether to dynamically quantize the model's linear
+                layers to int8; only applies on CPU
+        """
+        self.device = device or torch.device("cpu")
+        self.tokenizer = tokenizer
+        self.batch_size = max(1, batch_size)
+        self.max_sequence_length = max_sequence_length
+        self.cache_size = cache_size
+        self.quantized = quantize and self.device.type == "cpu"
+        self.model = quantize_model(model) if self.quantized else model
+        self.model.eval()
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+        self._cache: "OrderedDict[str, torch.Tensor]" = OrderedDict()
+
+    def embed(self, texts: List[str]) -> torch.Tensor:
+        """Embed texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Tensor of shape (len(texts), hidden size) holding the first
+            token's final hidden state for each text, in input order
+        """
+        keys = [hashlib.sha256(text.encode()).hexdigest() for text in texts]
+
+        found: Dict[str, torch.Tensor] = {}
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in found or key in missing:
+                continue
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                found[key] = self._cache[key]
+                self.hits += 1
+            else:
+                missing[key] = text
+                self.misses += 1
+
+        found.update(self._run(missing))
+        embeddings = [found[key] for key in keys]
+
+        if not embeddings:
+            return torch.empty(0, 0)
+        return torch.stack(embeddings)
+
+    def _run(self, texts: Dict[str, str]) -> Dict[str, torch.Tensor]:
+        """Run texts through the model in length-sorted, padded batches.
+
+        Args:
+            texts: Texts keyed by hash
+
+        Returns:
+            Embeddings keyed by hash
+        """
+        ordered = sorted(texts.items(), key=lambda item: len(item[1]))
+        computed = {}
+
+        for start in range(0, len(ordered), self.batch_size):
+            batch = ordered[start:start + self.batch_size]
+            encodings = self.tokenizer(
+                [text for _, text in batch],
+                padding=True,
+                truncation=True,
+                max_length=self.max_sequence_length,
+                return_tensors="pt"
+            )
+            encodings = {k: v.to(self.device) for k, v in encodings.items()}
+
+            with torch.inference_mode():
+                outputs = self.model(**encodings)
+                embeddings = outputs.last_hidden_state[:, 0, :].cpu()
+            self.batches += 1
+
+            for (key, _), embedding in zip(batch, embeddings):
+                computed[key] = embedding
+                self._store(key, embedding)
+
+        return computed
+
+    def _store(self, key: str, embedding: torch.Tensor) -> None:
+        """Cache an embedding, evicting the least recently used ones.
+
+        Args:
+            key: Text hash
+            embedding: Embedding to cache
+        """
+        if self.cache_size <= 0:
+            return
+
+        self._cache[key] = embedding
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """Clear cached embeddings."""
+        self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get inference statistics.
+
+        Returns:
+            Dictionary of inference statistics
+        """
+        lookups = self.hits + self.misses
+        return {
+            "cached_embeddings": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0,
+            "batches": self.batches,
+            "quantized": self.quantized
+        }
+
+def quantize_model(model: Any) -> Any:
+    """Dynamically quantize a model's linear layers to int8 for CPU inference.
+
+    Args:
+        model: Model to quantize
+
+    Returns:
+        Quantized model
+    """
+    return torch.quantization.quantize_dynamic(
+        model,
+        {torch.nn.Linear},
+        dtype=torch.qint8
+    )
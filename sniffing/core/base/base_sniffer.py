@@ -2,20 +2,32 @@
 Base sniffer class for domain-specific sniffing.
 """
 import asyncio
+import hashlib
+import json
 import logging
+import re
+import sys
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
+from ..utils.cache import path_cache_key
+from ..utils.file_context import FileContext
+from ..utils.line_index import LineIndex
 from ..utils.logging import setup_logger
 from ..utils.metrics import MetricsCollector
+from ..utils.patch import Edit, PatchSet, line_insert_edit, pattern_edits, text_edits, write_atomic
+from ..utils.rule_costs import create_rule_cost_tracker
 
 logger = logging.getLogger(__name__)
 
 class BaseSniffer(ABC):
     """Base class for all sniffers."""
 
+    # Bump when rules change in a way the sniffer's source does not reflect
+    RULES_VERSION = "1"
+
     def __init__(self, config: Dict, domain: str):
         """Initialize base sniffer.
 
@@ -35,11 +47,60 @@ class BaseSniffer(ABC):
 
         # Initialize metrics
         self.metrics = MetricsCollector(f"{domain}_sniffer")
+        self.rule_costs = create_rule_cost_tracker(
+            config["monitoring"].get("rule_costs", {}),
+            domain,
+            self.metrics
+        )
+        self.regex_safety = config.get("core", {}).get("regex_safety", {})
 
         # Initialize state
         self.results = {}
         self.active_jobs = set()
         self.is_running = False
+        self._rule_set_version: Optional[str] = None
+
+    @property
+    def rule_set_version(self) -> str:
+        """Version of the rule set applied by this sniffer.
+
+        Derived from ``RULES_VERSION``, the sniffer configuration and the
+        source of the sniffer module, so cached results are invalidated
+        whenever the rules that produced them may have changed.
+
+        Returns:
+            Hex digest identifying the rule set
+        """
+        if getattr(self, "_rule_set_version", None) is None:
+            digest = hashlib.sha256(self.RULES_VERSION.encode())
+            digest.update(
+                json.dumps(self.config, sort_keys=True, default=str).encode()
+            )
+
+            module = sys.modules.get(type(self).__module__)
+            try:
+                digest.update(Path(module.__file__).read_bytes())
+            except (AttributeError, TypeError, OSError) as e:
+                logger.warning(f"Rule set version without module source: {e}")
+
+            self._rule_set_version = digest.hexdigest()
+
+        return self._rule_set_version
+
+    def cache_key(self, file: str) -> str:
+        """Get the part of a file's path this sniffer's output depends on.
+
+        Cached results are only reused for files with the same key. Sniffers
+        whose output depends on more than the file name, such as its
+        directory, override this.
+
+        Args:
+            file: Sniffed file
+
+        Returns:
+            Path key for the result cache
+        """
+        return path_cache_key(file)
 
     async def start(self) -> None:
         """Start sniffer."""
@@ -68,12 +129,33 @@ class BaseSniffer(ABC):
             logger.error(f"Error stopping {self.domain} sniffer: {e}")
             raise
 
-    @abstractmethod
-    async def sniff_file(self, file: str) -> Dict:
+    async def sniff_file(
+        self,
+        file: str,
+        context: Optional[FileContext] = None
+    ) -> Dict:
         """Sniff a single file.
 
         Args:
             file: File to sniff
+            context: Optional file context shared with other domains
+
+        Returns:
+            Sniffing results
+        """
+        if context is None:
+            context = FileContext(file)
+
+        with self.metrics.span("sniff_file", domain=self.domain):
+            return await self._sniff_file_impl(file, context)
+
+    @abstractmethod
+    async def _sniff_file_impl(self, file: str, context: FileContext) -> Dict:
+        """Domain-specific file sniffing.
+
+        Args:
+            file: File to sniff
+            context: File context providing content, AST and line index
 
         Returns:
             Sniffing results
@@ -131,6 +213,11 @@ class BaseSniffer(ABC):
     ) -> Dict:
         """Fix detected issues.
 
+        Every fix is turned into edits against the content as read, so
+        fixes cannot corrupt each other; a fix overlapping an earlier one is
+        skipped. The edits are applied in one pass and the file is replaced
+        atomically.
+
         Args:
             file: File to fix
             issues: Issues to fix
@@ -151,8 +238,8 @@ class BaseSniffer(ABC):
             with open(file) as f:
                 content = f.read()
 
-            # Apply fixes
-            modified_content = content
+            # Collect edits
+            patch = PatchSet()
             for issue in issues:
                 try:
                     # Get fix
@@ -164,12 +251,22 @@ class BaseSniffer(ABC):
                         })
                         continue
 
-                    # Apply fix
-                    modified_content = self._apply_fix(modified_content, fix)
-                    fixes["applied"].append({
-                        "issue": issue,
-                        "fix": fix
-                    })
+                    edits = self._get_fix_edits(content, fix)
+                    if not edits:
+                        fixes["failed"].append({
+                            "issue": issue,
+                            "error": "Fix does not match the file"
+                        })
+                    elif patch.add(edits, issue):
+                        fixes["applied"].append({
+                            "issue": issue,
+                            "fix": fix
+                        })
+                    else:
+                        fixes["failed"].append({
+                            "issue": issue,
+                            "error": "Fix conflicts with an earlier fix"
+                        })
 
                 except Exception as e:
                     fixes["failed"].append({
@@ -179,8 +276,7 @@ class BaseSniffer(ABC):
 
             # Write file if fixes applied
             if fixes["applied"]:
-                with open(file, "w") as f:
-                    f.write(modified_content)
+                write_atomic(file, patch.apply(content))
 
             # Update status
             fixes["status"] = "completed"
@@ -197,6 +293,78 @@ class BaseSniffer(ABC):
                 "timestamp": datetime.now().isoformat()
             }
 
+    async def _apply_fixes(self, suggestions: List[Dict[str, Any]]) -> bool:
+        """Apply fix suggestions to issues.
+
+        Suggestions are grouped by file; each file is read once, patched in
+        one pass and replaced atomically before the fixes are validated.
+
+        Args:
+            suggestions: List of fix suggestions from AI
+
+        Returns:
+            True if all fixes were applied successfully, False otherwise
+        """
+        try:
+            success = True
+            by_file: Dict[str, List[Dict[str, Any]]] = {}
+            for suggestion in suggestions:
+                by_file.setdefault(suggestion["file"], []).append(suggestion)
+
+            for file, file_suggestions in by_file.items():
+                # Get file content
+                with open(file, "r") as f:
+                    content = f.read()
+
+                index = LineIndex(content)
+                patch = PatchSet()
+                applied = []
+                for suggestion in file_suggestions:
+                    if suggestion.get("fix_type") == "replace":
+                        edits = text_edits(content, suggestion["old_code"], suggestion["new_code"])
+                    elif suggestion.get("fix_type") == "insert":
+                        edits = [line_insert_edit(content, suggestion["line"], suggestion["code"], index)]
+                    else:
+                        logger.warning(f"Unknown fix type: {suggestion.get('fix_type')}")
+                        success = False
+                        continue
+
+                    if not patch.add(edits, suggestion):
+                        logger.warning(f"Skipping fix conflicting with an earlier fix in {file}")
+                        success = False
+                        continue
+                    applied.append(suggestion)
+
+                if not applied:
+                    continue
+
+                # Write fixed content
+                content = patch.apply(content)
+                write_atomic(file, content)
+
+                # Validate fixes
+                for suggestion in applied:
+                    if not await self._validate_fix(suggestion, content):
+                        success = False
+
+            return success
+
+        except Exception as e:
+            logger.error(f"Error applying fixes: {e}")
+            return False
+
+    async def _validate_fix(self, suggestion: Dict[str, Any], content: str) -> bool:
+        """Validate that a fix was successful.
+
+        Args:
+            suggestion: Fix suggestion that was applied
+            content: Updated file content
+
+        Returns:
+            True if fix was successful, False otherwise
+        """
+        return True
+
     def _analyze_issues(self, issues: List[Dict]) -> Dict:
         """Analyze issues.
 
@@ -289,118 +457,105 @@ class BaseSniffer(ABC):
             logger.error(f"Error getting fix: {e}")
             return None
 
-    def _apply_fix(self, content: str, fix: Dict) -> str:
-        """Apply fix to content.
+    def _get_fix_edits(self, content: str, fix: Dict) -> List[Edit]:
+        """Get the edits of a fix.
 
         Args:
             content: File content
             fix: Fix configuration
 
         Returns:
-            Modified content
+            Edits against the content
         """
         try:
             fix_type = fix.get("type")
             if not fix_type:
-                return content
+                return []
 
-            # Apply fix
+            # Get edits
             if fix_type == "replace":
-                return self._apply_replace_fix(content, fix)
+                return self._get_replace_edits(content, fix)
             elif fix_type == "insert":
-                return self._apply_insert_fix(content, fix)
+                return self._get_insert_edits(content, fix)
             elif fix_type == "delete":
-                return self._apply_delete_fix(content, fix)
+                return self._get_delete_edits(content, fix)
 
-            return content
+            return []
 
         except Exception as e:
-            logger.error(f"Error applying fix: {e}")
-            return content
+            logger.error(f"Error getting fix edits: {e}")
+            return []
 
-    def _apply_replace_fix(self, content: str, fix: Dict) -> str:
-        """Apply replace fix.
+    def _get_replace_edits(self, content: str, fix: Dict) -> List[Edit]:
+        """Get edits of a replace fix.
 
         Args:
             content: File content
             fix: Fix configuration
 
         Returns:
-            Modified content
+            Edits replacing every match of the pattern
         """
         try:
-            import re
             pattern = fix.get("pattern")
             replacement = fix.get("replacement")
             if not pattern or not replacement:
-                return content
+                return []
 
-            return re.sub(pattern, replacement, content)
+            return pattern_edits(content, pattern, replacement)
 
         except Exception as e:
-            logger.error(f"Error applying replace fix: {e}")
-            return content
+            logger.error(f"Error getting replace fix edits: {e}")
+            return []
 
-    def _apply_insert_fix(self, content: str, fix: Dict) -> str:
-        """Apply insert fix.
+    def _get_insert_edits(self, content: str, fix: Dict) -> List[Edit]:
+        """Get edits of an insert fix.
 
         Args:
             content: File content
             fix: Fix configuration
 
         Returns:
-            Modified content
+            Edit inserting the content before or after the first match
         """
         try:
             position = fix.get("position", "after")
             target = fix.get("target")
             insert = fix.get("content")
             if not target or not insert:
-                return content
+                return []
 
-            import re
             match = re.search(target, content)
             if not match:
-                return content
+                return []
 
-            if position == "before":
-                return (
-                    content[:match.start()] +
-                    insert +
-                    content[match.start():]
-                )
-            else:
-                return (
-                    content[:match.end()] +
-                    insert +
-                    content[match.end():]
-                )
+            offset = match.start() if position == "before" else match.end()
+            return [Edit(offset, 0, insert)]
 
         except Exception as e:
-            logger.error(f"Error applying insert fix: {e}")
-            return content
+            logger.error(f"Error getting insert fix edits: {e}")
+            return []
 
-    def _apply_delete_fix(self, content: str, fix: Dict) -> str:
-        """Apply delete fix.
+    def _get_delete_edits(self, content: str, fix: Dict) -> List[Edit]:
+        """Get edits of a delete fix.
 
         Args:
             content: File content
             fix: Fix configuration
 
         Returns:
-            Modified content
+            Edits deleting every match of the pattern
         """
         try:
             pattern = fix.get("pattern")
             if not pattern:
-                return content
+                return []
 
-            import re
-            return re.sub(pattern, "", content)
+            return pattern_edits(content, pattern, "")
 
         except Exception as e:
-            logger.error(f"Error applying delete fix: {e}")
-            return content
+            logger.error(f"Error getting delete fix edits: {e}")
+            return []
 
     def _get_recommendation(self, issue: Dict) -> Optional[Dict]:
         """Get recommendation for issue.
@@ -444,6 +599,7 @@ class BaseSniffer(ABC):
 
             # Add collector metrics
             metrics.update(self.metrics.get_metrics())
+            metrics["rule_costs"] = self.rule_costs.get_metrics()
 
             return metrics
 
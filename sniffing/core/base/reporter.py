@@ -1,6 +1,7 @@
 """
 Base reporter class providing core reporting functionality.
 """
+import functools
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime
@@ -9,9 +10,25 @@ from typing import Any, Dict, List, Optional, Set
 
 from ..utils.config import SnifferConfig
 from ..utils.logging import setup_logger
+from ..utils.report_service import ReportService
 
 logger = logging.getLogger("base_reporter")
 
+@functools.lru_cache(maxsize=None)
+def _get_template_environment() -> Any:
+    """Get the Jinja environment for report templates.
+
+    The environment is built once per process so its template cache is
+    shared by all reports.
+
+    Returns:
+        Jinja environment
+    """
+    # Import here to avoid circular imports
+    from jinja2 import Environment, PackageLoader
+
+    return Environment(loader=PackageLoader("sniffing.core.templates", "reports"))
+
 class BaseReporter(ABC):
     """Base class for all reporters."""
 
@@ -26,6 +43,11 @@ class BaseReporter(ABC):
         self.config = config
         self.active_jobs: Set[str] = set()
         self.metrics: Dict[str, Any] = {}
+        self.report_service = ReportService(
+            Path(config.report_path) / domain,
+            {"html": self._convert_to_html, "csv": self._convert_to_csv},
+            config.get_reporter_config(domain).get("pdf_workers", 1)
+        )
         self._setup_logging()
 
     def _setup_logging(self) -> None:
@@ -101,7 +123,8 @@ class BaseReporter(ABC):
                     "findings": len(analysis.get("findings", []))
                 }
 
-                # Save report
+                # Save report, other formats are rendered on request
+                report["job_id"] = job_id
                 await self._save_report(job_id, report)
 
                 return report
@@ -117,6 +140,23 @@ class BaseReporter(ABC):
                 "timestamp": datetime.now()
             }
 
+    async def get_report(self, job_id: str, format: str = "json") -> Path:
+        """Get a saved report, rendering it in the requested format if needed.
+
+        Args:
+            job_id: Job identifier returned in the report
+            format: One of "json", "html", "csv" or "pdf"
+
+        Returns:
+            Path of the report file
+        """
+        try:
+            return await self.report_service.render(job_id, format)
+
+        except Exception as e:
+            logger.error(f"Error getting {format} report {job_id}: {e}")
+            raise
+
     @abstractmethod
     async def _generate_report(
         self,
@@ -149,8 +189,8 @@ class BaseReporter(ABC):
     async def _cleanup(self) -> None:
         """Clean up reporter resources."""
         try:
-            # Clean up any temporary files
-            pass
+            # Stop PDF rendering workers
+            await self.report_service.shutdown()
 
         except Exception as e:
             logger.error(f"Error cleaning up reporter: {e}")
@@ -187,109 +227,20 @@ class BaseReporter(ABC):
         job_id: str,
         report: Dict[str, Any]
     ) -> None:
-        """Save report in multiple formats.
+        """Save the canonical JSON artifact of a report.
 
         Args:
             job_id: Job identifier
             report: Report to save
         """
         try:
-            # Get report directory
-            report_dir = Path(self.config.report_path) / self.domain
-
-            # Save JSON
-            json_path = report_dir / "json" / f"{job_id}.json"
-            import json
-            with open(json_path, "w") as f:
-                json.dump(report, f, indent=2, default=str)
-
-            # Save HTML
-            html_path = report_dir / "html" / f"{job_id}.html"
-            await self._save_html(html_path, report)
-
-            # Save PDF
-            pdf_path = report_dir / "pdf" / f"{job_id}.pdf"
-            await self._save_pdf(pdf_path, report)
-
-            # Save CSV
-            csv_path = report_dir / "csv" / f"{job_id}.csv"
-            await self._save_csv(csv_path, report)
-
+            self.report_service.store(job_id, report)
             logger.info(f"Saved report: {job_id}")
 
         except Exception as e:
             logger.error(f"Error saving report: {e}")
             raise
 
-    async def _save_html(
-        self,
-        path: Path,
-        report: Dict[str, Any]
-    ) -> None:
-        """Save report as HTML.
-
-        Args:
-            path: Path to save to
-            report: Report to save
-        """
-        try:
-            # Convert report to HTML
-            html = await self._convert_to_html(report)
-
-            # Write HTML
-            with open(path, "w") as f:
-                f.write(html)
-
-        except Exception as e:
-            logger.error(f"Error saving HTML: {e}")
-            raise
-
-    async def _save_pdf(
-        self,
-        path: Path,
-        report: Dict[str, Any]
-    ) -> None:
-        """Save report as PDF.
-
-        Args:
-            path: Path to save to
-            report: Report to save
-        """
-        try:
-            # Convert report to PDF
-            pdf = await self._convert_to_pdf(report)
-
-            # Write PDF
-            with open(path, "wb") as f:
-                f.write(pdf)
-
-        except Exception as e:
-            logger.error(f"Error saving PDF: {e}")
-            raise
-
-    async def _save_csv(
-        self,
-        path: Path,
-        report: Dict[str, Any]
-    ) -> None:
-        """Save report as CSV.
-
-        Args:
-            path: Path to save to
-            report: Report to save
-        """
-        try:
-            # Convert report to CSV
-            csv = await self._convert_to_csv(report)
-
-            # Write CSV
-            with open(path, "w") as f:
-                f.write(csv)
-
-        except Exception as e:
-            logger.error(f"Error saving CSV: {e}")
-            raise
-
     async def _convert_to_html(self, report: Dict[str, Any]) -> str:
         """Convert report to HTML.
 
@@ -300,14 +251,8 @@ class BaseReporter(ABC):
             HTML string
         """
         try:
-            # Import here to avoid circular imports
-            from jinja2 import Environment, PackageLoader
-
             # Load template
-            env = Environment(
-                loader=PackageLoader("sniffing.core.templates", "reports")
-            )
-            template = env.get_template(f"{self.domain}.html")
+            template = _get_template_environment().get_template(f"{self.domain}.html")
 
             # Render template
             return template.render(report=report)
@@ -316,29 +261,6 @@ class BaseReporter(ABC):
             logger.error(f"Error converting to HTML: {e}")
             raise
 
-    async def _convert_to_pdf(self, report: Dict[str, Any]) -> bytes:
-        """Convert report to PDF.
-
-        Args:
-            report: Report to convert
-
-        Returns:
-            PDF bytes
-        """
-        try:
-            # Import here to avoid circular imports
-            from weasyprint import HTML
-
-            # Convert to HTML first
-            html = await self._convert_to_html(report)
-
-            # Convert HTML to PDF
-            return HTML(string=html).write_pdf()
-
-        except Exception as e:
-            logger.error(f"Error converting to PDF: {e}")
-            raise
-
     async def _convert_to_csv(self, report: Dict[str, Any]) -> str:
         """Convert report to CSV.
 
@@ -420,6 +342,7 @@ class BaseReporter(ABC):
         try:
             return {
                 "metrics": self.metrics,
+                "rendering": self.report_service.get_stats(),
                 "labels": {
                     "domain": self.domain,
                     "reporter": self.__class__.__name__
@@ -11,7 +11,10 @@ import yaml
 from ..config.config_loader import load_config
 from ..utils.metrics import MetricsCollector
 from ..utils.logging import setup_logger
-from ..utils.file_lock import FileLock
+from ..utils.cache import DEFAULT_CACHE_PATH, ResultCache, sniffer_cache_key
+from ..utils.file_context import FileContext
+from ..utils.file_lock import LockTable
+from ..utils.result import SniffingResult
 
 logger = logging.getLogger(__name__)
 
@@ -46,8 +49,17 @@ class SniffingLoop:
 
         # Initialize state
         self.active_jobs: Set[str] = set()
-        self.file_locks: Dict[str, FileLock] = {}
+        # Striped, so memory stays bounded however many files are seen;
+        # stripes can be shared with other processes through lock files
+        self.file_locks = LockTable(
+            stripes=self.config["core"].get("lock_stripes", 256),
+            timeout=self.config["core"]["file_lock_timeout"],
+            lock_dir=self.config["core"].get("lock_dir")
+        )
         self.results_cache: Dict[str, Dict] = {}
+        self.result_cache = ResultCache(
+            self.config["core"].get("result_cache_path", DEFAULT_CACHE_PATH)
+        )
         self.metrics = MetricsCollector("sniffing_loop")
         self.is_running = False
 
@@ -96,6 +108,14 @@ class SniffingLoop:
             while self.active_jobs:
                 await asyncio.sleep(0.1)
 
+            # Export latency histograms
+            metrics_file = self.config["core"].get("metrics_file")
+            if metrics_file:
+                self.metrics.write_metrics_file(
+                    metrics_file["path"],
+                    metrics_file.get("format", "json")
+                )
+
             logger.info("Sniffing loop stopped")
 
         except Exception as e:
@@ -149,18 +169,11 @@ class SniffingLoop:
                 file = job["file"]
                 domains = job["domains"]
 
+                # Record metrics
+                span = self.metrics.span("file_processing")
                 try:
-                    # Record metrics
-                    self.metrics.record_start("file_processing")
-
-                    # Get or create file lock
-                    if file not in self.file_locks:
-                        self.file_locks[file] = FileLock(
-                            file,
-                            timeout=self.config["core"]["file_lock_timeout"]
-                        )
 
-                    async with self.file_locks[file]:
+                    async with self.file_locks.lock(file):
                         # Run sniffing
                         result = await self._sniff_file(job)
 
@@ -180,17 +193,11 @@ class SniffingLoop:
                                 })
 
                     # Record metrics
-                    self.metrics.record_end(
-                        "file_processing",
-                        success=True
-                    )
+                    span.end(success=True)
 
                 except Exception as e:
                     logger.error(f"Error processing file {file}: {e}")
-                    self.metrics.record_end(
-                        "file_processing",
-                        success=False
-                    )
+                    span.end(success=False)
 
                 finally:
                     # Mark task as done
@@ -216,9 +223,9 @@ class SniffingLoop:
                 file = job["file"]
                 result = job["result"]
 
+                # Record metrics
+                span = self.metrics.span(f"domain_{domain}", domain=domain)
                 try:
-                    # Record metrics
-                    self.metrics.record_start(f"domain_{domain}")
 
                     # Run domain-specific sniffing
                     domain_result = await self._sniff_domain(
@@ -235,19 +242,13 @@ class SniffingLoop:
                     )
 
                     # Record metrics
-                    self.metrics.record_end(
-                        f"domain_{domain}",
-                        success=True
-                    )
+                    span.end(success=True)
 
                 except Exception as e:
                     logger.error(
                         f"Error processing domain {domain} for {file}: {e}"
                     )
-                    self.metrics.record_end(
-                        f"domain_{domain}",
-                        success=False
-                    )
+                    span.end(success=False)
 
                 finally:
                     # Mark task as done
@@ -271,6 +272,9 @@ class SniffingLoop:
             file = job["file"]
             domains = job["domains"]
 
+            # Read and parse the file once for all domains
+            context = FileContext(file)
+
             # Run sniffing for each domain
             for domain in domains:
                 if domain not in self.domain_queues:
@@ -282,7 +286,12 @@ class SniffingLoop:
                     continue
 
                 # Run sniffing
-                result = await sniffer.sniff_file(file)
+                result = await self._sniff_file_cached(
+                    domain,
+                    sniffer,
+                    file,
+                    context
+                )
                 results[domain] = result
 
             return results
@@ -291,6 +300,52 @@ class SniffingLoop:
             logger.error(f"Error sniffing file: {e}")
             return {}
 
+    async def _sniff_file_cached(
+        self,
+        domain: str,
+        sniffer,
+        file: str,
+        context: FileContext
+    ) -> Dict:
+        """Run sniffing, reusing the cached result for unchanged content.
+
+        Args:
+            domain: Domain name
+            sniffer: Domain sniffer
+            file: File to sniff
+            context: File context
+
+        Returns:
+            Sniffing results
+        """
+        rule_version = getattr(sniffer, "rule_set_version", None)
+        if rule_version is None:
+            return await sniffer.sniff_file(file, context)
+
+        try:
+            content_hash = context.content_hash
+        except OSError as e:
+            logger.warning(f"Sniffing {file} without cache: {e}")
+            return await sniffer.sniff_file(file, context)
+
+        path_key = sniffer_cache_key(sniffer, file)
+        cached = self.result_cache.get(content_hash, domain, rule_version, path_key)
+        if cached is not None:
+            if "sniffer_type" in cached:
+                return SniffingResult.from_dict(cached, file)
+            return cached
+
+        result = await sniffer.sniff_file(file, context)
+
+        # As in the orchestrator, failures are not cached: a transient error
+        # would otherwise be served until the file's content changes
+        if isinstance(result, SniffingResult):
+            if result.status:
+                self.result_cache.set(content_hash, domain, rule_version, result.to_dict(), path_key)
+        elif isinstance(result, dict) and result.get("status") not in (False, "error", "failed"):
+            self.result_cache.set(content_hash, domain, rule_version, result, path_key)
+        return result
+
     async def _sniff_domain(
         self,
         domain: str,
@@ -404,7 +459,8 @@ class SniffingLoop:
                     for domain, queue in self.domain_queues.items()
                 },
                 "cached_results": len(self.results_cache),
-                "file_locks": len(self.file_locks),
+                "result_cache": self.result_cache.get_stats(),
+                "file_locks": self.file_locks.get_metrics(),
                 "metrics": self.metrics.get_metrics()
             }
 
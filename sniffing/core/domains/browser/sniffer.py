@@ -9,6 +9,8 @@ from typing import Dict, List, Optional
 import yaml
 
 from ...base import BaseSniffer
+from ...utils.file_context import FileContext
+from ...utils.line_index import LineIndex
 from ...utils.logging import setup_logger
 from ...utils.metrics import MetricsCollector, track_operation
 
@@ -113,11 +115,16 @@ class BrowserSniffer(BaseSniffer):
             return {}
 
     @track_operation("browser_sniff")
-    async def sniff_file(self, file: str) -> Dict:
+    async def sniff_file(
+        self,
+        file: str,
+        context: Optional[FileContext] = None
+    ) -> Dict:
         """Sniff file for browser issues.
 
         Args:
             file: File to sniff
+            context: Optional file context shared with other domains
 
         Returns:
             Sniffing results
@@ -132,11 +139,13 @@ class BrowserSniffer(BaseSniffer):
             }
 
             # Read file
-            with open(file) as f:
-                content = f.read()
+            if context is None:
+                context = FileContext(file)
+            content = context.text
 
             # Run pattern matching
-            pattern_issues = await self._check_patterns(content)
+            line_index = context.line_index
+            pattern_issues = await self._check_patterns(content, line_index)
             results["issues"].extend(pattern_issues)
 
             # Run rule validation
@@ -166,16 +175,24 @@ class BrowserSniffer(BaseSniffer):
                 "timestamp": datetime.now().isoformat()
             }
 
-    async def _check_patterns(self, content: str) -> List[Dict]:
+    async def _check_patterns(
+        self,
+        content: str,
+        line_index: Optional[LineIndex] = None
+    ) -> List[Dict]:
         """Check content against browser patterns.
 
         Args:
             content: File content
+            line_index: Optional line index for content
 
         Returns:
             List of pattern issues
         """
         try:
+            if line_index is None:
+                line_index = LineIndex(content)
+
             issues = []
 
             # Check each pattern
@@ -189,7 +206,7 @@ class BrowserSniffer(BaseSniffer):
                             "name": pattern_name,
                             "severity": pattern.get("severity", "medium"),
                             "description": pattern.get("description", ""),
-                            "line": content.count("\n", 0, match.start()) + 1,
+                            "line": line_index.line_of(match.start()),
                             "match": match.group(0),
                             "fix": pattern.get("fix"),
                             "recommendation": pattern.get("recommendation")
@@ -351,6 +368,7 @@ class BrowserSniffer(BaseSniffer):
             List of rule issues
         """
         try:
+            line_index = LineIndex(content)
             issues = []
 
             # Check each rule
@@ -374,7 +392,7 @@ class BrowserSniffer(BaseSniffer):
                                 "name": rule_name,
                                 "severity": rule.get("severity", "medium"),
                                 "description": rule.get("description", ""),
-                                "line": content.count("\n", 0, match.start()) + 1,
+                                "line": line_index.line_of(match.start()),
                                 "match": match.group(0),
                                 "metrics": metrics,
                                 "fix": rule.get("fix"),
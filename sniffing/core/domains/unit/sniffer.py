@@ -9,6 +9,8 @@ from typing import Dict, List, Optional
 import yaml
 
 from ...base import BaseSniffer
+from ...utils.file_context import FileContext
+from ...utils.line_index import LineIndex
 from ...utils.logging import setup_logger
 from ...utils.metrics import MetricsCollector, track_operation
 
@@ -88,11 +90,16 @@ class UnitSniffer(BaseSniffer):
             return {}
 
     @track_operation("unit_sniff")
-    async def sniff_file(self, file: str) -> Dict:
+    async def sniff_file(
+        self,
+        file: str,
+        context: Optional[FileContext] = None
+    ) -> Dict:
         """Sniff file for unit testing issues.
 
         Args:
             file: File to sniff
+            context: Optional file context shared with other domains
 
         Returns:
             Sniffing results
@@ -107,11 +114,13 @@ class UnitSniffer(BaseSniffer):
             }
 
             # Read file
-            with open(file) as f:
-                content = f.read()
+            if context is None:
+                context = FileContext(file)
+            content = context.text
 
             # Run pattern matching
-            pattern_issues = await self._check_patterns(content)
+            line_index = context.line_index
+            pattern_issues = await self._check_patterns(content, line_index)
             results["issues"].extend(pattern_issues)
 
             # Run rule validation
@@ -137,16 +146,24 @@ class UnitSniffer(BaseSniffer):
                 "timestamp": datetime.now().isoformat()
             }
 
-    async def _check_patterns(self, content: str) -> List[Dict]:
+    async def _check_patterns(
+        self,
+        content: str,
+        line_index: Optional[LineIndex] = None
+    ) -> List[Dict]:
         """Check content against unit patterns.
 
         Args:
             content: File content
+            line_index: Optional line index for content
 
         Returns:
             List of pattern issues
         """
         try:
+            if line_index is None:
+                line_index = LineIndex(content)
+
             issues = []
 
             # Check each pattern
@@ -160,7 +177,7 @@ class UnitSniffer(BaseSniffer):
                             "name": pattern_name,
                             "severity": pattern.get("severity", "medium"),
                             "description": pattern.get("description", ""),
-                            "line": content.count("\n", 0, match.start()) + 1,
+                            "line": line_index.line_of(match.start()),
                             "match": match.group(0),
                             "fix": pattern.get("fix"),
                             "recommendation": pattern.get("recommendation")
@@ -198,9 +198,9 @@ exit 0
         Returns:
             Hook results
         """
+        # Record metrics
+        span = self.metrics.span(f"hook_{hook_name}")
         try:
-            # Record metrics
-            self.metrics.record_start(f"hook_{hook_name}")
             self.active_hooks.add(hook_name)
 
             # Get hook config
@@ -244,10 +244,7 @@ exit 0
                     logger.error(f"Hook {hook_name} failed: High severity issues found")
 
             # Record metrics
-            self.metrics.record_end(
-                f"hook_{hook_name}",
-                success=(status == "success")
-            )
+            span.end(success=(status == "success"))
 
             return {
                 "status": status,
@@ -257,6 +254,7 @@ exit 0
 
         except Exception as e:
             logger.error(f"Error running hook {hook_name}: {e}")
+            span.end(success=False)
             return {
                 "status": "failed",
                 "error": str(e),
@@ -3,173 +3,257 @@ Result caching for sniffing operations.
 """
 import json
 import logging
+import sqlite3
+import threading
 import time
-from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 logger = logging.getLogger("cache")
 
-class ResultCache:
-    """Cache for sniffing results."""
+DEFAULT_CACHE_PATH = str(Path("reports") / "cache" / "results.db")
+
+def path_cache_key(file: str) -> str:
+    """Get the part of a file's path that sniffer output may depend on.
+
+    Sniffers branch on file names and suffixes, such as ``.py`` files or
+    READMEs, so identical content under another name is cached apart.
+
+    Args:
+        file: Sniffed file
+
+    Returns:
+        Path key for the result cache
+    """
+    return Path(file).name
 
-    def __init__(self, ttl: int = 3600):
+def sniffer_cache_key(sniffer: Any, file: str) -> str:
+    """Get the path key of a file for a sniffer's cached results.
+
+    Args:
+        sniffer: Domain sniffer, which may declare its own ``cache_key``
+        file: Sniffed file
+
+    Returns:
+        Path key for the result cache
+    """
+    cache_key = getattr(sniffer, "cache_key", None)
+    if cache_key is None:
+        return path_cache_key(file)
+    return cache_key(file)
+
+class ResultCache:
+    """Incremental cache for sniffing results.
+
+    Entries are keyed by (file content hash, domain, rule-set version, path
+    key), so a cached result stays valid for as long as the file content and
+    the rules that produced it are unchanged, wherever a file of that name
+    is sniffed. The path key covers what sniffer output depends on besides
+    the content, the file name by default. Entries live in an indexed SQLite table; each ``get``/``set``
+    touches a single row instead of loading or rewriting the whole cache.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl: Optional[int] = None
+    ):
         """Initialize result cache.
 
         Args:
-            ttl: Time to live for cache entries in seconds
+            path: Path to the cache database, or ":memory:"
+            ttl: Optional time to live for cache entries in seconds
         """
-        self.ttl = ttl
-        self.cache: Dict[str, Dict[str, Any]] = {}
-        self.cache_dir = Path("reports") / "cache"
+        self.path = path
+        self.ttl = ttl or None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
         self._setup_storage()
-        self._load_cache()
 
     def _setup_storage(self) -> None:
-        """Set up cache storage directory."""
+        """Set up cache database."""
         try:
-            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+            self._conn = sqlite3.connect(
+                self.path,
+                check_same_thread=False,
+                isolation_level=None
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+
+            # Entries of caches created before the path key are dropped
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(results)")]
+            if columns and "path_key" not in columns:
+                self._conn.execute("DROP TABLE results")
+
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    content_hash TEXT NOT NULL,
+                    domain TEXT NOT NULL,
+                    rule_version TEXT NOT NULL,
+                    path_key TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (content_hash, domain, rule_version, path_key)
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS results_created_at ON results (created_at)"
+            )
 
         except Exception as e:
             logger.error(f"Error setting up cache storage: {e}")
             raise
 
-    def _load_cache(self) -> None:
-        """Load cache from disk."""
-        try:
-            # Load all cache files
-            for cache_file in self.cache_dir.glob("*.json"):
-                try:
-                    with open(cache_file, "r") as f:
-                        cache_data = json.load(f)
-                        self.cache.update(cache_data)
-
-                except Exception as e:
-                    logger.error(f"Error loading cache file {cache_file}: {e}")
-
-            # Clean expired entries
-            self._clean_expired()
-
-        except Exception as e:
-            logger.error(f"Error loading cache: {e}")
-
-    def get(self, key: str) -> Optional[Dict[str, Any]]:
+    def get(
+        self,
+        content_hash: str,
+        domain: str,
+        rule_version: str,
+        path_key: str = ""
+    ) -> Optional[Dict[str, Any]]:
         """Get cached result.
 
         Args:
-            key: Cache key
+            content_hash: Hash of the sniffed file content
+            domain: Sniffer domain
+            rule_version: Version of the domain's rule set
+            path_key: Path key of the sniffed file
 
         Returns:
             Cached result or None if not found or expired
         """
         try:
-            # Check if key exists
-            if key not in self.cache:
-                return None
-
-            # Get cache entry
-            entry = self.cache[key]
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT result, created_at FROM results "
+                    "WHERE content_hash = ? AND domain = ? AND rule_version = ? AND path_key = ?",
+                    (content_hash, domain, rule_version, path_key)
+                ).fetchone()
 
-            # Check if expired
-            if time.time() - entry["timestamp"] > self.ttl:
-                del self.cache[key]
-                self._save_cache()
-                return None
+                if row is None or self._is_expired(row[1]):
+                    self.misses += 1
+                    return None
 
-            return entry["result"]
+                self.hits += 1
+                return json.loads(row[0])
 
         except Exception as e:
-            logger.error(f"Error getting cache entry {key}: {e}")
+            logger.error(f"Error getting cache entry {domain}/{content_hash}: {e}")
             return None
 
-    def set(self, key: str, result: Dict[str, Any]) -> None:
+    def set(
+        self,
+        content_hash: str,
+        domain: str,
+        rule_version: str,
+        result: Dict[str, Any],
+        path_key: str = ""
+    ) -> None:
         """Set cache entry.
 
         Args:
-            key: Cache key
+            content_hash: Hash of the sniffed file content
+            domain: Sniffer domain
+            rule_version: Version of the domain's rule set
             result: Result to cache
+            path_key: Path key of the sniffed file
         """
         try:
-            # Create cache entry
-            self.cache[key] = {
-                "timestamp": time.time(),
-                "result": result
-            }
-
-            # Save cache
-            self._save_cache()
+            data = json.dumps(result, default=str)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results "
+                    "(content_hash, domain, rule_version, path_key, result, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (content_hash, domain, rule_version, path_key, data, time.time())
+                )
 
         except Exception as e:
-            logger.error(f"Error setting cache entry {key}: {e}")
+            logger.error(f"Error setting cache entry {domain}/{content_hash}: {e}")
 
-    def delete(self, key: str) -> None:
-        """Delete cache entry.
+    def delete(
+        self,
+        content_hash: str,
+        domain: Optional[str] = None
+    ) -> None:
+        """Delete cache entries for content.
 
         Args:
-            key: Cache key
+            content_hash: Hash of the file content
+            domain: Optional domain, all domains if not given
         """
         try:
-            if key in self.cache:
-                del self.cache[key]
-                self._save_cache()
+            with self._lock:
+                if domain is None:
+                    self._conn.execute(
+                        "DELETE FROM results WHERE content_hash = ?",
+                        (content_hash,)
+                    )
+                else:
+                    self._conn.execute(
+                        "DELETE FROM results WHERE content_hash = ? AND domain = ?",
+                        (content_hash, domain)
+                    )
 
         except Exception as e:
-            logger.error(f"Error deleting cache entry {key}: {e}")
+            logger.error(f"Error deleting cache entry {content_hash}: {e}")
 
     def clear(self) -> None:
         """Clear all cache entries."""
         try:
-            self.cache.clear()
-            self._save_cache()
+            with self._lock:
+                self._conn.execute("DELETE FROM results")
 
         except Exception as e:
             logger.error(f"Error clearing cache: {e}")
 
-    def _clean_expired(self) -> None:
-        """Clean expired cache entries."""
-        try:
-            current_time = time.time()
-            expired_keys = [
-                key for key, entry in self.cache.items()
-                if current_time - entry["timestamp"] > self.ttl
-            ]
+    def prune(self) -> int:
+        """Remove expired cache entries.
 
-            for key in expired_keys:
-                del self.cache[key]
+        Returns:
+            Number of removed entries
+        """
+        try:
+            if self.ttl is None:
+                return 0
 
-            if expired_keys:
-                self._save_cache()
+            with self._lock:
+                cursor = self._conn.execute(
+                    "DELETE FROM results WHERE created_at < ?",
+                    (time.time() - self.ttl,)
+                )
+                return cursor.rowcount
 
         except Exception as e:
-            logger.error(f"Error cleaning expired entries: {e}")
+            logger.error(f"Error pruning cache: {e}")
+            return 0
 
-    def _save_cache(self) -> None:
-        """Save cache to disk."""
+    def close(self) -> None:
+        """Close the cache database."""
         try:
-            # Create cache file
-            cache_file = self.cache_dir / f"cache_{datetime.now().strftime('%Y%m%d')}.json"
-
-            # Save cache
-            with open(cache_file, "w") as f:
-                json.dump(self.cache, f, indent=2)
-
-            # Clean old cache files
-            self._clean_old_cache_files()
+            with self._lock:
+                self._conn.close()
 
         except Exception as e:
-            logger.error(f"Error saving cache: {e}")
+            logger.error(f"Error closing cache: {e}")
 
-    def _clean_old_cache_files(self) -> None:
-        """Clean old cache files."""
-        try:
-            # Keep only last 7 days of cache files
-            cache_files = sorted(self.cache_dir.glob("*.json"))
-            if len(cache_files) > 7:
-                for old_file in cache_files[:-7]:
-                    old_file.unlink()
+    def _is_expired(self, created_at: float) -> bool:
+        """Check whether an entry has expired.
 
-        except Exception as e:
-            logger.error(f"Error cleaning old cache files: {e}")
+        Args:
+            created_at: Entry creation time
+
+        Returns:
+            True if the entry is older than the TTL
+        """
+        return self.ttl is not None and time.time() - created_at > self.ttl
 
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics.
@@ -178,19 +262,19 @@ class ResultCache:
             Dictionary of cache statistics
         """
         try:
-            current_time = time.time()
-            total_entries = len(self.cache)
-            expired_entries = sum(
-                1 for entry in self.cache.values()
-                if current_time - entry["timestamp"] > self.ttl
-            )
-            active_entries = total_entries - expired_entries
+            with self._lock:
+                total_entries = self._conn.execute(
+                    "SELECT COUNT(*) FROM results"
+                ).fetchone()[0]
 
+            lookups = self.hits + self.misses
             return {
                 "total_entries": total_entries,
-                "active_entries": active_entries,
-                "expired_entries": expired_entries,
-                "ttl": self.ttl
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0,
+                "ttl": self.ttl,
+                "path": self.path
             }
 
         except Exception as e:
@@ -0,0 +1,346 @@
+"""
+Execution backends for running domain sniffers over batches of files.
+"""
+import asyncio
+import logging
+import multiprocessing
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .file_context import FileContext
+from .registry import LazySniffers
+from .result import SniffingResult
+
+logger = logging.getLogger("executor")
+
+# (file, domains to sniff the file with)
+WorkItem = Tuple[str, List[str]]
+
+# (file, domain, result dictionary or None, error or None)
+WorkOutput = Tuple[str, str, Optional[Dict[str, Any]], Optional[str]]
+
+# Sniffers constructed once per worker process or thread
+_worker_sniffers: Dict[str, Any] = {}
+_thread_state = threading.local()
+
+class SniffingExecutor(ABC):
+    """Base class for sniffing execution backends.
+
+    Backends take (file, domains) work items and stream back one
+    ``SniffingResult`` per file and domain as they complete. A sniffer that
+    raises produces a failed result carrying the error instead of aborting
+    the remaining items.
+    """
+
+    # Whether the backend reads files through contexts created by the caller
+    uses_contexts = False
+
+    # Number of files the backend sniffs in one task
+    batch_size = 1
+
+    def __init__(self, sniffers: Dict[str, Any]):
+        """Initialize executor.
+
+        Args:
+            sniffers: Mapping of domain to sniffer instance
+        """
+        self.sniffers = sniffers
+
+    @abstractmethod
+    def sniff(
+        self,
+        items: List[WorkItem],
+        contexts: Optional[Dict[str, FileContext]] = None
+    ) -> AsyncIterator[Tuple[str, str, SniffingResult]]:
+        """Sniff work items.
+
+        Args:
+            items: Files and the domains to sniff each with
+            contexts: Optional file contexts keyed by file
+
+        Returns:
+            Async iterator of (file, domain, result)
+        """
+        pass
+
+    async def sniff_item(
+        self,
+        file: str,
+        domain: str,
+        context: Optional[FileContext] = None
+    ) -> SniffingResult:
+        """Sniff a single file with a single domain.
+
+        Args:
+            file: File to sniff
+            domain: Domain to sniff the file with
+            context: Optional file context
+
+        Returns:
+            Sniffing result
+        """
+        contexts = {file: context} if context is not None else None
+        async for _, _, result in self.sniff([(file, [domain])], contexts):
+            return result
+
+    async def shutdown(self) -> None:
+        """Release executor resources."""
+        pass
+
+class InlineExecutor(SniffingExecutor):
+    """Backend running sniffers one after another on the event loop."""
+
+    uses_contexts = True
+
+    async def sniff(
+        self,
+        items: List[WorkItem],
+        contexts: Optional[Dict[str, FileContext]] = None
+    ) -> AsyncIterator[Tuple[str, str, SniffingResult]]:
+        """Sniff work items on the event loop.
+
+        Args:
+            items: Files and the domains to sniff each with
+            contexts: Optional file contexts keyed by file
+
+        Returns:
+            Async iterator of (file, domain, result)
+        """
+        for file, domains in items:
+            context = (contexts or {}).get(file) or FileContext(file)
+            for domain in domains:
+                try:
+                    result = await self.sniffers[domain].sniff_file(file, context)
+                except Exception as e:
+                    logger.error(f"Error sniffing {file} for {domain}: {e}")
+                    result = _failed_result(file, domain, str(e))
+                yield file, domain, result
+
+class PoolExecutor(SniffingExecutor):
+    """Backend shipping batches of files to a worker pool.
+
+    Each worker constructs its own sniffers once, from the class and
+    configuration of the sniffers given here, and sniffs whole batches so
+    per-task overhead is paid per batch rather than per file.
+    """
+
+    def __init__(
+        self,
+        sniffers: Dict[str, Any],
+        workers: int,
+        batch_size: int = 8,
+        processes: bool = True
+    ):
+        """Initialize pool executor.
+
+        Args:
+            sniffers: Mapping of domain to sniffer instance
+            workers: Number of workers
+            batch_size: Number of files per batch
+            processes: Whether to use processes rather than threads
+        """
+        super().__init__(sniffers)
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.processes = processes
+        self._specs: Optional[Dict[str, Tuple[type, Dict[str, Any]]]] = None
+        self._pool: Optional[Executor] = None
+
+    @property
+    def specs(self) -> Dict[str, Tuple[type, Dict[str, Any]]]:
+        """Get the class and configuration of each sniffer, on first use.
+
+        Returns:
+            Mapping of domain to (sniffer class, config)
+        """
+        if self._specs is None:
+            self._specs = {}
+            for domain in self.sniffers:
+                if isinstance(self.sniffers, LazySniffers):
+                    # Workers construct their own, no need to construct here
+                    self._specs[domain] = self.sniffers.spec(domain)
+                else:
+                    sniffer = self.sniffers[domain]
+                    self._specs[domain] = (type(sniffer), sniffer.config)
+        return self._specs
+
+    def _get_pool(self) -> Executor:
+        """Get the worker pool, starting it on first use.
+
+        Returns:
+            Worker pool
+        """
+        if self._pool is None:
+            if self.processes:
+                # Forking a process running an event loop and threads is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.specs,)
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="sniffing"
+                )
+        return self._pool
+
+    async def sniff(
+        self,
+        items: List[WorkItem],
+        contexts: Optional[Dict[str, FileContext]] = None
+    ) -> AsyncIterator[Tuple[str, str, SniffingResult]]:
+        """Sniff work items in the worker pool.
+
+        Args:
+            items: Files and the domains to sniff each with
+            contexts: Ignored, workers read the files themselves
+
+        Returns:
+            Async iterator of (file, domain, result), in completion order
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        futures = []
+        for start in range(0, len(items), self.batch_size):
+            batch = items[start:start + self.batch_size]
+            if self.processes:
+                futures.append(loop.run_in_executor(pool, _sniff_batch, batch))
+            else:
+                futures.append(
+                    loop.run_in_executor(pool, _sniff_batch_in_thread, self.specs, batch)
+                )
+
+        for future in asyncio.as_completed(futures):
+            for file, domain, data, error in await future:
+                if error is not None:
+                    logger.error(f"Error sniffing {file} for {domain}: {error}")
+                    yield file, domain, _failed_result(file, domain, error)
+                else:
+                    yield file, domain, SniffingResult.from_dict(data)
+
+    async def shutdown(self) -> None:
+        """Shut down the worker pool."""
+        try:
+            if self._pool is not None:
+                pool, self._pool = self._pool, None
+                await asyncio.get_running_loop().run_in_executor(None, pool.shutdown)
+
+        except Exception as e:
+            logger.error(f"Error shutting down executor: {e}")
+
+def create_executor(
+    backend: str,
+    sniffers: Dict[str, Any],
+    workers: int = 1,
+    batch_size: int = 8
+) -> SniffingExecutor:
+    """Create a sniffing executor.
+
+    Args:
+        backend: One of "inline", "thread" or "process"
+        sniffers: Mapping of domain to sniffer instance
+        workers: Number of workers for pool backends
+        batch_size: Number of files per batch for pool backends
+
+    Returns:
+        SniffingExecutor instance
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend == "inline" or (backend == "process" and workers <= 1):
+        return InlineExecutor(sniffers)
+    if backend == "thread":
+        return PoolExecutor(sniffers, workers, batch_size, processes=False)
+    if backend == "process":
+        return PoolExecutor(sniffers, workers, batch_size, processes=True)
+
+    raise ValueError(f"Unknown executor backend: {backend}")
+
+def _failed_result(file: str, domain: str, error: str) -> SniffingResult:
+    """Create the result reported for a sniffer that raised.
+
+    Args:
+        file: Sniffed file
+        domain: Sniffer domain
+        error: Error message
+
+    Returns:
+        Failed SniffingResult
+    """
+    return SniffingResult(file, domain, status=False, metrics={"error": error})
+
+def _build_sniffers(specs: Dict[str, Tuple[type, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Construct sniffers from their class and configuration.
+
+    Args:
+        specs: Mapping of domain to (sniffer class, config)
+
+    Returns:
+        Mapping of domain to sniffer instance
+    """
+    return {domain: cls(config) for domain, (cls, config) in specs.items()}
+
+def _init_worker(specs: Dict[str, Tuple[type, Dict[str, Any]]]) -> None:
+    """Construct the sniffers of a worker process.
+
+    Args:
+        specs: Mapping of domain to (sniffer class, config)
+    """
+    _worker_sniffers.update(_build_sniffers(specs))
+
+def _sniff_batch(items: List[WorkItem]) -> List[WorkOutput]:
+    """Sniff a batch in a worker process.
+
+    Args:
+        items: Files and the domains to sniff each with
+
+    Returns:
+        Outputs for each file and domain
+    """
+    return asyncio.run(_sniff_items(_worker_sniffers, items))
+
+def _sniff_batch_in_thread(
+    specs: Dict[str, Tuple[type, Dict[str, Any]]],
+    items: List[WorkItem]
+) -> List[WorkOutput]:
+    """Sniff a batch in a worker thread.
+
+    Args:
+        specs: Mapping of domain to (sniffer class, config)
+        items: Files and the domains to sniff each with
+
+    Returns:
+        Outputs for each file and domain
+    """
+    if not hasattr(_thread_state, "sniffers"):
+        _thread_state.sniffers = _build_sniffers(specs)
+    return asyncio.run(_sniff_items(_thread_state.sniffers, items))
+
+async def _sniff_items(
+    sniffers: Dict[str, Any],
+    items: List[WorkItem]
+) -> List[WorkOutput]:
+    """Sniff work items with the given sniffers.
+
+    Args:
+        sniffers: Mapping of domain to sniffer instance
+        items: Files and the domains to sniff each with
+
+    Returns:
+        Outputs for each file and domain
+    """
+    outputs = []
+    for file, domains in items:
+        context = FileContext(file)
+        for domain in domains:
+            try:
+                result = await sniffers[domain].sniff_file(file, context)
+                outputs.append((file, domain, result.to_dict(), None))
+            except Exception as e:
+                outputs.append((file, domain, None, str(e)))
+    return outputs
@@ -0,0 +1,130 @@
+"""
+Shared per-file context handed to every domain sniffer.
+"""
+import ast
+import hashlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .line_index import LineIndex
+
+class FileContext:
+    """Lazily loaded, parsed view of a single file.
+
+    The orchestrator creates one context per file and hands it to every
+    domain, so the file is read, decoded, parsed and indexed at most once
+    per run regardless of how many domains look at it. Each attribute is
+    computed on first access; read, decode and parse errors are raised to
+    the accessing sniffer, as a direct ``open``/``ast.parse`` would.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        data: Optional[bytes] = None,
+        encoding: str = "utf-8"
+    ):
+        """Initialize file context.
+
+        Args:
+            path: Path to the file
+            data: Optional file bytes, read from path on first access if omitted
+            encoding: Text encoding of the file
+        """
+        self.path = str(path)
+        self.encoding = encoding
+        self._data = data
+        self._text: Optional[str] = None
+        self._tree: Optional[ast.AST] = None
+        self._tree_error: Optional[SyntaxError] = None
+        self._line_index: Optional[LineIndex] = None
+        self._content_hash: Optional[str] = None
+        self._derived: Dict[str, Any] = {}
+
+    @classmethod
+    def from_text(cls, path: str, text: str, encoding: str = "utf-8") -> "FileContext":
+        """Create context from already decoded content.
+
+        Args:
+            path: Path the content belongs to
+            text: Decoded file content
+            encoding: Text encoding of the file
+
+        Returns:
+            FileContext instance
+        """
+        context = cls(path, text.encode(encoding), encoding)
+        context._text = text
+        return context
+
+    @property
+    def data(self) -> bytes:
+        """Raw file bytes."""
+        if self._data is None:
+            self._data = Path(self.path).read_bytes()
+        return self._data
+
+    @property
+    def text(self) -> str:
+        """Decoded file content with universal newlines."""
+        if self._text is None:
+            text = self.data.decode(self.encoding)
+            if "\r" in text:
+                text = text.replace("\r\n", "\n").replace("\r", "\n")
+            self._text = text
+        return self._text
+
+    @property
+    def tree(self) -> ast.AST:
+        """Python AST of the content, parsed once.
+
+        Raises:
+            SyntaxError: If the content is not valid Python
+        """
+        if self._tree_error is not None:
+            raise self._tree_error
+
+        if self._tree is None:
+            try:
+                self._tree = ast.parse(self.text, filename=self.path)
+            except SyntaxError as e:
+                self._tree_error = e
+                raise
+
+        return self._tree
+
+    @property
+    def line_index(self) -> LineIndex:
+        """Line-offset index of the content."""
+        if self._line_index is None:
+            self._line_index = LineIndex(self.text)
+        return self._line_index
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 hex digest of the raw file bytes."""
+        if self._content_hash is None:
+            self._content_hash = hashlib.sha256(self.data).hexdigest()
+        return self._content_hash
+
+    @property
+    def size(self) -> int:
+        """Size of the file in bytes."""
+        return len(self.data)
+
+    def derived(self, key: str, factory: Callable[["FileContext"], Any]) -> Any:
+        """Get a value derived from the context, computing it once.
+
+        Lets domains share results such as a single AST traversal instead
+        of each walking the tree again.
+
+        Args:
+            key: Name of the derived value
+            factory: Function computing the value from this context
+
+        Returns:
+            Derived value
+        """
+        if key not in self._derived:
+            self._derived[key] = factory(self)
+        return self._derived[key]
@@ -4,9 +4,32 @@ File locking utility for safe concurrent file access.
 import asyncio
 import logging
 import os
+import time
+import zlib
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# How FileLock excludes other processes: "flock" where available, a
+# byte-range lock on Windows, and exclusive creation of the lock file
+# elsewhere
+if fcntl is not None:
+    LOCK_MODE = "flock"
+elif msvcrt is not None:
+    LOCK_MODE = "msvcrt"
+else:
+    LOCK_MODE = "exclusive"
 
 logger = logging.getLogger(__name__)
 
@@ -15,132 +38,204 @@ class FileLockError(Exception):
     pass
 
 class FileLock:
-    """Asynchronous file lock implementation."""
+    """Asynchronous inter-process file lock based on ``flock``.
+
+    The kernel releases the lock when its holder exits, so a crashed worker
+    cannot leave a file locked; the lock file itself is left in place and
+    reused. The holder's PID is recorded in the lock file. A lock still held
+    by a dead owner, which happens when a forked child inherited it, is
+    broken once it is older than the timeout.
+
+    Without ``fcntl`` the lock uses ``msvcrt.locking`` on the lock file's
+    first byte, which Windows also releases when the holder exits, or else
+    exclusive creation of the lock file, which is removed on release and
+    broken like a stale ``flock`` lock if its owner died.
+    """
 
     def __init__(
         self,
         file_path: str,
         timeout: int = 30,
-        check_interval: float = 0.1
+        check_interval: float = 0.1,
+        lock_path: Optional[str] = None
     ):
         """Initialize file lock.
 
         Args:
             file_path: Path to file
             timeout: Lock timeout in seconds
-            check_interval: Lock check interval in seconds
+            check_interval: Longest wait between lock attempts in seconds
+            lock_path: Lock file, ``.<name>.lock`` next to the file if not
+                given
         """
         self.file_path = Path(file_path)
-        self.lock_path = self.file_path.parent / f".{self.file_path.name}.lock"
+        self.lock_path = (
+            Path(lock_path) if lock_path
+            else self.file_path.parent / f".{self.file_path.name}.lock"
+        )
         self.timeout = timeout
         self.check_interval = check_interval
-        self._locked = False
+        self._fd: Optional[int] = None
+
+    @property
+    def _locked(self) -> bool:
+        return self._fd is not None
 
     async def acquire(self) -> None:
-        """Acquire file lock."""
+        """Acquire file lock.
+
+        Raises:
+            FileLockError: If the lock is not acquired within the timeout
+        """
         try:
-            start_time = datetime.now()
+            start_time = time.monotonic()
+            delay = 0.001
 
             while True:
-                try:
-                    # Try to create lock file
-                    self.lock_path.parent.mkdir(parents=True, exist_ok=True)
-
-                    # Open with exclusive creation
-                    fd = os.open(
-                        str(self.lock_path),
-                        os.O_CREAT | os.O_EXCL | os.O_WRONLY
-                    )
-
-                    # Write process info
-                    with os.fdopen(fd, 'w') as f:
-                        f.write(f"{os.getpid()}\n{datetime.now().isoformat()}")
-
-                    self._locked = True
+                if self._try_acquire():
                     logger.debug(f"Acquired lock for {self.file_path}")
                     return
 
-                except FileExistsError:
-                    # Check timeout
-                    if (datetime.now() - start_time).total_seconds() > self.timeout:
-                        raise FileLockError(
-                            f"Timeout waiting for lock on {self.file_path}"
-                        )
+                if time.monotonic() - start_time > self.timeout:
+                    raise FileLockError(
+                        f"Timeout waiting for lock on {self.file_path}"
+                    )
 
-                    # Check if lock is stale
-                    if await self._is_stale_lock():
-                        await self._break_lock()
-                        continue
+                if self._is_stale_lock():
+                    self._break_lock()
+                    continue
 
-                    # Wait and retry
-                    await asyncio.sleep(self.check_interval)
+                # Back off so short holds are picked up quickly
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.check_interval)
 
         except Exception as e:
             logger.error(f"Error acquiring lock for {self.file_path}: {e}")
             raise
 
+    def _try_acquire(self) -> bool:
+        """Try to take the lock without blocking.
+
+        Returns:
+            True if the lock was acquired
+        """
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        if LOCK_MODE == "exclusive":
+            try:
+                fd = os.open(str(self.lock_path), os.O_CREAT | os.O_EXCL | os.O_RDWR, 0o644)
+            except FileExistsError:
+                return False
+            self._record_owner(fd)
+            return True
+
+        fd = os.open(str(self.lock_path), os.O_CREAT | os.O_RDWR, 0o644)
+        if LOCK_MODE == "msvcrt":
+            try:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            except OSError:
+                os.close(fd)
+                return False
+            self._record_owner(fd)
+            return True
+
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+
+        # A broken stale lock unlinks the file; a lock on the old inode
+        # does not exclude anyone
+        try:
+            if os.fstat(fd).st_ino != os.stat(self.lock_path).st_ino:
+                os.close(fd)
+                return False
+        except FileNotFoundError:
+            os.close(fd)
+            return False
+
+        self._record_owner(fd)
+        return True
+
+    def _record_owner(self, fd: int) -> None:
+        """Record this process as the holder of an acquired lock.
+
+        Args:
+            fd: Descriptor of the locked lock file
+        """
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n{datetime.now().isoformat()}".encode())
+        os.lseek(fd, 0, os.SEEK_SET)
+        self._fd = fd
+
     async def release(self) -> None:
         """Release file lock."""
         try:
-            if self._locked:
-                try:
-                    self.lock_path.unlink()
-                    self._locked = False
-                    logger.debug(f"Released lock for {self.file_path}")
-
-                except FileNotFoundError:
-                    # Lock file already gone
-                    self._locked = False
-                    logger.warning(
-                        f"Lock file missing on release for {self.file_path}"
-                    )
+            if self._fd is not None:
+                fd, self._fd = self._fd, None
+                if LOCK_MODE == "flock":
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                elif LOCK_MODE == "msvcrt":
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+                os.close(fd)
+                if LOCK_MODE == "exclusive":
+                    self.lock_path.unlink(missing_ok=True)
+                logger.debug(f"Released lock for {self.file_path}")
 
         except Exception as e:
             logger.error(f"Error releasing lock for {self.file_path}: {e}")
             raise
 
-    async def _is_stale_lock(self) -> bool:
-        """Check if lock file is stale.
+    def get_owner(self) -> Optional[Dict[str, Any]]:
+        """Get the process that last held the lock.
+
+        Returns:
+            Owner PID and acquisition time, or None if unknown
+        """
+        try:
+            with open(self.lock_path) as f:
+                pid = int(f.readline().strip())
+                acquired_at = datetime.fromisoformat(f.readline().strip())
+            return {"pid": pid, "acquired_at": acquired_at}
+        except (OSError, ValueError):
+            return None
+
+    def _is_stale_lock(self) -> bool:
+        """Check if the lock is held on behalf of a dead process.
 
         Returns:
             True if lock is stale
         """
         try:
-            if not self.lock_path.exists():
+            owner = self.get_owner()
+            if owner is None:
                 return False
 
-            # Read lock info
-            with open(self.lock_path) as f:
-                try:
-                    pid = int(f.readline().strip())
-                    timestamp = datetime.fromisoformat(f.readline().strip())
-                except (ValueError, TypeError):
-                    # Invalid lock file
-                    return True
-
             # Check process
             try:
-                os.kill(pid, 0)
-            except OSError:
-                # Process not running
-                return True
+                os.kill(owner["pid"], 0)
+                return False
+            except ProcessLookupError:
+                pass
+            except PermissionError:
+                # Running under another user
+                return False
 
             # Check timeout
-            if (datetime.now() - timestamp).total_seconds() > self.timeout:
-                return True
-
-            return False
+            return (datetime.now() - owner["acquired_at"]).total_seconds() > self.timeout
 
         except Exception as e:
             logger.error(f"Error checking stale lock for {self.file_path}: {e}")
             return False
 
-    async def _break_lock(self) -> None:
-        """Break stale lock file."""
+    def _break_lock(self) -> None:
+        """Break stale lock by replacing the lock file."""
         try:
-            if self.lock_path.exists():
-                self.lock_path.unlink()
-                logger.warning(f"Broke stale lock for {self.file_path}")
+            self.lock_path.unlink()
+            logger.warning(f"Broke stale lock for {self.file_path}")
+
+        except FileNotFoundError:
+            pass
 
         except Exception as e:
             logger.error(f"Error breaking lock for {self.file_path}: {e}")
@@ -156,9 +251,162 @@ class FileLock:
         await self.release()
 
     def __del__(self) -> None:
-        """Clean up lock file on deletion."""
+        """Release the lock on deletion."""
         try:
-            if self._locked and self.lock_path.exists():
-                self.lock_path.unlink()
+            if self._fd is not None:
+                os.close(self._fd)
+                if LOCK_MODE == "exclusive":
+                    self.lock_path.unlink(missing_ok=True)
         except Exception:
             pass
+
+class LockTable:
+    """Striped table of per-file locks with bounded memory.
+
+    Keys are hashed onto a fixed number of stripes, each an asyncio lock,
+    so memory does not grow with the number of files seen. Files sharing a
+    stripe serialize with each other, which only costs throughput when the
+    stripe count is small relative to the number of concurrently locked
+    files. With a lock directory, each stripe is also guarded by a
+    ``FileLock`` on one lock file so processes sharing the directory exclude
+    each other; stripes are hashed with CRC32 so every process agrees.
+
+    Locks are not reentrant: a task must not hold two keys at once, as
+    they may share a stripe.
+    """
+
+    def __init__(
+        self,
+        stripes: int = 256,
+        timeout: Optional[float] = None,
+        lock_dir: Optional[str] = None
+    ):
+        """Initialize lock table.
+
+        Args:
+            stripes: Number of stripes
+            timeout: Optional seconds to wait for a lock
+            lock_dir: Optional directory of inter-process stripe lock files
+        """
+        self.stripes = max(1, stripes)
+        self.timeout = timeout
+        self.lock_dir = Path(lock_dir) if lock_dir else None
+        self._locks: List[asyncio.Lock] = [asyncio.Lock() for _ in range(self.stripes)]
+        self._holders: Dict[int, str] = {}
+
+        # Contention metrics
+        self.acquisitions = 0
+        self.contended = 0
+        self.timeouts = 0
+        self.waiting = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def stripe(self, key: str) -> int:
+        """Get the stripe of a key.
+
+        Args:
+            key: Lock key, usually a file path
+
+        Returns:
+            Stripe index
+        """
+        return zlib.crc32(key.encode()) % self.stripes
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        """Hold the lock of a key.
+
+        Args:
+            key: Lock key, usually a file path
+
+        Raises:
+            FileLockError: If the lock is not acquired within the timeout
+        """
+        index = self.stripe(key)
+        lock = self._locks[index]
+        file_lock = None
+        if self.lock_dir is not None:
+            file_lock = FileLock(
+                key,
+                timeout=self.timeout or 30,
+                lock_path=str(self.lock_dir / f"stripe-{index}.lock")
+            )
+
+        start_time = time.monotonic()
+        if lock.locked():
+            self.contended += 1
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(lock.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise FileLockError(f"Timeout waiting for lock on {key}")
+        finally:
+            self.waiting -= 1
+
+        try:
+            if file_lock is not None:
+                try:
+                    await file_lock.acquire()
+                except FileLockError:
+                    self.timeouts += 1
+                    raise
+
+            waited = time.monotonic() - start_time
+            self.acquisitions += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            self._holders[index] = key
+
+            try:
+                yield
+            finally:
+                self._holders.pop(index, None)
+                if file_lock is not None:
+                    await file_lock.release()
+
+        finally:
+            lock.release()
+
+    def holders(self) -> List[str]:
+        """Get the keys whose locks are held.
+
+        Returns:
+            Held keys
+        """
+        return list(self._holders.values())
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get contention metrics.
+
+        Returns:
+            Dictionary of lock metrics
+        """
+        return {
+            "stripes": self.stripes,
+            "inter_process": self.lock_dir is not None,
+            "held": len(self._holders),
+            "waiting": self.waiting,
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "timeouts": self.timeouts,
+            "wait_seconds": self.wait_seconds,
+            "max_wait_seconds": self.max_wait_seconds,
+            "mean_wait_seconds": self.wait_seconds / self.acquisitions if self.acquisitions else 0
+        }
+
+def create_lock_table(config: Dict[str, Any]) -> LockTable:
+    """Create a lock table from a file_locks configuration section.
+
+    Args:
+        config: Lock configuration
+
+    Returns:
+        Lock table
+    """
+    return LockTable(
+        stripes=config.get("stripes", 256),
+        timeout=config.get("timeout"),
+        lock_dir=config.get("lock_dir") if config.get("inter_process", False) else None
+    )
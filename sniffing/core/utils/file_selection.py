@@ -0,0 +1,142 @@
+"""
+Selection of files to sniff, from the working tree or from a git diff.
+"""
+import fnmatch
+import os
+import subprocess
+from pathlib import PurePath
+from typing import Iterable, List, Optional, Sequence
+
+DEFAULT_EXTENSIONS = (".py", ".js", ".ts", ".html", ".css")
+
+def is_ignored(path: str, ignore_patterns: Iterable[str]) -> bool:
+    """Check whether a path matches an ignore pattern.
+
+    A pattern matches if it matches the whole path or any single component,
+    so "node_modules" ignores everything below a node_modules directory.
+
+    Args:
+        path: Path relative to the repository root
+        ignore_patterns: Glob patterns
+
+    Returns:
+        True if the path is ignored
+    """
+    parts = PurePath(path).parts
+    for pattern in ignore_patterns:
+        if fnmatch.fnmatch(path, pattern):
+            return True
+        if any(fnmatch.fnmatch(part, pattern) for part in parts):
+            return True
+    return False
+
+def discover_files(
+    root: str = ".",
+    extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+    ignore_patterns: Iterable[str] = ()
+) -> List[str]:
+    """Find files to sniff in a directory tree.
+
+    Ignored directories are pruned during the walk rather than filtered
+    afterwards, so virtualenvs and node_modules are never descended into.
+
+    Args:
+        root: Directory to search
+        extensions: File extensions to include
+        ignore_patterns: Glob patterns of paths to skip
+
+    Returns:
+        Sorted file paths relative to the current directory
+    """
+    ignore_patterns = list(ignore_patterns)
+    extensions = tuple(extensions)
+    files = []
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [
+            name for name in dirnames
+            if not is_ignored(name, ignore_patterns)
+        ]
+        for name in filenames:
+            if name.endswith(extensions) and not is_ignored(name, ignore_patterns):
+                files.append(os.path.normpath(os.path.join(dirpath, name)))
+
+    return sorted(files)
+
+def get_changed_files(
+    since: Optional[str] = None,
+    staged: bool = False,
+    repo_path: str = "."
+) -> List[str]:
+    """Get files changed according to git.
+
+    With ``staged`` only the index is compared, against ``since`` or HEAD.
+    Otherwise the working tree is compared against ``since`` and untracked
+    files are included. Deleted files are left out.
+
+    Args:
+        since: Base revision to diff against
+        staged: Whether to only consider staged changes
+        repo_path: Repository path
+
+    Returns:
+        Sorted changed file paths relative to the repository root
+
+    Raises:
+        RuntimeError: If git fails
+    """
+    diff = ["git", "diff", "--name-only", "-z", "--diff-filter=ACMR"]
+    if staged:
+        diff.append("--cached")
+    diff.append(since or "HEAD")
+
+    files = set(_git(diff, repo_path))
+    if not staged:
+        files.update(_git(
+            ["git", "ls-files", "--others", "--exclude-standard", "--full-name", "-z"],
+            repo_path
+        ))
+
+    return sorted(files)
+
+def select_files(
+    files: Iterable[str],
+    extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+    ignore_patterns: Iterable[str] = ()
+) -> List[str]:
+    """Filter files by extension and ignore patterns.
+
+    Args:
+        files: Candidate file paths
+        extensions: File extensions to include
+        ignore_patterns: Glob patterns of paths to skip
+
+    Returns:
+        Selected file paths
+    """
+    ignore_patterns = list(ignore_patterns)
+    extensions = tuple(extensions)
+    return [
+        file for file in files
+        if file.endswith(extensions) and not is_ignored(file, ignore_patterns)
+    ]
+
+def _git(cmd: List[str], repo_path: str) -> List[str]:
+    """Run a git command listing NUL-separated paths.
+
+    Args:
+        cmd: Git command
+        repo_path: Repository path
+
+    Returns:
+        Listed paths
+
+    Raises:
+        RuntimeError: If git fails
+    """
+    process = subprocess.run(cmd, cwd=repo_path, capture_output=True)
+    if process.returncode != 0:
+        raise RuntimeError(
+            f"{' '.join(cmd)} failed: {process.stderr.decode(errors='replace').strip()}"
+        )
+    return [path for path in process.stdout.decode().split("\0") if path]
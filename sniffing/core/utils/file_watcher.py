@@ -0,0 +1,294 @@
+"""
+Event-driven file watching with debounced, coalesced change batches.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+
+from .file_selection import DEFAULT_EXTENSIONS, discover_files, is_ignored
+
+logger = logging.getLogger("file_watcher")
+
+# Receives each batch of changed files
+BatchSink = Callable[[List[str]], Awaitable[Any]]
+
+# Event types that can change a file's content; watchdog also reports opens
+WATCHED_EVENTS = {"created", "modified", "moved", "deleted", "closed"}
+
+class FileWatcher:
+    """Watches a directory tree and delivers changed files in batches.
+
+    File system events from watchdog's observer thread are handed to the
+    event loop, filtered by extension and ignore patterns, and coalesced
+    into a set of pending paths. A batch is delivered once no change has
+    arrived for ``debounce`` seconds, or ``max_delay`` seconds after the
+    first pending change at the latest, so an editor's save burst or a
+    ``git checkout`` of thousands of files becomes one batch.
+
+    Only one batch is delivered at a time. While the sink is busy, for
+    example because the queue it feeds is full, new changes keep
+    coalescing into the next batch instead of piling up. Once more than
+    ``max_pending`` paths are pending, individual paths are dropped and the
+    next batch is a rescan of the whole tree.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        sink: BatchSink,
+        ignore_patterns: Iterable[str] = (),
+        extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+        debounce: float = 0.2,
+        max_delay: float = 2.0,
+        max_pending: int = 10000,
+        backend: str = "native",
+        poll_interval: float = 2.0
+    ):
+        """Initialize file watcher.
+
+        Args:
+            root: Directory to watch
+            sink: Coroutine function receiving each batch of changed files
+            ignore_patterns: Glob patterns of paths to ignore
+            extensions: File extensions to watch
+            debounce: Seconds without changes before a batch is delivered
+            max_delay: Maximum seconds a change waits before delivery
+            max_pending: Pending paths kept before falling back to a rescan
+            backend: "native" for inotify/FSEvents/kqueue, "polling" for
+                file systems without change notifications, or "manual" to
+                only receive changes passed to ``notify``
+            poll_interval: Seconds between scans of the polling backend
+        """
+        self.root = root
+        self.sink = sink
+        self.ignore_patterns = list(ignore_patterns)
+        self.extensions = tuple(extensions)
+        self.debounce = debounce
+        self.max_delay = max(debounce, max_delay)
+        self.max_pending = max_pending
+        self.backend = backend
+        self.poll_interval = poll_interval
+
+        self._pending: Dict[str, None] = {}
+        self._overflowed = False
+        self._first_change = 0.0
+        self._last_change = 0.0
+        self._changed: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._observer: Any = None
+
+        # Metrics
+        self.events_received = 0
+        self.events_ignored = 0
+        self.events_coalesced = 0
+        self.batches = 0
+        self.files_delivered = 0
+        self.rescans = 0
+        self.max_batch_size = 0
+        self.last_batch_size = 0
+        self.last_batch_delay = 0.0
+        self.sink_busy = False
+        self.sink_seconds = 0.0
+
+    async def start(self) -> None:
+        """Start watching."""
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+        if self.backend == "manual":
+            return
+        elif self.backend == "polling":
+            from watchdog.observers.polling import PollingObserver
+            self._observer = PollingObserver(timeout=self.poll_interval)
+        else:
+            from watchdog.observers import Observer
+            self._observer = Observer()
+
+        self._observer.schedule(_EventHandler(self), self.root, recursive=True)
+        self._observer.start()
+        logger.info(f"Watching {self.root} ({self.backend})")
+
+    async def stop(self) -> None:
+        """Stop watching, discarding pending changes."""
+        try:
+            if self._observer is not None:
+                observer, self._observer = self._observer, None
+                observer.stop()
+                await asyncio.get_running_loop().run_in_executor(None, observer.join)
+
+            if self._task is not None:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+                self._task = None
+
+        except Exception as e:
+            logger.error(f"Error stopping file watcher: {e}")
+
+    def notify(self, path: str) -> None:
+        """Report a changed path; safe to call from any thread.
+
+        Args:
+            path: Changed path
+        """
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._record, path)
+
+    def _record(self, path: str) -> None:
+        """Add a changed path to the pending batch.
+
+        Args:
+            path: Changed path
+        """
+        self.events_received += 1
+        path = os.path.normpath(path)
+        relative = os.path.relpath(path, self.root)
+        if not path.endswith(self.extensions) or is_ignored(relative, self.ignore_patterns):
+            self.events_ignored += 1
+            return
+
+        now = time.monotonic()
+        if not self._pending and not self._overflowed:
+            self._first_change = now
+        self._last_change = now
+
+        if path in self._pending or self._overflowed:
+            self.events_coalesced += 1
+        elif len(self._pending) >= self.max_pending:
+            # Too many changes to track one by one, rescan instead
+            self._overflowed = True
+            self._pending.clear()
+        else:
+            self._pending[path] = None
+
+        self._changed.set()
+
+    async def _run(self) -> None:
+        """Deliver debounced batches to the sink, one at a time."""
+        while True:
+            await self._changed.wait()
+
+            # Wait until changes settle, but not past the maximum delay
+            while True:
+                wake = min(self._last_change + self.debounce, self._first_change + self.max_delay)
+                delay = wake - time.monotonic()
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+
+            self._changed.clear()
+            batch_delay = time.monotonic() - self._first_change
+            batch = await self._take_batch()
+            if not batch:
+                continue
+
+            self.batches += 1
+            self.files_delivered += len(batch)
+            self.last_batch_size = len(batch)
+            self.max_batch_size = max(self.max_batch_size, len(batch))
+            self.last_batch_delay = batch_delay
+
+            start_time = time.monotonic()
+            self.sink_busy = True
+            try:
+                await self.sink(batch)
+            except Exception as e:
+                logger.error(f"Error delivering {len(batch)} changed files: {e}")
+            finally:
+                self.sink_busy = False
+                self.sink_seconds += time.monotonic() - start_time
+
+    async def _take_batch(self) -> List[str]:
+        """Take the pending changes as a batch.
+
+        Returns:
+            Changed files that still exist, or every watched file after an
+            overflow
+        """
+        if self._overflowed:
+            self._overflowed = False
+            self._pending.clear()
+            self.rescans += 1
+            return await asyncio.get_running_loop().run_in_executor(
+                None,
+                discover_files,
+                self.root,
+                self.extensions,
+                self.ignore_patterns
+            )
+
+        paths, self._pending = list(self._pending), {}
+        # Deleted files have nothing left to sniff
+        return [path for path in paths if os.path.isfile(path)]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get watcher and backpressure metrics.
+
+        Returns:
+            Dictionary of watcher metrics
+        """
+        return {
+            "backend": self.backend,
+            "events_received": self.events_received,
+            "events_ignored": self.events_ignored,
+            "events_coalesced": self.events_coalesced,
+            "pending": len(self._pending),
+            "overflowed": self._overflowed,
+            "rescans": self.rescans,
+            "batches": self.batches,
+            "files_delivered": self.files_delivered,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "last_batch_delay": self.last_batch_delay,
+            "sink_busy": self.sink_busy,
+            "sink_seconds": self.sink_seconds
+        }
+
+class _EventHandler:
+    """Forwards watchdog events to a watcher.
+
+    Observers only call ``dispatch``, so this does not need to subclass
+    watchdog's handler and the module imports without watchdog installed.
+    """
+
+    def __init__(self, watcher: FileWatcher):
+        self.watcher = watcher
+
+    def dispatch(self, event: Any) -> None:
+        if event.is_directory or event.event_type not in WATCHED_EVENTS:
+            return
+
+        self.watcher.notify(event.src_path)
+        dest_path = getattr(event, "dest_path", None)
+        if dest_path:
+            self.watcher.notify(dest_path)
+
+def create_file_watcher(config: Dict[str, Any], root: str, sink: BatchSink) -> FileWatcher:
+    """Create a file watcher from a file_watcher configuration section.
+
+    Args:
+        config: File watcher configuration
+        root: Directory to watch
+        sink: Coroutine function receiving each batch of changed files
+
+    Returns:
+        File watcher
+    """
+    return FileWatcher(
+        root,
+        sink,
+        ignore_patterns=config.get("ignore_patterns", []),
+        extensions=config.get("extensions", DEFAULT_EXTENSIONS),
+        debounce=config.get("debounce", 0.2),
+        max_delay=config.get("max_delay", 2.0),
+        max_pending=config.get("max_pending", 10000),
+        backend=config.get("backend", "native"),
+        poll_interval=config.get("poll_interval", 2.0)
+    )
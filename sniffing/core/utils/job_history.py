@@ -0,0 +1,399 @@
+"""
+Bounded history of finished jobs with spill-to-disk payloads.
+"""
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("job_history")
+
+class JobHistory:
+    """Bounded, evicting store of finished jobs.
+
+    Each entry has a small summary, which always stays in memory, and an
+    optional full payload. The most recent payloads are kept in memory up to
+    ``max_resident_bytes``; older ones are spilled to JSON files under
+    ``path`` and read back on demand. Entries beyond ``max_entries``, older
+    than ``max_age`` seconds or spilled beyond ``max_spilled_bytes`` are
+    evicted oldest first, together with their spill files.
+
+    Sizes are measured in bytes of the encoded JSON. Spill files are written
+    and deleted outside the lock, and the ``*_async`` methods run on the
+    default executor, so a spill does not stall the event loop.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 1000,
+        max_age: Optional[float] = None,
+        max_resident_bytes: int = 64 * 1024 * 1024,
+        max_spilled_bytes: Optional[int] = None
+    ):
+        """Initialize job history.
+
+        Args:
+            path: Directory for spilled payloads; payloads that do not fit in
+                memory are dropped if not given
+            max_entries: Maximum number of entries kept
+            max_age: Optional maximum entry age in seconds
+            max_resident_bytes: Budget for payloads held in memory
+            max_spilled_bytes: Optional budget for payloads spilled to disk
+        """
+        self.path = Path(path) if path else None
+        self.max_entries = max(1, max_entries)
+        self.max_age = max_age or None
+        self.max_resident_bytes = max(0, max_resident_bytes)
+        self.max_spilled_bytes = max_spilled_bytes
+        self.resident_bytes = 0
+        self.spilled_bytes = 0
+        self.evictions = 0
+        self.spills = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+
+    def put(
+        self,
+        key: str,
+        summary: Dict[str, Any],
+        payload: Any = None
+    ) -> None:
+        """Store a finished job, replacing any entry with the same key.
+
+        Args:
+            key: Job identifier
+            summary: Small summary kept in memory
+            payload: Optional full payload
+        """
+        try:
+            data = json.dumps(payload, default=str, ensure_ascii=False).encode() if payload is not None else None
+
+            with self._lock:
+                stale = [self._remove(key)]
+                self._entries[key] = {
+                    "summary": summary,
+                    "timestamp": time.time(),
+                    "payload": data,
+                    "size": len(data) if data is not None else 0,
+                    "spilled": False,
+                    "pending": None,
+                    "sequence": next(self._sequence)
+                }
+                if data is not None:
+                    self.resident_bytes += len(data)
+
+                spills = self._spill()
+                stale.extend(self._evict())
+
+            self._write_spills(spills)
+            self._unlink(stale)
+
+        except Exception as e:
+            logger.error(f"Error storing job {key}: {e}")
+
+    async def put_async(
+        self,
+        key: str,
+        summary: Dict[str, Any],
+        payload: Any = None
+    ) -> None:
+        """Store a finished job on the default executor.
+
+        Args:
+            key: Job identifier
+            summary: Small summary kept in memory
+            payload: Optional full payload
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self.put, key, summary, payload)
+
+    def get_summary(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the summary of a job.
+
+        Args:
+            key: Job identifier
+
+        Returns:
+            Summary or None if not found or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._is_expired(entry):
+                return None
+            return entry["summary"]
+
+    def get_payload(self, key: str) -> Any:
+        """Get the full payload of a job, reading it back from disk if spilled.
+
+        Args:
+            key: Job identifier
+
+        Returns:
+            Payload or None if not found, expired or dropped
+        """
+        try:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None or self._is_expired(entry):
+                    return None
+                if not entry["spilled"]:
+                    data = entry["payload"]
+                    return json.loads(data) if data is not None else None
+                # Still being written
+                if entry["pending"] is not None:
+                    return json.loads(entry["pending"])
+                spill_file = self._spill_file(key, entry)
+
+            with open(spill_file, "rb") as f:
+                return json.load(f)
+
+        except FileNotFoundError:
+            return None
+
+        except Exception as e:
+            logger.error(f"Error loading job {key}: {e}")
+            return None
+
+    async def get_payload_async(self, key: str) -> Any:
+        """Get the full payload of a job on the default executor.
+
+        Args:
+            key: Job identifier
+
+        Returns:
+            Payload or None if not found, expired or dropped
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self.get_payload, key)
+
+    def delete(self, key: str) -> None:
+        """Delete a job.
+
+        Args:
+            key: Job identifier
+        """
+        with self._lock:
+            stale = [self._remove(key)]
+        self._unlink(stale)
+
+    def clear(self) -> None:
+        """Delete all jobs."""
+        with self._lock:
+            stale = [self._remove(key) for key in list(self._entries)]
+        self._unlink(stale)
+
+    async def clear_async(self) -> None:
+        """Delete all jobs on the default executor."""
+        await asyncio.get_running_loop().run_in_executor(None, self.clear)
+
+    def prune(self) -> int:
+        """Evict expired jobs.
+
+        Returns:
+            Number of evicted jobs
+        """
+        with self._lock:
+            evictions = self.evictions
+            stale = self._evict()
+            evicted = self.evictions - evictions
+        self._unlink(stale)
+        return evicted
+
+    def __contains__(self, key: str) -> bool:
+        return self.get_summary(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def _is_expired(self, entry: Dict[str, Any]) -> bool:
+        """Check whether an entry has expired.
+
+        Args:
+            entry: History entry
+
+        Returns:
+            True if the entry is older than the maximum age
+        """
+        return self.max_age is not None and time.time() - entry["timestamp"] > self.max_age
+
+    def _evict(self) -> List[Optional[Path]]:
+        """Evict the oldest entries beyond the limits or maximum age.
+
+        Returns:
+            Spill files of the evicted entries, to delete outside the lock
+        """
+        stale = []
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            over_disk = (
+                self.max_spilled_bytes is not None
+                and self.spilled_bytes > self.max_spilled_bytes
+            )
+            if (
+                len(self._entries) <= self.max_entries
+                and not over_disk
+                and not self._is_expired(entry)
+            ):
+                break
+            stale.append(self._remove(key))
+            self.evictions += 1
+        return stale
+
+    def _spill(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Move the oldest resident payloads out of memory until within budget.
+
+        Entries are marked spilled and keep their payload as ``pending``
+        until ``_write_spills`` has written it.
+
+        Returns:
+            (key, entry) pairs to write outside the lock
+        """
+        spills = []
+        for key, entry in self._entries.items():
+            if self.resident_bytes <= self.max_resident_bytes:
+                break
+            if entry["spilled"] or entry["payload"] is None:
+                continue
+
+            self.resident_bytes -= entry["size"]
+            if self.path is not None:
+                entry["pending"] = entry["payload"]
+                entry["spilled"] = True
+                self.spilled_bytes += entry["size"]
+                spills.append((key, entry))
+            else:
+                entry["size"] = 0
+            entry["payload"] = None
+        return spills
+
+    def _write_spills(self, spills: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Write spilled payloads to disk.
+
+        Args:
+            spills: (key, entry) pairs returned by ``_spill``
+        """
+        for key, entry in spills:
+            spill_file = self._spill_file(key, entry)
+            try:
+                with open(spill_file, "wb") as f:
+                    f.write(entry["pending"])
+                written = True
+            except Exception as e:
+                logger.error(f"Error spilling job {key}: {e}")
+                written = False
+
+            with self._lock:
+                entry["pending"] = None
+                current = self._entries.get(key) is entry
+                if written and current:
+                    self.spills += 1
+                elif current:
+                    # Dropped, as when there is no spill path
+                    self.spilled_bytes -= entry["size"]
+                    entry["size"] = 0
+                    entry["spilled"] = False
+
+            # Removed or replaced while being written
+            if written and not current:
+                self._unlink([spill_file])
+
+    def _remove(self, key: str) -> Optional[Path]:
+        """Remove an entry.
+
+        Args:
+            key: Job identifier
+
+        Returns:
+            Spill file to delete outside the lock, if any; files still being
+            written are deleted by their writer
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+
+        if entry["spilled"]:
+            self.spilled_bytes -= entry["size"]
+            if entry["pending"] is None:
+                return self._spill_file(key, entry)
+        elif entry["payload"] is not None:
+            self.resident_bytes -= entry["size"]
+        return None
+
+    def _unlink(self, files: List[Optional[Path]]) -> None:
+        """Delete spill files.
+
+        Args:
+            files: Spill files, None entries are skipped
+        """
+        for spill_file in files:
+            if spill_file is None:
+                continue
+            try:
+                spill_file.unlink(missing_ok=True)
+            except Exception as e:
+                logger.error(f"Error deleting spill file {spill_file}: {e}")
+
+    def _spill_file(self, key: str, entry: Dict[str, Any]) -> Path:
+        """Get the spill file of a job entry.
+
+        Each entry has its own file, so a replaced entry's late write never
+        clobbers its successor's.
+
+        Args:
+            key: Job identifier
+            entry: History entry
+
+        Returns:
+            Spill file path
+        """
+        name = hashlib.sha1(key.encode()).hexdigest()
+        return self.path / f"{name}-{entry['sequence']}.json"
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get history statistics.
+
+        Returns:
+            Dictionary of history statistics
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "resident_bytes": self.resident_bytes,
+                "max_resident_bytes": self.max_resident_bytes,
+                "spilled_bytes": self.spilled_bytes,
+                "max_spilled_bytes": self.max_spilled_bytes,
+                "spills": self.spills,
+                "evictions": self.evictions
+            }
+
+def create_job_history(config: Dict[str, Any], default_path: str) -> JobHistory:
+    """Create a job history from a ``job_history`` configuration section.
+
+    Args:
+        config: Job history configuration
+        default_path: Spill directory used when none is configured
+
+    Returns:
+        JobHistory instance
+    """
+    return JobHistory(
+        path=config.get("path", default_path),
+        max_entries=config.get("max_entries", 1000),
+        max_age=config.get("max_age"),
+        max_resident_bytes=config.get("max_resident_bytes", 64 * 1024 * 1024),
+        max_spilled_bytes=config.get("max_spilled_bytes")
+    )
@@ -0,0 +1,93 @@
+"""
+Line-offset index for mapping content offsets to line and column numbers.
+"""
+from bisect import bisect_right
+from itertools import accumulate
+from typing import List, Tuple
+
+class LineIndex:
+    """Index of line start offsets for a file's content.
+
+    The index is built once per file in a single pass; each lookup is a
+    binary search over the line starts instead of a count of the newlines
+    before the offset.
+    """
+
+    def __init__(self, content: str):
+        """Initialize line index.
+
+        Args:
+            content: File content to index
+        """
+        self.length = len(content)
+        self.line_starts: List[int] = [0]
+        self.line_starts.extend(
+            accumulate(len(line) + 1 for line in content.split("\n")[:-1])
+        )
+
+    def __len__(self) -> int:
+        """Get number of lines.
+
+        Returns:
+            Number of lines in the content
+        """
+        return len(self.line_starts)
+
+    def line_of(self, offset: int) -> int:
+        """Get line number for an offset.
+
+        Args:
+            offset: Character offset into the content
+
+        Returns:
+            One-based line number
+        """
+        return bisect_right(self.line_starts, offset)
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """Get line and column for an offset.
+
+        Args:
+            offset: Character offset into the content
+
+        Returns:
+            Tuple of one-based line and one-based column
+        """
+        line = bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1] + 1
+
+    def line_start(self, line: int) -> int:
+        """Get offset of the start of a line.
+
+        Args:
+            line: One-based line number
+
+        Returns:
+            Offset of the first character of the line
+        """
+        return self.line_starts[line - 1]
+
+    def line_end(self, line: int) -> int:
+        """Get offset of the end of a line, excluding the newline.
+
+        Args:
+            line: One-based line number
+
+        Returns:
+            Offset just past the last character of the line
+        """
+        if line < len(self.line_starts):
+            return self.line_starts[line] - 1
+        return self.length
+
+    def line_span(self, offset: int) -> Tuple[int, int]:
+        """Get start and end offsets of the line containing an offset.
+
+        Args:
+            offset: Character offset into the content
+
+        Returns:
+            Tuple of line start and line end offsets
+        """
+        line = bisect_right(self.line_starts, offset)
+        return self.line_start(line), self.line_end(line)
@@ -1,14 +1,21 @@
 """
 Metrics utilities for sniffers.
 """
+import json
 import logging
+import weakref
+from array import array
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import threading
-from collections import defaultdict
+from collections import defaultdict, deque
 
 from prometheus_client import Counter, Gauge, Histogram, Summary
 
+from .patch import write_atomic
+
 logger = logging.getLogger("metrics_utils")
 
 # Define metrics
@@ -86,39 +93,339 @@ SNIFF_CPU = Gauge(
     ["domain"]
 )
 
+# Latency histograms keep 2**SUB_BUCKET_BITS linear sub-buckets per power of
+# two nanoseconds, which bounds the relative error of quantiles by 1/64
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+
+# Longest duration told apart, about 73 minutes; longer ones share the last bucket
+MAX_TRACKED_NS = (1 << 42) - 1
+BUCKET_COUNT = SUB_BUCKET_COUNT + (42 - SUB_BUCKET_BITS) * SUB_BUCKET_HALF
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Durations buffered by a histogram before they are counted
+PENDING_LIMIT = 1024
+
+# Label value used once a collector holds its maximum number of series
+OVERFLOW_LABEL = "other"
+
+# Collectors exported by SpanExporter
+_collectors: "weakref.WeakSet[MetricsCollector]" = weakref.WeakSet()
+
+def _bucket_index(value: int) -> int:
+    """Get the histogram bucket of a duration.
+
+    Args:
+        value: Duration in nanoseconds
+
+    Returns:
+        Bucket index
+    """
+    if value < SUB_BUCKET_COUNT:
+        return value
+    if value > MAX_TRACKED_NS:
+        value = MAX_TRACKED_NS
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return SUB_BUCKET_COUNT + (shift - 1) * SUB_BUCKET_HALF + (value >> shift) - SUB_BUCKET_HALF
+
+def _bucket_upper(index: int) -> int:
+    """Get the largest duration counted in a histogram bucket.
+
+    Args:
+        index: Bucket index
+
+    Returns:
+        Duration in nanoseconds
+    """
+    if index < SUB_BUCKET_COUNT:
+        return index
+    shift, sub = divmod(index - SUB_BUCKET_COUNT, SUB_BUCKET_HALF)
+    return ((sub + SUB_BUCKET_HALF + 1) << (shift + 1)) - 1
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram with HDR-style log-linear buckets.
+
+    Durations are counted in buckets that are linear within each power of
+    two, so quantiles are accurate to within about 1.6% from nanoseconds to
+    over an hour while the histogram never grows.
+    """
+
+    def __init__(self, labels: Optional[Dict[str, str]] = None):
+        """Initialize latency histogram.
+
+        Args:
+            labels: Optional labels of the series
+        """
+        self.labels = labels or {}
+        self.counts = array("q", bytes(8 * BUCKET_COUNT))
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.failures = 0
+        self._pending: deque = deque()
+        self._lock = threading.Lock()
+
+    def record(self, duration_ns: int, success: bool = True) -> None:
+        """Record one duration.
+
+        Durations are appended to a pending buffer, which is thread safe
+        without a lock, and counted in batches.
+
+        Args:
+            duration_ns: Duration in nanoseconds
+            success: Whether the timed operation succeeded
+        """
+        # Failures are stored complemented, as negative numbers
+        self._pending.append(duration_ns if success else ~duration_ns)
+        if len(self._pending) >= PENDING_LIMIT:
+            self._drain()
+
+    def _drain(self) -> None:
+        """Count the pending durations."""
+        with self._lock:
+            pending = self._pending
+            counts = self.counts
+            failures = count = total_ns = 0
+            max_ns = self.max_ns
+            while pending:
+                duration_ns = pending.popleft()
+                if duration_ns < 0:
+                    duration_ns = ~duration_ns
+                    failures += 1
+                count += 1
+                total_ns += duration_ns
+                if duration_ns > max_ns:
+                    max_ns = duration_ns
+
+                # Inlined _bucket_index
+                if duration_ns < SUB_BUCKET_COUNT:
+                    counts[duration_ns] += 1
+                    continue
+                if duration_ns > MAX_TRACKED_NS:
+                    duration_ns = MAX_TRACKED_NS
+                shift = duration_ns.bit_length() - SUB_BUCKET_BITS
+                counts[(shift - 1) * SUB_BUCKET_HALF + (duration_ns >> shift) + SUB_BUCKET_HALF] += 1
+
+            self.failures += failures
+            self.count += count
+            self.total_ns += total_ns
+            self.max_ns = max_ns
+
+    def span(self) -> "Span":
+        """Start timing one invocation.
+
+        Returns:
+            Span recording into this histogram when ended
+        """
+        return Span(self)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the durations of another histogram.
+
+        Args:
+            other: Histogram to add
+        """
+        other._drain()
+        with other._lock:
+            counts = array("q", other.counts)
+            count, total_ns, max_ns, failures = other.count, other.total_ns, other.max_ns, other.failures
+        with self._lock:
+            for index, value in enumerate(counts):
+                if value:
+                    self.counts[index] += value
+            self.count += count
+            self.total_ns += total_ns
+            self.max_ns = max(self.max_ns, max_ns)
+            self.failures += failures
+
+    def quantile(self, q: float) -> float:
+        """Get the duration below which a fraction of the durations fall.
+
+        Args:
+            q: Fraction between 0 and 1
+
+        Returns:
+            Duration in seconds, 0 if nothing was recorded
+        """
+        self._drain()
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, round(q * self.count))
+            seen = 0
+            for index, value in enumerate(self.counts):
+                seen += value
+                if seen >= rank:
+                    return min(_bucket_upper(index), self.max_ns) / 1e9
+            return self.max_ns / 1e9
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the histogram's statistics.
+
+        Returns:
+            Dictionary of count, failures, sum, mean, max and quantiles, in
+            seconds
+        """
+        self._drain()
+        stats = {
+            "count": self.count,
+            "failures": self.failures,
+            "sum": self.total_ns / 1e9,
+            "mean": self.total_ns / self.count / 1e9 if self.count else 0.0,
+            "max": self.max_ns / 1e9
+        }
+        for q in QUANTILES:
+            stats[f"p{round(q * 100)}"] = self.quantile(q)
+        return stats
+
+class Span:
+    """One timed invocation, used as a token or as a context manager.
+
+    Each span carries its own start time, so concurrent invocations of the
+    same operation never overwrite each other.
+    """
+
+    __slots__ = ("_histogram", "_start", "success")
+
+    def __init__(self, histogram: LatencyHistogram):
+        """Start the span.
+
+        Args:
+            histogram: Histogram the duration is recorded in
+        """
+        self._histogram = histogram
+        self.success = True
+        self._start = perf_counter_ns()
+
+    def end(self, success: Optional[bool] = None) -> float:
+        """End the span and record its duration; later calls do nothing.
+
+        Args:
+            success: Whether the operation succeeded, the span's ``success``
+                attribute if not given
+
+        Returns:
+            Duration in seconds
+        """
+        duration = perf_counter_ns() - self._start
+        histogram, self._histogram = self._histogram, None
+        if histogram is None:
+            return 0.0
+
+        # Inlined LatencyHistogram.record
+        if success is None:
+            success = self.success
+        histogram._pending.append(duration if success else ~duration)
+        if len(histogram._pending) >= PENDING_LIMIT:
+            histogram._drain()
+        return duration / 1e9
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.end(self.success and exc_type is None)
+
 class MetricsCollector:
     """Collects and manages metrics for monitoring."""
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, max_series: int = 256):
         """Initialize metrics collector.
 
         Args:
             name: Collector name
+            max_series: Maximum number of labeled latency series; further
+                label values are folded into "other"
         """
         self.name = name
+        self.max_series = max_series
         self._metrics = defaultdict(lambda: defaultdict(int))
-        self._timings = {}
+        self._timings = defaultdict(deque)
+        self._series: Dict[Tuple[str, str, str], LatencyHistogram] = {}
         self._lock = threading.Lock()
+        _collectors.add(self)
+
+    def histogram(self, operation: str, domain: str = "", rule: str = "") -> LatencyHistogram:
+        """Get the latency histogram of an operation.
+
+        Hot paths can look the histogram up once and start spans from it.
+        Labels must have few distinct values, such as domain and rule names,
+        never file paths.
+
+        Args:
+            operation: Operation name
+            domain: Optional domain label
+            rule: Optional rule label
+
+        Returns:
+            Latency histogram
+        """
+        key = (operation, domain, rule)
+        histogram = self._series.get(key)
+        if histogram is not None:
+            return histogram
+
+        with self._lock:
+            if key not in self._series and len(self._series) >= self.max_series:
+                key = (
+                    operation,
+                    domain and OVERFLOW_LABEL,
+                    rule and OVERFLOW_LABEL
+                )
+            histogram = self._series.get(key)
+            if histogram is None:
+                histogram = LatencyHistogram({
+                    "operation": key[0],
+                    "domain": key[1],
+                    "rule": key[2]
+                })
+                self._series[key] = histogram
+            return histogram
+
+    def span(self, operation: str, domain: str = "", rule: str = "") -> Span:
+        """Start timing one invocation of an operation.
+
+        Args:
+            operation: Operation name
+            domain: Optional domain label
+            rule: Optional rule label
 
-    def record_start(self, operation: str) -> None:
+        Returns:
+            Span to end, or to use as a context manager
+        """
+        return Span(self.histogram(operation, domain, rule))
+
+    def record_start(self, operation: str) -> Optional[Span]:
         """Record operation start time.
 
+        Pass the returned span to ``record_end``; without it, ends are
+        matched to starts of the same operation in order.
+
         Args:
             operation: Operation name
+
+        Returns:
+            Span of the operation
         """
         try:
+            span = self.span(operation)
             with self._lock:
-                self._timings[operation] = datetime.now()
+                self._timings[operation].append(span)
                 self._metrics[operation]["starts"] += 1
+            return span
 
         except Exception as e:
             logger.error(f"Error recording start for {operation}: {e}")
+            return None
 
     def record_end(
         self,
         operation: str,
         success: bool = True,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        span: Optional[Span] = None
     ) -> None:
         """Record operation end time and status.
 
@@ -126,21 +433,26 @@ class MetricsCollector:
             operation: Operation name
             success: Whether operation succeeded
             metadata: Optional metadata
+            span: Span returned by ``record_start``
         """
         try:
             with self._lock:
                 # Get timing
-                start_time = self._timings.pop(operation, None)
-                if start_time:
-                    duration = (datetime.now() - start_time).total_seconds()
-                    self._metrics[operation]["duration_total"] += duration
-                    self._metrics[operation]["count"] += 1
-
-                # Record status
-                if success:
-                    self._metrics[operation]["successes"] += 1
-                else:
-                    self._metrics[operation]["failures"] += 1
+                timings = self._timings.get(operation)
+                if span is not None:
+                    if timings and span in timings:
+                        timings.remove(span)
+                elif timings:
+                    span = timings.popleft()
+                if timings is not None and not timings:
+                    del self._timings[operation]
+
+                # Spans count successes and failures with their durations
+                if span is None:
+                    if success:
+                        self._metrics[operation]["successes"] += 1
+                    else:
+                        self._metrics[operation]["failures"] += 1
 
                 # Record metadata
                 if metadata:
@@ -148,6 +460,9 @@ class MetricsCollector:
                         if isinstance(value, (int, float)):
                             self._metrics[operation][f"meta_{key}"] += value
 
+            if span is not None:
+                span.end(success)
+
         except Exception as e:
             logger.error(f"Error recording end for {operation}: {e}")
 
@@ -217,36 +532,210 @@ class MetricsCollector:
                 for operation, data in self._metrics.items():
                     metrics[operation] = dict(data)
 
-                    # Calculate averages
-                    if "duration_total" in data and "count" in data:
-                        count = data["count"]
-                        if count > 0:
-                            metrics[operation]["duration_avg"] = \
-                                data["duration_total"] / count
-
-                    # Calculate success rate
-                    if "successes" in data and "failures" in data:
-                        total = data["successes"] + data["failures"]
-                        if total > 0:
-                            metrics[operation]["success_rate"] = \
-                                data["successes"] / total
-
-                return metrics
+                # Combine the latency series of each operation
+                combined: Dict[str, LatencyHistogram] = {}
+                for (operation, _, _), histogram in self._series.items():
+                    if operation not in combined:
+                        combined[operation] = LatencyHistogram()
+                    combined[operation].merge(histogram)
+
+            for operation, histogram in combined.items():
+                if not histogram.count:
+                    continue
+                stats = histogram.snapshot()
+                data = metrics.setdefault(operation, {})
+                data["count"] = stats["count"]
+                data["duration_total"] = stats["sum"]
+                data["duration_max"] = stats["max"]
+                for q in QUANTILES:
+                    key = f"p{round(q * 100)}"
+                    data[f"duration_{key}"] = stats[key]
+                data["successes"] = data.get("successes", 0) + stats["count"] - stats["failures"]
+                data["failures"] = data.get("failures", 0) + stats["failures"]
+
+            for operation, data in metrics.items():
+                # Calculate averages
+                if "duration_total" in data and "count" in data:
+                    count = data["count"]
+                    if count > 0:
+                        metrics[operation]["duration_avg"] = \
+                            data["duration_total"] / count
+
+                # Calculate success rate
+                if "successes" in data and "failures" in data:
+                    total = data["successes"] + data["failures"]
+                    if total > 0:
+                        metrics[operation]["success_rate"] = \
+                            data["successes"] / total
+
+            return metrics
 
         except Exception as e:
             logger.error(f"Error getting metrics: {e}")
             return {}
 
+    def get_latencies(self) -> List[Dict[str, Any]]:
+        """Get the statistics of every labeled latency series.
+
+        Returns:
+            List of series labels and statistics
+        """
+        with self._lock:
+            series = list(self._series.values())
+        latencies = []
+        for histogram in series:
+            stats = histogram.snapshot()
+            if stats["count"]:
+                latencies.append({**histogram.labels, **stats})
+        return latencies
+
+    def prometheus_samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        """Get the latency series as Prometheus samples.
+
+        Yields:
+            Sample name, labels and value
+        """
+        for stats in self.get_latencies():
+            labels = {
+                "collector": self.name,
+                "operation": stats["operation"],
+                "domain": stats["domain"],
+                "rule": stats["rule"]
+            }
+            for q in QUANTILES:
+                yield (
+                    "sniffing_span_duration_seconds",
+                    {**labels, "quantile": str(q)},
+                    stats[f"p{round(q * 100)}"]
+                )
+            yield "sniffing_span_duration_seconds_sum", labels, stats["sum"]
+            yield "sniffing_span_duration_seconds_count", labels, stats["count"]
+            yield "sniffing_span_failures_total", labels, stats["failures"]
+
+    def export_prometheus(self) -> str:
+        """Export the latency series in the Prometheus text format.
+
+        Returns:
+            Metrics text
+        """
+        return format_prometheus(self.prometheus_samples())
+
+    def write_metrics_file(self, path: str, format: str = "json") -> None:
+        """Write metrics to a local file, replacing it atomically.
+
+        The "prometheus" format suits the node exporter's textfile
+        collector.
+
+        Args:
+            path: File to write
+            format: "json" or "prometheus"
+        """
+        try:
+            if format == "prometheus":
+                content = self.export_prometheus()
+            else:
+                content = json.dumps({
+                    "collector": self.name,
+                    "timestamp": datetime.now().isoformat(),
+                    "metrics": self.get_metrics(),
+                    "latencies": self.get_latencies()
+                }, indent=2, default=str)
+
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(path, content)
+
+        except Exception as e:
+            logger.error(f"Error writing metrics to {path}: {e}")
+
     def reset(self) -> None:
         """Reset all metrics."""
         try:
             with self._lock:
                 self._metrics.clear()
                 self._timings.clear()
+                self._series.clear()
 
         except Exception as e:
             logger.error(f"Error resetting metrics: {e}")
 
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def format_prometheus(samples: Iterator[Tuple[str, Dict[str, str], float]]) -> str:
+    """Format span samples in the Prometheus text format.
+
+    Args:
+        samples: Sample name, labels and value
+
+    Returns:
+        Metrics text
+    """
+    lines = [
+        "# HELP sniffing_span_duration_seconds Duration of timed sniffing operations",
+        "# TYPE sniffing_span_duration_seconds summary",
+    ]
+    failures = [
+        "# HELP sniffing_span_failures_total Failed timed sniffing operations",
+        "# TYPE sniffing_span_failures_total counter"
+    ]
+    for name, labels, value in samples:
+        label_text = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+        line = f"{name}{{{label_text}}} {value}"
+        (failures if name == "sniffing_span_failures_total" else lines).append(line)
+    return "\n".join(lines + failures) + "\n"
+
+class SpanExporter:
+    """Prometheus collector exporting the latency series of all collectors."""
+
+    def collect(self) -> Iterator[Any]:
+        """Collect metrics for a Prometheus registry.
+
+        Yields:
+            Prometheus metric families
+        """
+        from prometheus_client.core import Metric
+
+        durations = Metric(
+            "sniffing_span_duration_seconds",
+            "Duration of timed sniffing operations",
+            "summary"
+        )
+        failures = Metric(
+            "sniffing_span_failures",
+            "Failed timed sniffing operations",
+            "counter"
+        )
+        for collector in list(_collectors):
+            for name, labels, value in collector.prometheus_samples():
+                metric = failures if name == "sniffing_span_failures_total" else durations
+                metric.add_sample(name, labels, value)
+        yield durations
+        yield failures
+
+_exporter: Optional[SpanExporter] = None
+
+def register_span_exporter(registry: Any = None) -> SpanExporter:
+    """Export span latencies through a Prometheus registry.
+
+    Args:
+        registry: Registry to register with, the default registry served by
+            ``start_http_server`` if not given
+
+    Returns:
+        Registered exporter
+    """
+    global _exporter
+    if registry is not None:
+        exporter = SpanExporter()
+        registry.register(exporter)
+        return exporter
+
+    if _exporter is None:
+        from prometheus_client import REGISTRY
+        _exporter = SpanExporter()
+        REGISTRY.register(_exporter)
+    return _exporter
+
 class OperationMetrics:
     """Context manager for operation metrics."""
 
@@ -267,10 +756,11 @@ class OperationMetrics:
         self.operation = operation
         self.metadata = metadata
         self.success = True
+        self.span: Optional[Span] = None
 
     def __enter__(self):
         """Enter context and record start."""
-        self.collector.record_start(self.operation)
+        self.span = self.collector.record_start(self.operation)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -280,7 +770,8 @@ class OperationMetrics:
         self.collector.record_end(
             self.operation,
             self.success,
-            self.metadata
+            self.metadata,
+            self.span
         )
 
 def track_operation(
@@ -0,0 +1,216 @@
+"""
+Offset-based patch sets for applying many fixes to a file in one pass.
+"""
+import os
+import re
+import tempfile
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .line_index import LineIndex
+
+@dataclass(frozen=True)
+class Edit:
+    """Replacement of ``length`` characters at ``offset`` in the original content."""
+    offset: int
+    length: int
+    replacement: str
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+    def overlaps(self, other: "Edit") -> bool:
+        """Check whether two edits touch the same original characters.
+
+        Insertions conflict only with edits that replace characters on both
+        sides of them; several insertions at one offset apply in order.
+
+        Args:
+            other: Edit to compare with
+
+        Returns:
+            True if the edits conflict
+        """
+        if self.length == 0 and other.length == 0:
+            return False
+        if self.length == 0:
+            return other.offset < self.offset < other.end
+        if other.length == 0:
+            return self.offset < other.offset < self.end
+        return self.offset < other.end and other.offset < self.end
+
+class PatchSet:
+    """Set of non-overlapping edits against one version of a file.
+
+    Fixes are added as groups of edits computed against the original
+    content, so no fix sees another's output. A fix whose edits overlap an
+    already accepted edit is rejected as a whole instead of corrupting it;
+    fixes added first win. All accepted edits are applied in a single pass.
+    """
+
+    def __init__(self):
+        """Initialize patch set."""
+        self._edits: List[Edit] = []
+        self._keys: List[Tuple[int, int]] = []
+        self._sequence = 0
+        self.conflicts: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._edits)
+
+    def add(self, edits: List[Edit], source: Any = None) -> bool:
+        """Add the edits of one fix.
+
+        Args:
+            edits: Edits of the fix, against the original content
+            source: Optional fix the edits came from, kept with conflicts
+
+        Returns:
+            True if the edits were accepted, False if any conflicted
+        """
+        edits = sorted(set(edits), key=lambda edit: (edit.offset, edit.length))
+        for i, edit in enumerate(edits):
+            if (i and edits[i - 1].overlaps(edit)) or self._conflicting(edit):
+                self.conflicts.append({"source": source, "edit": edit})
+                return False
+
+        for edit in edits:
+            if edit in self._edits:
+                # The same change from another fix
+                continue
+            # Insertions at one offset keep the order they were added in
+            key = (edit.offset, self._sequence)
+            self._sequence += 1
+            index = bisect_left(self._keys, key)
+            self._keys.insert(index, key)
+            self._edits.insert(index, edit)
+        return True
+
+    def _conflicting(self, edit: Edit) -> bool:
+        """Check whether an edit overlaps an accepted edit.
+
+        Args:
+            edit: Edit to check
+
+        Returns:
+            True if the edit conflicts
+        """
+        # Accepted replacements do not overlap, so their ends increase with
+        # their offsets; walk back from the new edit's end until one ends
+        # before the new edit starts
+        index = bisect_left(self._keys, (edit.end + 1, -1))
+        while index > 0:
+            index -= 1
+            accepted = self._edits[index]
+            if accepted == edit:
+                continue
+            if accepted.overlaps(edit):
+                return True
+            if accepted.length and accepted.end <= edit.offset:
+                return False
+        return False
+
+    def apply(self, content: str) -> str:
+        """Apply all edits to the content they were computed against.
+
+        Args:
+            content: Original content
+
+        Returns:
+            Patched content
+        """
+        parts = []
+        position = 0
+        for edit in self._edits:
+            parts.append(content[position:edit.offset])
+            parts.append(edit.replacement)
+            position = max(position, edit.end)
+        parts.append(content[position:])
+        return "".join(parts)
+
+def pattern_edits(content: str, pattern: str, replacement: str, count: int = 0) -> List[Edit]:
+    """Get the edits of a regular expression substitution.
+
+    Args:
+        content: Content to search
+        pattern: Regular expression
+        replacement: Replacement template, as for ``re.sub``
+        count: Maximum number of matches to replace, 0 for all
+
+    Returns:
+        Edits replacing the matches
+    """
+    edits = []
+    for match in re.compile(pattern).finditer(content):
+        edits.append(Edit(match.start(), match.end() - match.start(), match.expand(replacement)))
+        if count and len(edits) >= count:
+            break
+    return edits
+
+def text_edits(content: str, old: str, new: str) -> List[Edit]:
+    """Get the edits replacing every occurrence of a text.
+
+    Args:
+        content: Content to search
+        old: Text to replace
+        new: Replacement text
+
+    Returns:
+        Edits replacing the occurrences
+    """
+    if not old:
+        return []
+
+    edits = []
+    offset = content.find(old)
+    while offset != -1:
+        edits.append(Edit(offset, len(old), new))
+        offset = content.find(old, offset + len(old))
+    return edits
+
+def line_insert_edit(content: str, line: int, text: str, index: Optional[LineIndex] = None) -> Edit:
+    """Get the edit inserting a line before a line.
+
+    Args:
+        content: Content to insert into
+        line: One-based line number the text is inserted before; past the
+            last line appends
+        text: Line to insert, without a trailing newline
+        index: Optional line index of the content
+
+    Returns:
+        Insertion edit
+    """
+    index = index or LineIndex(content)
+    if line > len(index):
+        separator = "" if not content or content.endswith("\n") else "\n"
+        return Edit(len(content), 0, f"{separator}{text}\n")
+    return Edit(index.line_start(max(1, line)), 0, f"{text}\n")
+
+def write_atomic(path: str, content: str) -> None:
+    """Replace a file's content so readers never see it partially written.
+
+    The content is written to a temporary file in the same directory and
+    renamed over the file, keeping the file's permissions.
+
+    Args:
+        path: File to write
+        content: New content
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(tmp_path, path.stat().st_mode & 0o7777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
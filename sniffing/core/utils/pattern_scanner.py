@@ -0,0 +1,508 @@
+"""
+Single-pass multi-pattern scanning for sniffer rule sets.
+"""
+import asyncio
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+from .line_index import LineIndex
+from .regex_safety import SafePattern, create_safe_pattern, vet_pattern
+from .rule_costs import RuleCostTracker
+
+logger = logging.getLogger("pattern_scanner")
+
+# Patterns using these constructs cannot share one compiled alternation
+_STANDALONE_MARKERS = re.compile(r"\\[1-9]|\(\?P=|\(\?[aiLmsux]+\)")
+
+@dataclass
+class PatternHit:
+    """A single rule match reported by the scanner."""
+    rule: str
+    start: int
+    end: int
+    line: int
+    code: str
+
+@dataclass
+class _Rule:
+    """Compiled form of a single rule."""
+    name: str
+    pattern: str
+    core: Pattern
+    line_scoped: bool
+    group: Optional[str] = None
+    safe: Optional[SafePattern] = None
+
+class PatternScanner:
+    """Scanner that matches a whole rule set in one pass over the content.
+
+    All rules are compiled once into a single alternation. Leading and
+    trailing ``.*`` wildcards are stripped from each alternative, because
+    they only widen a match to the surrounding line and force the regex
+    engine to retry the wildcard at every offset. Lines hit by the combined
+    scan are then re-checked for the remaining rules, so every rule is
+    reported at most once per line it matches.
+
+    The combined pass cannot tell what each rule costs, so with a cost
+    tracker every ``sample_every``-th scan runs the rules one by one and
+    records each; rules the tracker quarantines are left out of later scans.
+
+    Rules are vetted for catastrophic backtracking when compiled. A flagged
+    rule is kept out of the alternation, where it would slow every rule,
+    and matched through a ``SafePattern`` under a time budget instead.
+    Scans are serialized, since ``scan_async`` runs them on executor threads
+    and a quarantine recompiles the rules.
+    """
+
+    def __init__(
+        self,
+        rules: Dict[str, str],
+        flags: int = re.MULTILINE,
+        costs: Optional[RuleCostTracker] = None,
+        safety: Optional[Dict[str, Any]] = None
+    ):
+        """Initialize pattern scanner.
+
+        Args:
+            rules: Mapping of rule name to regular expression
+            flags: Regex flags applied to every rule
+            costs: Optional tracker recording per-rule costs
+            safety: Optional regex safety configuration for flagged rules
+        """
+        self.flags = flags
+        self.costs = costs
+        self.safety = safety or {}
+        self.patterns = dict(rules)
+        self._safe: Dict[str, SafePattern] = {}
+        self.rules: Dict[str, _Rule] = {}
+        self._combined: Optional[Pattern] = None
+        self._group_rules: Dict[str, _Rule] = {}
+        self._standalone: List[_Rule] = []
+        self._quarantine_version = costs.quarantine_version if costs else 0
+        self._lock = threading.Lock()
+        self._compile(self._active_patterns())
+
+    @classmethod
+    def from_checks(
+        cls,
+        checks: Dict[str, Dict[str, Any]],
+        prefix: str = "",
+        flags: int = re.MULTILINE,
+        costs: Optional[RuleCostTracker] = None,
+        safety: Optional[Dict[str, Any]] = None
+    ) -> "PatternScanner":
+        """Create scanner from a sniffer check table.
+
+        Args:
+            checks: Mapping of check name to check info with a ``pattern`` key
+            prefix: Optional prefix for rule names
+            flags: Regex flags applied to every rule
+            costs: Optional tracker recording per-rule costs
+            safety: Optional regex safety configuration for flagged rules
+
+        Returns:
+            PatternScanner instance
+        """
+        return cls(
+            {f"{prefix}{name}": info["pattern"] for name, info in checks.items()},
+            flags,
+            costs,
+            safety
+        )
+
+    def _active_patterns(self) -> Dict[str, str]:
+        """Get the rules that are not quarantined.
+
+        Returns:
+            Mapping of rule name to regular expression
+        """
+        if self.costs is None:
+            return self.patterns
+        return {
+            name: pattern for name, pattern in self.patterns.items()
+            if not self.costs.is_quarantined(name)
+        }
+
+    def _compile(self, rules: Dict[str, str]) -> None:
+        """Compile rules into the combined alternation.
+
+        Args:
+            rules: Mapping of rule name to regular expression
+        """
+        self.rules = {}
+        self._combined = None
+        self._group_rules = {}
+        self._standalone = []
+
+        parts = []
+        for index, (name, pattern) in enumerate(rules.items()):
+            core, line_scoped = _strip_wildcards(pattern)
+            rule = _Rule(
+                name=name,
+                pattern=pattern,
+                core=re.compile(core, self.flags),
+                line_scoped=line_scoped
+            )
+            self.rules[name] = rule
+
+            rule.safe = self._guard(name, core)
+            if rule.safe is not None:
+                self._standalone.append(rule)
+                continue
+
+            if rule.core.groupindex or _STANDALONE_MARKERS.search(core):
+                self._standalone.append(rule)
+                continue
+
+            rule.group = f"_r{index}"
+            self._group_rules[rule.group] = rule
+            parts.append(f"(?P<{rule.group}>{core})")
+
+        if not parts:
+            return
+
+        try:
+            self._combined = re.compile("|".join(parts), self.flags)
+        except re.error as e:
+            logger.warning(f"Falling back to per-rule scanning: {e}")
+            self._standalone = list(self.rules.values())
+            self._group_rules.clear()
+
+    def _guard(self, name: str, core: str) -> Optional[SafePattern]:
+        """Vet a rule and guard it if it can backtrack catastrophically.
+
+        Args:
+            name: Rule name
+            core: Rule pattern with wildcards stripped
+
+        Returns:
+            Safe pattern for a flagged rule, None if the rule looks safe or
+            guarding is disabled
+        """
+        if self.safety.get("engine") == "re":
+            return None
+        if name in self._safe:
+            return self._safe[name]
+
+        warnings = vet_pattern(core, self.flags)
+        if not warnings:
+            return None
+
+        logger.warning(f"Rule {name} can backtrack catastrophically: {'; '.join(warnings)}")
+        safe = self._safe[name] = create_safe_pattern(core, self.flags, self.safety)
+        return safe
+
+    def scan(
+        self,
+        content: str,
+        line_index: Optional[LineIndex] = None
+    ) -> List[PatternHit]:
+        """Scan content for all rules.
+
+        Args:
+            content: Content to scan
+            line_index: Optional line index for content
+
+        Returns:
+            Hits ordered by position
+        """
+        if line_index is None:
+            line_index = LineIndex(content)
+        with self._lock:
+            return self._scan(content, line_index)
+
+    def _scan(self, content: str, line_index: LineIndex) -> List[PatternHit]:
+        """Scan content for all rules, holding the scan lock.
+
+        Args:
+            content: Content to scan
+            line_index: Line index for content
+
+        Returns:
+            Hits ordered by position
+        """
+        if self.costs is not None:
+            if self.costs.quarantine_version != self._quarantine_version:
+                self._quarantine_version = self.costs.quarantine_version
+                self._compile(self._active_patterns())
+            if self.costs.should_profile():
+                return self._scan_profiled(content, line_index)
+
+        hits: List[PatternHit] = []
+        seen: Set[Tuple[str, int]] = set()
+        hit_lines: Set[int] = set()
+
+        if self._combined:
+            for match in self._combined.finditer(content):
+                rule = self._group_rules[match.lastgroup]
+                line = line_index.line_of(match.start())
+                if (rule.name, line) in seen:
+                    continue
+                seen.add((rule.name, line))
+                hit_lines.add(line)
+                start, end = match.span(rule.group)
+                hits.append(self._make_hit(rule, content, start, end, line, line_index))
+
+            # Rules shadowed by an earlier alternative on the same line
+            for line in hit_lines:
+                line_start = line_index.line_start(line)
+                line_end = line_index.line_end(line)
+                for rule in self._group_rules.values():
+                    if (rule.name, line) in seen:
+                        continue
+                    match = rule.core.search(content, line_start, line_end)
+                    if match:
+                        seen.add((rule.name, line))
+                        hits.append(
+                            self._make_hit(rule, content, *match.span(), line, line_index)
+                        )
+
+        for rule in self._standalone:
+            if self.costs is None:
+                hits.extend(self._scan_standalone(rule, content, line_index))
+                continue
+            with self.costs.measure(rule.name, len(content)) as run:
+                rule_hits = self._scan_standalone(rule, content, line_index)
+                run.matches = len(rule_hits)
+            hits.extend(rule_hits)
+
+        hits.sort(key=lambda hit: hit.start)
+        return hits
+
+    async def scan_async(
+        self,
+        content: str,
+        line_index: Optional[LineIndex] = None
+    ) -> List[PatternHit]:
+        """Scan content for all rules without blocking the event loop.
+
+        Scans with rules guarded by the worker process, which can wait up to
+        their timeout, run on the default executor; others run inline.
+
+        Args:
+            content: Content to scan
+            line_index: Optional line index for content
+
+        Returns:
+            Hits ordered by position
+        """
+        if not any(safe.guarded for safe in self._safe.values()):
+            return self.scan(content, line_index)
+        return await asyncio.get_running_loop().run_in_executor(None, self.scan, content, line_index)
+
+    def _scan_profiled(self, content: str, line_index: LineIndex) -> List[PatternHit]:
+        """Scan content one rule at a time, recording each rule's cost.
+
+        Args:
+            content: Content to scan
+            line_index: Line index for content
+
+        Returns:
+            Hits ordered by position
+        """
+        hits: List[PatternHit] = []
+        for rule in self.rules.values():
+            with self.costs.measure(rule.name, len(content)) as run:
+                rule_hits = self._scan_standalone(rule, content, line_index)
+                run.matches = len(rule_hits)
+            hits.extend(rule_hits)
+
+        hits.sort(key=lambda hit: hit.start)
+        return hits
+
+    def matched_rules(
+        self,
+        content: str,
+        line_index: Optional[LineIndex] = None
+    ) -> Set[str]:
+        """Get names of rules matching anywhere in content.
+
+        Args:
+            content: Content to scan
+            line_index: Optional line index for content
+
+        Returns:
+            Set of matching rule names
+        """
+        return {hit.rule for hit in self.scan(content, line_index)}
+
+    async def matched_rules_async(
+        self,
+        content: str,
+        line_index: Optional[LineIndex] = None
+    ) -> Set[str]:
+        """Get names of rules matching anywhere in content without blocking.
+
+        Args:
+            content: Content to scan
+            line_index: Optional line index for content
+
+        Returns:
+            Set of matching rule names
+        """
+        return {hit.rule for hit in await self.scan_async(content, line_index)}
+
+    def guarded_rules(self) -> Dict[str, Dict[str, Any]]:
+        """Get the rules matched under a time budget.
+
+        Returns:
+            Mapping of rule name to its safe pattern metrics
+        """
+        return {name: safe.get_metrics() for name, safe in self._safe.items()}
+
+    def group_hits(self, hits: Iterable[PatternHit]) -> Dict[str, List[PatternHit]]:
+        """Group hits by rule name.
+
+        Args:
+            hits: Hits to group
+
+        Returns:
+            Mapping of rule name to its hits
+        """
+        grouped: Dict[str, List[PatternHit]] = {name: [] for name in self.patterns}
+        for hit in hits:
+            grouped[hit.rule].append(hit)
+        return grouped
+
+    def _scan_standalone(
+        self,
+        rule: _Rule,
+        content: str,
+        line_index: LineIndex
+    ) -> List[PatternHit]:
+        """Scan content for a rule excluded from the combined alternation.
+
+        Args:
+            rule: Rule to scan for
+            content: Content to scan
+            line_index: Line index for content
+
+        Returns:
+            Hits for the rule
+        """
+        if rule.safe is not None:
+            spans = rule.safe.spans(content)
+        else:
+            spans = [match.span() for match in rule.core.finditer(content)]
+
+        hits = []
+        seen_lines: Set[int] = set()
+        for start, end in spans:
+            line = line_index.line_of(start)
+            if line in seen_lines:
+                continue
+            seen_lines.add(line)
+            hits.append(self._make_hit(rule, content, start, end, line, line_index))
+
+        return hits
+
+    def _make_hit(
+        self,
+        rule: _Rule,
+        content: str,
+        start: int,
+        end: int,
+        line: int,
+        line_index: LineIndex
+    ) -> PatternHit:
+        """Build a hit from a match.
+
+        Args:
+            rule: Matching rule
+            content: Scanned content
+            start: Offset of the match start
+            end: Offset of the match end
+            line: One-based line number of the match start
+            line_index: Line index for content
+
+        Returns:
+            PatternHit instance
+        """
+        if rule.line_scoped:
+            code = content[line_index.line_start(line):line_index.line_end(line)]
+        else:
+            code = content[start:end]
+
+        return PatternHit(
+            rule=rule.name,
+            start=start,
+            end=end,
+            line=line,
+            code=code.strip()
+        )
+
+def _split_alternatives(pattern: str) -> List[str]:
+    """Split a pattern on its top-level ``|`` operators.
+
+    Args:
+        pattern: Regular expression
+
+    Returns:
+        List of top-level alternatives
+    """
+    alternatives = []
+    depth = 0
+    in_class = False
+    current = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            current.append(pattern[i:i + 2])
+            i += 2
+            continue
+
+        if in_class:
+            if char == "]" and current and current[-1] not in ("[", "[^"):
+                in_class = False
+        elif char == "[":
+            in_class = True
+            if pattern[i + 1:i + 2] == "^":
+                current.append("[^")
+                i += 2
+                continue
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            alternatives.append("".join(current))
+            current = []
+            i += 1
+            continue
+
+        current.append(char)
+        i += 1
+
+    alternatives.append("".join(current))
+    return alternatives
+
+def _strip_wildcards(pattern: str) -> Tuple[str, bool]:
+    """Strip leading and trailing ``.*`` from each top-level alternative.
+
+    Args:
+        pattern: Regular expression
+
+    Returns:
+        Tuple of stripped pattern and whether any wildcard was stripped
+    """
+    stripped = False
+    alternatives = []
+    for alternative in _split_alternatives(pattern):
+        core = alternative
+        if core.startswith(".*") and not core.startswith(".*?") and len(core) > 2:
+            core = core[2:]
+            stripped = True
+        if (
+            core.endswith(".*") and
+            not core.endswith("\\.*") and
+            len(core) > 2
+        ):
+            core = core[:-2]
+            stripped = True
+        alternatives.append(core)
+
+    return "|".join(alternatives), stripped
@@ -0,0 +1,698 @@
+"""
+Static vetting and time-bounded execution of regular expressions.
+
+Python's ``re`` engine backtracks, so a pattern with nested or overlapping
+quantifiers can take exponential or high polynomial time on a crafted or
+minified file, and it cannot be interrupted while it runs. Patterns are
+vetted when rules load; those flagged run on a linear-time engine when
+``re2`` is installed, and otherwise in a worker process that is killed when
+a match exceeds its time budget, falling back to matching line by line.
+"""
+import asyncio
+import logging
+import multiprocessing
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+logger = logging.getLogger("regex_safety")
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Offsets of a match
+Span = Tuple[int, int]
+
+MAXREPEAT = sre_constants.MAXREPEAT
+
+# Repeats bounded above this are treated as unbounded
+UNBOUNDED_THRESHOLD = 16
+
+# ASCII character masks, with a flag for characters beyond ASCII
+_ASCII = (1 << 128) - 1
+_DIGITS = sum(1 << c for c in range(ord("0"), ord("9") + 1))
+_WORD = _DIGITS | (1 << ord("_")) | sum(
+    1 << c for c in list(range(ord("a"), ord("z") + 1)) + list(range(ord("A"), ord("Z") + 1))
+)
+_SPACE = sum(1 << ord(c) for c in " \t\n\r\f\v")
+
+class RegexTimeout(Exception):
+    """A match exceeded its time budget."""
+    pass
+
+class _Chars:
+    """Approximate set of characters an element can match."""
+
+    __slots__ = ("mask", "other")
+
+    def __init__(self, mask: int = 0, other: bool = False):
+        self.mask = mask
+        self.other = other
+
+    def __or__(self, chars: "_Chars") -> "_Chars":
+        return _Chars(self.mask | chars.mask, self.other or chars.other)
+
+    def overlaps(self, chars: "_Chars") -> bool:
+        return bool(self.mask & chars.mask) or (self.other and chars.other)
+
+    def contains(self, chars: "_Chars") -> bool:
+        return not chars.mask & ~self.mask and (self.other or not chars.other)
+
+    @property
+    def broad(self) -> bool:
+        return bin(self.mask).count("1") > 96
+
+def _char(code: int, ignore_case: bool) -> _Chars:
+    """Get the characters matched by a literal."""
+    if code >= 128:
+        return _Chars(other=True)
+    mask = 1 << code
+    if ignore_case and chr(code).isalpha():
+        mask |= 1 << ord(chr(code).swapcase())
+    return _Chars(mask)
+
+def _category(category: Any) -> _Chars:
+    """Get the characters matched by a class category."""
+    name = str(category)
+    negated = "NOT_" in name
+    if "DIGIT" in name:
+        chars = _Chars(_DIGITS)
+    elif "WORD" in name:
+        chars = _Chars(_WORD, True)
+    elif "SPACE" in name:
+        chars = _Chars(_SPACE)
+    else:
+        chars = _Chars(_ASCII, True)
+        negated = False
+    if negated:
+        return _Chars(_ASCII & ~chars.mask, True)
+    return chars
+
+def _class_chars(items: List[Tuple[Any, Any]], ignore_case: bool) -> _Chars:
+    """Get the characters matched by a character class."""
+    chars = _Chars()
+    negated = False
+    for op, av in items:
+        if op is sre_constants.NEGATE:
+            negated = True
+        elif op is sre_constants.LITERAL:
+            chars = chars | _char(av, ignore_case)
+        elif op is sre_constants.RANGE:
+            low, high = av
+            for code in range(low, min(high, 127) + 1):
+                chars = chars | _char(code, ignore_case)
+            if high >= 128:
+                chars.other = True
+        elif op is sre_constants.CATEGORY:
+            chars = chars | _category(av)
+        else:
+            chars = chars | _Chars(_ASCII, True)
+    if negated:
+        return _Chars(_ASCII & ~chars.mask, True)
+    return chars
+
+class _Vetter:
+    """Walks a parsed pattern looking for backtracking hazards."""
+
+    def __init__(self, flags: int):
+        self.ignore_case = bool(flags & re.IGNORECASE)
+        self.dot_all = bool(flags & re.DOTALL)
+        self.warnings: List[str] = []
+
+    def warn(self, warning: str) -> None:
+        if warning not in self.warnings:
+            self.warnings.append(warning)
+
+    def chars(self, items: Any) -> _Chars:
+        """Get the characters any element of a sequence can match."""
+        chars = _Chars()
+        for op, av in items:
+            chars = chars | self.element_chars(op, av)
+        return chars
+
+    def element_chars(self, op: Any, av: Any) -> _Chars:
+        """Get the characters an element can match."""
+        if op is sre_constants.LITERAL:
+            return _char(av, self.ignore_case)
+        if op is sre_constants.NOT_LITERAL:
+            return _Chars(_ASCII & ~(1 << av) if av < 128 else _ASCII, True)
+        if op is sre_constants.ANY:
+            return _Chars(_ASCII if self.dot_all else _ASCII & ~(1 << 10), True)
+        if op is sre_constants.IN:
+            return _class_chars(av, self.ignore_case)
+        if op in _REPEATS:
+            return self.chars(av[2])
+        if op is sre_constants.SUBPATTERN:
+            return self.chars(av[-1])
+        if op is sre_constants.BRANCH:
+            chars = _Chars()
+            for branch in av[1]:
+                chars = chars | self.chars(branch)
+            return chars
+        if op is getattr(sre_constants, "ATOMIC_GROUP", None):
+            return self.chars(av)
+        if op is getattr(sre_constants, "POSSESSIVE_REPEAT", None):
+            return self.chars(av[2])
+        if op in _ZERO_WIDTH:
+            return _Chars()
+        # Back references and anything unknown
+        return _Chars(_ASCII, True)
+
+    def first_chars(self, items: Any, last: bool = False) -> _Chars:
+        """Get the characters a sequence can start with.
+
+        Args:
+            items: Parsed sequence
+            last: Get the characters it can end with instead
+        """
+        chars = _Chars()
+        for op, av in reversed(items) if last else items:
+            if op in _ZERO_WIDTH:
+                continue
+            if op is sre_constants.SUBPATTERN:
+                chars = chars | self.first_chars(av[-1], last)
+                body = av[-1]
+            elif op is sre_constants.BRANCH:
+                for branch in av[1]:
+                    chars = chars | self.first_chars(branch, last)
+                body = [(op, av)]
+            elif op in _REPEATS:
+                chars = chars | self.first_chars(av[2], last)
+                body = av[2] if av[0] else []
+            else:
+                chars = chars | self.element_chars(op, av)
+                body = [(op, av)]
+            if not self.optional(body):
+                break
+        return chars
+
+    def walk(self, items: Any, follow: Optional[_Chars] = None) -> None:
+        """Check a sequence and everything nested in it.
+
+        Args:
+            items: Parsed sequence
+            follow: Characters that can follow the sequence inside an
+                enclosing unbounded repeat, None outside one
+        """
+        # Unbounded repeats that can still absorb what follows them
+        open_repeats: List[Tuple[_Chars, _Chars]] = []
+
+        for i, (op, av) in enumerate(items):
+            after = None
+            if follow is not None:
+                rest = items[i + 1:]
+                after = self.first_chars(rest) | (follow if self.optional(rest) else _Chars())
+
+            if op in _ZERO_WIDTH:
+                if op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+                    self.walk(av[1])
+                continue
+
+            if op in _REPEATS and av[1] > UNBOUNDED_THRESHOLD:
+                body = av[2]
+                chars = self.chars(body)
+                # Inside another repeat, text this one stops at can be taken
+                # by the next outer iteration instead
+                if after is not None and chars.overlaps(after):
+                    self.warn("nested quantifiers can backtrack exponentially")
+                self._check_alternation(body)
+                if any(ending.overlaps(chars) for _, ending in open_repeats):
+                    self.warn("adjacent quantifiers overlap and can backtrack polynomially")
+                self.walk(body, self.first_chars(body) | (after or _Chars()))
+                if av[0]:
+                    open_repeats = [repeat for repeat in open_repeats if repeat[0].contains(chars)]
+                open_repeats.append((chars, self.first_chars(body, last=True)))
+                continue
+
+            if op in _REPEATS:
+                self.walk(av[2], after)
+            elif op is sre_constants.SUBPATTERN:
+                self.walk(av[-1], after)
+            elif op is sre_constants.BRANCH:
+                for branch in av[1]:
+                    self.walk(branch, after)
+
+            chars = self.element_chars(op, av)
+            open_repeats = [repeat for repeat in open_repeats if repeat[0].contains(chars)]
+
+    def optional(self, items: Any) -> bool:
+        """Check whether a sequence can match the empty string."""
+        for op, av in items:
+            if op in _ZERO_WIDTH or (op in _REPEATS and av[0] == 0):
+                continue
+            if op is sre_constants.SUBPATTERN and self.optional(av[-1]):
+                continue
+            if op is sre_constants.BRANCH and any(self.optional(branch) for branch in av[1]):
+                continue
+            return False
+        return True
+
+    def _check_alternation(self, body: Any, follow: Optional[_Chars] = None) -> None:
+        """Check a repeated body for alternatives that match the same text.
+
+        Args:
+            body: Repeated sequence
+            follow: Characters the next repetition can start with
+        """
+        follow = follow or self.first_chars(body)
+        for i, (op, av) in enumerate(body):
+            if op is sre_constants.SUBPATTERN:
+                self._check_alternation(av[-1], self.first_chars(body[i + 1:]) | follow)
+            elif op is sre_constants.BRANCH:
+                # An empty alternative hands over to what follows; "a|aa" is
+                # parsed as "a(?:|a)"
+                firsts = [
+                    self.first_chars(branch) | (
+                        self.first_chars(body[i + 1:]) | follow if self.optional(branch) else _Chars()
+                    )
+                    for branch in av[1]
+                ]
+                for j, chars in enumerate(firsts):
+                    if any(chars.overlaps(other) for other in firsts[j + 1:]):
+                        self.warn("repeated alternatives overlap and can backtrack exponentially")
+                        return
+
+    def check_leading(self, items: Any) -> None:
+        """Check for a leading wildcard retried at every offset."""
+        for op, av in items:
+            if op in _ZERO_WIDTH:
+                if op is sre_constants.AT:
+                    return
+                continue
+            if op is sre_constants.BRANCH:
+                for branch in av[1]:
+                    self.check_leading(branch)
+            elif op is sre_constants.SUBPATTERN:
+                self.check_leading(av[-1])
+            elif op in _REPEATS and av[1] > UNBOUNDED_THRESHOLD and self.chars(av[2]).broad:
+                self.warn("leading wildcard is retried at every offset, quadratic in line length")
+            return
+
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+_ZERO_WIDTH = {sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT}
+
+def vet_pattern(pattern: str, flags: int = 0) -> List[str]:
+    """Look for constructs that make a pattern backtrack catastrophically.
+
+    Flags nested unbounded quantifiers, repeated alternatives that can
+    match the same text, unbounded quantifiers that can trade characters
+    with each other, and leading wildcards. The check is conservative:
+    some flagged patterns are safe, but they only cost guarded execution.
+
+    Args:
+        pattern: Regular expression
+        flags: Regex flags
+
+    Returns:
+        Warnings, empty if the pattern looks safe
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error as e:
+        return [f"invalid pattern: {e}"]
+
+    vetter = _Vetter(flags | parsed.state.flags)
+    vetter.walk(parsed)
+    vetter.check_leading(parsed)
+    return vetter.warnings
+
+def _match_spans(
+    regex: "re.Pattern",
+    content: str,
+    max_line_length: Optional[int] = None
+) -> Tuple[List[Span], int]:
+    """Find the spans of all matches.
+
+    Args:
+        regex: Compiled pattern
+        content: Content to search
+        max_line_length: Match each line on its own, skipping longer lines
+
+    Returns:
+        Tuple of match spans and number of skipped lines
+    """
+    if max_line_length is None:
+        return [match.span() for match in regex.finditer(content)], 0
+
+    spans = []
+    skipped = 0
+    start = 0
+    length = len(content)
+    while start <= length:
+        end = content.find("\n", start)
+        if end == -1:
+            end = length
+        if end - start > max_line_length:
+            skipped += 1
+        else:
+            spans.extend(match.span() for match in regex.finditer(content, start, end))
+        start = end + 1
+    return spans, skipped
+
+def _worker_main(conn: Any) -> None:
+    """Serve match requests in a worker process.
+
+    Args:
+        conn: Pipe connection to the parent
+    """
+    content = ""
+    compiled: Dict[Tuple[str, int], "re.Pattern"] = {}
+    conn.send("ready")
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+
+        if request[0] == "content":
+            content = request[1]
+            continue
+
+        _, pattern, flags, max_line_length = request
+        try:
+            regex = compiled.get((pattern, flags))
+            if regex is None:
+                regex = compiled[(pattern, flags)] = re.compile(pattern, flags)
+            conn.send(("ok", _match_spans(regex, content, max_line_length)))
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+class RegexWorker:
+    """Worker process running matches that can be killed mid-match.
+
+    The content is sent once and reused for every pattern matched against
+    it. A match exceeding its budget kills the worker; the next request
+    starts a new one.
+    """
+
+    def __init__(self, start_timeout: float = 30.0):
+        """Initialize regex worker.
+
+        Args:
+            start_timeout: Seconds to wait for a new worker to start
+        """
+        self.start_timeout = start_timeout
+        self.starts = 0
+        self.kills = 0
+        self._process: Any = None
+        self._conn: Any = None
+        self._content: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def match(
+        self,
+        pattern: str,
+        flags: int,
+        content: str,
+        timeout: float,
+        max_line_length: Optional[int] = None
+    ) -> Tuple[List[Span], int]:
+        """Find the spans of all matches within a time budget.
+
+        Args:
+            pattern: Regular expression
+            flags: Regex flags
+            content: Content to search
+            timeout: Seconds the match may take
+            max_line_length: Match each line on its own, skipping longer lines
+
+        Returns:
+            Tuple of match spans and number of skipped lines
+
+        Raises:
+            RegexTimeout: If the match did not finish in time
+        """
+        with self._lock:
+            if self._process is None or not self._process.is_alive():
+                self._start()
+
+            if self._content is not content:
+                self._conn.send(("content", content))
+                self._content = content
+
+            self._conn.send(("match", pattern, flags, max_line_length))
+            if not self._conn.poll(timeout):
+                self._kill()
+                raise RegexTimeout(f"Match exceeded {timeout:.2f}s")
+
+            status, result = self._conn.recv()
+            if status == "error":
+                raise re.error(result)
+            return result
+
+    async def match_async(
+        self,
+        pattern: str,
+        flags: int,
+        content: str,
+        timeout: float,
+        max_line_length: Optional[int] = None
+    ) -> Tuple[List[Span], int]:
+        """Find the spans of all matches without blocking the event loop.
+
+        Waiting for the worker runs on the default executor.
+
+        Args:
+            pattern: Regular expression
+            flags: Regex flags
+            content: Content to search
+            timeout: Seconds the match may take
+            max_line_length: Match each line on its own, skipping longer lines
+
+        Returns:
+            Tuple of match spans and number of skipped lines
+
+        Raises:
+            RegexTimeout: If the match did not finish in time
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            self.match,
+            pattern,
+            flags,
+            content,
+            timeout,
+            max_line_length
+        )
+
+    def _start(self) -> None:
+        """Start a worker process and wait until it is ready."""
+        self._kill()
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self._process.start()
+        child_conn.close()
+        self.starts += 1
+
+        if not self._conn.poll(self.start_timeout) or self._conn.recv() != "ready":
+            self._kill()
+            raise RuntimeError("Regex worker failed to start")
+
+    def _kill(self) -> None:
+        """Kill the worker process."""
+        self._content = None
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.kill()
+                self.kills += 1
+            self._process.join()
+            self._process = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def close(self) -> None:
+        """Stop the worker process."""
+        with self._lock:
+            self._kill()
+
+_worker: Optional[RegexWorker] = None
+_worker_lock = threading.Lock()
+
+def get_worker() -> RegexWorker:
+    """Get the regex worker shared by this process.
+
+    Returns:
+        Regex worker
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = RegexWorker()
+        return _worker
+
+def _compile_linear(pattern: str, flags: int) -> Any:
+    """Compile a pattern with the linear-time ``re2`` engine if installed.
+
+    Args:
+        pattern: Regular expression
+        flags: Regex flags
+
+    Returns:
+        Compiled pattern, or None if re2 is missing or rejects the pattern
+    """
+    if re2 is None:
+        return None
+
+    inline = "".join(
+        letter for flag, letter in (
+            (re.IGNORECASE, "i"),
+            (re.MULTILINE, "m"),
+            (re.DOTALL, "s")
+        )
+        if flags & flag
+    )
+    try:
+        return re2.compile(f"(?{inline}){pattern}" if inline else pattern)
+    except Exception:
+        # Back references and lookarounds are not supported
+        return None
+
+class SafePattern:
+    """Regular expression guarded against catastrophic backtracking.
+
+    Patterns that pass ``vet_pattern`` run on ``re`` directly. Flagged
+    patterns run on re2 when it is installed and accepts them, and
+    otherwise in the shared worker process under a time budget. A match
+    over budget is retried line by line with over-long lines skipped, and
+    if that is also over budget the pattern reports no matches for the
+    content.
+    """
+
+    def __init__(
+        self,
+        pattern: str,
+        flags: int = 0,
+        timeout: float = 1.0,
+        max_line_length: int = 10000,
+        engine: str = "auto"
+    ):
+        """Initialize safe pattern.
+
+        Args:
+            pattern: Regular expression
+            flags: Regex flags
+            timeout: Seconds a guarded match may take
+            max_line_length: Longest line matched by the line-bounded
+                fallback
+            engine: "auto" to prefer re2, "worker" to always use the
+                worker process for flagged patterns, or "re" to run every
+                pattern unguarded
+
+        Raises:
+            re.error: If the pattern is invalid
+        """
+        self.pattern = pattern
+        self.flags = flags
+        self.timeout = timeout
+        self.max_line_length = max_line_length
+        self.regex = re.compile(pattern, flags)
+        self.warnings = vet_pattern(pattern, flags)
+        self.linear = _compile_linear(pattern, flags) if engine == "auto" and self.warnings else None
+        self.guarded = bool(self.warnings) and engine != "re" and self.linear is None
+        self.timed_out = False
+
+        # Metrics
+        self.timeouts = 0
+        self.fallbacks = 0
+        self.skipped_lines = 0
+
+    def spans(self, content: str) -> List[Span]:
+        """Find the spans of all matches.
+
+        Args:
+            content: Content to search
+
+        Returns:
+            Match spans, possibly only those on lines matched in time
+        """
+        self.timed_out = False
+        if self.linear is not None:
+            return [match.span() for match in self.linear.finditer(content)]
+        if not self.guarded:
+            return [match.span() for match in self.regex.finditer(content)]
+
+        worker = get_worker()
+        try:
+            return worker.match(self.pattern, self.flags, content, self.timeout)[0]
+        except RegexTimeout:
+            self.timeouts += 1
+            logger.warning(f"Pattern {self.pattern!r} timed out, matching line by line")
+
+        self.fallbacks += 1
+        try:
+            spans, skipped = worker.match(
+                self.pattern,
+                self.flags,
+                content,
+                self.timeout,
+                self.max_line_length
+            )
+            self.skipped_lines += skipped
+            return spans
+        except RegexTimeout:
+            self.timeouts += 1
+            self.timed_out = True
+            logger.warning(f"Pattern {self.pattern!r} timed out line by line, skipping content")
+            return []
+
+    async def spans_async(self, content: str) -> List[Span]:
+        """Find the spans of all matches without blocking the event loop.
+
+        Guarded patterns wait for the worker process, for up to twice the
+        timeout, so they run on the default executor; others run inline.
+
+        Args:
+            content: Content to search
+
+        Returns:
+            Match spans, possibly only those on lines matched in time
+        """
+        if not self.guarded:
+            return self.spans(content)
+        return await asyncio.get_running_loop().run_in_executor(None, self.spans, content)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get pattern metrics.
+
+        Returns:
+            Dictionary of pattern metrics
+        """
+        return {
+            "pattern": self.pattern,
+            "warnings": self.warnings,
+            "engine": "re2" if self.linear is not None else "worker" if self.guarded else "re",
+            "timeouts": self.timeouts,
+            "fallbacks": self.fallbacks,
+            "skipped_lines": self.skipped_lines
+        }
+
+def create_safe_pattern(pattern: str, flags: int = 0, config: Optional[Dict[str, Any]] = None) -> SafePattern:
+    """Create a safe pattern from a regex_safety configuration section.
+
+    Args:
+        pattern: Regular expression
+        flags: Regex flags
+        config: Optional regex safety configuration
+
+    Returns:
+        Safe pattern
+    """
+    config = config or {}
+    return SafePattern(
+        pattern,
+        flags,
+        timeout=config.get("timeout_ms", 1000) / 1000,
+        max_line_length=config.get("max_line_length", 10000),
+        engine=config.get("engine", "auto")
+    )
@@ -0,0 +1,179 @@
+"""
+Lazy registry of domain plugins.
+"""
+import importlib
+import logging
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger("registry")
+
+# Entry point group third-party packages register domain sniffers under
+SNIFFER_ENTRY_POINT_GROUP = "sniffing.domains"
+
+BUILTIN_SNIFFERS = {
+    "security": "sniffing.domains.security.security_sniffer:SecuritySniffer",
+    "browser": "sniffing.domains.browser.browser_sniffer:BrowserSniffer",
+    "functional": "sniffing.domains.functional.functional_sniffer:FunctionalSniffer",
+    "unit": "sniffing.domains.unit.unit_sniffer:UnitSniffer",
+    "documentation": "sniffing.domains.documentation.documentation_sniffer:DocumentationSniffer"
+}
+
+class PluginRegistry:
+    """Registry of plugins addressed by name and imported on first use.
+
+    Plugins are registered as ``"module:attribute"`` references, so listing
+    or configuring them imports nothing; a plugin's module, and whatever
+    heavy dependencies it pulls in, is only imported when the plugin is
+    loaded. Plugins published under the registry's entry point group are
+    discovered the first time a name is not found among the registered ones.
+    """
+
+    def __init__(self, group: Optional[str] = None, plugins: Optional[Dict[str, str]] = None):
+        """Initialize plugin registry.
+
+        Args:
+            group: Optional entry point group to discover plugins from
+            plugins: Mapping of name to "module:attribute" reference
+        """
+        self.group = group
+        self._references: Dict[str, Union[str, Any]] = dict(plugins or {})
+        self._loaded: Dict[str, Any] = {}
+        self._discovered = group is None
+
+    def register(self, name: str, plugin: Union[str, Any]) -> None:
+        """Register a plugin.
+
+        Args:
+            name: Plugin name
+            plugin: "module:attribute" reference or the plugin itself
+        """
+        self._references[name] = plugin
+        self._loaded.pop(name, None)
+
+    def names(self) -> List[str]:
+        """Get the names of all known plugins.
+
+        Returns:
+            Plugin names
+        """
+        self._discover()
+        return list(self._references)
+
+    def __contains__(self, name: str) -> bool:
+        if name not in self._references:
+            self._discover()
+        return name in self._references
+
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a plugin has been imported.
+
+        Args:
+            name: Plugin name
+
+        Returns:
+            True if the plugin has been loaded
+        """
+        return name in self._loaded
+
+    def load(self, name: str) -> Any:
+        """Load a plugin, importing its module on first use.
+
+        Args:
+            name: Plugin name
+
+        Returns:
+            The plugin
+
+        Raises:
+            KeyError: If no plugin is registered under the name
+        """
+        if name in self._loaded:
+            return self._loaded[name]
+
+        if name not in self:
+            raise KeyError(f"Unknown plugin: {name}")
+
+        reference = self._references[name]
+        if isinstance(reference, str):
+            module_name, _, attribute = reference.partition(":")
+            plugin = importlib.import_module(module_name)
+            for part in attribute.split(".") if attribute else []:
+                plugin = getattr(plugin, part)
+        else:
+            plugin = reference
+
+        self._loaded[name] = plugin
+        return plugin
+
+    def _discover(self) -> None:
+        """Register plugins published under the entry point group, once."""
+        if self._discovered:
+            return
+        self._discovered = True
+
+        try:
+            # Deferred, importlib.metadata is slow to import
+            from importlib.metadata import entry_points
+
+            for entry_point in entry_points(group=self.group):
+                self._references.setdefault(entry_point.name, entry_point.value)
+
+        except Exception as e:
+            logger.error(f"Error discovering {self.group} plugins: {e}")
+
+class LazySniffers(Mapping):
+    """Mapping of domain to sniffer, instantiated on first access.
+
+    Iterating lists the configured domains without importing anything;
+    looking up a domain imports and constructs its sniffer once.
+    """
+
+    def __init__(self, configs: Dict[str, Dict[str, Any]], registry: Optional[PluginRegistry] = None):
+        """Initialize lazy sniffers.
+
+        Args:
+            configs: Mapping of domain to sniffer configuration
+            registry: Sniffer registry, the built-in registry if not given
+        """
+        self.registry = registry or SNIFFERS
+        self.configs = configs
+        self._domains = [domain for domain in configs if domain in self.registry]
+        self._instances: Dict[str, Any] = {}
+
+    def __getitem__(self, domain: str) -> Any:
+        if domain not in self._instances:
+            if domain not in self._domains:
+                raise KeyError(domain)
+            sniffer_class = self.registry.load(domain)
+            self._instances[domain] = sniffer_class(self.configs[domain])
+        return self._instances[domain]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._domains)
+
+    def __len__(self) -> int:
+        return len(self._domains)
+
+    def spec(self, domain: str) -> Tuple[type, Dict[str, Any]]:
+        """Get the sniffer class and configuration of a domain.
+
+        Args:
+            domain: Domain name
+
+        Returns:
+            Tuple of sniffer class and configuration
+        """
+        if domain not in self._domains:
+            raise KeyError(domain)
+        return self.registry.load(domain), self.configs[domain]
+
+    def loaded(self) -> Dict[str, Any]:
+        """Get the sniffers constructed so far.
+
+        Returns:
+            Mapping of domain to sniffer
+        """
+        return dict(self._instances)
+
+SNIFFERS = PluginRegistry(SNIFFER_ENTRY_POINT_GROUP, BUILTIN_SNIFFERS)
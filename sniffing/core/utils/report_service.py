@@ -0,0 +1,194 @@
+"""
+Report storage with on-demand, cached rendering of derived formats.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("report_service")
+
+# Renders a report dictionary as text
+Renderer = Callable[[Dict[str, Any]], Awaitable[str]]
+
+class ReportService:
+    """Stores canonical report artifacts and renders other formats lazily.
+
+    Only the JSON artifact is written when a report is stored. HTML, CSV
+    and PDF are rendered the first time they are requested and cached under
+    the hash of the JSON artifact, so identical reports share renders and a
+    report that is never opened costs nothing beyond its JSON. PDF rendering
+    runs in a worker process pool to keep it off the event loop.
+    """
+
+    FORMATS = ("json", "html", "csv", "pdf")
+
+    def __init__(
+        self,
+        report_dir: Path,
+        renderers: Dict[str, Renderer],
+        pdf_workers: int = 1
+    ):
+        """Initialize report service.
+
+        Args:
+            report_dir: Directory holding one subdirectory per format
+            renderers: Text renderers keyed by format; PDF is rendered from
+                the "html" renderer's output
+            pdf_workers: Number of PDF rendering processes
+        """
+        self.report_dir = Path(report_dir)
+        self.renderers = renderers
+        self.pdf_workers = max(1, pdf_workers)
+        self.renders = 0
+        self.cache_hits = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    def store(self, job_id: str, report: Dict[str, Any]) -> Path:
+        """Store the canonical JSON artifact of a report.
+
+        Args:
+            job_id: Job identifier
+            report: Report to store
+
+        Returns:
+            Path of the JSON artifact
+        """
+        path = self.report_dir / "json" / f"{job_id}.json"
+        _write_atomic(path, json.dumps(report, indent=2, default=str).encode())
+        return path
+
+    async def render(self, job_id: str, format: str) -> Path:
+        """Get a report in a format, rendering it if not cached.
+
+        Args:
+            job_id: Job identifier
+            format: One of "json", "html", "csv" or "pdf"
+
+        Returns:
+            Path of the rendered report
+
+        Raises:
+            ValueError: If the format is not supported
+            FileNotFoundError: If no report was stored for the job
+        """
+        if format not in self.FORMATS:
+            raise ValueError(f"Unsupported report format: {format}")
+
+        source = self.report_dir / "json" / f"{job_id}.json"
+        data = source.read_bytes()
+        if format == "json":
+            return source
+
+        digest = hashlib.sha256(data).hexdigest()
+        output = self.report_dir / format / f"{digest}.{format}"
+        if output.exists():
+            self.cache_hits += 1
+            return output
+
+        # Concurrent requests for the same render share one render
+        key = (digest, format)
+        if key not in self._pending:
+            self._pending[key] = asyncio.ensure_future(
+                self._render(json.loads(data), format, output)
+            )
+            self._pending[key].add_done_callback(lambda _: self._pending.pop(key, None))
+
+        return await asyncio.shield(self._pending[key])
+
+    async def _render(
+        self,
+        report: Dict[str, Any],
+        format: str,
+        output: Path
+    ) -> Path:
+        """Render a report and write it to the cache.
+
+        Args:
+            report: Report to render
+            format: Format to render
+            output: Cache path
+
+        Returns:
+            Cache path
+        """
+        if format == "pdf":
+            html = await self.renderers["html"](report)
+            content = await asyncio.get_running_loop().run_in_executor(
+                self._get_pool(),
+                _render_pdf,
+                html
+            )
+        else:
+            content = (await self.renderers[format](report)).encode()
+
+        _write_atomic(output, content)
+        self.renders += 1
+        return output
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Get the PDF rendering pool, starting it on first use.
+
+        Returns:
+            Process pool
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.pdf_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    async def shutdown(self) -> None:
+        """Shut down the PDF rendering pool."""
+        try:
+            if self._pool is not None:
+                pool, self._pool = self._pool, None
+                await asyncio.get_running_loop().run_in_executor(None, pool.shutdown)
+
+        except Exception as e:
+            logger.error(f"Error shutting down report service: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get rendering statistics.
+
+        Returns:
+            Dictionary of rendering statistics
+        """
+        return {
+            "renders": self.renders,
+            "cache_hits": self.cache_hits,
+            "pending": len(self._pending),
+            "pdf_workers": self.pdf_workers
+        }
+
+def _render_pdf(html: str) -> bytes:
+    """Render HTML to PDF in a worker process.
+
+    Args:
+        html: HTML document
+
+    Returns:
+        PDF bytes
+    """
+    from weasyprint import HTML
+    return HTML(string=html).write_pdf()
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    """Write a file so readers never see it partially written.
+
+    Args:
+        path: Path to write
+        content: File content
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
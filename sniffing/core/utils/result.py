@@ -155,20 +155,38 @@ class SniffingResult:
         with open(path) as f:
             data = json.load(f)
 
-        # Convert timestamps back to datetime
-        data["created_at"] = datetime.fromisoformat(data["created_at"])
-        data["updated_at"] = datetime.fromisoformat(data["updated_at"])
+        return cls.from_dict(data)
 
-        # Create result object
+    @classmethod
+    def from_dict(
+        cls,
+        data: Dict[str, Any],
+        file: Optional[str] = None
+    ) -> "SniffingResult":
+        """Create result from its dictionary representation.
+
+        Args:
+            data: Dictionary produced by ``to_dict``
+            file: Optional path to attribute the result and its issues to,
+                e.g. when reusing a cached result for identical content
+
+        Returns:
+            SniffingResult object
+        """
         result = cls(
-            file=data["file"],
+            file=file or data["file"],
             sniffer_type=data["sniffer_type"],
             status=data["status"]
         )
         result.issues = data["issues"]
         result.metrics = data["metrics"]
-        result.created_at = data["created_at"]
-        result.updated_at = data["updated_at"]
+        result.created_at = datetime.fromisoformat(data["created_at"])
+        result.updated_at = datetime.fromisoformat(data["updated_at"])
+
+        if file:
+            for issue in result.issues:
+                if "file" in issue:
+                    issue["file"] = file
 
         return result
 
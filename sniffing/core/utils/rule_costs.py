@@ -0,0 +1,303 @@
+"""
+Per-rule cost accounting for sniffer rules.
+"""
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from .metrics import MetricsCollector
+
+logger = logging.getLogger("rule_costs")
+
+@dataclass
+class RuleCost:
+    """Accumulated cost of one rule."""
+    rule: str
+    runs: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    matches: int = 0
+    bytes_scanned: int = 0
+    over_budget: int = 0
+    last_seconds: float = 0.0
+    last_matches: int = 0
+    last_bytes: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert cost to dictionary.
+
+        Returns:
+            Cost with mean time and scan throughput
+        """
+        data = asdict(self)
+        data["mean_seconds"] = self.seconds / self.runs if self.runs else 0.0
+        data["bytes_per_second"] = self.bytes_scanned / self.seconds if self.seconds else 0.0
+        return data
+
+class RuleRun:
+    """One run of a rule over one file, timed as a context manager."""
+
+    __slots__ = ("tracker", "rule", "bytes_scanned", "matches", "_start")
+
+    def __init__(self, tracker: "RuleCostTracker", rule: str, bytes_scanned: int):
+        """Initialize rule run.
+
+        Args:
+            tracker: Tracker the run is recorded in
+            rule: Rule name
+            bytes_scanned: Size of the scanned content
+        """
+        self.tracker = tracker
+        self.rule = rule
+        self.bytes_scanned = bytes_scanned
+        self.matches = 0
+        self._start = 0.0
+
+    def __enter__(self) -> "RuleRun":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.tracker.record(
+            self.rule,
+            time.perf_counter() - self._start,
+            self.matches,
+            self.bytes_scanned
+        )
+
+class RuleCostTracker:
+    """Records the time, matches and bytes scanned of each rule run.
+
+    A run is one rule evaluated over one file. Costs accumulate per rule so
+    the slowest rules can be ranked, and are also recorded in the "rule"
+    latency series of a metrics collector when one is given. With a time
+    budget, a rule exceeding it on ``quarantine_after`` runs is quarantined:
+    scanners stop running it until it is released, so one backtracking
+    pattern cannot keep making every file slow.
+
+    Scanners may run on executor threads, so recording is locked.
+    """
+
+    def __init__(
+        self,
+        domain: str = "",
+        budget: Optional[float] = None,
+        quarantine_after: int = 3,
+        sample_every: int = 20,
+        metrics: Optional[MetricsCollector] = None
+    ):
+        """Initialize rule cost tracker.
+
+        Args:
+            domain: Domain the rules belong to
+            budget: Optional seconds a rule may take on one file
+            quarantine_after: Over-budget runs before a rule is quarantined
+            sample_every: Scans between the per-rule profiles of scanners
+                that otherwise run rules combined
+            metrics: Optional collector receiving rule latencies
+        """
+        self.domain = domain
+        self.budget = budget
+        self.quarantine_after = max(1, quarantine_after)
+        self.sample_every = max(1, sample_every)
+        self.metrics = metrics
+        self.costs: Dict[str, RuleCost] = {}
+        self.quarantined: Dict[str, Dict[str, Any]] = {}
+        self.quarantine_version = 0
+        self._scans = 0
+        self._lock = threading.RLock()
+
+    def measure(self, rule: str, bytes_scanned: int) -> RuleRun:
+        """Time one run of a rule.
+
+        Args:
+            rule: Rule name
+            bytes_scanned: Size of the scanned content
+
+        Returns:
+            Run to use as a context manager, counting matches in ``matches``
+        """
+        return RuleRun(self, rule, bytes_scanned)
+
+    def record(self, rule: str, seconds: float, matches: int, bytes_scanned: int) -> None:
+        """Record one run of a rule.
+
+        Args:
+            rule: Rule name
+            seconds: Time taken
+            matches: Number of matches found
+            bytes_scanned: Size of the scanned content
+        """
+        over_budget = self.budget is not None and seconds > self.budget
+        with self._lock:
+            cost = self.costs.get(rule)
+            if cost is None:
+                cost = self.costs[rule] = RuleCost(rule)
+
+            cost.runs += 1
+            cost.seconds += seconds
+            cost.matches += matches
+            cost.bytes_scanned += bytes_scanned
+            cost.last_seconds = seconds
+            cost.last_matches = matches
+            cost.last_bytes = bytes_scanned
+            if seconds > cost.max_seconds:
+                cost.max_seconds = seconds
+
+            if over_budget:
+                cost.over_budget += 1
+                if cost.over_budget >= self.quarantine_after and rule not in self.quarantined:
+                    self.quarantine(
+                        rule,
+                        f"{cost.over_budget} runs over the {self.budget * 1000:.0f}ms budget, "
+                        f"slowest {cost.max_seconds * 1000:.0f}ms"
+                    )
+
+        if self.metrics is not None:
+            self.metrics.histogram("rule", self.domain, rule).record(
+                int(seconds * 1e9),
+                success=not over_budget
+            )
+
+    def should_profile(self) -> bool:
+        """Count a scan and check whether it should profile rules one by one.
+
+        Returns:
+            True for every ``sample_every``-th scan, starting with the first
+        """
+        with self._lock:
+            self._scans += 1
+            return (self._scans - 1) % self.sample_every == 0
+
+    def is_quarantined(self, rule: str) -> bool:
+        """Check whether a rule is quarantined.
+
+        Args:
+            rule: Rule name
+
+        Returns:
+            True if the rule should not be run
+        """
+        return rule in self.quarantined
+
+    def quarantine(self, rule: str, reason: str) -> None:
+        """Stop running a rule.
+
+        Args:
+            rule: Rule name
+            reason: Why the rule is quarantined
+        """
+        with self._lock:
+            self.quarantined[rule] = {"reason": reason, "since": time.time()}
+            self.quarantine_version += 1
+        logger.warning(f"Quarantined {self.domain} rule {rule}: {reason}")
+
+    def release(self, rule: str) -> None:
+        """Run a quarantined rule again.
+
+        Args:
+            rule: Rule name
+        """
+        with self._lock:
+            released = self.quarantined.pop(rule, None) is not None
+            if released:
+                cost = self.costs.get(rule)
+                if cost is not None:
+                    cost.over_budget = 0
+                self.quarantine_version += 1
+        if released:
+            logger.info(f"Released {self.domain} rule {rule}")
+
+    def report(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Rank the rules by total time taken.
+
+        Args:
+            limit: Maximum number of rules, 0 for all
+
+        Returns:
+            Rule costs, slowest first
+        """
+        with self._lock:
+            costs = sorted(self.costs.values(), key=lambda cost: cost.seconds, reverse=True)
+        if limit:
+            costs = costs[:limit]
+
+        report = []
+        for cost in costs:
+            data = cost.to_dict()
+            data["quarantined"] = cost.rule in self.quarantined
+            report.append(data)
+        return report
+
+    def format_report(self, limit: int = 10) -> str:
+        """Format the slowest rules as a table.
+
+        Args:
+            limit: Maximum number of rules, 0 for all
+
+        Returns:
+            Report text
+        """
+        lines = [
+            f"{'rule':<40} {'runs':>7} {'total ms':>10} {'mean ms':>9} "
+            f"{'max ms':>9} {'matches':>8} {'MB/s':>8}"
+        ]
+        for cost in self.report(limit):
+            flag = " (quarantined)" if cost["quarantined"] else ""
+            lines.append(
+                f"{cost['rule']:<40} {cost['runs']:>7} {cost['seconds'] * 1000:>10.1f} "
+                f"{cost['mean_seconds'] * 1000:>9.2f} {cost['max_seconds'] * 1000:>9.2f} "
+                f"{cost['matches']:>8} {cost['bytes_per_second'] / 1e6:>8.1f}{flag}"
+            )
+        return "\n".join(lines)
+
+    def get_metrics(self, limit: int = 10) -> Dict[str, Any]:
+        """Get rule cost metrics.
+
+        Args:
+            limit: Maximum number of slowest rules
+
+        Returns:
+            Dictionary of rule cost metrics
+        """
+        with self._lock:
+            seconds = sum(cost.seconds for cost in self.costs.values())
+        return {
+            "rules": len(self.costs),
+            "seconds": seconds,
+            "budget": self.budget,
+            "quarantined": dict(self.quarantined),
+            "slowest": self.report(limit)
+        }
+
+    def reset(self) -> None:
+        """Forget recorded costs, keeping quarantined rules."""
+        with self._lock:
+            self.costs.clear()
+            self._scans = 0
+
+def create_rule_cost_tracker(
+    config: Dict[str, Any],
+    domain: str = "",
+    metrics: Optional[MetricsCollector] = None
+) -> RuleCostTracker:
+    """Create a rule cost tracker from a rule_costs configuration section.
+
+    Args:
+        config: Rule cost configuration
+        domain: Domain the rules belong to
+        metrics: Optional collector receiving rule latencies
+
+    Returns:
+        Rule cost tracker
+    """
+    budget_ms = config.get("budget_ms")
+    return RuleCostTracker(
+        domain=domain,
+        budget=budget_ms / 1000 if budget_ms else None,
+        quarantine_after=config.get("quarantine_after", 3),
+        sample_every=config.get("sample_every", 20),
+        metrics=metrics
+    )
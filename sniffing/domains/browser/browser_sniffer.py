@@ -4,9 +4,11 @@ Enhanced browser sniffer for cross-browser testing, accessibility checks, and pe
 import logging
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Optional, Set, Tuple
 
 from ...core.base.base_sniffer import BaseSniffer
+from ...core.utils.file_context import FileContext
+from ...core.utils.line_index import LineIndex
 from ...core.utils.result import SniffingResult
 
 logger = logging.getLogger("browser_sniffer")
@@ -142,11 +144,12 @@ class BrowserSniffer(BaseSniffer):
             logger.error(f"Error loading AI browser model: {e}")
             return None
 
-    async def _sniff_file_impl(self, file: str) -> SniffingResult:
+    async def _sniff_file_impl(self, file: str, context: FileContext) -> SniffingResult:
         """Implementation of file sniffing logic.
 
         Args:
             file: Path to the file to sniff.
+            context: File context shared with other domains.
 
         Returns:
             SniffingResult object
@@ -155,14 +158,14 @@ class BrowserSniffer(BaseSniffer):
             # Create result
             result = SniffingResult(file, self.get_sniffer_type())
 
-            # Read file content
-            with open(file, "r") as f:
-                content = f.read()
+            # Get shared file content
+            content = context.text
+            line_index = context.line_index
 
             # Run browser checks
-            await self._check_browser_compatibility(content, result)
-            await self._check_accessibility(content, result)
-            await self._check_performance(content, result)
+            await self._check_browser_compatibility(content, result, line_index)
+            await self._check_accessibility(content, result, line_index)
+            await self._check_performance(content, result, line_index)
             await self._run_ai_browser_analysis(content, result)
 
             # Update status
@@ -174,14 +177,23 @@ class BrowserSniffer(BaseSniffer):
             logger.error(f"Error sniffing file {file}: {e}")
             return SniffingResult(file, self.get_sniffer_type(), status=False)
 
-    async def _check_browser_compatibility(self, content: str, result: SniffingResult) -> None:
+    async def _check_browser_compatibility(
+        self,
+        content: str,
+        result: SniffingResult,
+        line_index: Optional[LineIndex] = None
+    ) -> None:
         """Check for browser compatibility issues.
 
         Args:
             content: File content to check
             result: SniffingResult to update
+            line_index: Optional line index for content
         """
         try:
+            if line_index is None:
+                line_index = LineIndex(content)
+
             for check_type, check_info in self.browser_checks.items():
                 matches = re.finditer(check_info["pattern"], content, re.MULTILINE)
                 for match in matches:
@@ -190,7 +202,7 @@ class BrowserSniffer(BaseSniffer):
                         "subtype": check_type,
                         "severity": check_info["severity"],
                         "description": check_info["description"],
-                        "line": content.count("\n", 0, match.start()) + 1,
+                        "line": line_index.line_of(match.start()),
                         "code": match.group(0).strip(),
                         "fix_suggestion": check_info["fix_template"]
                     }
@@ -208,14 +220,23 @@ class BrowserSniffer(BaseSniffer):
         except Exception as e:
             logger.error(f"Error checking browser compatibility: {e}")
 
-    async def _check_accessibility(self, content: str, result: SniffingResult) -> None:
+    async def _check_accessibility(
+        self,
+        content: str,
+        result: SniffingResult,
+        line_index: Optional[LineIndex] = None
+    ) -> None:
         """Check for accessibility issues.
 
         Args:
             content: File content to check
             result: SniffingResult to update
+            line_index: Optional line index for content
         """
         try:
+            if line_index is None:
+                line_index = LineIndex(content)
+
             for check_type, check_info in self.accessibility_checks.items():
                 matches = re.finditer(check_info["pattern"], content, re.MULTILINE)
                 for match in matches:
@@ -224,7 +245,7 @@ class BrowserSniffer(BaseSniffer):
                         "subtype": check_type,
                         "severity": check_info["severity"],
                         "description": check_info["description"],
-                        "line": content.count("\n", 0, match.start()) + 1,
+                        "line": line_index.line_of(match.start()),
                         "code": match.group(0).strip(),
                         "wcag": check_info["wcag"],
                         "fix_suggestion": check_info["fix_template"]
@@ -243,14 +264,23 @@ class BrowserSniffer(BaseSniffer):
         except Exception as e:
             logger.error(f"Error checking accessibility: {e}")
 
-    async def _check_performance(self, content: str, result: SniffingResult) -> None:
+    async def _check_performance(
+        self,
+        content: str,
+        result: SniffingResult,
+        line_index: Optional[LineIndex] = None
+    ) -> None:
         """Check for performance issues.
 
         Args:
             content: File content to check
             result: SniffingResult to update
+            line_index: Optional line index for content
         """
         try:
+            if line_index is None:
+                line_index = LineIndex(content)
+
             for check_type, check_info in self.performance_checks.items():
                 matches = re.finditer(check_info["pattern"], content, re.MULTILINE)
                 for match in matches:
@@ -259,7 +289,7 @@ class BrowserSniffer(BaseSniffer):
                         "subtype": check_type,
                         "severity": check_info["severity"],
                         "description": check_info["description"],
-                        "line": content.count("\n", 0, match.start()) + 1,
+                        "line": line_index.line_of(match.start()),
                         "code": match.group(0).strip(),
                         "fix_suggestion": check_info["fix_template"]
                     }
@@ -308,54 +338,6 @@ class BrowserSniffer(BaseSniffer):
         except Exception as e:
             logger.error(f"Error running AI browser analysis: {e}")
 
-    async def _apply_fixes(self, suggestions: List[Dict[str, Any]]) -> bool:
-        """Apply fix suggestions to issues.
-
-        Args:
-            suggestions: List of fix suggestions from AI
-
-        Returns:
-            True if all fixes were applied successfully, False otherwise
-        """
-        try:
-            success = True
-            for suggestion in suggestions:
-                # Get file content
-                with open(suggestion["file"], "r") as f:
-                    content = f.read()
-
-                # Apply fix
-                if suggestion.get("fix_type") == "replace":
-                    content = content.replace(
-                        suggestion["old_code"],
-                        suggestion["new_code"]
-                    )
-                elif suggestion.get("fix_type") == "insert":
-                    lines = content.splitlines()
-                    lines.insert(
-                        suggestion["line"] - 1,
-                        suggestion["code"]
-                    )
-                    content = "\n".join(lines)
-                else:
-                    logger.warning(f"Unknown fix type: {suggestion.get('fix_type')}")
-                    success = False
-                    continue
-
-                # Write fixed content
-                with open(suggestion["file"], "w") as f:
-                    f.write(content)
-
-                # Validate fix
-                if not await self._validate_fix(suggestion, content):
-                    success = False
-
-            return success
-
-        except Exception as e:
-            logger.error(f"Error applying fixes: {e}")
-            return False
-
     async def _validate_fix(self, suggestion: Dict[str, Any], content: str) -> bool:
         """Validate that a fix was successful.
 
@@ -5,9 +5,11 @@ import ast
 import logging
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Optional, Set, Tuple
 
 from ...core.base.base_sniffer import BaseSniffer
+from ...core.utils.file_context import FileContext
+from ...core.utils.line_index import LineIndex
 from ...core.utils.result import SniffingResult
 
 logger = logging.getLogger("documentation_sniffer")
@@ -150,11 +152,12 @@ class DocumentationSniffer(BaseSniffer):
             logger.error(f"Error loading AI doc model: {e}")
             return None
 
-    async def _sniff_file_impl(self, file: str) -> SniffingResult:
+    async def _sniff_file_impl(self, file: str, context: FileContext) -> SniffingResult:
         """Implementation of file sniffing logic.
 
         Args:
             file: Path to the file to sniff.
+            context: File context shared with other domains.
 
         Returns:
             SniffingResult object
@@ -163,14 +166,14 @@ class DocumentationSniffer(BaseSniffer):
             # Create result
             result = SniffingResult(file, self.get_sniffer_type())
 
-            # Read file content
-            with open(file, "r") as f:
-                content = f.read()
+            # Get shared file content
+            content = context.text
+            line_index = context.line_index
 
             # Run documentation checks
             if file.endswith(".py"):
-                await self._check_docstrings(content, result)
-                await self._check_api_docs(content, result)
+                await self._check_docstrings(content, result, context)
+                await self._check_api_docs(content, result, line_index)
             elif file.lower() == "readme.md":
                 await self._check_readme(content, result)
 
@@ -185,65 +188,26 @@ class DocumentationSniffer(BaseSniffer):
             logger.error(f"Error sniffing file {file}: {e}")
             return SniffingResult(file, self.get_sniffer_type(), status=False)
 
-    async def _check_docstrings(self, content: str, result: SniffingResult) -> None:
+    async def _check_docstrings(
+        self,
+        content: str,
+        result: SniffingResult,
+        context: Optional[FileContext] = None
+    ) -> None:
         """Check Python docstrings.
 
         Args:
             content: File content to check
             result: SniffingResult to update
+            context: Optional file context providing the parsed AST
         """
         try:
             # Parse code into AST
-            tree = ast.parse(content)
-
-            # Check module docstring
-            if not ast.get_docstring(tree):
-                result.add_issue({
-                    "type": "docstring",
-                    "subtype": "module_docstring",
-                    "severity": "high",
-                    "description": "Missing module docstring",
-                    "fix_suggestion": "Add module-level docstring"
-                })
+            tree = context.tree if context else ast.parse(content)
 
-            # Check class and function docstrings
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
-                    docstring = ast.get_docstring(node)
-                    if not docstring:
-                        result.add_issue({
-                            "type": "docstring",
-                            "subtype": f"{node.__class__.__name__.lower()}_docstring",
-                            "severity": "high",
-                            "description": f"Missing {node.__class__.__name__.lower()} docstring",
-                            "line": node.lineno,
-                            "name": node.name,
-                            "fix_suggestion": f"Add {node.__class__.__name__.lower()}-level docstring"
-                        })
-                    else:
-                        # Check docstring sections
-                        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                            if node.args.args and "Args:" not in docstring:
-                                result.add_issue({
-                                    "type": "docstring",
-                                    "subtype": "args_docstring",
-                                    "severity": "medium",
-                                    "description": "Missing Args section",
-                                    "line": node.lineno,
-                                    "name": node.name,
-                                    "fix_suggestion": "Add Args section to docstring"
-                                })
-
-                            if "Returns:" not in docstring and not isinstance(node.returns, ast.Constant):
-                                result.add_issue({
-                                    "type": "docstring",
-                                    "subtype": "returns_docstring",
-                                    "severity": "medium",
-                                    "description": "Missing Returns section",
-                                    "line": node.lineno,
-                                    "name": node.name,
-                                    "fix_suggestion": "Add Returns section to docstring"
-                                })
+            # Check module, class and function docstrings
+            with self.rule_costs.measure("docstring.ast", len(content)) as run:
+                run.matches = self._check_docstring_nodes(tree, result)
 
             # Run AI docstring analysis
             if self.ai_doc_model:
@@ -257,6 +221,69 @@ class DocumentationSniffer(BaseSniffer):
         except Exception as e:
             logger.error(f"Error checking docstrings: {e}")
 
+    def _check_docstring_nodes(self, tree: ast.AST, result: SniffingResult) -> int:
+        """Check the docstrings of a module and its classes and functions.
+
+        Args:
+            tree: Parsed module
+            result: SniffingResult to update
+
+        Returns:
+            Number of issues found
+        """
+        issue_count = len(result.issues)
+
+        # Check module docstring
+        if not ast.get_docstring(tree):
+            result.add_issue({
+                "type": "docstring",
+                "subtype": "module_docstring",
+                "severity": "high",
+                "description": "Missing module docstring",
+                "fix_suggestion": "Add module-level docstring"
+            })
+
+        # Check class and function docstrings
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+                docstring = ast.get_docstring(node)
+                if not docstring:
+                    result.add_issue({
+                        "type": "docstring",
+                        "subtype": f"{node.__class__.__name__.lower()}_docstring",
+                        "severity": "high",
+                        "description": f"Missing {node.__class__.__name__.lower()} docstring",
+                        "line": node.lineno,
+                        "name": node.name,
+                        "fix_suggestion": f"Add {node.__class__.__name__.lower()}-level docstring"
+                    })
+                else:
+                    # Check docstring sections
+                    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        if node.args.args and "Args:" not in docstring:
+                            result.add_issue({
+                                "type": "docstring",
+                                "subtype": "args_docstring",
+                                "severity": "medium",
+                                "description": "Missing Args section",
+                                "line": node.lineno,
+                                "name": node.name,
+                                "fix_suggestion": "Add Args section to docstring"
+                            })
+
+                        if "Returns:" not in docstring and not isinstance(node.returns, ast.Constant):
+                            result.add_issue({
+                                "type": "docstring",
+                                "subtype": "returns_docstring",
+                                "severity": "medium",
+                                "description": "Missing Returns section",
+                                "line": node.lineno,
+                                "name": node.name,
+                                "fix_suggestion": "Add Returns section to docstring"
+                            })
+
+        return len(result.issues) - issue_count
+
     async def _check_readme(self, content: str, result: SniffingResult) -> None:
         """Check README documentation.
 
@@ -266,8 +293,13 @@ class DocumentationSniffer(BaseSniffer):
         """
         try:
             for check_type, check_info in self.readme_checks.items():
-                matches = re.finditer(check_info["pattern"], content, re.MULTILINE)
-                if not list(matches):
+                rule = f"readme.{check_type}"
+                if self.rule_costs.is_quarantined(rule):
+                    continue
+
+                with self.rule_costs.measure(rule, len(content)) as run:
+                    run.matches = len(re.findall(check_info["pattern"], content, re.MULTILINE))
+                if not run.matches:
                     result.add_issue({
                         "type": "readme",
                         "subtype": check_type,
@@ -306,23 +338,38 @@ class DocumentationSniffer(BaseSniffer):
         except Exception as e:
             logger.error(f"Error checking README: {e}")
 
-    async def _check_api_docs(self, content: str, result: SniffingResult) -> None:
+    async def _check_api_docs(
+        self,
+        content: str,
+        result: SniffingResult,
+        line_index: Optional[LineIndex] = None
+    ) -> None:
         """Check API documentation.
 
         Args:
             content: File content to check
             result: SniffingResult to update
+            line_index: Optional line index for content
         """
         try:
+            if line_index is None:
+                line_index = LineIndex(content)
+
             for check_type, check_info in self.api_doc_checks.items():
-                matches = re.finditer(check_info["pattern"], content, re.MULTILINE)
+                rule = f"api_doc.{check_type}"
+                if self.rule_costs.is_quarantined(rule):
+                    continue
+
+                with self.rule_costs.measure(rule, len(content)) as run:
+                    matches = list(re.finditer(check_info["pattern"], content, re.MULTILINE))
+                    run.matches = len(matches)
                 for match in matches:
                     result.add_issue({
                         "type": "api_doc",
                         "subtype": check_type,
                         "severity": check_info["severity"],
                         "description": f"Missing {check_info['description']}",
-                        "line": content.count("\n", 0, match.start()) + 1,
+                        "line": line_index.line_of(match.start()),
                         "code": match.group(0).strip(),
                         "fix_suggestion": check_info["fix_template"]
                     })
@@ -370,54 +417,6 @@ class DocumentationSniffer(BaseSniffer):
         except Exception as e:
             logger.error(f"Error running AI doc analysis: {e}")
 
-    async def _apply_fixes(self, suggestions: List[Dict[str, Any]]) -> bool:
-        """Apply fix suggestions to issues.
-
-        Args:
-            suggestions: List of fix suggestions from AI
-
-        Returns:
-            True if all fixes were applied successfully, False otherwise
-        """
-        try:
-            success = True
-            for suggestion in suggestions:
-                # Get file content
-                with open(suggestion["file"], "r") as f:
-                    content = f.read()
-
-                # Apply fix
-                if suggestion.get("fix_type") == "replace":
-                    content = content.replace(
-                        suggestion["old_code"],
-                        suggestion["new_code"]
-                    )
-                elif suggestion.get("fix_type") == "insert":
-                    lines = content.splitlines()
-                    lines.insert(
-                        suggestion["line"] - 1,
-                        suggestion["code"]
-                    )
-                    content = "\n".join(lines)
-                else:
-                    logger.warning(f"Unknown fix type: {suggestion.get('fix_type')}")
-                    success = False
-                    continue
-
-                # Write fixed content
-                with open(suggestion["file"], "w") as f:
-                    f.write(content)
-
-                # Validate fix
-                if not await self._validate_fix(suggestion, content):
-                    success = False
-
-            return success
-
-        except Exception as e:
-            logger.error(f"Error applying fixes: {e}")
-            return False
-
     async def _validate_fix(self, suggestion: Dict[str, Any], content: str) -> bool:
         """Validate that a fix was successful.
 
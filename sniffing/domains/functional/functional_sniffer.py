@@ -7,9 +7,11 @@ import inspect
 import logging
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Optional, Set, Tuple
 
 from ...core.base.base_sniffer import BaseSniffer
+from ...core.utils.file_context import FileContext
+from ...core.utils.line_index import LineIndex
 from ...core.utils.result import SniffingResult
 
 logger = logging.getLogger("functional_sniffer")
@@ -146,11 +148,12 @@ class FunctionalSniffer(BaseSniffer):
             logger.error(f"Error loading AI functional model: {e}")
             return None
 
-    async def _sniff_file_impl(self, file: str) -> SniffingResult:
+    async def _sniff_file_impl(self, file: str, context: FileContext) -> SniffingResult:
         """Implementation of file sniffing logic.
 
         Args:
             file: Path to the file to sniff.
+            context: File context shared with other domains.
 
         Returns:
             SniffingResult object
@@ -159,14 +162,14 @@ class FunctionalSniffer(BaseSniffer):
             # Create result
             result = SniffingResult(file, self.get_sniffer_type())
 
-            # Read file content
-            with open(file, "r") as f:
-                content = f.read()
+            # Get shared file content
+            content = context.text
+            line_index = context.line_index
 
             # Run functional checks
-            await self._check_api(content, result)
-            await self._check_integration(content, result)
-            await self._check_error_handling(content, result)
+            await self._check_api(content, result, line_index)
+            await self._check_integration(content, result, line_index)
+            await self._check_error_handling(content, result, line_index)
             await self._run_ai_functional_analysis(content, result)
 
             # Update status
@@ -178,14 +181,23 @@ class FunctionalSniffer(BaseSniffer):
             logger.error(f"Error sniffing file {file}: {e}")
             return SniffingResult(file, self.get_sniffer_type(), status=False)
 
-    async def _check_api(self, content: str, result: SniffingResult) -> None:
+    async def _check_api(
+        self,
+        content: str,
+        result: SniffingResult,
+        line_index: Optional[LineIndex] = None
+    ) -> None:
         """Check for API issues.
 
         Args:
             content: File content to check
             result: SniffingResult to update
+            line_index: Optional line index for content
         """
         try:
+            if line_index is None:
+                line_index = LineIndex(content)
+
             for check_type, check_info in self.api_checks.items():
                 matches = re.finditer(check_info["pattern"], content, re.MULTILINE)
                 for match in matches:
@@ -194,7 +206,7 @@ class FunctionalSniffer(BaseSniffer):
                         "subtype": check_type,
                         "severity": check_info["severity"],
                         "description": check_info["description"],
-                        "line": content.count("\n", 0, match.start()) + 1,
+                        "line": line_index.line_of(match.start()),
                         "code": match.group(0).strip(),
                         "fix_suggestion": check_info["fix_template"]
                     }
@@ -212,14 +224,23 @@ class FunctionalSniffer(BaseSniffer):
         except Exception as e:
             logger.error(f"Error checking API: {e}")
 
-    async def _check_integration(self, content: str, result: SniffingResult) -> None:
+    async def _check_integration(
+        self,
+        content: str,
+        result: SniffingResult,
+        line_index: Optional[LineIndex] = None
+    ) -> None:
         """Check for integration issues.
 
         Args:
             content: File content to check
             result: SniffingResult to update
+            line_index: Optional line index for content
         """
         try:
+            if line_index is None:
+                line_index = LineIndex(content)
+
             for check_type, check_info in self.integration_checks.items():
                 matches = re.finditer(check_info["pattern"], content, re.MULTILINE)
                 for match in matches:
@@ -228,7 +249,7 @@ class FunctionalSniffer(BaseSniffer):
                         "subtype": check_type,
                         "severity": check_info["severity"],
                         "description": check_info["description"],
-                        "line": content.count("\n", 0, match.start()) + 1,
+                        "line": line_index.line_of(match.start()),
                         "code": match.group(0).strip(),
                         "fix_suggestion": check_info["fix_template"]
                     }
@@ -246,14 +267,23 @@ class FunctionalSniffer(BaseSniffer):
         except Exception as e:
             logger.error(f"Error checking integration: {e}")
 
-    async def _check_error_handling(self, content: str, result: SniffingResult) -> None:
+    async def _check_error_handling(
+        self,
+        content: str,
+        result: SniffingResult,
+        line_index: Optional[LineIndex] = None
+    ) -> None:
         """Check for error handling issues.
 
         Args:
             content: File content to check
             result: SniffingResult to update
+            line_index: Optional line index for content
         """
         try:
+            if line_index is None:
+                line_index = LineIndex(content)
+
             for check_type, check_info in self.error_checks.items():
                 matches = re.finditer(check_info["pattern"], content, re.MULTILINE)
                 for match in matches:
@@ -262,7 +292,7 @@ class FunctionalSniffer(BaseSniffer):
                         "subtype": check_type,
                         "severity": check_info["severity"],
                         "description": check_info["description"],
-                        "line": content.count("\n", 0, match.start()) + 1,
+                        "line": line_index.line_of(match.start()),
                         "code": match.group(0).strip(),
                         "fix_suggestion": check_info["fix_template"]
                     }
@@ -311,54 +341,6 @@ class FunctionalSniffer(BaseSniffer):
         except Exception as e:
             logger.error(f"Error running AI functional analysis: {e}")
 
-    async def _apply_fixes(self, suggestions: List[Dict[str, Any]]) -> bool:
-        """Apply fix suggestions to issues.
-
-        Args:
-            suggestions: List of fix suggestions from AI
-
-        Returns:
-            True if all fixes were applied successfully, False otherwise
-        """
-        try:
-            success = True
-            for suggestion in suggestions:
-                # Get file content
-                with open(suggestion["file"], "r") as f:
-                    content = f.read()
-
-                # Apply fix
-                if suggestion.get("fix_type") == "replace":
-                    content = content.replace(
-                        suggestion["old_code"],
-                        suggestion["new_code"]
-                    )
-                elif suggestion.get("fix_type") == "insert":
-                    lines = content.splitlines()
-                    lines.insert(
-                        suggestion["line"] - 1,
-                        suggestion["code"]
-                    )
-                    content = "\n".join(lines)
-                else:
-                    logger.warning(f"Unknown fix type: {suggestion.get('fix_type')}")
-                    success = False
-                    continue
-
-                # Write fixed content
-                with open(suggestion["file"], "w") as f:
-                    f.write(content)
-
-                # Validate fix
-                if not await self._validate_fix(suggestion, content):
-                    success = False
-
-            return success
-
-        except Exception as e:
-            logger.error(f"Error applying fixes: {e}")
-            return False
-
     async def _validate_fix(self, suggestion: Dict[str, Any], content: str) -> bool:
         """Validate that a fix was successful.
 
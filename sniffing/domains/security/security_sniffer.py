@@ -8,6 +8,9 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 from ...core.base.base_sniffer import BaseSniffer
+from ...core.utils.file_context import FileContext
+from ...core.utils.line_index import LineIndex
+from ...core.utils.pattern_scanner import PatternHit, PatternScanner
 from ...core.utils.result import SniffingResult
 
 logger = logging.getLogger("security_sniffer")
@@ -26,17 +29,39 @@ class SecuritySniffer(BaseSniffer):
         self.compliance_checks = self._load_compliance_checks()
         self.attack_simulations = self._load_attack_simulations()
         self.soc2_requirements = self._load_soc2_requirements()
+        self.soc2_control_patterns = self._load_soc2_control_patterns()
+        self.rule_scanner = self._build_rule_scanner()
+        self.soc2_control_scanner = PatternScanner(
+            self.soc2_control_patterns,
+            re.MULTILINE | re.IGNORECASE,
+            self.rule_costs,
+            self.regex_safety
+        )
         self.ai_security_model = self._load_ai_security_model()
 
     def get_sniffer_type(self) -> str:
         """Return the type of this sniffer."""
         return "security"
 
-    async def _sniff_file_impl(self, file: str) -> SniffingResult:
+    def get_metrics(self) -> Dict:
+        """Get sniffer metrics, including rules matched under a time budget.
+
+        Returns:
+            Metrics dictionary
+        """
+        metrics = super().get_metrics()
+        metrics["guarded_rules"] = {
+            **self.rule_scanner.guarded_rules(),
+            **self.soc2_control_scanner.guarded_rules()
+        }
+        return metrics
+
+    async def _sniff_file_impl(self, file: str, context: FileContext) -> SniffingResult:
         """Implementation of file sniffing logic.
 
         Args:
             file: Path to the file to sniff.
+            context: File context shared with other domains.
 
         Returns:
             SniffingResult object
@@ -45,15 +70,18 @@ class SecuritySniffer(BaseSniffer):
             # Create result
             result = SniffingResult(file, self.get_sniffer_type())
 
-            # Read file content
-            with open(file, "r") as f:
-                content = f.read()
+            # Get shared file content
+            content = context.text
+
+            # Scan vulnerability and compliance rules in one pass
+            line_index = context.line_index
+            hits = await self._scan_rules(content, line_index)
 
             # Run security checks
-            await self._check_vulnerabilities(content, result)
-            await self._check_compliance(content, result)
-            await self._simulate_attacks(content, result)
-            await self._validate_soc2(content, result)
+            await self._check_vulnerabilities(content, result, hits)
+            await self._check_compliance(content, result, hits)
+            await self._simulate_attacks(content, result, context)
+            await self._validate_soc2(content, result, line_index)
             await self._run_ai_security_analysis(content, result)
 
             # Update status
@@ -252,6 +280,56 @@ class SecuritySniffer(BaseSniffer):
             }
         }
 
+    def _load_soc2_control_patterns(self) -> Dict[str, str]:
+        """Load SOC2 control implementation patterns."""
+        return {
+            "vulnerability_scanning": r".*scan.*vuln.*|.*security.*check.*",
+            "secure_coding": r".*sanitize.*|.*validate.*|.*escape.*",
+            "access_control": r".*auth.*|.*permission.*|.*role.*",
+            "authentication": r".*login.*|.*authenticate.*|.*session.*",
+            "authorization": r".*authorize.*|.*permission.*|.*role.*",
+            "role_based_access": r".*role.*|.*permission.*|.*access.*",
+            "input_validation": r".*validate.*|.*sanitize.*|.*check.*input.*",
+            "output_encoding": r".*encode.*|.*escape.*|.*sanitize.*output.*",
+            "sanitization": r".*sanitize.*|.*clean.*|.*escape.*",
+            "encryption_in_transit": r".*ssl.*|.*tls.*|.*https.*",
+            "encryption_at_rest": r".*encrypt.*|.*cipher.*|.*crypt.*",
+            "key_management": r".*key.*manage.*|.*secret.*|.*credential.*",
+            "logging": r".*log\.|.*logger.*|.*audit.*",
+            "monitoring": r".*monitor.*|.*watch.*|.*track.*",
+            "alerting": r".*alert.*|.*notify.*|.*warn.*"
+        }
+
+    def _build_rule_scanner(self) -> PatternScanner:
+        """Compile vulnerability and compliance patterns into one scanner."""
+        rules = {
+            f"vulnerability.{name}": info["pattern"]
+            for name, info in self.vulnerability_patterns.items()
+        }
+        rules.update({
+            f"compliance.{name}": info["pattern"]
+            for name, info in self.compliance_checks.items()
+        })
+        return PatternScanner(rules, costs=self.rule_costs, safety=self.regex_safety)
+
+    async def _scan_rules(
+        self,
+        content: str,
+        line_index: Optional[LineIndex] = None
+    ) -> Dict[str, List[PatternHit]]:
+        """Scan content for all vulnerability and compliance rules.
+
+        Args:
+            content: File content to scan
+            line_index: Optional line index for content
+
+        Returns:
+            Mapping of rule name to its hits
+        """
+        return self.rule_scanner.group_hits(
+            await self.rule_scanner.scan_async(content, line_index)
+        )
+
     def _load_ai_security_model(self) -> Any:
         """Load AI security analysis model."""
         try:
@@ -260,24 +338,32 @@ class SecuritySniffer(BaseSniffer):
             logger.error(f"Error loading AI security model: {e}")
             return None
 
-    async def _check_vulnerabilities(self, content: str, result: SniffingResult) -> None:
+    async def _check_vulnerabilities(
+        self,
+        content: str,
+        result: SniffingResult,
+        hits: Optional[Dict[str, List[PatternHit]]] = None
+    ) -> None:
         """Check for security vulnerabilities.
 
         Args:
             content: File content to check
             result: SniffingResult to update
+            hits: Optional rule hits from a previous scan of content
         """
         try:
+            if hits is None:
+                hits = await self._scan_rules(content)
+
             for vuln_type, vuln_info in self.vulnerability_patterns.items():
-                matches = re.finditer(vuln_info["pattern"], content, re.MULTILINE)
-                for match in matches:
+                for hit in hits[f"vulnerability.{vuln_type}"]:
                     issue = {
                         "type": "vulnerability",
                         "subtype": vuln_type,
                         "severity": vuln_info["severity"],
                         "description": vuln_info["description"],
-                        "line": content.count("\n", 0, match.start()) + 1,
-                        "code": match.group(0).strip(),
+                        "line": hit.line,
+                        "code": hit.code,
                         "cwe": vuln_info.get("cwe"),
                         "fix_suggestion": vuln_info.get("fix_template"),
                         "soc2_control": vuln_info.get("soc2_control")
@@ -296,17 +382,29 @@ class SecuritySniffer(BaseSniffer):
         except Exception as e:
             logger.error(f"Error checking vulnerabilities: {e}")
 
-    async def _check_compliance(self, content: str, result: SniffingResult) -> None:
+    async def _check_compliance(
+        self,
+        content: str,
+        result: SniffingResult,
+        hits: Optional[Dict[str, List[PatternHit]]] = None
+    ) -> None:
         """Check for compliance issues.
 
         Args:
             content: File content to check
             result: SniffingResult to update
+            hits: Optional rule hits from a previous scan of content
         """
         try:
+            if hits is None:
+                hits = await self._scan_rules(content)
+
             for check_type, check_info in self.compliance_checks.items():
-                matches = re.finditer(check_info["pattern"], content, re.MULTILINE)
-                implementations = list(matches)
+                # A quarantined rule finding nothing says nothing
+                if self.rule_costs.is_quarantined(f"compliance.{check_type}"):
+                    continue
+
+                implementations = hits[f"compliance.{check_type}"]
 
                 if not implementations:
                     issue = {
@@ -336,18 +434,24 @@ class SecuritySniffer(BaseSniffer):
         except Exception as e:
             logger.error(f"Error checking compliance: {e}")
 
-    async def _simulate_attacks(self, content: str, result: SniffingResult) -> None:
+    async def _simulate_attacks(
+        self,
+        content: str,
+        result: SniffingResult,
+        context: Optional[FileContext] = None
+    ) -> None:
         """Simulate attacks to detect vulnerabilities.
 
         Args:
             content: File content to check
             result: SniffingResult to update
+            context: Optional file context providing the parsed AST
         """
         try:
             for attack_type, attack_info in self.attack_simulations.items():
                 for payload in attack_info["payloads"]:
                     # Check if code is vulnerable to payload
-                    if await self._is_vulnerable_to_payload(content, payload):
+                    if await self._is_vulnerable_to_payload(content, payload, context):
                         issue = {
                             "type": "attack_simulation",
                             "subtype": attack_type,
@@ -370,18 +474,26 @@ class SecuritySniffer(BaseSniffer):
         except Exception as e:
             logger.error(f"Error simulating attacks: {e}")
 
-    async def _validate_soc2(self, content: str, result: SniffingResult) -> None:
+    async def _validate_soc2(
+        self,
+        content: str,
+        result: SniffingResult,
+        line_index: Optional[LineIndex] = None
+    ) -> None:
         """Validate SOC2 compliance requirements.
 
         Args:
             content: File content to check
             result: SniffingResult to update
+            line_index: Optional line index for content
         """
         try:
+            implemented = await self.soc2_control_scanner.matched_rules_async(content, line_index)
+
             for control_id, control_info in self.soc2_requirements.items():
                 # Check each required control
                 for check in control_info["checks"]:
-                    if not await self._validate_soc2_control(content, check):
+                    if check not in implemented and not self.rule_costs.is_quarantined(check):
                         issue = {
                             "type": "soc2",
                             "subtype": check,
@@ -436,19 +548,25 @@ class SecuritySniffer(BaseSniffer):
         except Exception as e:
             logger.error(f"Error running AI security analysis: {e}")
 
-    async def _is_vulnerable_to_payload(self, content: str, payload: str) -> bool:
+    async def _is_vulnerable_to_payload(
+        self,
+        content: str,
+        payload: str,
+        context: Optional[FileContext] = None
+    ) -> bool:
         """Check if code is vulnerable to attack payload.
 
         Args:
             content: File content to check
             payload: Attack payload to test
+            context: Optional file context providing the parsed AST
 
         Returns:
             True if vulnerable, False otherwise
         """
         try:
             # Parse code into AST
-            tree = ast.parse(content)
+            tree = context.tree if context else ast.parse(content)
 
             # Look for vulnerable patterns
             for node in ast.walk(tree):
@@ -483,27 +601,8 @@ class SecuritySniffer(BaseSniffer):
             True if control is implemented, False otherwise
         """
         try:
-            # Check for control implementation patterns
-            patterns = {
-                "vulnerability_scanning": r".*scan.*vuln.*|.*security.*check.*",
-                "secure_coding": r".*sanitize.*|.*validate.*|.*escape.*",
-                "access_control": r".*auth.*|.*permission.*|.*role.*",
-                "authentication": r".*login.*|.*authenticate.*|.*session.*",
-                "authorization": r".*authorize.*|.*permission.*|.*role.*",
-                "role_based_access": r".*role.*|.*permission.*|.*access.*",
-                "input_validation": r".*validate.*|.*sanitize.*|.*check.*input.*",
-                "output_encoding": r".*encode.*|.*escape.*|.*sanitize.*output.*",
-                "sanitization": r".*sanitize.*|.*clean.*|.*escape.*",
-                "encryption_in_transit": r".*ssl.*|.*tls.*|.*https.*",
-                "encryption_at_rest": r".*encrypt.*|.*cipher.*|.*crypt.*",
-                "key_management": r".*key.*manage.*|.*secret.*|.*credential.*",
-                "logging": r".*log\.|.*logger.*|.*audit.*",
-                "monitoring": r".*monitor.*|.*watch.*|.*track.*",
-                "alerting": r".*alert.*|.*notify.*|.*warn.*"
-            }
-
-            if control in patterns:
-                return bool(re.search(patterns[control], content, re.IGNORECASE))
+            if control in self.soc2_control_patterns:
+                return control in await self.soc2_control_scanner.matched_rules_async(content)
 
             return False
 
@@ -511,54 +610,6 @@ class SecuritySniffer(BaseSniffer):
             logger.error(f"Error validating SOC2 control: {e}")
             return False
 
-    async def _apply_fixes(self, suggestions: List[Dict[str, Any]]) -> bool:
-        """Apply fix suggestions to issues.
-
-        Args:
-            suggestions: List of fix suggestions from AI
-
-        Returns:
-            True if all fixes were applied successfully, False otherwise
-        """
-        try:
-            success = True
-            for suggestion in suggestions:
-                # Get file content
-                with open(suggestion["file"], "r") as f:
-                    content = f.read()
-
-                # Apply fix
-                if suggestion.get("fix_type") == "replace":
-                    content = content.replace(
-                        suggestion["old_code"],
-                        suggestion["new_code"]
-                    )
-                elif suggestion.get("fix_type") == "insert":
-                    lines = content.splitlines()
-                    lines.insert(
-                        suggestion["line"] - 1,
-                        suggestion["code"]
-                    )
-                    content = "\n".join(lines)
-                else:
-                    logger.warning(f"Unknown fix type: {suggestion.get('fix_type')}")
-                    success = False
-                    continue
-
-                # Write fixed content
-                with open(suggestion["file"], "w") as f:
-                    f.write(content)
-
-                # Validate fix
-                if not await self._validate_fix(suggestion, content):
-                    success = False
-
-            return success
-
-        except Exception as e:
-            logger.error(f"Error applying fixes: {e}")
-            return False
-
     async def _validate_fix(self, suggestion: Dict[str, Any], content: str) -> bool:
         """Validate that a fix was successful.
 
@@ -574,8 +625,9 @@ class SecuritySniffer(BaseSniffer):
             result = SniffingResult(suggestion["file"], self.get_sniffer_type())
 
             # Run security checks on updated content
-            await self._check_vulnerabilities(content, result)
-            await self._check_compliance(content, result)
+            hits = await self._scan_rules(content)
+            await self._check_vulnerabilities(content, result, hits)
+            await self._check_compliance(content, result, hits)
             await self._simulate_attacks(content, result)
             await self._validate_soc2(content, result)
 
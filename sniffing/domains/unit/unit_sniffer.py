@@ -5,9 +5,11 @@ import ast
 import logging
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Optional, Set, Tuple
 
 from ...core.base.base_sniffer import BaseSniffer
+from ...core.utils.file_context import FileContext
+from ...core.utils.line_index import LineIndex
 from ...core.utils.result import SniffingResult
 
 logger = logging.getLogger("unit_sniffer")
@@ -138,11 +140,12 @@ class UnitSniffer(BaseSniffer):
             logger.error(f"Error loading AI unit model: {e}")
             return None
 
-    async def _sniff_file_impl(self, file: str) -> SniffingResult:
+    async def _sniff_file_impl(self, file: str, context: FileContext) -> SniffingResult:
         """Implementation of file sniffing logic.
 
         Args:
             file: Path to the file to sniff.
+            context: File context shared with other domains.
 
         Returns:
             SniffingResult object
@@ -151,14 +154,14 @@ class UnitSniffer(BaseSniffer):
             # Create result
             result = SniffingResult(file, self.get_sniffer_type())
 
-            # Read file content
-            with open(file, "r") as f:
-                content = f.read()
+            # Get shared file content
+            content = context.text
+            line_index = context.line_index
 
             # Run unit test checks
-            await self._check_coverage(content, result)
-            await self._check_quality(content, result)
-            await self._check_benchmarks(content, result)
+            await self._check_coverage(content, result, context)
+            await self._check_quality(content, result, line_index)
+            await self._check_benchmarks(content, result, line_index)
             await self._run_ai_unit_analysis(content, result)
 
             # Update status
@@ -170,16 +173,22 @@ class UnitSniffer(BaseSniffer):
             logger.error(f"Error sniffing file {file}: {e}")
             return SniffingResult(file, self.get_sniffer_type(), status=False)
 
-    async def _check_coverage(self, content: str, result: SniffingResult) -> None:
+    async def _check_coverage(
+        self,
+        content: str,
+        result: SniffingResult,
+        context: Optional[FileContext] = None
+    ) -> None:
         """Check test coverage.
 
         Args:
             content: File content to check
             result: SniffingResult to update
+            context: Optional file context providing the parsed AST
         """
         try:
             # Parse code into AST
-            tree = ast.parse(content)
+            tree = context.tree if context else ast.parse(content)
 
             # Find all functions and classes
             functions = [
@@ -249,19 +258,28 @@ class UnitSniffer(BaseSniffer):
         except Exception as e:
             logger.error(f"Error checking coverage: {e}")
 
-    async def _check_quality(self, content: str, result: SniffingResult) -> None:
+    async def _check_quality(
+        self,
+        content: str,
+        result: SniffingResult,
+        line_index: Optional[LineIndex] = None
+    ) -> None:
         """Check test quality.
 
         Args:
             content: File content to check
             result: SniffingResult to update
+            line_index: Optional line index for content
         """
         try:
+            if line_index is None:
+                line_index = LineIndex(content)
+
             for check_type, check_info in self.quality_checks.items():
                 matches = re.finditer(check_info["pattern"], content, re.MULTILINE)
                 for match in matches:
                     # Get matched code and context
-                    line_num = content.count("\n", 0, match.start()) + 1
+                    line_num = line_index.line_of(match.start())
                     matched_code = match.group(0).strip()
 
                     # Check specific quality issues
@@ -316,19 +334,28 @@ class UnitSniffer(BaseSniffer):
         except Exception as e:
             logger.error(f"Error checking quality: {e}")
 
-    async def _check_benchmarks(self, content: str, result: SniffingResult) -> None:
+    async def _check_benchmarks(
+        self,
+        content: str,
+        result: SniffingResult,
+        line_index: Optional[LineIndex] = None
+    ) -> None:
         """Check performance benchmarks.
 
         Args:
             content: File content to check
             result: SniffingResult to update
+            line_index: Optional line index for content
         """
         try:
+            if line_index is None:
+                line_index = LineIndex(content)
+
             for check_type, check_info in self.benchmark_checks.items():
                 matches = re.finditer(check_info["pattern"], content, re.MULTILINE)
                 for match in matches:
                     # Get matched code and context
-                    line_num = content.count("\n", 0, match.start()) + 1
+                    line_num = line_index.line_of(match.start())
                     matched_code = match.group(0).strip()
 
                     # Add benchmark metrics
@@ -406,54 +433,6 @@ class UnitSniffer(BaseSniffer):
         except Exception as e:
             logger.error(f"Error running AI unit analysis: {e}")
 
-    async def _apply_fixes(self, suggestions: List[Dict[str, Any]]) -> bool:
-        """Apply fix suggestions to issues.
-
-        Args:
-            suggestions: List of fix suggestions from AI
-
-        Returns:
-            True if all fixes were applied successfully, False otherwise
-        """
-        try:
-            success = True
-            for suggestion in suggestions:
-                # Get file content
-                with open(suggestion["file"], "r") as f:
-                    content = f.read()
-
-                # Apply fix
-                if suggestion.get("fix_type") == "replace":
-                    content = content.replace(
-                        suggestion["old_code"],
-                        suggestion["new_code"]
-                    )
-                elif suggestion.get("fix_type") == "insert":
-                    lines = content.splitlines()
-                    lines.insert(
-                        suggestion["line"] - 1,
-                        suggestion["code"]
-                    )
-                    content = "\n".join(lines)
-                else:
-                    logger.warning(f"Unknown fix type: {suggestion.get('fix_type')}")
-                    success = False
-                    continue
-
-                # Write fixed content
-                with open(suggestion["file"], "w") as f:
-                    f.write(content)
-
-                # Validate fix
-                if not await self._validate_fix(suggestion, content):
-                    success = False
-
-            return success
-
-        except Exception as e:
-            logger.error(f"Error applying fixes: {e}")
-            return False
-
     async def _validate_fix(self, suggestion: Dict[str, Any], content: str) -> bool:
         """Validate that a fix was successful.
 
@@ -0,0 +1,346 @@
+"""
+Long-running sniffing daemon serving git hooks over a Unix domain socket.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from ..mcp.orchestration.test_orchestrator import TestOrchestrator
+from .hooks.client import UNIX_SOCKETS, default_socket_path, encode_message, ensure_private_dir, is_running
+
+logger = logging.getLogger("sniffing_daemon")
+
+class SniffingDaemon:
+    """Keeps sniffers, compiled rules and result caches warm for git hooks.
+
+    Clients send one JSON request per connection, terminated by a newline:
+    ``{"command": "sniff", "files": [...], "domains": [...], "fix": false}``,
+    ``{"command": "ping"}``, ``{"command": "status"}`` or
+    ``{"command": "shutdown"}``. Sniff results are streamed back as one JSON
+    line per (file, domain) result followed by an "end" line carrying the
+    overall status, so hooks pay neither interpreter startup nor rule
+    compilation and can report issues as they are found.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        socket_path: Optional[Path] = None,
+        orchestrator: Optional[TestOrchestrator] = None
+    ):
+        """Initialize sniffing daemon.
+
+        Args:
+            config: Configuration dictionary
+            socket_path: Socket path, the repository's default if not given
+            orchestrator: Optional orchestrator to serve requests with
+        """
+        self.config = config
+        daemon_config = config.get("git", {}).get("daemon", {})
+        socket_path = (
+            socket_path
+            or daemon_config.get("socket_path")
+            or default_socket_path(config.get("global", {}).get("workspace_path", "."))
+        )
+        # None where Unix domain sockets are unavailable; requests can
+        # still be served in-process through handle_request
+        self.socket_path: Optional[Path] = Path(socket_path) if socket_path else None
+        self.idle_timeout = daemon_config.get("idle_timeout", 1800)
+        self.preload = daemon_config.get("preload", True)
+        self.orchestrator = orchestrator or TestOrchestrator(config)
+        self.requests = 0
+        self.active_requests = 0
+        self.started_at = time.time()
+        self.last_activity = time.monotonic()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._stopped = asyncio.Event()
+
+    async def start(self) -> None:
+        """Start listening on the socket.
+
+        Raises:
+            RuntimeError: If Unix domain sockets are unavailable or another
+                daemon is already listening
+            PermissionError: If the socket directory is not private to
+                this user
+        """
+        if not UNIX_SOCKETS or self.socket_path is None:
+            raise RuntimeError("The sniffing daemon requires Unix domain sockets")
+
+        # Only this user can create or replace entries in a 0700 directory,
+        # so nobody can take the path before bind() or between bind() and
+        # chmod()
+        ensure_private_dir(self.socket_path.parent)
+
+        if os.path.lexists(self.socket_path):
+            if await asyncio.get_running_loop().run_in_executor(None, is_running, self.socket_path):
+                raise RuntimeError(f"Sniffing daemon already running on {self.socket_path}")
+            # Left behind by a daemon that did not shut down cleanly
+            self.socket_path.unlink()
+
+        self._server = await asyncio.start_unix_server(
+            self._handle_client,
+            path=str(self.socket_path),
+            limit=16 * 1024 * 1024
+        )
+        os.chmod(self.socket_path, 0o600)
+
+        if self.preload:
+            # Import and construct sniffers before the first hook needs them
+            for domain in self.orchestrator.sniffers:
+                try:
+                    self.orchestrator.sniffers[domain]
+                except Exception as e:
+                    logger.error(f"Error preloading {domain} sniffer: {e}")
+
+        logger.info(f"Sniffing daemon listening on {self.socket_path}")
+
+    async def serve_forever(self) -> None:
+        """Serve requests until shut down or idle for too long."""
+        await self.start()
+        try:
+            while not self._stopped.is_set():
+                try:
+                    await asyncio.wait_for(self._stopped.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+
+                idle = time.monotonic() - self.last_activity
+                if self.idle_timeout and not self.active_requests and idle > self.idle_timeout:
+                    logger.info(f"Sniffing daemon idle for {idle:.0f}s, shutting down")
+                    break
+        finally:
+            await self.stop()
+
+    async def _handle_client(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one client request.
+
+        Args:
+            reader: Client stream reader
+            writer: Client stream writer
+        """
+        self.active_requests += 1
+        self.last_activity = time.monotonic()
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                await self._send(writer, {"type": "error", "error": f"Invalid request: {e}"})
+                return
+
+            command = request.get("command")
+            if command == "ping":
+                await self._send(writer, {"type": "pong", "pid": os.getpid()})
+            elif command == "status":
+                await self._send(writer, {"type": "end", "status": "ok", "daemon": self.get_status()})
+            elif command == "shutdown":
+                await self._send(writer, {"type": "end", "status": "stopping"})
+                self._stopped.set()
+            elif command == "sniff":
+                await self._sniff(request, writer)
+            else:
+                await self._send(writer, {"type": "error", "error": f"Unknown command: {command}"})
+
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # Client went away, nothing to report to
+            pass
+
+        except Exception as e:
+            logger.error(f"Error handling daemon request: {e}")
+            try:
+                await self._send(writer, {"type": "error", "error": str(e)})
+            except Exception:
+                pass
+
+        finally:
+            self.active_requests -= 1
+            self.last_activity = time.monotonic()
+            writer.close()
+
+    async def _sniff(self, request: Dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        """Sniff files, streaming each result to the client.
+
+        Args:
+            request: Sniff request
+            writer: Client stream writer
+        """
+        self.requests += 1
+        start_time = time.perf_counter()
+        critical = 0
+
+        async def on_result(file: str, domain: str, result: Dict[str, Any]) -> None:
+            nonlocal critical
+            critical += sum(
+                1 for issue in result.get("issues", [])
+                if issue.get("severity") == "critical"
+            )
+            await self._send(writer, {
+                "type": "result",
+                "file": file,
+                "domain": domain,
+                "result": result
+            })
+
+        outcome = await self.orchestrator.run_tests(
+            request.get("files", []),
+            request.get("domains"),
+            request.get("priority", 1),
+            request.get("fix", False),
+            on_result
+        )
+
+        end = {
+            "type": "end",
+            "duration": time.perf_counter() - start_time,
+            "critical": critical
+        }
+        if outcome.get("status") != "completed":
+            end.update(status="error", error=outcome.get("error"))
+        else:
+            end.update(status="failed" if critical else "passed", **outcome["results"])
+        await self._send(writer, end)
+
+    async def _send(self, writer: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+        """Send a message to a client.
+
+        Args:
+            writer: Client stream writer
+            message: Message to send
+        """
+        writer.write(encode_message(message))
+        await writer.drain()
+
+    async def handle_request(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Serve a sniff request without a socket.
+
+        Args:
+            request: Sniff request
+
+        Returns:
+            Messages a client would have been sent
+        """
+        collector = _MessageCollector()
+        await self._sniff(request, collector)
+        return collector.messages
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get daemon status.
+
+        Returns:
+            Dictionary of daemon status
+        """
+        return {
+            "pid": os.getpid(),
+            "socket": str(self.socket_path),
+            "uptime": time.time() - self.started_at,
+            "requests": self.requests,
+            "active_requests": self.active_requests,
+            "domains": self.orchestrator.get_domain_status()
+        }
+
+    async def stop(self) -> None:
+        """Stop listening and release resources."""
+        try:
+            self._stopped.set()
+            if self._server is not None:
+                self._server.close()
+                await self._server.wait_closed()
+                self._server = None
+
+            if self.socket_path is not None and self.socket_path.exists():
+                self.socket_path.unlink()
+
+            await self.orchestrator.cleanup()
+
+        except Exception as e:
+            logger.error(f"Error stopping sniffing daemon: {e}")
+
+class _MessageCollector:
+    """Stream writer stand-in collecting the messages sent to it."""
+
+    def __init__(self):
+        self.messages: List[Dict[str, Any]] = []
+
+    def write(self, data: bytes) -> None:
+        self.messages.append(json.loads(data))
+
+    async def drain(self) -> None:
+        pass
+
+def sniff_in_process(config_path: str, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Serve one sniff request in this process, without a daemon.
+
+    Used by the hook client where Unix domain sockets are unavailable.
+
+    Args:
+        config_path: Configuration file
+        request: Sniff request
+
+    Returns:
+        Messages a daemon would have sent
+    """
+    with open(config_path) as f:
+        config = yaml.safe_load(f)
+
+    async def run() -> List[Dict[str, Any]]:
+        daemon = SniffingDaemon(config)
+        try:
+            return await daemon.handle_request(request)
+        finally:
+            await daemon.orchestrator.cleanup()
+
+    return asyncio.run(run())
+
+def main() -> int:
+    """Main entry point.
+
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    parser = argparse.ArgumentParser(description="Sniffing daemon for git hooks")
+    parser.add_argument(
+        "--config",
+        default="sniffing/config/sniffing_config.yaml",
+        help="Configuration file"
+    )
+    parser.add_argument("--socket", help="Socket path")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    try:
+        with open(args.config) as f:
+            config = yaml.safe_load(f)
+
+        async def run() -> None:
+            daemon = SniffingDaemon(config, Path(args.socket) if args.socket else None)
+            await daemon.serve_forever()
+
+        asyncio.run(run())
+        return 0
+
+    except Exception as e:
+        logger.error(f"Error running sniffing daemon: {e}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,8 @@ from typing import Any, Dict, List, Optional, Set
 from git import Repo
 from git.exc import GitCommandError
 
+from .hooks.client import UNIX_SOCKETS, default_socket_path, send_request
+
 logger = logging.getLogger("git_integration")
 
 class GitIntegration:
@@ -24,6 +26,19 @@ class GitIntegration:
         self.repo = Repo(self.repo_path)
         self._setup_hooks()
 
+    @property
+    def socket_path(self) -> Optional[Path]:
+        """Get the sniffing daemon socket path.
+
+        Returns:
+            Socket path, or None where Unix domain sockets are unavailable
+            and files are sniffed directly
+        """
+        if not UNIX_SOCKETS:
+            return None
+        configured = self.config.get("daemon", {}).get("socket_path")
+        return Path(configured) if configured else default_socket_path(str(self.repo_path))
+
     def _setup_hooks(self) -> None:
         """Set up Git hooks."""
         try:
@@ -56,8 +71,8 @@ class GitIntegration:
 # Get staged files
 files=$(git diff --cached --name-only --diff-filter=ACM)
 
-# Run sniffing on staged files
-python -m sniffing.git.hooks.pre_commit $files
+# Sniff staged files through the sniffing daemon, starting it if needed
+python -m sniffing.git.hooks.client $files
 
 # Check result
 if [ $? -ne 0 ]; then
@@ -240,6 +255,21 @@ exit 0
     async def _run_sniffing(self, files: Set[Path]) -> Dict[str, Any]:
         """Run sniffing on files."""
         try:
+            # Prefer a running daemon, it has sniffers and caches warm
+            socket_path = self.socket_path
+            if socket_path is not None and socket_path.exists():
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(
+                        None,
+                        self._sniff_with_daemon,
+                        socket_path,
+                        files
+                    )
+                except (FileNotFoundError, ConnectionRefusedError):
+                    logger.info(f"Sniffing daemon not running on {socket_path}")
+                except PermissionError as e:
+                    logger.warning(f"Not using sniffing daemon: {e}")
+
             # Run sniffing command
             cmd = ["python", "-m", "sniffing"]
             cmd.extend(str(f) for f in files)
@@ -264,6 +294,37 @@ exit 0
                 "error": str(e)
             }
 
+    def _sniff_with_daemon(self, socket_path: Path, files: Set[Path]) -> Dict[str, Any]:
+        """Sniff files through the sniffing daemon.
+
+        Args:
+            socket_path: Daemon socket path
+            files: Files to sniff
+
+        Returns:
+            Sniffing result
+
+        Raises:
+            OSError: If the daemon is not reachable
+        """
+        request = {
+            "command": "sniff",
+            "files": [str((self.repo_path / f).resolve()) for f in files],
+            "fix": False
+        }
+        results = []
+        for message in send_request(socket_path, request):
+            if message["type"] == "result":
+                results.append(message)
+            else:
+                return {
+                    "status": "success" if message.get("status") == "passed" else "failure",
+                    "results": results,
+                    "summary": message
+                }
+
+        return {"status": "error", "error": "No response from sniffing daemon"}
+
     async def _run_tests(self, files: Set[Path]) -> Dict[str, Any]:
         """Run tests for files."""
         try:
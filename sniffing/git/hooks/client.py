@@ -0,0 +1,360 @@
+"""
+Thin git hook client for the sniffing daemon.
+
+Only the standard library is imported here so hooks start quickly; the
+sniffers, compiled rules and caches live in the long-running daemon started
+with ``python -m sniffing.git.daemon``.
+"""
+import argparse
+import hashlib
+import json
+import os
+import socket
+import stat
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# The daemon needs Unix domain sockets and Unix file ownership; elsewhere,
+# as on Windows, hooks sniff in-process
+UNIX_SOCKETS = hasattr(socket, "AF_UNIX") and hasattr(os, "getuid")
+
+def runtime_dir() -> Path:
+    """Get the per-user directory holding daemon sockets.
+
+    ``$XDG_RUNTIME_DIR`` when set, otherwise a directory named after the
+    user in the temporary directory. The daemon creates it with mode 0700.
+
+    Returns:
+        Runtime directory
+    """
+    xdg = os.environ.get("XDG_RUNTIME_DIR")
+    if xdg and os.path.isabs(xdg):
+        return Path(xdg) / "sniffing"
+    return Path(tempfile.gettempdir()) / f"sniffing-{os.getuid()}"
+
+def default_socket_path(repo_path: str = ".") -> Optional[Path]:
+    """Get the daemon socket path of a repository.
+
+    The path lives in the runtime directory rather than the repository
+    because Unix socket paths are limited to about 100 characters.
+
+    Args:
+        repo_path: Repository path
+
+    Returns:
+        Socket path, or None where Unix domain sockets are unavailable
+    """
+    if not UNIX_SOCKETS:
+        return None
+    repo = str(Path(repo_path).resolve())
+    digest = hashlib.sha1(repo.encode()).hexdigest()[:12]
+    return runtime_dir() / f"{digest}.sock"
+
+def check_private_dir(path: Path) -> None:
+    """Check that a directory is owned by and only writable by this user.
+
+    Args:
+        path: Directory to check
+
+    Raises:
+        PermissionError: If another user owns or can write to the directory
+    """
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"{path} is not a directory")
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by uid {info.st_uid}")
+    if info.st_mode & 0o022:
+        raise PermissionError(f"{path} is writable by other users")
+
+def ensure_private_dir(path: Path) -> None:
+    """Create a directory with mode 0700 unless it exists, then check it.
+
+    Args:
+        path: Directory to create
+
+    Raises:
+        PermissionError: If the directory exists but is not private
+    """
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    check_private_dir(path)
+
+def check_socket(socket_path: Path) -> None:
+    """Check that a socket and its directory belong to this user.
+
+    Another local user could otherwise listen on the path first and answer
+    every request with "passed".
+
+    Args:
+        socket_path: Daemon socket path
+
+    Raises:
+        FileNotFoundError: If the socket does not exist
+        PermissionError: If the socket or its directory is not this user's
+    """
+    check_private_dir(socket_path.parent)
+    info = os.lstat(socket_path)
+    if not stat.S_ISSOCK(info.st_mode):
+        raise PermissionError(f"{socket_path} is not a socket")
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"{socket_path} is owned by uid {info.st_uid}")
+
+def check_peer(sock: socket.socket) -> None:
+    """Check that the process listening on a connected socket is this user's.
+
+    Only checked where ``SO_PEERCRED`` is available, as on Linux; elsewhere
+    the ownership checks of ``check_socket`` apply.
+
+    Args:
+        sock: Connected Unix domain socket
+
+    Raises:
+        PermissionError: If the peer runs as another user
+    """
+    if not hasattr(socket, "SO_PEERCRED"):
+        return
+    credentials = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", credentials)
+    if uid != os.getuid():
+        raise PermissionError(f"Sniffing daemon runs as uid {uid}")
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Encode a protocol message as one line of JSON.
+
+    Args:
+        message: Message to encode
+
+    Returns:
+        Encoded message
+    """
+    return json.dumps(message, default=str).encode() + b"\n"
+
+def send_request(
+    socket_path: Path,
+    request: Dict[str, Any],
+    timeout: Optional[float] = None
+) -> Iterator[Dict[str, Any]]:
+    """Send a request to the daemon and stream back its messages.
+
+    Args:
+        socket_path: Daemon socket path
+        request: Request message
+        timeout: Optional timeout in seconds for each read
+
+    Yields:
+        Messages sent by the daemon, ending with its "end" message
+
+    Raises:
+        OSError: If the daemon is not reachable
+        PermissionError: If the socket or the daemon is not this user's
+        ConnectionError: If the daemon closes the connection early
+    """
+    check_socket(socket_path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        check_peer(sock)
+        sock.sendall(encode_message(request))
+
+        with sock.makefile("rb") as stream:
+            for line in stream:
+                message = json.loads(line)
+                yield message
+                if message.get("type") in ("end", "pong", "error"):
+                    return
+
+    raise ConnectionError("Daemon closed the connection")
+
+def is_running(socket_path: Path) -> bool:
+    """Check whether a daemon answers on a socket.
+
+    Args:
+        socket_path: Daemon socket path
+
+    Returns:
+        True if the daemon answered a ping
+    """
+    try:
+        return any(m.get("type") == "pong" for m in send_request(socket_path, {"command": "ping"}, 1.0))
+    except (OSError, ValueError):
+        return False
+
+def spawn_daemon(socket_path: Path, config_path: str, timeout: float) -> bool:
+    """Start a daemon in the background and wait for it to listen.
+
+    Args:
+        socket_path: Socket path the daemon listens on
+        config_path: Daemon configuration file
+        timeout: Seconds to wait for the daemon to come up
+
+    Returns:
+        True if the daemon is running
+    """
+    subprocess.Popen(
+        [
+            sys.executable, "-m", "sniffing.git.daemon",
+            "--socket", str(socket_path),
+            "--config", config_path
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if is_running(socket_path):
+            return True
+        time.sleep(0.05)
+    return False
+
+def sniff_request(
+    files: List[str],
+    domains: Optional[List[str]] = None,
+    fix: bool = False
+) -> Dict[str, Any]:
+    """Build a sniff request.
+
+    Args:
+        files: Files to sniff
+        domains: Optional domains to sniff with
+        fix: Whether to fix issues
+
+    Returns:
+        Request message
+    """
+    return {
+        "command": "sniff",
+        "files": [str(Path(file).resolve()) for file in files],
+        "domains": domains,
+        "fix": fix
+    }
+
+def check_files(
+    socket_path: Path,
+    files: List[str],
+    domains: Optional[List[str]] = None,
+    fix: bool = False,
+    timeout: Optional[float] = None,
+    verbose: bool = False
+) -> int:
+    """Sniff files through the daemon and print the issues found.
+
+    Args:
+        socket_path: Daemon socket path
+        files: Files to sniff
+        domains: Optional domains to sniff with
+        fix: Whether the daemon should fix issues
+        timeout: Optional timeout in seconds for each read
+        verbose: Whether to print every issue rather than critical ones only
+
+    Returns:
+        Exit code (0 if no critical issues were found, 1 otherwise)
+
+    Raises:
+        OSError: If the daemon is not reachable
+    """
+    return report(send_request(socket_path, sniff_request(files, domains, fix), timeout), verbose)
+
+def report(messages: Iterable[Dict[str, Any]], verbose: bool = False) -> int:
+    """Print the issues of a sniff response.
+
+    Args:
+        messages: Messages of the response
+        verbose: Whether to print every issue rather than critical ones only
+
+    Returns:
+        Exit code (0 if no critical issues were found, 1 otherwise)
+    """
+    for message in messages:
+        if message["type"] == "result":
+            for issue in message["result"].get("issues", []):
+                if verbose or issue.get("severity") == "critical":
+                    print(
+                        f"{message['file']}: [{message['domain']}] "
+                        f"{issue.get('severity', 'unknown')}: {issue.get('message', issue.get('type', ''))}",
+                        file=sys.stderr
+                    )
+        elif message["type"] == "end":
+            if message.get("status") == "error":
+                print(f"Sniffing failed: {message.get('error')}", file=sys.stderr)
+                return 1
+            return 0 if message.get("status") == "passed" else 1
+        elif message["type"] == "error":
+            print(f"Sniffing failed: {message.get('error')}", file=sys.stderr)
+            return 1
+
+    return 1
+
+def main() -> int:
+    """Main entry point.
+
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    parser = argparse.ArgumentParser(description="Sniff changed files through the sniffing daemon")
+    parser.add_argument("files", nargs="*", help="Files to sniff")
+    parser.add_argument("--socket", help="Daemon socket path")
+    parser.add_argument(
+        "--config",
+        default="sniffing/config/sniffing_config.yaml",
+        help="Configuration file for a spawned daemon"
+    )
+    parser.add_argument("--domains", nargs="*", help="Domains to sniff with")
+    parser.add_argument("--fix", action="store_true", help="Fix issues")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Read timeout in seconds")
+    parser.add_argument(
+        "--no-spawn",
+        action="store_true",
+        help="Do not start a daemon when none is running"
+    )
+    parser.add_argument(
+        "--start-timeout",
+        type=float,
+        default=30.0,
+        help="Seconds to wait for a spawned daemon"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Print all issues")
+    args = parser.parse_args()
+
+    files = [file for file in args.files if Path(file).is_file()]
+    if not files:
+        return 0
+
+    if not UNIX_SOCKETS:
+        from ..daemon import sniff_in_process
+        return report(sniff_in_process(args.config, sniff_request(files, args.domains, args.fix)), args.verbose)
+
+    socket_path = Path(args.socket) if args.socket else default_socket_path()
+    try:
+        return check_files(socket_path, files, args.domains, args.fix, args.timeout, args.verbose)
+    except (FileNotFoundError, ConnectionRefusedError):
+        # No daemon listening, start one unless asked not to
+        if args.no_spawn:
+            print(f"Sniffing daemon not running on {socket_path}", file=sys.stderr)
+            return 1
+    except PermissionError as e:
+        print(f"Refusing to use sniffing daemon socket: {e}", file=sys.stderr)
+        return 1
+    except OSError as e:
+        print(f"Error contacting sniffing daemon: {e}", file=sys.stderr)
+        return 1
+
+    if not spawn_daemon(socket_path, args.config, args.start_timeout):
+        print(f"Sniffing daemon failed to start on {socket_path}", file=sys.stderr)
+        return 1
+
+    try:
+        return check_files(socket_path, files, args.domains, args.fix, args.timeout, args.verbose)
+    except OSError as e:
+        print(f"Error contacting sniffing daemon: {e}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,14 @@
 """
 Documentation runner for documentation quality and completeness checks.
 """
+import ast
 import asyncio
 import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Set
 
 from .base import BaseRunner
+from ....core.utils.file_context import FileContext
 from ...server.config import ServerConfig
 
 logger = logging.getLogger("documentation_runner")
@@ -91,16 +93,19 @@ class DocumentationRunner(BaseRunner):
                 "coverage": {}
             }
 
+            # Read and parse each file once for all checks
+            contexts = {file: FileContext(file) for file in files}
+
             # Check documentation
-            doc_results = await self._check_documentation(files)
+            doc_results = await self._check_documentation(files, contexts)
             results["documentation"] = doc_results
 
             # Check style
-            style_results = await self._check_style(files)
+            style_results = await self._check_style(files, contexts)
             results["style"] = style_results
 
             # Check completeness
-            completeness_results = await self._check_completeness(files)
+            completeness_results = await self._check_completeness(files, contexts)
             results["completeness"] = completeness_results
 
             # Calculate coverage
@@ -108,7 +113,8 @@ class DocumentationRunner(BaseRunner):
                 files,
                 doc_results,
                 style_results,
-                completeness_results
+                completeness_results,
+                contexts
             )
             results["coverage"] = coverage
 
@@ -134,12 +140,14 @@ class DocumentationRunner(BaseRunner):
 
     async def _check_documentation(
         self,
-        files: List[str]
+        files: List[str],
+        contexts: Optional[Dict[str, FileContext]] = None
     ) -> Dict[str, Any]:
         """Check documentation quality.
 
         Args:
             files: Files to check
+            contexts: Optional file contexts keyed by file
 
         Returns:
             Documentation check results
@@ -154,7 +162,10 @@ class DocumentationRunner(BaseRunner):
 
             for file in files:
                 # Check file documentation
-                file_results = await self._check_file_documentation(file)
+                file_results = await self._check_file_documentation(
+                    file,
+                    (contexts or {}).get(file)
+                )
                 results["issues"].extend(file_results.get("issues", []))
 
             # Update status
@@ -172,12 +183,14 @@ class DocumentationRunner(BaseRunner):
 
     async def _check_file_documentation(
         self,
-        file: str
+        file: str,
+        context: Optional[FileContext] = None
     ) -> Dict[str, Any]:
         """Check file documentation.
 
         Args:
             file: File to check
+            context: Optional file context, created if not given
 
         Returns:
             File documentation results
@@ -188,18 +201,20 @@ class DocumentationRunner(BaseRunner):
                 "issues": []
             }
 
-            # Read file content
-            with open(file, "r") as f:
-                content = f.read()
+            if context is None:
+                context = FileContext(file)
 
-            # Parse AST
-            import ast
-            tree = ast.parse(content)
+            # Collect definitions once and share them across patterns
+            definitions = context.derived("doc_definitions", _collect_definitions)
+            undocumented = [
+                definition for definition in definitions
+                if not definition["docstring"]
+            ]
 
             # Check each pattern
             for pattern_id, pattern in self.doc_patterns.items():
                 matches = await self._check_doc_pattern(
-                    tree,
+                    undocumented,
                     pattern
                 )
                 if matches:
@@ -227,55 +242,27 @@ class DocumentationRunner(BaseRunner):
 
     async def _check_doc_pattern(
         self,
-        tree: Any,
+        undocumented: List[Dict[str, Any]],
         pattern: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
-        """Check AST for documentation pattern.
+        """Check undocumented definitions for documentation pattern.
 
         Args:
-            tree: AST to check
+            undocumented: Definitions without a docstring
             pattern: Pattern to check for
 
         Returns:
             List of pattern matches
         """
         try:
-            matches = []
-
-            class DocVisitor(ast.NodeVisitor):
-                def __init__(self, pattern):
-                    self.pattern = pattern
-                    self.matches = []
-
-                def visit_FunctionDef(self, node):
-                    if not ast.get_docstring(node):
-                        self.matches.append({
-                            "node": node,
-                            "type": "function",
-                            "name": node.name
-                        })
-                    self.generic_visit(node)
-
-                def visit_ClassDef(self, node):
-                    if not ast.get_docstring(node):
-                        self.matches.append({
-                            "node": node,
-                            "type": "class",
-                            "name": node.name
-                        })
-                    self.generic_visit(node)
-
-                def visit_Module(self, node):
-                    if not ast.get_docstring(node):
-                        self.matches.append({
-                            "node": node,
-                            "type": "module"
-                        })
-                    self.generic_visit(node)
-
-            visitor = DocVisitor(pattern)
-            visitor.visit(tree)
-            return visitor.matches
+            return [
+                {
+                    key: value
+                    for key, value in definition.items()
+                    if key != "docstring" and value is not None
+                }
+                for definition in undocumented
+            ]
 
         except Exception as e:
             logger.error(f"Error checking pattern: {e}")
@@ -283,12 +270,14 @@ class DocumentationRunner(BaseRunner):
 
     async def _check_style(
         self,
-        files: List[str]
+        files: List[str],
+        contexts: Optional[Dict[str, FileContext]] = None
     ) -> Dict[str, Any]:
         """Check documentation style.
 
         Args:
             files: Files to check
+            contexts: Optional file contexts keyed by file
 
         Returns:
             Style check results
@@ -303,7 +292,10 @@ class DocumentationRunner(BaseRunner):
 
             for file in files:
                 # Check file style
-                file_results = await self._check_file_style(file)
+                file_results = await self._check_file_style(
+                    file,
+                    (contexts or {}).get(file)
+                )
                 results["issues"].extend(file_results.get("issues", []))
 
             # Update status
@@ -321,12 +313,14 @@ class DocumentationRunner(BaseRunner):
 
     async def _check_file_style(
         self,
-        file: str
+        file: str,
+        context: Optional[FileContext] = None
     ) -> Dict[str, Any]:
         """Check file documentation style.
 
         Args:
             file: File to check
+            context: Optional file context, created if not given
 
         Returns:
             File style results
@@ -337,9 +331,9 @@ class DocumentationRunner(BaseRunner):
                 "issues": []
             }
 
-            # Read file content
-            with open(file, "r") as f:
-                content = f.read()
+            if context is None:
+                context = FileContext(file)
+            content = context.text
 
             # Check each rule
             for rule_id, rule in self.style_rules.items():
@@ -407,12 +401,14 @@ class DocumentationRunner(BaseRunner):
 
     async def _check_completeness(
         self,
-        files: List[str]
+        files: List[str],
+        contexts: Optional[Dict[str, FileContext]] = None
     ) -> Dict[str, Any]:
         """Check documentation completeness.
 
         Args:
             files: Files to check
+            contexts: Optional file contexts keyed by file
 
         Returns:
             Completeness check results
@@ -427,7 +423,10 @@ class DocumentationRunner(BaseRunner):
 
             for file in files:
                 # Check file completeness
-                file_results = await self._check_file_completeness(file)
+                file_results = await self._check_file_completeness(
+                    file,
+                    (contexts or {}).get(file)
+                )
                 results["issues"].extend(file_results.get("issues", []))
 
             # Update status
@@ -445,12 +444,14 @@ class DocumentationRunner(BaseRunner):
 
     async def _check_file_completeness(
         self,
-        file: str
+        file: str,
+        context: Optional[FileContext] = None
     ) -> Dict[str, Any]:
         """Check file documentation completeness.
 
         Args:
             file: File to check
+            context: Optional file context, created if not given
 
         Returns:
             File completeness results
@@ -461,18 +462,20 @@ class DocumentationRunner(BaseRunner):
                 "issues": []
             }
 
-            # Read file content
-            with open(file, "r") as f:
-                content = f.read()
+            if context is None:
+                context = FileContext(file)
 
-            # Parse AST
-            import ast
-            tree = ast.parse(content)
+            # Only documented classes and functions are checked for sections
+            documented = [
+                definition
+                for definition in context.derived("doc_definitions", _collect_definitions)
+                if definition["docstring"] and definition["type"] != "module"
+            ]
 
             # Check each rule
             for rule_id, rule in self.completeness_rules.items():
                 violations = await self._check_completeness_rule(
-                    tree,
+                    documented,
                     rule
                 )
                 if violations:
@@ -501,13 +504,13 @@ class DocumentationRunner(BaseRunner):
 
     async def _check_completeness_rule(
         self,
-        tree: Any,
+        documented: List[Dict[str, Any]],
         rule: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
-        """Check AST for completeness rule.
+        """Check documented definitions for completeness rule.
 
         Args:
-            tree: AST to check
+            documented: Classes and functions with a docstring
             rule: Rule to check for
 
         Returns:
@@ -515,49 +518,22 @@ class DocumentationRunner(BaseRunner):
         """
         try:
             violations = []
+            sections = rule.get("required_sections", [])
+
+            for definition in documented:
+                missing = [
+                    section for section in sections
+                    if section not in definition["docstring"]
+                ]
+                if missing:
+                    violations.append({
+                        "node": definition["node"],
+                        "type": definition["type"],
+                        "name": definition["name"],
+                        "missing": missing
+                    })
 
-            class CompletenessVisitor(ast.NodeVisitor):
-                def __init__(self, rule):
-                    self.rule = rule
-                    self.violations = []
-
-                def visit_FunctionDef(self, node):
-                    docstring = ast.get_docstring(node)
-                    if docstring:
-                        # Check required sections
-                        missing = []
-                        for section in self.rule.get("required_sections", []):
-                            if section not in docstring:
-                                missing.append(section)
-                        if missing:
-                            self.violations.append({
-                                "node": node,
-                                "type": "function",
-                                "name": node.name,
-                                "missing": missing
-                            })
-                    self.generic_visit(node)
-
-                def visit_ClassDef(self, node):
-                    docstring = ast.get_docstring(node)
-                    if docstring:
-                        # Check required sections
-                        missing = []
-                        for section in self.rule.get("required_sections", []):
-                            if section not in docstring:
-                                missing.append(section)
-                        if missing:
-                            self.violations.append({
-                                "node": node,
-                                "type": "class",
-                                "name": node.name,
-                                "missing": missing
-                            })
-                    self.generic_visit(node)
-
-            visitor = CompletenessVisitor(rule)
-            visitor.visit(tree)
-            return visitor.violations
+            return violations
 
         except Exception as e:
             logger.error(f"Error checking rule: {e}")
@@ -568,7 +544,8 @@ class DocumentationRunner(BaseRunner):
         files: List[str],
         doc_results: Dict[str, Any],
         style_results: Dict[str, Any],
-        completeness_results: Dict[str, Any]
+        completeness_results: Dict[str, Any],
+        contexts: Optional[Dict[str, FileContext]] = None
     ) -> Dict[str, Any]:
         """Calculate documentation coverage.
 
@@ -577,6 +554,7 @@ class DocumentationRunner(BaseRunner):
             doc_results: Documentation check results
             style_results: Style check results
             completeness_results: Completeness check results
+            contexts: Optional file contexts keyed by file
 
         Returns:
             Coverage metrics
@@ -587,40 +565,14 @@ class DocumentationRunner(BaseRunner):
             documented_elements = 0
 
             for file in files:
-                # Parse AST
-                with open(file, "r") as f:
-                    content = f.read()
-                    import ast
-                    tree = ast.parse(content)
+                context = (contexts or {}).get(file) or FileContext(file)
 
                 # Count elements
-                class ElementCounter(ast.NodeVisitor):
-                    def __init__(self):
-                        self.total = 0
-                        self.documented = 0
-
-                    def visit_FunctionDef(self, node):
-                        self.total += 1
-                        if ast.get_docstring(node):
-                            self.documented += 1
-                        self.generic_visit(node)
-
-                    def visit_ClassDef(self, node):
-                        self.total += 1
-                        if ast.get_docstring(node):
-                            self.documented += 1
-                        self.generic_visit(node)
-
-                    def visit_Module(self, node):
-                        self.total += 1
-                        if ast.get_docstring(node):
-                            self.documented += 1
-                        self.generic_visit(node)
-
-                counter = ElementCounter()
-                counter.visit(tree)
-                total_elements += counter.total
-                documented_elements += counter.documented
+                definitions = context.derived("doc_definitions", _collect_definitions)
+                total_elements += len(definitions)
+                documented_elements += sum(
+                    1 for definition in definitions if definition["docstring"]
+                )
 
             return {
                 "total_elements": total_elements,
@@ -642,3 +594,45 @@ class DocumentationRunner(BaseRunner):
                 "style_violations": 0,
                 "completeness_violations": 0
             }
+
+def _collect_definitions(context: FileContext) -> List[Dict[str, Any]]:
+    """Collect the module, classes and functions of a file in one traversal.
+
+    Args:
+        context: File context to collect from
+
+    Returns:
+        List of definitions with their node, type, name and docstring
+    """
+    definitions = []
+
+    class DefinitionVisitor(ast.NodeVisitor):
+        def visit_FunctionDef(self, node):
+            definitions.append({
+                "node": node,
+                "type": "function",
+                "name": node.name,
+                "docstring": ast.get_docstring(node)
+            })
+            self.generic_visit(node)
+
+        def visit_ClassDef(self, node):
+            definitions.append({
+                "node": node,
+                "type": "class",
+                "name": node.name,
+                "docstring": ast.get_docstring(node)
+            })
+            self.generic_visit(node)
+
+        def visit_Module(self, node):
+            definitions.append({
+                "node": node,
+                "type": "module",
+                "name": None,
+                "docstring": ast.get_docstring(node)
+            })
+            self.generic_visit(node)
+
+    DefinitionVisitor().visit(context.tree)
+    return definitions
@@ -8,7 +8,13 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
 from ...core.base_sniffer import BaseSniffer, SnifferType, SniffingResult
+from ...core.utils.cache import DEFAULT_CACHE_PATH, ResultCache, sniffer_cache_key
+from ...core.utils.file_context import FileContext
+from ...core.utils.file_lock import create_lock_table
+from ...core.utils.file_watcher import FileWatcher, create_file_watcher
+from ...core.utils.result import SniffingResult as CachedResult
 from ..ai.ai_analyzer import AIAnalyzer
+from .test_orchestrator import orchestration_config
 
 logger = logging.getLogger("sniffing_loop")
 
@@ -18,10 +24,22 @@ class SniffingLoop:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.active_sniffers: Dict[str, BaseSniffer] = {}
-        self.file_queue: asyncio.Queue = asyncio.Queue()
+        # Bounded so a burst of changes holds the watcher back instead of
+        # growing the queue
+        self.watcher_config = config.get("file_watcher", {})
+        self.file_queue: asyncio.Queue = asyncio.Queue(
+            maxsize=self.watcher_config.get("max_queue_size", 0)
+        )
+        self.queued_files: Set[str] = set()
+        self.watcher: Optional[FileWatcher] = None
         self.domain_queues: Dict[str, asyncio.Queue] = {}
-        self.file_locks: Dict[str, asyncio.Lock] = {}
+        self.file_locks = create_lock_table(config.get("file_locks", {}))
         self.results_cache: Dict[str, Dict[str, Any]] = {}
+        cache_config = orchestration_config(config).get("result_cache", {})
+        self.result_cache = ResultCache(
+            cache_config.get("path", DEFAULT_CACHE_PATH),
+            cache_config.get("ttl")
+        )
         self.ai_analyzer = AIAnalyzer(config.get("ai", {}))
         self.is_running = False
         self.report_path = Path(config.get("report_path", "reports"))
@@ -57,6 +75,15 @@ class SniffingLoop:
             file_worker = asyncio.create_task(self._file_worker())
             workers.append(file_worker)
 
+            # Queue changed files as they are saved
+            if self.watcher_config.get("enabled", False):
+                self.watcher = create_file_watcher(
+                    self.watcher_config,
+                    self.config.get("workspace_path", "."),
+                    self.add_files
+                )
+                await self.watcher.start()
+
             # Wait for workers
             await asyncio.gather(*workers)
 
@@ -67,11 +94,15 @@ class SniffingLoop:
     async def stop(self) -> None:
         """Stop the sniffing loop."""
         self.is_running = False
+        if self.watcher:
+            await self.watcher.stop()
+            self.watcher = None
         logger.info("Stopping sniffing loop")
 
     async def add_file(self, file: str, domains: Optional[List[str]] = None) -> None:
         """Add a file to the sniffing queue."""
         try:
+            self.queued_files.add(file)
             await self.file_queue.put({
                 "file": file,
                 "domains": domains,
@@ -82,6 +113,29 @@ class SniffingLoop:
         except Exception as e:
             logger.error(f"Error adding file to queue: {e}")
 
+    async def add_files(self, files: List[str], domains: Optional[List[str]] = None) -> int:
+        """Add a batch of changed files to the sniffing queue.
+
+        Files still waiting in the queue are not queued again. Waits while
+        the queue is full, which holds back the file watcher.
+
+        Args:
+            files: Files to sniff
+            domains: Optional list of domains to sniff
+
+        Returns:
+            Number of files queued
+        """
+        queued = 0
+        for file in files:
+            if file in self.queued_files:
+                continue
+            await self.add_file(file, domains)
+            queued += 1
+
+        logger.info(f"Queued {queued} of {len(files)} changed files")
+        return queued
+
     async def _file_worker(self) -> None:
         """Process files from the queue."""
         try:
@@ -90,12 +144,9 @@ class SniffingLoop:
                 file_data = await self.file_queue.get()
                 file = file_data["file"]
                 domains = file_data["domains"]
+                self.queued_files.discard(file)
 
-                # Get or create file lock
-                if file not in self.file_locks:
-                    self.file_locks[file] = asyncio.Lock()
-
-                async with self.file_locks[file]:
+                async with self.file_locks.lock(file):
                     # Run sniffing on file
                     result = await self._sniff_file(file, domains)
 
@@ -145,11 +196,19 @@ class SniffingLoop:
             if not domains:
                 domains = list(self.domain_queues.keys())
 
+            # Read and parse the file once for all domains
+            context = FileContext(file)
+
             # Run sniffing for each domain
             for domain in domains:
                 sniffer = self.active_sniffers.get(domain)
                 if sniffer:
-                    result = await sniffer.sniff_file(file)
+                    result = await self._sniff_file_cached(
+                        domain,
+                        sniffer,
+                        file,
+                        context
+                    )
                     results.append(result)
                     issues.extend(result.issues)
                     self._update_metrics(metrics, result.metrics)
@@ -175,6 +234,35 @@ class SniffingLoop:
                 "error": str(e)
             }
 
+    async def _sniff_file_cached(
+        self,
+        domain: str,
+        sniffer: BaseSniffer,
+        file: str,
+        context: FileContext
+    ) -> Any:
+        """Sniff a file, reusing the cached result for unchanged content."""
+        rule_version = getattr(sniffer, "rule_set_version", None)
+        if rule_version is None:
+            return await sniffer.sniff_file(file, context)
+
+        try:
+            content_hash = context.content_hash
+        except OSError as e:
+            logger.warning(f"Sniffing {file} without cache: {e}")
+            return await sniffer.sniff_file(file, context)
+
+        path_key = sniffer_cache_key(sniffer, file)
+        cached = self.result_cache.get(content_hash, domain, rule_version, path_key)
+        if cached is not None:
+            return CachedResult.from_dict(cached, file)
+
+        result = await sniffer.sniff_file(file, context)
+        # Failures are not cached, so a transient error is retried
+        if isinstance(result, CachedResult) and result.status:
+            self.result_cache.set(content_hash, domain, rule_version, result.to_dict(), path_key)
+        return result
+
     async def _sniff_domain(self, domain: str, file: str) -> Dict[str, Any]:
         """Run domain-specific sniffing on a file."""
         try:
@@ -258,3 +346,18 @@ class SniffingLoop:
                 metrics[key] = metrics.get(key, 0) + value
             else:
                 metrics[key] = value
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get queue and file watcher metrics.
+
+        Returns:
+            Dictionary of sniffing loop metrics
+        """
+        return {
+            "queued_files": self.file_queue.qsize(),
+            "max_queue_size": self.file_queue.maxsize,
+            "queue_full": self.file_queue.full(),
+            "cached_results": len(self.results_cache),
+            "file_locks": self.file_locks.get_metrics(),
+            "file_watcher": self.watcher.get_metrics() if self.watcher else {}
+        }
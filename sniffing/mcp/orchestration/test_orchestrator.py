@@ -2,18 +2,22 @@
 Enhanced test orchestrator for managing and scheduling sniffing operations.
 """
 import asyncio
+import itertools
 import logging
+import time
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
-
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from ...core.utils.cache import DEFAULT_CACHE_PATH, ResultCache, sniffer_cache_key
+from ...core.utils.executor import SniffingExecutor, create_executor
+from ...core.utils.file_context import FileContext
+from ...core.utils.file_lock import create_lock_table
+from ...core.utils.job_history import JobHistory, create_job_history
+from ...core.utils.registry import LazySniffers
 from ...core.utils.result import SniffingResult
-from ...domains.security.security_sniffer import SecuritySniffer
-from ...domains.browser.browser_sniffer import BrowserSniffer
-from ...domains.functional.functional_sniffer import FunctionalSniffer
-from ...domains.unit.unit_sniffer import UnitSniffer
-from ...domains.documentation.documentation_sniffer import DocumentationSniffer
 
 logger = logging.getLogger("test_orchestrator")
 
@@ -29,6 +33,24 @@ class TestJob:
     status: str = "pending"
     results: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    on_result: Optional[Callable[[str, str, Dict[str, Any]], Awaitable[None]]] = None
+
+def orchestration_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the orchestration section of a sniffing configuration.
+
+    The section lives under ``mcp`` in ``sniffing_config.yaml``; a top-level
+    ``orchestration`` section is still read when there is none there.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        Orchestration configuration
+    """
+    section = config.get("mcp", {}).get("orchestration")
+    if section is None:
+        section = config.get("orchestration", {})
+    return section
 
 class TestOrchestrator:
     """Enhanced test orchestrator for managing sniffing operations."""
@@ -40,45 +62,117 @@ class TestOrchestrator:
             config: Configuration dictionary
         """
         self.config = config
+        self.orchestration_config = orchestration_config(config)
         self.job_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._job_sequence = itertools.count()
         self.active_jobs: Dict[str, TestJob] = {}
-        self.completed_jobs: Dict[str, TestJob] = {}
-        self.domain_locks: Dict[str, asyncio.Lock] = {}
-        self.file_locks: Dict[str, asyncio.Lock] = {}
+        self.completed_jobs: JobHistory = create_job_history(
+            self.orchestration_config.get("job_history", {}),
+            "reports/history/jobs"
+        )
+        self.file_locks = create_lock_table(self.orchestration_config.get("file_locks", {}))
         self.sniffers = self._initialize_sniffers()
-        self.max_concurrent_jobs = config.get("orchestration", {}).get("max_concurrent_jobs", 4)
+        self.result_cache = self._initialize_result_cache()
+        self.executor = self._initialize_executor()
+        self.max_concurrent_jobs = self.orchestration_config.get("max_concurrent_jobs", 4)
         self.job_semaphore = asyncio.Semaphore(self.max_concurrent_jobs)
-        self._setup_domain_locks()
 
-    def _initialize_sniffers(self) -> Dict[str, Any]:
+        # Pipeline of (file, domain) work items
+        parallel_jobs = config.get("global", {}).get("parallel_jobs", 4)
+        self.pipeline_workers = self.orchestration_config.get("pipeline_workers", parallel_jobs)
+        self.pipeline_queue_size = self.orchestration_config.get(
+            "pipeline_queue_size",
+            self.pipeline_workers * 2
+        )
+        self.domain_limits: Dict[str, int] = {}
+        self.domain_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.domain_in_flight: Dict[str, int] = {}
+        self._setup_domain_limits(
+            self.orchestration_config.get("domain_concurrency", parallel_jobs)
+        )
+
+        # Throughput tracking
+        self.throughput_window = self.orchestration_config.get("throughput_window", 60)
+        self.items_completed = 0
+        self._completion_times: Deque[float] = deque()
+
+    def _initialize_sniffers(self) -> LazySniffers:
         """Initialize domain-specific sniffers.
 
+        Sniffers are imported and constructed when a job first needs them.
+
         Returns:
-            Dictionary of initialized sniffers
+            Mapping of domain to sniffer
         """
         try:
-            return {
-                "security": SecuritySniffer(self.config["domains"]["security"]),
-                "browser": BrowserSniffer(self.config["domains"]["browser"]),
-                "functional": FunctionalSniffer(self.config["domains"]["functional"]),
-                "unit": UnitSniffer(self.config["domains"]["unit"]),
-                "documentation": DocumentationSniffer(self.config["domains"]["documentation"])
-            }
+            return LazySniffers(self.config["domains"])
         except Exception as e:
             logger.error(f"Error initializing sniffers: {e}")
             raise
 
-    def _setup_domain_locks(self) -> None:
-        """Set up locks for each domain."""
+    def _initialize_result_cache(self) -> Optional[ResultCache]:
+        """Initialize the incremental result cache.
+
+        Returns:
+            Result cache, or None if disabled
+        """
+        try:
+            cache_config = self.orchestration_config.get("result_cache", {})
+            if not cache_config.get("enabled", True):
+                return None
+
+            return ResultCache(
+                cache_config.get("path", DEFAULT_CACHE_PATH),
+                cache_config.get("ttl")
+            )
+
+        except Exception as e:
+            logger.error(f"Error initializing result cache: {e}")
+            return None
+
+    def _initialize_executor(self) -> SniffingExecutor:
+        """Initialize the sniffing execution backend.
+
+        Returns:
+            Sniffing executor sized from ``global.parallel_jobs``
+        """
+        global_config = self.config.get("global", {})
+        backend = global_config.get("executor", "inline")
+        try:
+            return create_executor(
+                backend,
+                self.sniffers,
+                workers=global_config.get("parallel_jobs", 1),
+                batch_size=global_config.get("executor_batch_size", 8)
+            )
+
+        except Exception as e:
+            logger.error(f"Error initializing {backend} executor: {e}")
+            return create_executor("inline", self.sniffers)
+
+    def _setup_domain_limits(self, concurrency: Any) -> None:
+        """Set up concurrency limits for each domain.
+
+        Args:
+            concurrency: Limit for every domain, or mapping of domain to limit
+        """
         for domain in self.sniffers:
-            self.domain_locks[domain] = asyncio.Lock()
+            if isinstance(concurrency, dict):
+                limit = concurrency.get(domain, 1)
+            else:
+                limit = concurrency
+
+            self.domain_limits[domain] = max(1, limit)
+            self.domain_semaphores[domain] = asyncio.Semaphore(self.domain_limits[domain])
+            self.domain_in_flight[domain] = 0
 
     async def run_tests(
         self,
         files: List[str],
         domains: Optional[List[str]] = None,
         priority: int = 1,
-        fix: bool = True
+        fix: bool = True,
+        on_result: Optional[Callable[[str, str, Dict[str, Any]], Awaitable[None]]] = None
     ) -> Dict[str, Any]:
         """Run tests on specified files.
 
@@ -87,23 +181,27 @@ class TestOrchestrator:
             domains: Optional list of domains to test
             priority: Job priority (lower is higher priority)
             fix: Whether to fix issues
+            on_result: Optional callback receiving (file, domain, result) as
+                each result completes; the job then keeps only a summary
 
         Returns:
             Test results
         """
         try:
-            # Create job
+            # Create job, ids stay unique in long-running processes
+            sequence = next(self._job_sequence)
             job = TestJob(
-                id=f"job_{len(self.active_jobs)}",
+                id=f"job_{sequence}",
                 files=files,
                 domains=domains or list(self.sniffers.keys()),
                 priority=priority,
                 fix=fix,
-                created_at=datetime.now()
+                created_at=datetime.now(),
+                on_result=on_result
             )
 
             # Queue job
-            await self.job_queue.put((priority, job))
+            await self.job_queue.put((priority, sequence, job))
             self.active_jobs[job.id] = job
 
             # Process job
@@ -112,8 +210,7 @@ class TestOrchestrator:
             # Update job status
             job.status = "completed"
             job.results = results
-            self.completed_jobs[job.id] = job
-            del self.active_jobs[job.id]
+            await self._complete_job(job)
 
             return {
                 "job_id": job.id,
@@ -126,8 +223,7 @@ class TestOrchestrator:
             if job.id in self.active_jobs:
                 job.status = "failed"
                 job.error = str(e)
-                self.completed_jobs[job.id] = job
-                del self.active_jobs[job.id]
+                await self._complete_job(job)
             return {
                 "status": "failed",
                 "error": str(e)
@@ -136,6 +232,15 @@ class TestOrchestrator:
     async def _process_job(self, job: TestJob) -> Dict[str, Any]:
         """Process a test job.
 
+        Work items are fed through a bounded queue to a pool of pipeline
+        workers; per-domain semaphores, shared by all jobs, cap how many items
+        of a domain run at once. Without fixing, a work item is up to the
+        executor's batch size of files with all domains, sent to the executor
+        in one call so a pool worker reads each file once. When fixing, each
+        file's domains form one work item sniffed a domain at a time, so that
+        every domain sees the previous domain's fixes, as ``fix_issues``
+        requires.
+
         Args:
             job: Test job to process
 
@@ -144,42 +249,337 @@ class TestOrchestrator:
         """
         try:
             async with self.job_semaphore:
-                results = {}
+                # The queue holds jobs waiting for a slot
+                self.job_queue.get_nowait()
+
+                if job.on_result is None:
+                    results = {file: {} for file in job.files}
+                else:
+                    results = {"files": len(job.files), "results": 0, "issues": 0}
+                queue: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_queue_size)
+                domains = [
+                    domain for domain in job.domains
+                    if domain in self.sniffers
+                    and self.sniffers.configs[domain].get("enabled", True)
+                ]
+                batch_size = 1 if job.fix else self.executor.batch_size
+                batches = [
+                    job.files[start:start + batch_size]
+                    for start in range(0, len(job.files), batch_size)
+                ] if domains else []
+                workers = max(1, min(self.pipeline_workers, len(batches)))
+
+                async def produce() -> None:
+                    for files in batches:
+                        await queue.put(files)
+
+                    for _ in range(workers):
+                        await queue.put(None)
+
+                async def work() -> None:
+                    while True:
+                        files = await queue.get()
+                        if files is None:
+                            return
+                        if job.fix:
+                            await self._process_item(job, files[0], domains, results)
+                        else:
+                            await self._process_batch(job, files, domains, results)
+
+                await asyncio.gather(produce(), *(work() for _ in range(workers)))
+                return results
 
-                # Process each file
-                for file in job.files:
-                    # Get or create file lock
-                    if file not in self.file_locks:
-                        self.file_locks[file] = asyncio.Lock()
+        except Exception as e:
+            logger.error(f"Error processing job {job.id}: {e}")
+            raise
 
-                    async with self.file_locks[file]:
-                        file_results = {}
+    async def _process_item(
+        self,
+        job: TestJob,
+        file: str,
+        domains: List[str],
+        results: Dict[str, Any]
+    ) -> None:
+        """Sniff a file with one or more domains in order.
 
-                        # Process each domain
-                        for domain in job.domains:
-                            if domain not in self.sniffers:
-                                continue
+        Args:
+            job: Job the work item belongs to
+            file: File to sniff
+            domains: Domains to sniff the file with, in order
+            results: Job results to record into
+        """
+        done: List[str] = []
+        try:
+            if not job.fix:
+                await self._sniff_domains(job, file, domains, results, done)
+                return
 
-                            sniffer = self.sniffers[domain]
-                            if not sniffer.config.get("enabled", True):
-                                continue
+            # Fixes rewrite the file, so other jobs must not interleave
+            async with self.file_locks.lock(file):
+                await self._sniff_domains(job, file, domains, results, done)
 
-                            async with self.domain_locks[domain]:
-                                # Run sniffing
-                                result = await sniffer.sniff_file(file)
-                                file_results[domain] = result.to_dict()
+        except Exception as e:
+            logger.error(f"Error processing {file} in job {job.id}: {e}")
+            for domain in domains:
+                if domain not in done:
+                    await self._record_result(
+                        job,
+                        file,
+                        domain,
+                        SniffingResult(
+                            file,
+                            domain,
+                            status=False,
+                            metrics={"error": str(e)}
+                        ).to_dict(),
+                        results
+                    )
+
+    async def _process_batch(
+        self,
+        job: TestJob,
+        files: List[str],
+        domains: List[str],
+        results: Dict[str, Any]
+    ) -> None:
+        """Sniff several files with several domains in one executor call.
 
-                                # Fix issues if requested
-                                if job.fix and result.has_issues():
-                                    await sniffer.fix_issues(result.issues)
+        Cached results are recorded first; the misses go to the executor as
+        one work item per file. The batch holds a slot of each of its domains
+        while it runs, taken in sorted order so batches cannot deadlock, and
+        results are recorded as the executor streams them back.
 
-                        results[file] = file_results
+        Args:
+            job: Job the work item belongs to
+            files: Files to sniff
+            domains: Domains to sniff the files with
+            results: Job results to record into
+        """
+        contexts = {file: FileContext(file) for file in files}
+        hashes = {file: self._content_hash(contexts[file]) for file in files}
+        pending: Dict[str, List[str]] = {}
+        for file in files:
+            for domain in domains:
+                result = self._get_cached_result(domain, file, hashes[file])
+                if result is None:
+                    pending.setdefault(file, []).append(domain)
+                else:
+                    await self._record_result(job, file, domain, result.to_dict(), results)
+                    self._record_completion()
+
+        if not pending:
+            return
+
+        held: List[str] = []
+        try:
+            for domain in sorted({domain for missed in pending.values() for domain in missed}):
+                await self.domain_semaphores[domain].acquire()
+                held.append(domain)
+                self.domain_in_flight[domain] += 1
+
+            async for file, domain, result in self.executor.sniff(
+                [(file, list(missed)) for file, missed in pending.items()],
+                contexts if self.executor.uses_contexts else None
+            ):
+                pending[file].remove(domain)
+                self._cache_result(domain, file, hashes[file], result)
+                await self._record_result(job, file, domain, result.to_dict(), results)
+                self._record_completion()
 
-                return results
+        except Exception as e:
+            logger.error(f"Error processing {', '.join(pending)} in job {job.id}: {e}")
+            for file, missed in pending.items():
+                for domain in missed:
+                    await self._record_result(
+                        job,
+                        file,
+                        domain,
+                        SniffingResult(
+                            file,
+                            domain,
+                            status=False,
+                            metrics={"error": str(e)}
+                        ).to_dict(),
+                        results
+                    )
+
+        finally:
+            for domain in held:
+                self.domain_in_flight[domain] -= 1
+                self.domain_semaphores[domain].release()
+
+    async def _sniff_domains(
+        self,
+        job: TestJob,
+        file: str,
+        domains: List[str],
+        results: Dict[str, Any],
+        done: List[str]
+    ) -> None:
+        """Sniff a file with domains in order, fixing issues if requested.
+
+        Args:
+            job: Job the work item belongs to
+            file: File to sniff
+            domains: Domains to sniff the file with, in order
+            results: Job results to record into
+            done: Domains whose result has been recorded
+        """
+        # Read the file once for all domains
+        context = FileContext(file)
+
+        for domain in domains:
+            content_hash = self._content_hash(context)
+            result = self._get_cached_result(domain, file, content_hash)
+
+            if result is None:
+                async with self.domain_semaphores[domain]:
+                    self.domain_in_flight[domain] += 1
+                    try:
+                        result = await self.executor.sniff_item(
+                            file,
+                            domain,
+                            context if self.executor.uses_contexts else None
+                        )
+                    finally:
+                        self.domain_in_flight[domain] -= 1
+
+                self._cache_result(domain, file, content_hash, result)
+
+            await self._record_result(job, file, domain, result.to_dict(), results)
+            done.append(domain)
+            self._record_completion()
+
+            # Fix issues if requested
+            if job.fix and result.has_issues():
+                await self.sniffers[domain].fix_issues(result.issues)
+
+                # Later domains must see the fixed content
+                context = FileContext(file)
+
+    async def _record_result(
+        self,
+        job: TestJob,
+        file: str,
+        domain: str,
+        data: Dict[str, Any],
+        results: Dict[str, Any]
+    ) -> None:
+        """Record a result in the job results or hand it to the job callback.
+
+        Args:
+            job: Job the result belongs to
+            file: Sniffed file
+            domain: Sniffer domain
+            data: Result dictionary
+            results: Job results to record into
+        """
+        if job.on_result is None:
+            results[file][domain] = data
+            return
 
+        # Streamed results are not retained, only summarized
+        results["results"] += 1
+        results["issues"] += len(data.get("issues", []))
+        try:
+            await job.on_result(file, domain, data)
         except Exception as e:
-            logger.error(f"Error processing job {job.id}: {e}")
-            raise
+            logger.error(f"Error delivering result for {file} in job {job.id}: {e}")
+
+    def _record_completion(self) -> None:
+        """Record a completed work item for throughput tracking."""
+        now = time.monotonic()
+        self.items_completed += 1
+        self._completion_times.append(now)
+        self._trim_completions(now)
+
+    def _trim_completions(self, now: float) -> None:
+        """Drop completions older than the throughput window.
+
+        Args:
+            now: Current monotonic time
+        """
+        while (
+            self._completion_times and
+            now - self._completion_times[0] > self.throughput_window
+        ):
+            self._completion_times.popleft()
+
+    def _content_hash(self, context: FileContext) -> Optional[str]:
+        """Get the content hash used as cache key.
+
+        Args:
+            context: File context
+
+        Returns:
+            Content hash, or None if caching is disabled or the file is unreadable
+        """
+        if self.result_cache is None:
+            return None
+
+        try:
+            return context.content_hash
+        except OSError as e:
+            logger.warning(f"Sniffing {context.path} without cache: {e}")
+            return None
+
+    def _get_cached_result(
+        self,
+        domain: str,
+        file: str,
+        content_hash: Optional[str]
+    ) -> Optional[SniffingResult]:
+        """Get the cached result for unchanged content.
+
+        Args:
+            domain: Sniffer domain
+            file: File to attribute the result to
+            content_hash: Hash of the file content
+
+        Returns:
+            Cached result, or None on a miss
+        """
+        if content_hash is None:
+            return None
+
+        sniffer = self.sniffers[domain]
+        cached = self.result_cache.get(
+            content_hash,
+            domain,
+            sniffer.rule_set_version,
+            sniffer_cache_key(sniffer, file)
+        )
+        if cached is None:
+            return None
+
+        return SniffingResult.from_dict(cached, file)
+
+    def _cache_result(
+        self,
+        domain: str,
+        file: str,
+        content_hash: Optional[str],
+        result: SniffingResult
+    ) -> None:
+        """Cache a successful sniffing result.
+
+        Args:
+            domain: Sniffer domain
+            file: Sniffed file
+            content_hash: Hash of the sniffed content
+            result: Sniffing result
+        """
+        if content_hash is None or not result.status:
+            return
+
+        sniffer = self.sniffers[domain]
+        self.result_cache.set(
+            content_hash,
+            domain,
+            sniffer.rule_set_version,
+            result.to_dict(),
+            sniffer_cache_key(sniffer, file)
+        )
 
     async def get_job_status(self, job_id: str) -> Dict[str, Any]:
         """Get status of a job.
@@ -203,17 +603,11 @@ class TestOrchestrator:
                 }
 
             # Check completed jobs
-            if job_id in self.completed_jobs:
-                job = self.completed_jobs[job_id]
+            summary = self.completed_jobs.get_summary(job_id)
+            if summary is not None:
                 return {
-                    "job_id": job.id,
-                    "status": job.status,
-                    "created_at": job.created_at.isoformat(),
-                    "completed_at": datetime.now().isoformat(),
-                    "files": len(job.files),
-                    "domains": job.domains,
-                    "results": job.results,
-                    "error": job.error
+                    **summary,
+                    "results": await self.completed_jobs.get_payload_async(job_id)
                 }
 
             return {
@@ -229,6 +623,27 @@ class TestOrchestrator:
                 "error": str(e)
             }
 
+    async def _complete_job(self, job: TestJob) -> None:
+        """Move a finished job from the active jobs to the job history.
+
+        Args:
+            job: Finished job
+        """
+        await self.completed_jobs.put_async(
+            job.id,
+            {
+                "job_id": job.id,
+                "status": job.status,
+                "created_at": job.created_at.isoformat(),
+                "completed_at": datetime.now().isoformat(),
+                "files": len(job.files),
+                "domains": job.domains,
+                "error": job.error
+            },
+            job.results
+        )
+        self.active_jobs.pop(job.id, None)
+
     async def cancel_job(self, job_id: str) -> Dict[str, Any]:
         """Cancel a job.
 
@@ -247,8 +662,7 @@ class TestOrchestrator:
 
             job = self.active_jobs[job_id]
             job.status = "cancelled"
-            self.completed_jobs[job_id] = job
-            del self.active_jobs[job_id]
+            await self._complete_job(job)
 
             return {
                 "status": "cancelled",
@@ -269,11 +683,18 @@ class TestOrchestrator:
         Returns:
             Queue status information
         """
+        self._trim_completions(time.monotonic())
         return {
             "active_jobs": len(self.active_jobs),
             "completed_jobs": len(self.completed_jobs),
             "queue_size": self.job_queue.qsize(),
-            "max_concurrent_jobs": self.max_concurrent_jobs
+            "max_concurrent_jobs": self.max_concurrent_jobs,
+            "items_completed": self.items_completed,
+            "items_in_flight": sum(self.domain_in_flight.values()),
+            "throughput_per_second": len(self._completion_times) / self.throughput_window,
+            "result_cache": self.result_cache.get_stats() if self.result_cache else {},
+            "file_locks": self.file_locks.get_metrics(),
+            "job_history": self.completed_jobs.get_stats()
         }
 
     def get_domain_status(self) -> Dict[str, Any]:
@@ -284,10 +705,12 @@ class TestOrchestrator:
         """
         return {
             domain: {
-                "enabled": sniffer.config.get("enabled", True),
-                "locked": self.domain_locks[domain].locked()
+                "enabled": self.sniffers.configs[domain].get("enabled", True),
+                "loaded": domain in self.sniffers.loaded(),
+                "in_flight": self.domain_in_flight[domain],
+                "concurrency_limit": self.domain_limits[domain]
             }
-            for domain, sniffer in self.sniffers.items()
+            for domain in self.sniffers
         }
 
     async def cleanup(self) -> None:
@@ -302,14 +725,17 @@ class TestOrchestrator:
                 await self.job_queue.get()
 
             self.active_jobs.clear()
-            self.completed_jobs.clear()
-            self.domain_locks.clear()
-            self.file_locks.clear()
+            await self.completed_jobs.clear_async()
 
-            # Clean up sniffers
-            for sniffer in self.sniffers.values():
+            # Clean up sniffers that were loaded
+            for sniffer in self.sniffers.loaded().values():
                 await sniffer.cleanup()
 
+            await self.executor.shutdown()
+
+            if self.result_cache:
+                self.result_cache.close()
+
         except Exception as e:
             logger.error(f"Error cleaning up test orchestrator: {e}")
             raise
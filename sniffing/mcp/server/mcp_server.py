@@ -2,22 +2,22 @@
 Enhanced MCP (Master Control Program) server for orchestrating sniffing operations.
 """
 import asyncio
+import itertools
 import logging
 import yaml
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Header
+from fastapi.responses import StreamingResponse
 from prometheus_client import start_http_server, Counter, Gauge, Histogram
 from pydantic import BaseModel
 
 from ...core.utils.result import SniffingResult
+from ...core.utils.job_history import JobHistory, create_job_history
+from ...core.utils.registry import LazySniffers
 from ..orchestration.test_orchestrator import TestOrchestrator
-from ...domains.security.security_sniffer import SecuritySniffer
-from ...domains.browser.browser_sniffer import BrowserSniffer
-from ...domains.functional.functional_sniffer import FunctionalSniffer
-from ...domains.unit.unit_sniffer import UnitSniffer
-from ...domains.documentation.documentation_sniffer import DocumentationSniffer
+from .result_stream import InvalidCursor, ResultStream, format_ndjson, format_sse
 
 logger = logging.getLogger("mcp_server")
 
@@ -26,6 +26,10 @@ SNIFFING_REQUESTS = Counter("sniffing_requests_total", "Total sniffing requests"
 SNIFFING_ERRORS = Counter("sniffing_errors_total", "Total sniffing errors")
 ACTIVE_SNIFFING_JOBS = Gauge("active_sniffing_jobs", "Number of active sniffing jobs")
 SNIFFING_DURATION = Histogram("sniffing_duration_seconds", "Sniffing operation duration")
+JOB_HISTORY_RESIDENT_BYTES = Gauge(
+    "job_history_resident_bytes",
+    "Finished job result bytes held in memory"
+)
 
 class SniffingRequest(BaseModel):
     """Sniffing request model."""
@@ -48,6 +52,15 @@ class MCPServer:
         self.orchestrator = TestOrchestrator(self.config)
         self.sniffers = self._initialize_sniffers()
         self.active_jobs: Dict[str, asyncio.Task] = {}
+        self.job_history: JobHistory = create_job_history(
+            self.config.get("mcp", {}).get("job_history", {}),
+            "reports/history/sniffing"
+        )
+        self.result_streams: Dict[str, ResultStream] = {}
+        streaming_config = self.config.get("mcp", {}).get("streaming", {})
+        self.stream_path = Path(streaming_config.get("path", "reports/streams"))
+        self.max_streams = streaming_config.get("max_streams", 100)
+        self._job_sequence = itertools.count()
         self._setup_routes()
         self._setup_monitoring()
 
@@ -67,20 +80,17 @@ class MCPServer:
             logger.error(f"Error loading config: {e}")
             raise
 
-    def _initialize_sniffers(self) -> Dict[str, Any]:
+    def _initialize_sniffers(self) -> LazySniffers:
         """Initialize domain-specific sniffers.
 
+        Sniffers are shared with the orchestrator and imported and
+        constructed when first used.
+
         Returns:
-            Dictionary of initialized sniffers
+            Mapping of domain to sniffer
         """
         try:
-            return {
-                "security": SecuritySniffer(self.config["domains"]["security"]),
-                "browser": BrowserSniffer(self.config["domains"]["browser"]),
-                "functional": FunctionalSniffer(self.config["domains"]["functional"]),
-                "unit": UnitSniffer(self.config["domains"]["unit"]),
-                "documentation": DocumentationSniffer(self.config["domains"]["documentation"])
-            }
+            return self.orchestrator.sniffers
         except Exception as e:
             logger.error(f"Error initializing sniffers: {e}")
             raise
@@ -91,6 +101,7 @@ class MCPServer:
         self.app.post("/api/v1/sniff")(self.sniff)
         self.app.post("/api/v1/sniff/file")(self.sniff_file)
         self.app.get("/api/v1/sniff/status/{job_id}")(self.get_sniffing_status)
+        self.app.get("/api/v1/sniff/stream/{job_id}")(self.stream_results)
         self.app.post("/api/v1/sniff/cancel/{job_id}")(self.cancel_sniffing)
 
         # Domain-specific endpoints
@@ -136,7 +147,12 @@ class MCPServer:
                 raise HTTPException(status_code=400, message="No files specified")
 
             # Create job ID
-            job_id = f"sniff_{len(self.active_jobs)}"
+            job_id = f"sniff_{next(self._job_sequence)}"
+
+            # Create result stream
+            stream = ResultStream(job_id, self.stream_path / f"{job_id}.ndjson")
+            self.result_streams[job_id] = stream
+            self._evict_streams()
 
             # Start sniffing task
             task = asyncio.create_task(self._run_sniffing(
@@ -144,7 +160,8 @@ class MCPServer:
                 request.files,
                 request.domains,
                 request.priority,
-                request.fix
+                request.fix,
+                stream
             ))
             self.active_jobs[job_id] = task
 
@@ -155,7 +172,8 @@ class MCPServer:
                 "job_id": job_id,
                 "status": "started",
                 "files": len(request.files),
-                "domains": request.domains
+                "domains": request.domains,
+                "stream": f"/api/v1/sniff/stream/{job_id}"
             }
 
         except Exception as e:
@@ -181,11 +199,10 @@ class MCPServer:
                 if domain not in self.sniffers:
                     continue
 
-                sniffer = self.sniffers[domain]
-                if not sniffer.config.get("enabled", True):
+                if not self.sniffers.configs[domain].get("enabled", True):
                     continue
 
-                result = await sniffer.sniff_file(file)
+                result = await self.sniffers[domain].sniff_file(file)
                 results[domain] = result.to_dict()
 
             return {
@@ -207,20 +224,101 @@ class MCPServer:
             Job status
         """
         try:
-            if job_id not in self.active_jobs:
-                raise HTTPException(status_code=404, detail="Job not found")
+            if job_id in self.active_jobs:
+                task = self.active_jobs[job_id]
+                status = {
+                    "job_id": job_id,
+                    "status": "running" if not task.done() else "completed",
+                    "result": task.result() if task.done() else None
+                }
+            else:
+                summary = self.job_history.get_summary(job_id)
+                if summary is None:
+                    raise HTTPException(status_code=404, detail="Job not found")
+
+                status = {
+                    "job_id": job_id,
+                    "status": summary.get("status", "completed"),
+                    "result": {**summary, "results": await self.job_history.get_payload_async(job_id)}
+                }
 
-            task = self.active_jobs[job_id]
-            return {
-                "job_id": job_id,
-                "status": "running" if not task.done() else "completed",
-                "result": task.result() if task.done() else None
-            }
+            if job_id in self.result_streams:
+                status["stream"] = self.result_streams[job_id].get_status()
+
+            return status
+
+        except HTTPException:
+            raise
 
         except Exception as e:
             logger.error(f"Error getting job status: {e}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    async def stream_results(
+        self,
+        job_id: str,
+        cursor: int = 0,
+        format: str = "ndjson",
+        last_event_id: Optional[str] = Header(None)
+    ) -> StreamingResponse:
+        """Stream per-file results of a sniffing job as they complete.
+
+        Args:
+            job_id: Job ID
+            cursor: Cursor to resume from, as returned with each event
+            format: "ndjson" or "sse"
+            last_event_id: SSE resume cursor, takes precedence over cursor
+
+        Returns:
+            Streaming response following the job until it ends
+        """
+        try:
+            if job_id not in self.result_streams:
+                raise HTTPException(status_code=404, detail="Stream not found")
+
+            if format not in ("ndjson", "sse"):
+                raise HTTPException(status_code=400, detail=f"Unknown format: {format}")
+
+            if last_event_id:
+                cursor = int(last_event_id)
+
+            stream = self.result_streams[job_id]
+            stream.validate_cursor(cursor)
+
+            formatter = format_sse if format == "sse" else format_ndjson
+            media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+
+            async def body():
+                async for next_cursor, line in stream.read(cursor):
+                    yield formatter(next_cursor, line)
+
+            return StreamingResponse(body(), media_type=media_type)
+
+        except HTTPException:
+            raise
+
+        except (InvalidCursor, ValueError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        except Exception as e:
+            logger.error(f"Error streaming results for job {job_id}: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    def _evict_streams(self) -> None:
+        """Delete the oldest finished streams beyond the retention limit."""
+        try:
+            excess = len(self.result_streams) - self.max_streams
+            for job_id, stream in list(self.result_streams.items()):
+                if excess <= 0:
+                    break
+                if stream.closed:
+                    stream.delete()
+                    del self.result_streams[job_id]
+                    excess -= 1
+
+        except Exception as e:
+            logger.error(f"Error evicting result streams: {e}")
+
     async def cancel_sniffing(self, job_id: str) -> Dict[str, Any]:
         """Cancel sniffing job.
 
@@ -288,10 +386,11 @@ class MCPServer:
         """
         return {
             domain: {
-                "enabled": sniffer.config.get("enabled", True),
-                "priority": sniffer.config.get("priority", 1)
+                "enabled": config.get("enabled", True),
+                "priority": config.get("priority", 1)
             }
-            for domain, sniffer in self.sniffers.items()
+            for domain, config in self.sniffers.configs.items()
+            if domain in self.sniffers
         }
 
     async def get_domain_config(self, domain: str) -> Dict[str, Any]:
@@ -307,7 +406,7 @@ class MCPServer:
             if domain not in self.sniffers:
                 raise HTTPException(status_code=404, detail="Domain not found")
 
-            return self.sniffers[domain].config
+            return self.sniffers.configs[domain]
 
         except Exception as e:
             logger.error(f"Error getting domain config: {e}")
@@ -320,12 +419,17 @@ class MCPServer:
             Health status
         """
         try:
+            loaded = self.sniffers.loaded()
             status = {
                 "status": "healthy",
                 "active_jobs": len(self.active_jobs),
                 "domains": {
-                    domain: "healthy" if sniffer.health.is_healthy() else "unhealthy"
-                    for domain, sniffer in self.sniffers.items()
+                    domain: (
+                        "not_loaded" if domain not in loaded
+                        else "healthy" if loaded[domain].health.is_healthy()
+                        else "unhealthy"
+                    )
+                    for domain in self.sniffers
                 }
             }
 
@@ -349,9 +453,10 @@ class MCPServer:
                 "sniffing_requests": SNIFFING_REQUESTS._value.get(),
                 "sniffing_errors": SNIFFING_ERRORS._value.get(),
                 "active_jobs": ACTIVE_SNIFFING_JOBS._value.get(),
+                "job_history": self.job_history.get_stats(),
                 "domain_metrics": {
                     domain: sniffer.get_metrics()
-                    for domain, sniffer in self.sniffers.items()
+                    for domain, sniffer in self.sniffers.loaded().items()
                 }
             }
 
@@ -444,7 +549,8 @@ class MCPServer:
         files: List[str],
         domains: Optional[List[str]] = None,
         priority: int = 1,
-        fix: bool = True
+        fix: bool = True,
+        stream: Optional[ResultStream] = None
     ) -> Dict[str, Any]:
         """Run sniffing operation.
 
@@ -454,42 +560,74 @@ class MCPServer:
             domains: Optional list of domains to sniff
             priority: Job priority
             fix: Whether to fix issues
+            stream: Optional stream receiving per-file results; the returned
+                results then only hold a summary
 
         Returns:
             Sniffing results
         """
+        outcome: Dict[str, Any] = {"job_id": job_id, "status": "cancelled"}
         try:
             ACTIVE_SNIFFING_JOBS.inc()
             start_time = asyncio.get_event_loop().time()
 
+            on_result = self._stream_callback(stream) if stream is not None else None
+
             # Run sniffing through orchestrator
             results = await self.orchestrator.run_tests(
                 files,
                 domains,
                 priority,
-                fix
+                fix,
+                on_result
             )
 
             duration = asyncio.get_event_loop().time() - start_time
             SNIFFING_DURATION.observe(duration)
 
-            return {
+            outcome = {
                 "job_id": job_id,
                 "status": "completed",
                 "duration": duration,
                 "results": results
             }
+            return outcome
 
         except Exception as e:
             logger.error(f"Error running sniffing job {job_id}: {e}")
-            return {
+            outcome = {
                 "job_id": job_id,
                 "status": "failed",
                 "error": str(e)
             }
+            return outcome
 
         finally:
             ACTIVE_SNIFFING_JOBS.dec()
+            if stream is not None:
+                await stream.close({"type": "end", **outcome})
+
+    def _stream_callback(
+        self,
+        stream: ResultStream
+    ) -> Callable[[str, str, Dict[str, Any]], Awaitable[None]]:
+        """Create the callback appending each sniffing result to a stream.
+
+        Args:
+            stream: Stream receiving per-file results
+
+        Returns:
+            Callback receiving (file, domain, result)
+        """
+        async def on_result(file: str, domain: str, result: Dict[str, Any]) -> None:
+            await stream.append({
+                "type": "result",
+                "file": file,
+                "domain": domain,
+                "result": result
+            })
+
+        return on_result
 
     async def _cleanup_job(self, job_id: str) -> None:
         """Clean up completed job.
@@ -499,12 +637,25 @@ class MCPServer:
         """
         try:
             task = self.active_jobs[job_id]
-            await task
-            del self.active_jobs[job_id]
+            try:
+                outcome = await task
+            except asyncio.CancelledError:
+                outcome = {"job_id": job_id, "status": "cancelled"}
+
+            # Keep the summary in memory, the full results may spill to disk
+            await self.job_history.put_async(
+                job_id,
+                {k: v for k, v in outcome.items() if k != "results"},
+                outcome.get("results")
+            )
+            JOB_HISTORY_RESIDENT_BYTES.set(self.job_history.resident_bytes)
 
         except Exception as e:
             logger.error(f"Error cleaning up job {job_id}: {e}")
 
+        finally:
+            self.active_jobs.pop(job_id, None)
+
     def start(self) -> None:
         """Start the MCP server."""
         try:
@@ -531,7 +682,9 @@ class MCPServer:
 
             # Clean up resources
             self.active_jobs.clear()
-            for sniffer in self.sniffers.values():
+            for stream in self.result_streams.values():
+                await stream.close()
+            for sniffer in self.sniffers.loaded().values():
                 await sniffer.cleanup()
 
         except Exception as e:
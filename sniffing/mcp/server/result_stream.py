@@ -0,0 +1,180 @@
+"""
+Resumable per-job result streams backed by append-only NDJSON spool files.
+"""
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+logger = logging.getLogger("result_stream")
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor does not point at the start of an event."""
+
+class ResultStream:
+    """Append-only stream of job events.
+
+    Events are appended as NDJSON lines to a spool file and never held in
+    memory, so server memory stays constant however many files a job has.
+    A cursor is the byte offset of the next event in the spool file; a
+    client that reconnects with the last cursor it saw resumes right after
+    the last event it received.
+    """
+
+    def __init__(self, job_id: str, path: Path):
+        """Initialize result stream.
+
+        Args:
+            job_id: Job the stream belongs to
+            path: Spool file path
+        """
+        self.job_id = job_id
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.size = 0
+        self.events = 0
+        self.closed = False
+        self._file = open(self.path, "wb")
+        self._changed = asyncio.Condition()
+
+    async def append(self, event: Dict[str, Any]) -> int:
+        """Append an event.
+
+        Args:
+            event: JSON-serializable event
+
+        Returns:
+            Cursor after the event
+        """
+        if self.closed:
+            raise RuntimeError(f"Stream {self.job_id} is closed")
+
+        # Written and flushed without awaiting, so readers never see half a line
+        line = json.dumps(event, default=str).encode() + b"\n"
+        self._file.write(line)
+        self._file.flush()
+        self.size += len(line)
+        self.events += 1
+
+        async with self._changed:
+            self._changed.notify_all()
+
+        return self.size
+
+    async def close(self, event: Optional[Dict[str, Any]] = None) -> None:
+        """Close the stream, optionally appending a final event.
+
+        Args:
+            event: Optional final event
+        """
+        if self.closed:
+            return
+
+        if event is not None:
+            await self.append(event)
+
+        self.closed = True
+        self._file.close()
+
+        async with self._changed:
+            self._changed.notify_all()
+
+    def validate_cursor(self, cursor: int) -> None:
+        """Check that a cursor points at the start of an event.
+
+        Args:
+            cursor: Cursor to check
+
+        Raises:
+            InvalidCursor: If the cursor is out of range or mid-event
+        """
+        if cursor == 0:
+            return
+
+        if cursor < 0 or cursor > self.size:
+            raise InvalidCursor(f"Cursor {cursor} out of range")
+
+        with open(self.path, "rb") as f:
+            f.seek(cursor - 1)
+            if f.read(1) != b"\n":
+                raise InvalidCursor(f"Cursor {cursor} is not at an event boundary")
+
+    async def read(self, cursor: int = 0) -> AsyncIterator[Tuple[int, bytes]]:
+        """Read events from a cursor, following the stream until it closes.
+
+        Args:
+            cursor: Cursor to start from
+
+        Returns:
+            Async iterator of (cursor after the event, raw JSON event line)
+        """
+        self.validate_cursor(cursor)
+
+        with open(self.path, "rb") as f:
+            f.seek(cursor)
+            while True:
+                line = f.readline()
+                if line:
+                    cursor += len(line)
+                    yield cursor, line.rstrip(b"\n")
+                    continue
+
+                if self.closed and cursor >= self.size:
+                    return
+
+                async with self._changed:
+                    if not self.closed and cursor >= self.size:
+                        await self._changed.wait()
+
+    def delete(self) -> None:
+        """Delete the spool file."""
+        try:
+            if not self.closed:
+                self._file.close()
+                self.closed = True
+            self.path.unlink(missing_ok=True)
+
+        except Exception as e:
+            logger.error(f"Error deleting stream {self.job_id}: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get stream status.
+
+        Returns:
+            Stream status information
+        """
+        return {
+            "job_id": self.job_id,
+            "events": self.events,
+            "cursor": self.size,
+            "closed": self.closed
+        }
+
+def format_ndjson(cursor: int, line: bytes) -> bytes:
+    """Format an event as an NDJSON line carrying its resume cursor.
+
+    Args:
+        cursor: Cursor after the event
+        line: Raw JSON event line
+
+    Returns:
+        NDJSON line
+    """
+    # Splice the cursor into the stored object instead of re-encoding it
+    return b'{"cursor":' + str(cursor).encode() + b"," + line[1:] + b"\n"
+
+def format_sse(cursor: int, line: bytes) -> bytes:
+    """Format an event as a Server-Sent Event.
+
+    The cursor is sent as the event id, so browsers resume automatically
+    through the ``Last-Event-ID`` header.
+
+    Args:
+        cursor: Cursor after the event
+        line: Raw JSON event line
+
+    Returns:
+        SSE message
+    """
+    return b"id: " + str(cursor).encode() + b"\ndata: " + line + b"\n\n"
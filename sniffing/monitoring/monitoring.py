@@ -14,6 +14,8 @@ import aiohttp
 import psutil
 from prometheus_client import Counter, Gauge, Histogram, start_http_server
 
+from ..core.utils.metrics import register_span_exporter
+
 logger = logging.getLogger("monitoring")
 
 class MonitoringSystem:
@@ -74,6 +76,9 @@ class MonitoringSystem:
         port = self.config.get("prometheus_port", 9090)
         start_http_server(port)
 
+        # Serve span latency histograms alongside
+        register_span_exporter()
+
     def _setup_alerts(self) -> None:
         """Set up alerting system."""
         self.alert_channels = []
@@ -10,6 +10,8 @@ from typing import Any, Dict, List, Optional, Set
 
 from prometheus_client import Counter, Gauge, Histogram, start_http_server
 
+from ..core.utils.metrics import register_span_exporter
+
 logger = logging.getLogger("sniffing_monitor")
 
 class SniffingMonitor:
@@ -69,6 +71,9 @@ class SniffingMonitor:
         port = self.config.get("prometheus_port", 9090)
         start_http_server(port)
 
+        # Serve span latency histograms alongside
+        register_span_exporter()
+
     async def start_monitoring(self) -> None:
         """Start monitoring system."""
         try:
@@ -12,6 +12,7 @@ import yaml
 from rich.console import Console
 from rich.logging import RichHandler
 
+from .core.utils.file_selection import discover_files, get_changed_files, select_files
 from .mcp.server.mcp_server import MCPServer
 
 # Set up logging
@@ -33,6 +34,16 @@ def parse_args() -> argparse.Namespace:
         nargs="*",
         help="Specific files to check"
     )
+    parser.add_argument(
+        "--since",
+        metavar="REV",
+        help="Only check files changed since a git revision"
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="Only check files staged for commit"
+    )
     parser.add_argument(
         "--domains",
         nargs="*",
@@ -98,8 +109,14 @@ async def run_sniffing(args: argparse.Namespace) -> int:
         mcp_server = MCPServer(config.get("mcp", {}))
 
         # Get files to check
-        files = get_files_to_check(args)
+        ignore_patterns = get_ignore_patterns(config)
+        files = get_files_to_check(args, ignore_patterns)
+        if files is None:
+            return 1
         if not files and not args.full:
+            if args.since or args.staged:
+                console.print("No changed files to check")
+                return 0
             logger.error("No files to check")
             return 1
 
@@ -110,7 +127,7 @@ async def run_sniffing(args: argparse.Namespace) -> int:
         console.print("\n[bold blue]Running Sniffing Infrastructure[/bold blue]")
 
         if args.full:
-            results = await run_full_suite(mcp_server)
+            results = await run_full_suite(mcp_server, ignore_patterns)
         else:
             results = await run_targeted_checks(mcp_server, files, domains)
 
@@ -129,22 +146,36 @@ async def run_sniffing(args: argparse.Namespace) -> int:
         logger.error(f"Error running sniffing: {e}")
         return 1
 
-def get_files_to_check(args: argparse.Namespace) -> List[str]:
-    """Get list of files to check."""
+def get_ignore_patterns(config: Dict[str, Any]) -> List[str]:
+    """Get patterns of paths excluded from file discovery."""
+    return config.get("mcp", {}).get("file_watcher", {}).get("ignore_patterns", [])
+
+def get_files_to_check(
+    args: argparse.Namespace,
+    ignore_patterns: Optional[List[str]] = None
+) -> Optional[List[str]]:
+    """Get list of files to check, or None if they could not be determined."""
     try:
         if args.files:
             return args.files
 
-        # Get all relevant files
-        files = []
-        for ext in [".py", ".js", ".ts", ".html", ".css"]:
-            files.extend(str(f) for f in Path(".").glob(f"**/*{ext}"))
+        ignore_patterns = ignore_patterns or []
+
+        # Only files in the diff, so hooks scale with the change, not the tree
+        since = getattr(args, "since", None)
+        staged = getattr(args, "staged", False)
+        if since or staged:
+            return select_files(
+                get_changed_files(since, staged),
+                ignore_patterns=ignore_patterns
+            )
 
-        return files
+        # Get all relevant files
+        return discover_files(".", ignore_patterns=ignore_patterns)
 
     except Exception as e:
         logger.error(f"Error getting files: {e}")
-        return []
+        return None
 
 def get_domains_to_check(args: argparse.Namespace) -> List[str]:
     """Get list of domains to check."""
@@ -160,14 +191,17 @@ def get_domains_to_check(args: argparse.Namespace) -> List[str]:
         "documentation"
     ]
 
-async def run_full_suite(mcp_server: MCPServer) -> Optional[Dict[str, Any]]:
+async def run_full_suite(
+    mcp_server: MCPServer,
+    ignore_patterns: Optional[List[str]] = None
+) -> Optional[Dict[str, Any]]:
     """Run full test suite."""
     try:
         console = Console()
         console.print("\n[bold green]Running Full Test Suite[/bold green]")
 
         # Get all files
-        files = get_files_to_check(argparse.Namespace(files=None))
+        files = get_files_to_check(argparse.Namespace(files=None), ignore_patterns) or []
 
         # Get all domains
         domains = get_domains_to_check(argparse.Namespace(domains=None))
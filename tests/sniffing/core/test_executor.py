@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from sniffing.core.utils.executor import InlineExecutor, PoolExecutor, create_executor
+from sniffing.core.utils.result import SniffingResult
+
+class LineCountSniffer:
+    """Picklable sniffer reporting the number of lines in a file"""
+
+    def __init__(self, config):
+        self.config = config
+
+    async def sniff_file(self, file, context):
+        if self.config.get("fail"):
+            raise ValueError("broken sniffer")
+        result = SniffingResult(file, "lines")
+        result.update_metrics({"lines": len(context.line_index)})
+        return result
+
+def collect(executor, items):
+    async def run():
+        try:
+            return [item async for item in executor.sniff(items)]
+        finally:
+            await executor.shutdown()
+    return asyncio.run(run())
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"file_{i}.py"
+        path.write_text("x = 1\n" * i)
+        paths.append(str(path))
+    return paths
+
+class TestExecutor:
+    @pytest.mark.parametrize("backend", ["inline", "thread", "process"])
+    def test_backends_agree(self, backend, files):
+        """Test that every backend returns one result per file and domain"""
+        sniffers = {"lines": LineCountSniffer({}), "other": LineCountSniffer({})}
+        executor = create_executor(backend, sniffers, workers=2, batch_size=2)
+        results = collect(executor, [(file, ["lines", "other"]) for file in files])
+
+        assert len(results) == 10
+        lines = {(file, domain): result.metrics["lines"] for file, domain, result in results}
+        assert lines[(files[3], "lines")] == 4
+
+    def test_failed_sniffer(self, files):
+        """Test that a raising sniffer yields a failed result"""
+        executor = InlineExecutor({"lines": LineCountSniffer({"fail": True})})
+        (file, domain, result), = collect(executor, [(files[0], ["lines"])])
+        assert result.status is False
+        assert "broken sniffer" in result.metrics["error"]
+
+    def test_create_executor(self):
+        """Test backend selection"""
+        sniffers = {"lines": LineCountSniffer({})}
+        assert isinstance(create_executor("process", sniffers, workers=1), InlineExecutor)
+        assert isinstance(create_executor("thread", sniffers, workers=4), PoolExecutor)
+        with pytest.raises(ValueError):
+            create_executor("gpu", sniffers)
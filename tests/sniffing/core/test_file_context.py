@@ -0,0 +1,48 @@
+import pytest
+
+from sniffing.core.utils.file_context import FileContext
+
+class TestFileContext:
+    def test_reads_file_once(self, tmp_path):
+        """Test that content is read lazily and cached"""
+        path = tmp_path / "module.py"
+        path.write_text("x = 1\r\ny = 2\n")
+        context = FileContext(str(path))
+        assert context.text == "x = 1\ny = 2\n"
+
+        path.write_text("changed\n")
+        assert context.text == "x = 1\ny = 2\n"
+        assert context.size == len(b"x = 1\r\ny = 2\n")
+
+    def test_tree_parsed_once(self):
+        """Test that the AST is shared between accesses"""
+        context = FileContext.from_text("module.py", "def f():\n    pass\n")
+        assert context.tree is context.tree
+        assert context.line_index.line_of(10) == 2
+
+    def test_syntax_error_cached(self):
+        """Test that parse errors are raised on every access"""
+        context = FileContext.from_text("broken.py", "def f(:\n")
+        with pytest.raises(SyntaxError):
+            context.tree
+        with pytest.raises(SyntaxError):
+            context.tree
+
+    def test_content_hash(self):
+        """Test that the content hash depends only on the bytes"""
+        first = FileContext.from_text("a.py", "x = 1\n")
+        second = FileContext("b.py", b"x = 1\n")
+        assert first.content_hash == second.content_hash
+
+    def test_derived_computed_once(self):
+        """Test that derived values are cached per context"""
+        context = FileContext.from_text("module.py", "x = 1\n")
+        calls = []
+
+        def factory(ctx):
+            calls.append(ctx)
+            return len(ctx.text)
+
+        assert context.derived("length", factory) == 6
+        assert context.derived("length", factory) == 6
+        assert len(calls) == 1
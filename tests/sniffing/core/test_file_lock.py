@@ -0,0 +1,163 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from sniffing.core.utils import file_lock
+from sniffing.core.utils.file_lock import FileLock, FileLockError, LockTable
+
+HOLD_LOCK = """
+import fcntl, os, sys, time
+fd = os.open(sys.argv[1], os.O_CREAT | os.O_RDWR)
+fcntl.flock(fd, fcntl.LOCK_EX)
+print("locked", flush=True)
+time.sleep(float(sys.argv[2]))
+"""
+
+def hold_lock(path, seconds):
+    """Hold an flock on a path from another process."""
+    process = subprocess.Popen(
+        [sys.executable, "-c", HOLD_LOCK, str(path), str(seconds)],
+        stdout=subprocess.PIPE,
+        text=True
+    )
+    assert process.stdout.readline().strip() == "locked"
+    return process
+
+class TestFileLock:
+    def test_waits_for_other_process(self, tmp_path):
+        """Test that a lock held by another process is waited for"""
+        lock = FileLock(str(tmp_path / "a.py"), timeout=5)
+        process = hold_lock(lock.lock_path, 0.3)
+
+        async def run():
+            start = time.monotonic()
+            async with lock:
+                return time.monotonic() - start
+
+        try:
+            waited = asyncio.run(run())
+        finally:
+            process.wait()
+
+        assert waited >= 0.2
+        assert lock.lock_path.exists()
+
+    def test_timeout(self, tmp_path):
+        """Test that waiting gives up after the timeout"""
+        lock = FileLock(str(tmp_path / "a.py"), timeout=0.1)
+        process = hold_lock(lock.lock_path, 2)
+        try:
+            with pytest.raises(FileLockError):
+                asyncio.run(lock.acquire())
+        finally:
+            process.kill()
+            process.wait()
+
+    def test_records_owner(self, tmp_path):
+        """Test that the holder's PID is recorded in the lock file"""
+        lock = FileLock(str(tmp_path / "a.py"))
+
+        async def run():
+            async with lock:
+                return lock.get_owner()
+
+        assert asyncio.run(run())["pid"] == os.getpid()
+
+    def test_stale_lock_file_is_not_held(self, tmp_path):
+        """Test that a lock file left by a crashed process does not block"""
+        lock = FileLock(str(tmp_path / "a.py"), timeout=0.5)
+        lock.lock_path.write_text("999999999\n2000-01-01T00:00:00")
+
+        asyncio.run(lock.acquire())
+        assert lock.get_owner()["pid"] == os.getpid()
+        asyncio.run(lock.release())
+
+    def test_exclusive_creation_fallback(self, tmp_path, monkeypatch):
+        """Test the lock used where neither flock nor msvcrt is available"""
+        monkeypatch.setattr(file_lock, "LOCK_MODE", "exclusive")
+        first = FileLock(str(tmp_path / "a.py"), timeout=0.1)
+        second = FileLock(str(tmp_path / "a.py"), timeout=0.1)
+
+        async def run():
+            async with first:
+                assert first.get_owner()["pid"] == os.getpid()
+                with pytest.raises(FileLockError):
+                    await second.acquire()
+            assert not first.lock_path.exists()
+            async with second:
+                pass
+
+        asyncio.run(run())
+
+        # Left behind by a dead process
+        first.lock_path.write_text("999999999\n2000-01-01T00:00:00")
+        asyncio.run(second.acquire())
+        asyncio.run(second.release())
+
+class TestLockTable:
+    def test_bounded_stripes(self):
+        """Test that locks are shared across a fixed number of stripes"""
+        table = LockTable(stripes=4)
+
+        async def run():
+            for i in range(100):
+                async with table.lock(f"file_{i}.py"):
+                    pass
+
+        asyncio.run(run())
+        assert len(table._locks) == 4
+        assert table.get_metrics()["acquisitions"] == 100
+        assert table.holders() == []
+
+    def test_serializes_same_key(self):
+        """Test that holders of one key exclude each other and contention is counted"""
+        table = LockTable()
+        events = []
+
+        async def hold(name):
+            async with table.lock("a.py"):
+                events.append(f"{name} start")
+                await asyncio.sleep(0.05)
+                events.append(f"{name} end")
+
+        async def run():
+            await asyncio.gather(hold("first"), hold("second"))
+
+        asyncio.run(run())
+        assert events == ["first start", "first end", "second start", "second end"]
+        metrics = table.get_metrics()
+        assert metrics["contended"] == 1
+        assert metrics["max_wait_seconds"] >= 0.04
+
+    def test_timeout(self):
+        """Test that a lock table wait times out"""
+        table = LockTable(timeout=0.05)
+
+        async def run():
+            async with table.lock("a.py"):
+                async with table.lock("a.py"):
+                    pass
+
+        with pytest.raises(FileLockError):
+            asyncio.run(run())
+        assert table.get_metrics()["timeouts"] == 1
+
+    def test_inter_process_stripes(self, tmp_path):
+        """Test that stripe lock files exclude other processes"""
+        table = LockTable(stripes=8, timeout=5, lock_dir=str(tmp_path))
+        stripe_file = tmp_path / f"stripe-{table.stripe('a.py')}.lock"
+        process = hold_lock(stripe_file, 0.3)
+
+        async def run():
+            start = time.monotonic()
+            async with table.lock("a.py"):
+                return time.monotonic() - start
+
+        try:
+            assert asyncio.run(run()) >= 0.2
+        finally:
+            process.wait()
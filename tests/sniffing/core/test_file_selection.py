@@ -0,0 +1,75 @@
+import subprocess
+
+import pytest
+
+from sniffing.core.utils.file_selection import (
+    discover_files,
+    get_changed_files,
+    is_ignored,
+    select_files
+)
+
+IGNORE = ["*.pyc", "__pycache__", "*.git", "venv", "node_modules"]
+
+def git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True
+    )
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, "init", "-q")
+    (tmp_path / "a.py").write_text("a = 1\n")
+    (tmp_path / "b.py").write_text("b = 1\n")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+    return tmp_path
+
+class TestFileSelection:
+    def test_ignore_patterns_match_components(self):
+        """Test that patterns match the whole path or any component"""
+        assert is_ignored("node_modules/pkg/index.js", IGNORE)
+        assert is_ignored("src/__pycache__/mod.py", IGNORE)
+        assert is_ignored("mod.pyc", IGNORE)
+        assert not is_ignored("src/mod.py", IGNORE)
+
+    def test_discovery_prunes_ignored_directories(self, tmp_path):
+        """Test that discovery skips ignored directories and extensions"""
+        (tmp_path / "venv" / "lib").mkdir(parents=True)
+        (tmp_path / "venv" / "lib" / "site.py").write_text("")
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "app.py").write_text("")
+        (tmp_path / "src" / "notes.txt").write_text("")
+
+        files = discover_files(str(tmp_path), ignore_patterns=IGNORE)
+        assert files == [str(tmp_path / "src" / "app.py")]
+
+    def test_changed_since_revision(self, repo):
+        """Test that changed and untracked files are selected, deleted ones are not"""
+        (repo / "a.py").write_text("a = 2\n")
+        (repo / "c.py").write_text("c = 1\n")
+        (repo / "b.py").unlink()
+
+        assert get_changed_files("HEAD", repo_path=str(repo)) == ["a.py", "c.py"]
+
+    def test_staged_only(self, repo):
+        """Test that staged mode ignores unstaged and untracked changes"""
+        (repo / "a.py").write_text("a = 2\n")
+        (repo / "b.py").write_text("b = 2\n")
+        (repo / "c.py").write_text("c = 1\n")
+        git(repo, "add", "a.py")
+
+        assert get_changed_files(staged=True, repo_path=str(repo)) == ["a.py"]
+
+    def test_unknown_revision(self, repo):
+        """Test that git failures are raised"""
+        with pytest.raises(RuntimeError):
+            get_changed_files("no-such-rev", repo_path=str(repo))
+
+    def test_select_files(self):
+        """Test filtering changed files by extension and ignore patterns"""
+        files = ["app.py", "README.md", "node_modules/x.js", "web/app.js"]
+        assert select_files(files, ignore_patterns=IGNORE) == ["app.py", "web/app.js"]
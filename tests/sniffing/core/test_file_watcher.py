@@ -0,0 +1,108 @@
+import asyncio
+
+from sniffing.core.utils.file_watcher import FileWatcher
+
+def make_files(root, count):
+    paths = []
+    for i in range(count):
+        path = root / f"module_{i}.py"
+        path.write_text("x = 1\n")
+        paths.append(str(path))
+    return paths
+
+def watch(root, changes, sink=None, **kwargs):
+    """Feed changes to a manual watcher and collect the delivered batches."""
+    batches = []
+
+    async def collect(batch):
+        batches.append(sorted(batch))
+        if sink:
+            await sink(batch)
+
+    async def run():
+        watcher = FileWatcher(str(root), collect, backend="manual", **kwargs)
+        await watcher.start()
+        await changes(watcher)
+        await asyncio.sleep(0.1)
+        await watcher.stop()
+        return watcher
+
+    return asyncio.run(run()), batches
+
+class TestFileWatcher:
+    def test_coalesces_save_burst(self, tmp_path):
+        """Test that repeated saves become one batch per file"""
+        paths = make_files(tmp_path, 3)
+
+        async def changes(watcher):
+            for _ in range(5):
+                for path in paths:
+                    watcher.notify(path)
+                await asyncio.sleep(0.01)
+
+        watcher, batches = watch(tmp_path, changes, debounce=0.05)
+
+        assert batches == [sorted(paths)]
+        assert watcher.get_metrics()["events_coalesced"] == 12
+
+    def test_filters_ignored_paths(self, tmp_path):
+        """Test that ignored paths, other extensions and deleted files are dropped"""
+        (tmp_path / "venv").mkdir()
+        ignored = tmp_path / "venv" / "lib.py"
+        ignored.write_text("")
+        kept = make_files(tmp_path, 1)[0]
+
+        async def changes(watcher):
+            for path in (str(ignored), str(tmp_path / "notes.txt"), str(tmp_path / "gone.py"), kept):
+                watcher.notify(path)
+
+        watcher, batches = watch(tmp_path, changes, debounce=0.02, ignore_patterns=["venv"])
+
+        assert batches == [[kept]]
+        assert watcher.get_metrics()["events_ignored"] == 2
+
+    def test_max_delay_bounds_waiting(self, tmp_path):
+        """Test that a steady stream of changes is still delivered"""
+        path = make_files(tmp_path, 1)[0]
+
+        async def changes(watcher):
+            for _ in range(20):
+                watcher.notify(path)
+                await asyncio.sleep(0.02)
+
+        _, batches = watch(tmp_path, changes, debounce=0.05, max_delay=0.1)
+
+        assert len(batches) >= 2
+
+    def test_backpressure_coalesces_while_busy(self, tmp_path):
+        """Test that changes made while the sink is busy form the next batch"""
+        paths = make_files(tmp_path, 4)
+
+        async def changes(watcher):
+            watcher.notify(paths[0])
+            await asyncio.sleep(0.05)
+            for path in paths[1:] + paths[1:]:
+                watcher.notify(path)
+            await asyncio.sleep(0.2)
+
+        async def slow_sink(batch):
+            await asyncio.sleep(0.1)
+
+        watcher, batches = watch(tmp_path, changes, slow_sink, debounce=0.01)
+
+        assert batches == [[paths[0]], sorted(paths[1:])]
+        assert watcher.get_metrics()["sink_seconds"] >= 0.1
+
+    def test_overflow_rescans(self, tmp_path):
+        """Test that too many changes fall back to one rescan"""
+        paths = make_files(tmp_path, 5)
+
+        async def changes(watcher):
+            for path in paths:
+                watcher.notify(path)
+
+        watcher, batches = watch(tmp_path, changes, debounce=0.02, max_pending=2)
+
+        assert len(batches) == 1
+        assert sorted(batches[0]) == sorted(paths)
+        assert watcher.get_metrics()["rescans"] == 1
@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+import torch
+
+from sniffing.core.ai.inference import InferenceEngine
+
+class LengthTokenizer:
+    """Tokenizer encoding each word as token 1"""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, texts, padding, truncation, max_length, return_tensors):
+        self.batches.append(list(texts))
+        width = max(len(text.split()) for text in texts)
+        mask = torch.tensor([
+            [1] * len(text.split()) + [0] * (width - len(text.split()))
+            for text in texts
+        ])
+        return {"input_ids": mask.clone(), "attention_mask": mask}
+
+class CountingModel(torch.nn.Module):
+    """Model whose first-token state is the number of tokens in the text"""
+
+    def __init__(self):
+        super().__init__()
+        self.linear = torch.nn.Linear(1, 1)
+
+    def forward(self, input_ids, attention_mask):
+        counts = attention_mask.sum(dim=1, keepdim=True).float()
+        state = counts.unsqueeze(1).expand(-1, input_ids.shape[1], 2)
+        return SimpleNamespace(last_hidden_state=state)
+
+class TestInferenceEngine:
+    def test_embeddings_in_input_order(self):
+        """Test that length-sorted batching returns embeddings in input order"""
+        tokenizer = LengthTokenizer()
+        engine = InferenceEngine(CountingModel(), tokenizer, batch_size=2)
+
+        embeddings = engine.embed(["a b c", "a", "a b"])
+        assert embeddings[:, 0].tolist() == [3.0, 1.0, 2.0]
+        assert tokenizer.batches == [["a", "a b"], ["a b c"]]
+
+    def test_cache_by_text(self):
+        """Test that repeated texts are only run through the model once"""
+        tokenizer = LengthTokenizer()
+        engine = InferenceEngine(CountingModel(), tokenizer)
+
+        engine.embed(["a b", "a b", "a"])
+        embeddings = engine.embed(["a", "a b c"])
+
+        assert embeddings[:, 0].tolist() == [1.0, 3.0]
+        assert tokenizer.batches == [["a", "a b"], ["a b c"]]
+        stats = engine.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 3
+
+    def test_cache_bounded(self):
+        """Test that the least recently used embeddings are evicted"""
+        engine = InferenceEngine(CountingModel(), LengthTokenizer(), cache_size=2)
+
+        engine.embed(["a", "a b", "a b c"])
+        assert engine.get_stats()["cached_embeddings"] == 2
+        assert engine.embed(["a"])[0, 0] == 1.0
+
+    def test_quantized_model(self):
+        """Test that quantization replaces linear layers on CPU"""
+        engine = InferenceEngine(CountingModel(), LengthTokenizer(), quantize=True)
+
+        assert engine.quantized
+        assert not isinstance(engine.model.linear, torch.nn.Linear)
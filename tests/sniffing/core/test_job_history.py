@@ -0,0 +1,70 @@
+import asyncio
+
+from sniffing.core.utils.job_history import JobHistory
+
+class TestJobHistory:
+    def test_evicts_oldest_beyond_limit(self, tmp_path):
+        """Test that the oldest entries are evicted beyond max_entries"""
+        history = JobHistory(str(tmp_path), max_entries=2)
+        for key in ("a", "b", "c"):
+            history.put(key, {"status": "completed"}, {"issues": [key]})
+
+        assert "a" not in history
+        assert history.get_payload("c") == {"issues": ["c"]}
+        assert history.get_stats()["evictions"] == 1
+
+    def test_spills_payloads_beyond_budget(self, tmp_path):
+        """Test that older payloads move to disk while summaries stay resident"""
+        history = JobHistory(str(tmp_path), max_resident_bytes=50)
+        history.put("a", {"files": 1}, {"issues": ["x" * 20]})
+        history.put("b", {"files": 2}, {"issues": ["y" * 20]})
+
+        stats = history.get_stats()
+        assert stats["spills"] == 1
+        assert 0 < stats["resident_bytes"] <= 50
+        assert history.get_summary("a") == {"files": 1}
+        assert history.get_payload("a") == {"issues": ["x" * 20]}
+
+        history.delete("a")
+        assert list(tmp_path.iterdir()) == []
+
+    def test_drops_payloads_without_spill_path(self):
+        """Test that payloads beyond budget are dropped when not spilling"""
+        history = JobHistory(max_resident_bytes=0)
+        history.put("a", {"files": 1}, {"issues": []})
+
+        assert history.get_summary("a") == {"files": 1}
+        assert history.get_payload("a") is None
+        assert history.resident_bytes == 0
+
+    def test_age_based_eviction(self, tmp_path):
+        """Test that expired entries are hidden and pruned"""
+        history = JobHistory(str(tmp_path), max_age=60)
+        history.put("a", {}, {"issues": []})
+        history._entries["a"]["timestamp"] -= 120
+
+        assert history.get_summary("a") is None
+        assert history.prune() == 1
+        assert len(history) == 0
+
+    def test_sizes_are_bytes(self):
+        """Test that budgets count encoded bytes, not characters"""
+        history = JobHistory(max_resident_bytes=1024)
+        history.put("a", {}, "é" * 100)
+
+        # Two bytes per character plus the quotes
+        assert history.resident_bytes == 202
+        assert history.get_payload("a") == "é" * 100
+
+    def test_async_access(self, tmp_path):
+        """Test storing and loading spilled payloads off the event loop"""
+        history = JobHistory(str(tmp_path), max_resident_bytes=0)
+
+        async def run():
+            await history.put_async("a", {"files": 1}, {"issues": ["ü"]})
+            return await history.get_payload_async("a")
+
+        assert asyncio.run(run()) == {"issues": ["ü"]}
+        assert history.get_stats()["spills"] == 1
+        asyncio.run(history.clear_async())
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,31 @@
+from sniffing.core.utils.line_index import LineIndex
+
+class TestLineIndex:
+    def test_line_of_matches_newline_count(self):
+        """Test that line lookups agree with counting newlines"""
+        content = "first\n\nthird line\nfourth"
+        index = LineIndex(content)
+        for offset in range(len(content) + 1):
+            assert index.line_of(offset) == content.count("\n", 0, offset) + 1
+
+    def test_position(self):
+        """Test line and column lookup"""
+        index = LineIndex("abc\ndef\n")
+        assert index.position(0) == (1, 1)
+        assert index.position(5) == (2, 2)
+        assert index.position(8) == (3, 1)
+
+    def test_line_bounds(self):
+        """Test line start and end offsets"""
+        content = "abc\ndef\nghi"
+        index = LineIndex(content)
+        assert len(index) == 3
+        assert content[index.line_start(2):index.line_end(2)] == "def"
+        assert content[index.line_start(3):index.line_end(3)] == "ghi"
+        assert index.line_span(5) == (4, 7)
+
+    def test_empty_content(self):
+        """Test indexing empty content"""
+        index = LineIndex("")
+        assert len(index) == 1
+        assert index.line_of(0) == 1
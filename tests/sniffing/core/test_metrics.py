@@ -0,0 +1,120 @@
+import asyncio
+import json
+import threading
+
+from sniffing.core.utils.metrics import LatencyHistogram, MetricsCollector, OperationMetrics
+
+class TestLatencyHistogram:
+    def test_quantiles(self):
+        """Test that quantiles are within the histogram's precision"""
+        histogram = LatencyHistogram()
+        for i in range(1, 10001):
+            histogram.record(i * 1000)
+
+        stats = histogram.snapshot()
+        assert stats["count"] == 10000
+        assert stats["max"] == 0.01
+        for key, expected in (("p50", 0.005), ("p95", 0.0095), ("p99", 0.0099)):
+            assert abs(stats[key] - expected) / expected < 0.02
+
+    def test_fixed_memory(self):
+        """Test that the histogram does not grow with the durations seen"""
+        histogram = LatencyHistogram()
+        size = len(histogram.counts)
+        for duration in (0, 1, 10 ** 6, 10 ** 12, 10 ** 18):
+            histogram.record(duration)
+
+        assert len(histogram.counts) == size
+        assert histogram.snapshot()["count"] == 5
+
+    def test_threads(self):
+        """Test that durations recorded from threads are all counted"""
+        histogram = LatencyHistogram()
+
+        def record():
+            for i in range(5000):
+                histogram.record(i, success=i % 10 != 0)
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = histogram.snapshot()
+        assert stats["count"] == 20000
+        assert stats["failures"] == 2000
+
+class TestMetricsCollector:
+    def test_concurrent_spans(self):
+        """Test that concurrent spans of one operation keep their own timings"""
+        collector = MetricsCollector("test")
+
+        async def sniff(seconds):
+            with collector.span("sniff", domain="security"):
+                await asyncio.sleep(seconds)
+
+        async def run():
+            await asyncio.gather(sniff(0.2), sniff(0.01), sniff(0.01))
+
+        asyncio.run(run())
+
+        metrics = collector.get_metrics()["sniff"]
+        assert metrics["count"] == 3
+        assert metrics["duration_max"] >= 0.2
+        assert metrics["duration_p50"] < 0.1
+
+    def test_span_failure(self):
+        """Test that spans left by an exception count as failures"""
+        collector = MetricsCollector("test")
+        try:
+            with collector.span("sniff"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+        collector.span("sniff").end(success=True)
+
+        metrics = collector.get_metrics()["sniff"]
+        assert metrics["failures"] == 1
+        assert metrics["successes"] == 1
+
+    def test_record_start_and_end(self):
+        """Test that interleaved starts and ends are each timed"""
+        collector = MetricsCollector("test")
+        first = collector.record_start("hook")
+        collector.record_start("hook")
+        collector.record_end("hook", span=first)
+        collector.record_end("hook", success=False)
+        with OperationMetrics(collector, "hook"):
+            pass
+
+        metrics = collector.get_metrics()["hook"]
+        assert metrics["starts"] == 3
+        assert metrics["count"] == 3
+        assert metrics["failures"] == 1
+        assert not collector._timings
+
+    def test_series_limit(self):
+        """Test that label values past the series limit are folded together"""
+        collector = MetricsCollector("test", max_series=2)
+        for rule in ("a", "b", "c", "d"):
+            collector.span("rule", domain="security", rule=rule).end()
+
+        rules = sorted(stats["rule"] for stats in collector.get_latencies())
+        assert rules == ["a", "b", "other"]
+
+    def test_exports(self, tmp_path):
+        """Test the Prometheus and file exports"""
+        collector = MetricsCollector("test")
+        collector.span("rule", domain="security", rule='eval "call"').end(success=False)
+
+        text = collector.export_prometheus()
+        assert "# TYPE sniffing_span_duration_seconds summary" in text
+        assert 'rule="eval \\"call\\"",quantile="0.99"}' in text
+        assert 'sniffing_span_failures_total{collector="test",operation="rule",domain="security",rule="eval \\"call\\""} 1' in text
+
+        path = tmp_path / "metrics" / "test.json"
+        collector.write_metrics_file(str(path))
+        data = json.loads(path.read_text())
+        assert data["latencies"][0]["count"] == 1
+        assert data["metrics"]["rule"]["failures"] == 1
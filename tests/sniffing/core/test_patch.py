@@ -0,0 +1,123 @@
+import asyncio
+import os
+
+from sniffing.core.base.base_sniffer import BaseSniffer
+from sniffing.core.utils.patch import (
+    Edit,
+    PatchSet,
+    line_insert_edit,
+    pattern_edits,
+    text_edits,
+    write_atomic
+)
+
+class FixingSniffer(BaseSniffer):
+    """Sniffer with no rules, used to exercise fixing."""
+
+    async def _sniff_file_impl(self, file, context):
+        return {}
+
+def make_sniffer():
+    return FixingSniffer({"monitoring": {"logging": {"level": "WARNING"}}}, "fixing")
+
+class TestPatchSet:
+    def test_applies_in_one_pass(self):
+        """Test that edits computed against the original apply together"""
+        content = "a = eval(x)\nb = eval(y)\n"
+        patch = PatchSet()
+        assert patch.add(pattern_edits(content, r"eval\((\w)\)", r"literal_eval(\1)"))
+        assert patch.add([line_insert_edit(content, 1, "from ast import literal_eval")])
+
+        assert patch.apply(content) == (
+            "from ast import literal_eval\na = literal_eval(x)\nb = literal_eval(y)\n"
+        )
+
+    def test_rejects_overlapping_fix(self):
+        """Test that a fix overlapping an earlier one is rejected whole"""
+        content = "password = 'secret'\n"
+        patch = PatchSet()
+        assert patch.add(text_edits(content, "'secret'", "os.environ['PASSWORD']"))
+        assert not patch.add([Edit(0, 4, "x"), Edit(12, 3, "SECRET")], source="second")
+
+        assert len(patch) == 1
+        assert patch.conflicts[0]["source"] == "second"
+        assert patch.apply(content) == "password = os.environ['PASSWORD']\n"
+
+    def test_insertions_keep_order(self):
+        """Test that insertions at one offset apply in the order added"""
+        patch = PatchSet()
+        assert patch.add([Edit(0, 0, "first\n")])
+        assert patch.add([Edit(0, 0, "second\n")])
+        assert patch.add([Edit(0, 1, "X")])
+
+        assert patch.apply("x\n") == "first\nsecond\nX\n"
+
+    def test_insert_inside_replacement_conflicts(self):
+        """Test that inserting inside a replaced range conflicts"""
+        patch = PatchSet()
+        assert patch.add([Edit(2, 0, "!")])
+        assert patch.add([Edit(5, 10, "y")])
+        assert not patch.add([Edit(7, 0, "z")])
+        assert not patch.add([Edit(0, 3, "z")])
+
+    def test_duplicate_fixes(self):
+        """Test that the same edit from two fixes is applied once"""
+        patch = PatchSet()
+        assert patch.add([Edit(0, 1, "y")])
+        assert patch.add([Edit(0, 1, "y")])
+
+        assert patch.apply("x") == "y"
+
+    def test_many_fixes(self):
+        """Test a file with many issues against sequential substitution"""
+        content = "".join(f"value_{i} = eval(data_{i})\n" for i in range(500))
+        patch = PatchSet()
+        for edit in text_edits(content, "eval(", "literal_eval("):
+            assert patch.add([edit])
+
+        assert patch.apply(content) == content.replace("eval(", "literal_eval(")
+
+class TestWriteAtomic:
+    def test_keeps_mode(self, tmp_path):
+        """Test that the file is replaced with its permissions kept"""
+        path = tmp_path / "script.py"
+        path.write_text("old\n")
+        path.chmod(0o755)
+
+        write_atomic(str(path), "new\n")
+
+        assert path.read_text() == "new\n"
+        assert path.stat().st_mode & 0o777 == 0o755
+        assert os.listdir(tmp_path) == ["script.py"]
+
+class TestFixIssues:
+    def test_fix_issues_reports_conflicts(self, tmp_path):
+        """Test that conflicting fixes are reported and the rest applied"""
+        path = tmp_path / "module.py"
+        path.write_text("result = eval(data)\n")
+        issues = [
+            {"id": 1, "fix": {"type": "replace", "pattern": r"eval\(", "replacement": "literal_eval("}},
+            {"id": 2, "fix": {"type": "delete", "pattern": r"eval\(data\)"}},
+            {"id": 3, "fix": {"type": "insert", "target": r"\A", "content": "from ast import literal_eval\n"}},
+            {"id": 4, "fix": {"type": "delete", "pattern": "missing"}}
+        ]
+
+        fixes = asyncio.run(make_sniffer().fix_issues(str(path), issues))
+
+        assert fixes["status"] == "partial"
+        assert [fix["issue"]["id"] for fix in fixes["applied"]] == [1, 3]
+        assert [fix["issue"]["id"] for fix in fixes["failed"]] == [2, 4]
+        assert path.read_text() == "from ast import literal_eval\nresult = literal_eval(data)\n"
+
+    def test_apply_fixes_writes_each_file_once(self, tmp_path):
+        """Test that suggestions for one file are applied together"""
+        path = tmp_path / "module.py"
+        path.write_text("a = 1\nb = 2\n")
+        suggestions = [
+            {"file": str(path), "fix_type": "replace", "old_code": "a = 1", "new_code": "a = 10"},
+            {"file": str(path), "fix_type": "insert", "line": 2, "code": "# b"},
+            {"file": str(path), "fix_type": "insert", "line": 9, "code": "c = 3"}
+        ]
+
+        assert asyncio.run(make_sniffer()._apply_fixes(suggestions))
+        assert path.read_text() == "a = 10\n# b\nb = 2\nc = 3\n"
@@ -0,0 +1,60 @@
+import re
+
+from sniffing.core.utils.pattern_scanner import PatternScanner
+
+RULES = {
+    "sql_injection": r".*\b(SELECT|INSERT|UPDATE|DELETE)\b.*\+.*",
+    "command_injection": r".*exec\(.*\)|.*eval\(.*\)|.*system\(.*\)",
+    "hardcoded_credentials": r"password\s*=\s*['\"][^'\"]+['\"]",
+    "insecure_crypto": r".*MD5|.*SHA1",
+}
+
+class TestPatternScanner:
+    def test_reports_every_rule_on_a_line(self):
+        """Test that rules shadowed by an earlier match on the same line are reported"""
+        scanner = PatternScanner(RULES)
+        hits = scanner.scan('query = "SELECT *" + table; eval(query)\n')
+        assert {hit.rule for hit in hits} == {"sql_injection", "command_injection"}
+        assert all(hit.line == 1 for hit in hits)
+
+    def test_line_numbers_and_code(self):
+        """Test hit line numbers and reported code"""
+        scanner = PatternScanner(RULES)
+        content = "import hashlib\n\npassword = 'secret'\nh = hashlib.MD5()\n"
+        hits = scanner.scan(content)
+        assert [(hit.rule, hit.line) for hit in hits] == [
+            ("hardcoded_credentials", 3),
+            ("insecure_crypto", 4),
+        ]
+        assert hits[0].code == "password = 'secret'"
+        assert hits[1].code == "h = hashlib.MD5()"
+
+    def test_matches_per_pattern_lines(self):
+        """Test that the scanner flags the same lines as per-pattern scanning"""
+        scanner = PatternScanner(RULES)
+        content = "\n".join([
+            "x = 1",
+            "os.system(cmd)",
+            "DELETE FROM t WHERE id = ' + id",
+            "use SHA1 and MD5",
+            "nothing here",
+        ])
+        expected = set()
+        for name, pattern in RULES.items():
+            for match in re.finditer(pattern, content, re.MULTILINE):
+                expected.add((name, content.count("\n", 0, match.start()) + 1))
+        assert {(hit.rule, hit.line) for hit in scanner.scan(content)} == expected
+
+    def test_standalone_rules(self):
+        """Test rules that cannot join the combined alternation"""
+        scanner = PatternScanner({"repeat": r"(\w)\1", "named": r"(?P<word>foo)"})
+        hits = scanner.scan("aa foo\n")
+        assert {hit.rule for hit in hits} == {"repeat", "named"}
+
+    def test_matched_rules(self):
+        """Test rule presence detection"""
+        scanner = PatternScanner(
+            {"logging": r".*logger.*", "alerting": r".*alert.*"},
+            re.MULTILINE | re.IGNORECASE
+        )
+        assert scanner.matched_rules("LOGGER.info('x')") == {"logging"}
@@ -0,0 +1,95 @@
+import asyncio
+import re
+import time
+
+from sniffing.core.utils.pattern_scanner import PatternScanner
+from sniffing.core.utils.regex_safety import SafePattern, vet_pattern
+
+class TestVetPattern:
+    def test_flags_backtracking_patterns(self):
+        """Test that nested and overlapping quantifiers are flagged"""
+        assert any("nested" in warning for warning in vet_pattern(r"(a+)+"))
+        assert any("alternatives" in warning for warning in vet_pattern(r"(a|aa)+"))
+        assert any("adjacent" in warning for warning in vet_pattern(r".*\bFROM\b.*\bWHERE\b.*"))
+        assert vet_pattern(r"(unclosed")
+
+    def test_accepts_linear_patterns(self):
+        """Test that quantifiers separated by delimiters are not flagged"""
+        assert vet_pattern(r"password\s*=\s*['\"][^'\"]+['\"]") == []
+        assert vet_pattern(r"(a|ab)+") == []
+        assert vet_pattern(r"(?:a*b)+") == []
+        assert vet_pattern(r"^(\d+\.)+\d+$") == []
+        assert vet_pattern(r"setInterval\([^,]+,\s*\d+\s*\)") == []
+
+class TestSafePattern:
+    def test_unflagged_pattern_runs_inline(self):
+        """Test that safe patterns are matched without the worker"""
+        safe = SafePattern(r"eval\(")
+        assert not safe.guarded
+        assert safe.spans("x = eval(y)") == [(4, 9)]
+
+    def test_timeout_bounds_backtracking(self):
+        """Test that a catastrophic match is abandoned within its budget"""
+        safe = SafePattern(r"(a+)+$", timeout=0.5, engine="worker")
+        assert safe.spans("a") == [(0, 1)]
+
+        start = time.monotonic()
+        assert safe.spans("a" * 40 + "b") == []
+        assert time.monotonic() - start < 5
+        assert safe.timed_out
+        assert safe.timeouts == 2
+
+    def test_line_bounded_fallback(self):
+        """Test that short lines still match after a timeout"""
+        safe = SafePattern(r"(x+x+)+y", timeout=0.5, max_line_length=20, engine="worker")
+        content = "x" * 40 + "\nxxy\n"
+
+        assert safe.spans(content) == [(41, 44)]
+        assert not safe.timed_out
+        assert safe.fallbacks == 1
+        assert safe.skipped_lines == 1
+
+    def test_guarded_match_does_not_block_loop(self):
+        """Test that waiting for the worker leaves the event loop running"""
+        safe = SafePattern(r"(a+)+$", timeout=0.5, engine="worker")
+        safe.spans("a")
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.05)
+
+        async def run():
+            ticker = asyncio.ensure_future(tick())
+            spans = await safe.spans_async("a" * 40 + "b")
+            ticker.cancel()
+            return spans
+
+        assert asyncio.run(run()) == []
+        assert len(ticks) > 5
+
+class TestPatternScannerSafety:
+    def test_flagged_rule_is_guarded(self):
+        """Test that flagged rules are kept out of the combined alternation"""
+        scanner = PatternScanner(
+            {"eval": r"eval\(", "nested": r"(a+)+b"},
+            safety={"engine": "worker", "timeout_ms": 500, "max_line_length": 20}
+        )
+
+        assert scanner.rules["nested"].group is None
+        assert "nested" in scanner.guarded_rules()
+        assert "eval" not in scanner.guarded_rules()
+
+        hits = scanner.group_hits(scanner.scan("eval(x)\naab\n" + "a" * 40 + "\n"))
+        assert len(hits["eval"]) == 1
+        assert [hit.line for hit in hits["nested"]] == [2]
+
+        async_hits = asyncio.run(scanner.scan_async("eval(x)\naab\n"))
+        assert [hit.rule for hit in async_hits] == ["eval", "nested"]
+
+    def test_guarding_can_be_disabled(self):
+        """Test that the re engine leaves flagged rules unguarded"""
+        scanner = PatternScanner({"nested": r"(a+)+b"}, re.MULTILINE, safety={"engine": "re"})
+        assert scanner.guarded_rules() == {}
+        assert scanner.rules["nested"].group is not None
@@ -0,0 +1,73 @@
+import sys
+
+import pytest
+
+from sniffing.core.utils.registry import BUILTIN_SNIFFERS, LazySniffers, PluginRegistry
+
+PLUGIN_SOURCE = '''
+class CountingSniffer:
+    instances = 0
+
+    def __init__(self, config):
+        CountingSniffer.instances += 1
+        self.config = config
+'''
+
+@pytest.fixture
+def plugin_module(tmp_path, monkeypatch):
+    (tmp_path / "lazy_plugin_module.py").write_text(PLUGIN_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_plugin_module"
+    sys.modules.pop("lazy_plugin_module", None)
+
+class TestPluginRegistry:
+    def test_imports_on_first_load(self, plugin_module):
+        """Test that plugin modules are imported on first load only"""
+        registry = PluginRegistry(plugins={"counting": f"{plugin_module}:CountingSniffer"})
+
+        assert registry.names() == ["counting"]
+        assert plugin_module not in sys.modules
+
+        plugin = registry.load("counting")
+        assert plugin.__name__ == "CountingSniffer"
+        assert registry.is_loaded("counting")
+        assert registry.load("counting") is plugin
+
+    def test_unknown_plugin(self):
+        """Test that unknown names raise KeyError"""
+        with pytest.raises(KeyError):
+            PluginRegistry(plugins={}).load("missing")
+
+    def test_builtin_references_resolve(self):
+        """Test that every built-in sniffer reference names a module and class"""
+        for reference in BUILTIN_SNIFFERS.values():
+            module, _, attribute = reference.partition(":")
+            assert module.startswith("sniffing.domains.")
+            assert attribute.endswith("Sniffer")
+
+class TestLazySniffers:
+    def test_constructs_on_access(self, plugin_module):
+        """Test that sniffers are constructed once, on first access"""
+        registry = PluginRegistry(plugins={"counting": f"{plugin_module}:CountingSniffer"})
+        sniffers = LazySniffers({"counting": {"enabled": True}, "unknown": {}}, registry)
+
+        assert list(sniffers) == ["counting"]
+        assert sniffers.loaded() == {}
+        assert plugin_module not in sys.modules
+
+        sniffer = sniffers["counting"]
+        assert sniffers["counting"] is sniffer
+        assert sniffer.config == {"enabled": True}
+        assert type(sniffer).instances == 1
+        assert sniffers.loaded() == {"counting": sniffer}
+
+    def test_spec_does_not_construct(self, plugin_module):
+        """Test that specs give the class and config without constructing"""
+        registry = PluginRegistry(plugins={"counting": f"{plugin_module}:CountingSniffer"})
+        sniffers = LazySniffers({"counting": {"x": 1}}, registry)
+
+        cls, config = sniffers.spec("counting")
+        assert cls.instances == 0
+        assert config == {"x": 1}
+        with pytest.raises(KeyError):
+            sniffers["unknown"]
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from sniffing.core.utils.report_service import ReportService
+
+@pytest.fixture
+def calls():
+    return []
+
+@pytest.fixture
+def service(tmp_path, calls):
+    async def render_html(report):
+        calls.append(report)
+        await asyncio.sleep(0)
+        return f"<h1>{report['title']}</h1>"
+
+    async def render_csv(report):
+        return "title\n" + report["title"]
+
+    return ReportService(tmp_path, {"html": render_html, "csv": render_csv})
+
+class TestReportService:
+    def test_store_writes_json_only(self, service, tmp_path):
+        """Test that storing a report does not render other formats"""
+        path = service.store("job1", {"title": "Report"})
+
+        assert path == tmp_path / "json" / "job1.json"
+        assert not (tmp_path / "html").exists()
+        assert asyncio.run(service.render("job1", "json")) == path
+
+    def test_render_cached_by_content(self, service, calls):
+        """Test that renders are cached and shared by identical reports"""
+        service.store("job1", {"title": "Report"})
+        service.store("job2", {"title": "Report"})
+
+        first = asyncio.run(service.render("job1", "html"))
+        second = asyncio.run(service.render("job2", "html"))
+
+        assert first == second
+        assert first.read_text() == "<h1>Report</h1>"
+        assert len(calls) == 1
+        assert service.get_stats()["cache_hits"] == 1
+
+    def test_concurrent_renders_shared(self, service, calls):
+        """Test that concurrent requests for one render render once"""
+        service.store("job1", {"title": "Report"})
+
+        async def run():
+            return await asyncio.gather(
+                service.render("job1", "html"),
+                service.render("job1", "html")
+            )
+
+        first, second = asyncio.run(run())
+        assert first == second
+        assert len(calls) == 1
+
+    def test_unsupported_format(self, service):
+        """Test that unknown formats and reports are rejected"""
+        service.store("job1", {"title": "Report"})
+
+        with pytest.raises(ValueError):
+            asyncio.run(service.render("job1", "docx"))
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(service.render("missing", "csv"))
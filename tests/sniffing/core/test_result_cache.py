@@ -0,0 +1,90 @@
+import sqlite3
+
+from sniffing.core.utils.cache import ResultCache, path_cache_key
+from sniffing.core.utils.result import SniffingResult
+
+class TestResultCache:
+    def test_keyed_by_hash_domain_and_rules(self, tmp_path):
+        """Test that entries only match the same content, domain and rule set"""
+        cache = ResultCache(str(tmp_path / "results.db"))
+        cache.set("abc", "security", "v1", {"issues": [1]})
+
+        assert cache.get("abc", "security", "v1") == {"issues": [1]}
+        assert cache.get("abc", "security", "v2") is None
+        assert cache.get("abc", "unit", "v1") is None
+        assert cache.get("def", "security", "v1") is None
+
+        stats = cache.get_stats()
+        assert stats["total_entries"] == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 3
+
+    def test_keyed_by_path(self):
+        """Test that identical content under another file name is cached apart"""
+        cache = ResultCache(":memory:")
+        cache.set("abc", "documentation", "v1", {"issues": [1]}, path_cache_key("src/a.py"))
+
+        assert cache.get("abc", "documentation", "v1", path_cache_key("lib/a.py")) == {"issues": [1]}
+        assert cache.get("abc", "documentation", "v1", path_cache_key("src/a.txt")) is None
+        assert cache.get("abc", "documentation", "v1", path_cache_key("README.md")) is None
+
+    def test_drops_entries_without_path_key(self, tmp_path):
+        """Test that a cache created before path keys is reset"""
+        path = tmp_path / "results.db"
+        conn = sqlite3.connect(str(path))
+        conn.execute(
+            "CREATE TABLE results (content_hash TEXT, domain TEXT, rule_version TEXT, "
+            "result TEXT, created_at REAL)"
+        )
+        conn.execute("INSERT INTO results VALUES ('abc', 'unit', 'v1', '{}', 0)")
+        conn.commit()
+        conn.close()
+
+        cache = ResultCache(str(path))
+        assert cache.get_stats()["total_entries"] == 0
+        cache.set("abc", "unit", "v1", {})
+        assert cache.get("abc", "unit", "v1") == {}
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that entries survive reopening the cache"""
+        path = str(tmp_path / "results.db")
+        cache = ResultCache(path)
+        cache.set("abc", "unit", "v1", {"status": "ok"})
+        cache.close()
+
+        assert ResultCache(path).get("abc", "unit", "v1") == {"status": "ok"}
+
+    def test_ttl_and_prune(self):
+        """Test that expired entries are ignored and pruned"""
+        cache = ResultCache(":memory:", ttl=60)
+        cache.set("abc", "unit", "v1", {})
+        cache._conn.execute("UPDATE results SET created_at = created_at - 120")
+
+        assert cache.get("abc", "unit", "v1") is None
+        assert cache.prune() == 1
+
+    def test_delete_and_clear(self):
+        """Test removing entries"""
+        cache = ResultCache(":memory:")
+        cache.set("abc", "unit", "v1", {})
+        cache.set("abc", "security", "v1", {})
+        cache.set("def", "unit", "v1", {})
+
+        cache.delete("abc", "unit")
+        assert cache.get("abc", "unit", "v1") is None
+        assert cache.get("abc", "security", "v1") == {}
+
+        cache.clear()
+        assert cache.get_stats()["total_entries"] == 0
+
+    def test_cached_result_round_trip(self):
+        """Test restoring a cached sniffing result for another path"""
+        cache = ResultCache(":memory:")
+        result = SniffingResult("a.py", "security")
+        result.add_issue({"type": "sql_injection"})
+        cache.set("abc", "security", "v1", result.to_dict())
+
+        restored = SniffingResult.from_dict(cache.get("abc", "security", "v1"), "b.py")
+        assert restored.file == "b.py"
+        assert restored.issues[0]["file"] == "b.py"
+        assert restored.has_issues()
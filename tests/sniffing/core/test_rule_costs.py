@@ -0,0 +1,75 @@
+from sniffing.core.utils.metrics import MetricsCollector
+from sniffing.core.utils.pattern_scanner import PatternScanner
+from sniffing.core.utils.rule_costs import RuleCostTracker
+
+RULES = {
+    "eval": r"eval\(",
+    "password": r"password\s*=",
+    "backtracking": r"(a+)+b"
+}
+
+CONTENT = "x = eval(data)\npassword = 'secret'\n" + "a" * 16 + "\n"
+
+class TestRuleCostTracker:
+    def test_report_ranks_rules(self):
+        """Test that the report lists the slowest rules first"""
+        metrics = MetricsCollector("test")
+        costs = RuleCostTracker("security", metrics=metrics)
+        costs.record("fast", 0.001, 2, 100)
+        costs.record("slow", 0.5, 0, 100)
+        costs.record("fast", 0.003, 1, 100)
+
+        report = costs.report()
+        assert [cost["rule"] for cost in report] == ["slow", "fast"]
+        assert report[1]["runs"] == 2
+        assert report[1]["matches"] == 3
+        assert report[1]["bytes_scanned"] == 200
+        assert report[1]["last_matches"] == 1
+        assert "slow" in costs.format_report(1)
+        assert "fast" not in costs.format_report(1)
+        assert {stats["rule"] for stats in metrics.get_latencies()} == {"fast", "slow"}
+
+    def test_budget_quarantines_rule(self):
+        """Test that a rule is quarantined after repeated budget overruns"""
+        costs = RuleCostTracker(budget=0.1, quarantine_after=2)
+        costs.record("slow", 0.2, 0, 10)
+        assert not costs.is_quarantined("slow")
+        costs.record("slow", 0.3, 0, 10)
+        assert costs.is_quarantined("slow")
+
+        costs.release("slow")
+        assert not costs.is_quarantined("slow")
+        costs.record("slow", 0.3, 0, 10)
+        assert not costs.is_quarantined("slow")
+
+class TestPatternScannerCosts:
+    def test_profiled_scans(self):
+        """Test that sampled scans record the cost of each rule"""
+        costs = RuleCostTracker(sample_every=2)
+        scanner = PatternScanner(RULES, costs=costs)
+
+        profiled = scanner.scan(CONTENT)
+        combined = scanner.scan(CONTENT)
+
+        assert [hit.rule for hit in profiled] == [hit.rule for hit in combined] == ["eval", "password"]
+        assert {cost["rule"]: cost["runs"] for cost in costs.report(0)} == {
+            "eval": 1,
+            "password": 1,
+            # Guarded rules run on their own, so every scan times them
+            "backtracking": 2
+        }
+        assert costs.costs["eval"].bytes_scanned == len(CONTENT)
+
+    def test_quarantined_rule_is_skipped(self):
+        """Test that quarantined rules are left out of later scans"""
+        costs = RuleCostTracker(sample_every=1)
+        scanner = PatternScanner(RULES, costs=costs)
+        costs.quarantine("password", "too slow")
+
+        hits = scanner.group_hits(scanner.scan(CONTENT))
+        assert hits["password"] == []
+        assert len(hits["eval"]) == 1
+        assert "password" not in costs.costs
+
+        costs.release("password")
+        assert len(scanner.group_hits(scanner.scan(CONTENT))["password"]) == 1
@@ -0,0 +1,66 @@
+import asyncio
+
+from sniffing.core.base.sniffing_loop import SniffingLoop
+from sniffing.core.utils.cache import ResultCache
+from sniffing.core.utils.file_context import FileContext
+from sniffing.core.utils.result import SniffingResult
+
+class FlakySniffer:
+    rule_set_version = "v1"
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    async def sniff_file(self, file, context):
+        self.calls += 1
+        return SniffingResult(file, "security", status=self.statuses.pop(0))
+
+class SuffixSniffer:
+    """Sniffer whose output depends on the file suffix, like the documentation sniffer"""
+    rule_set_version = "v1"
+
+    async def sniff_file(self, file, context):
+        result = SniffingResult(file, "documentation")
+        if file.endswith(".py"):
+            result.add_issue({"type": "docstring"})
+        return result
+
+class TestSniffingLoopCache:
+    def _loop(self):
+        loop = SniffingLoop.__new__(SniffingLoop)
+        loop.result_cache = ResultCache(":memory:")
+        return loop
+
+    def test_failed_results_are_not_cached(self, tmp_path):
+        """Test that a failure is retried instead of served from the cache"""
+        path = tmp_path / "a.py"
+        path.write_text("x = 1\n")
+        loop = self._loop()
+        sniffer = FlakySniffer([False, True, True])
+
+        async def sniff():
+            return await loop._sniff_file_cached("security", sniffer, str(path), FileContext(str(path)))
+
+        assert asyncio.run(sniff()).status is False
+        assert asyncio.run(sniff()).status is True
+        cached = asyncio.run(sniff())
+        assert sniffer.calls == 2
+        assert isinstance(cached, SniffingResult)
+        assert cached.status is True
+
+    def test_cache_is_keyed_by_path(self, tmp_path):
+        """Test that identical content under another suffix is sniffed again"""
+        loop = self._loop()
+        sniffer = SuffixSniffer()
+        paths = [tmp_path / "a.py", tmp_path / "a.txt"]
+        for path in paths:
+            path.write_text("x = 1\n")
+
+        async def sniff(path):
+            return await loop._sniff_file_cached("documentation", sniffer, str(path), FileContext(str(path)))
+
+        assert asyncio.run(sniff(paths[0])).has_issues()
+        assert not asyncio.run(sniff(paths[1])).has_issues()
+        assert asyncio.run(sniff(paths[0])).has_issues()
+        assert loop.result_cache.hits == 1
@@ -0,0 +1,155 @@
+import asyncio
+import os
+import stat
+
+import pytest
+
+from sniffing.git import git_integration
+from sniffing.git.daemon import SniffingDaemon
+from sniffing.git.hooks.client import check_files, default_socket_path, is_running, send_request
+
+class FakeOrchestrator:
+    """Orchestrator reporting one canned result per file."""
+
+    sniffers = {}
+
+    def __init__(self, severity):
+        self.severity = severity
+        self.calls = 0
+
+    async def run_tests(self, files, domains, priority, fix, on_result):
+        self.calls += 1
+        for file in files:
+            await on_result(file, "security", {"issues": [{"severity": self.severity, "message": "bad"}]})
+        return {"status": "completed", "results": {"files": len(files), "results": len(files), "issues": len(files)}}
+
+    def get_domain_status(self):
+        return {}
+
+    async def cleanup(self):
+        pass
+
+def serve(daemon, client):
+    """Run a daemon while a blocking client talks to it."""
+    async def run():
+        await daemon.start()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, client)
+        finally:
+            await daemon.stop()
+    return asyncio.run(run())
+
+class TestSniffingDaemon:
+    def test_streams_results(self, tmp_path):
+        """Test that sniff results are streamed before the end message"""
+        daemon = SniffingDaemon({}, tmp_path / "d.sock", FakeOrchestrator("low"))
+        request = {"command": "sniff", "files": ["a.py", "b.py"]}
+
+        messages = serve(daemon, lambda: list(send_request(daemon.socket_path, request, 5)))
+
+        assert [m["type"] for m in messages] == ["result", "result", "end"]
+        assert messages[-1]["status"] == "passed"
+        assert messages[-1]["results"] == 2
+        assert not daemon.socket_path.exists()
+
+    def test_critical_issues_fail(self, tmp_path):
+        """Test that critical issues fail the hook"""
+        target = tmp_path / "a.py"
+        target.write_text("x = 1\n")
+        daemon = SniffingDaemon({}, tmp_path / "d.sock", FakeOrchestrator("critical"))
+
+        assert serve(daemon, lambda: check_files(daemon.socket_path, [str(target)], timeout=5)) == 1
+
+    def test_ping_and_status(self, tmp_path):
+        """Test that the daemon answers pings and status requests"""
+        daemon = SniffingDaemon({}, tmp_path / "d.sock", FakeOrchestrator("low"))
+
+        def client():
+            status = list(send_request(daemon.socket_path, {"command": "status"}, 5))
+            return is_running(daemon.socket_path), status[-1]["daemon"]
+
+        running, status = serve(daemon, client)
+        assert running
+        assert status["socket"] == str(daemon.socket_path)
+
+    def test_replaces_stale_socket(self, tmp_path):
+        """Test that a socket left by a dead daemon is replaced"""
+        socket_path = tmp_path / "d.sock"
+        socket_path.write_text("")
+        daemon = SniffingDaemon({}, socket_path, FakeOrchestrator("low"))
+
+        assert serve(daemon, lambda: is_running(socket_path))
+
+    def test_client_without_daemon(self, tmp_path):
+        """Test that connecting without a daemon raises"""
+        with pytest.raises(FileNotFoundError):
+            check_files(tmp_path / "missing.sock", [str(tmp_path)])
+
+class TestSocketSecurity:
+    def test_default_path_is_per_user(self, tmp_path, monkeypatch):
+        """Test that sockets live in a per-user runtime directory"""
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        assert default_socket_path(".").parent == tmp_path / "sniffing"
+
+        monkeypatch.delenv("XDG_RUNTIME_DIR")
+        assert default_socket_path(".").parent.name == f"sniffing-{os.getuid()}"
+
+    def test_daemon_creates_private_directory(self, tmp_path):
+        """Test that the daemon binds inside a directory only its user can enter"""
+        daemon = SniffingDaemon({}, tmp_path / "run" / "d.sock", FakeOrchestrator("low"))
+
+        def client():
+            return stat.S_IMODE(os.stat(daemon.socket_path.parent).st_mode), is_running(daemon.socket_path)
+
+        mode, running = serve(daemon, client)
+        assert mode == 0o700
+        assert running
+
+    def test_refuses_shared_directory(self, tmp_path):
+        """Test that a socket in a directory other users can write is not trusted"""
+        shared = tmp_path / "shared"
+        shared.mkdir()
+        daemon = SniffingDaemon({}, shared / "d.sock", FakeOrchestrator("low"))
+
+        async def run():
+            await daemon.start()
+            try:
+                os.chmod(shared, 0o777)
+                return await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    lambda: list(send_request(daemon.socket_path, {"command": "ping"}, 5))
+                )
+            finally:
+                os.chmod(shared, 0o700)
+                await daemon.stop()
+
+        with pytest.raises(PermissionError):
+            asyncio.run(run())
+
+    def test_refuses_non_socket(self, tmp_path):
+        """Test that a file squatting on the socket path is not connected to"""
+        (tmp_path / "d.sock").write_text("")
+        with pytest.raises(PermissionError):
+            list(send_request(tmp_path / "d.sock", {"command": "ping"}, 5))
+        assert not is_running(tmp_path / "d.sock")
+
+    def test_in_process_without_unix_sockets(self, tmp_path):
+        """Test that requests can be served without a socket"""
+        daemon = SniffingDaemon({}, None, FakeOrchestrator("critical"))
+        daemon.socket_path = None
+
+        messages = asyncio.run(daemon.handle_request({"command": "sniff", "files": ["a.py"]}))
+        assert [m["type"] for m in messages] == ["result", "end"]
+        assert messages[-1]["status"] == "failed"
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(daemon.start())
+
+    def test_git_integration_without_unix_sockets(self, monkeypatch):
+        """Test that git integration sniffs directly without Unix sockets"""
+        monkeypatch.setattr(git_integration, "UNIX_SOCKETS", False)
+        integration = git_integration.GitIntegration.__new__(git_integration.GitIntegration)
+        integration.config = {}
+        integration.repo_path = "."
+
+        assert integration.socket_path is None
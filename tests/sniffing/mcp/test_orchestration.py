@@ -0,0 +1,186 @@
+import asyncio
+from pathlib import Path
+
+import yaml
+
+from sniffing.core.utils.executor import SniffingExecutor
+from sniffing.core.utils.registry import LazySniffers, PluginRegistry
+from sniffing.core.utils.result import SniffingResult
+from sniffing.mcp.orchestration import test_orchestrator
+
+class NullSniffer:
+    """Sniffer that is never run directly, the fake executor stands in"""
+
+    rule_set_version = "v1"
+
+    def __init__(self, config):
+        self.config = config
+
+    def cache_key(self, file):
+        return file.rsplit(".", 1)[-1]
+
+    async def cleanup(self):
+        pass
+
+class RecordingExecutor(SniffingExecutor):
+    """Executor recording its calls and the concurrency of each domain"""
+
+    def __init__(self, sniffers, batch_size, delay=0.01):
+        super().__init__(sniffers)
+        self.batch_size = batch_size
+        self.delay = delay
+        self.calls = []
+        self.running = {domain: 0 for domain in sniffers}
+        self.peak = {domain: 0 for domain in sniffers}
+        self.gate = None
+
+    async def sniff(self, items, contexts=None):
+        self.calls.append(items)
+        domains = {domain for _, item_domains in items for domain in item_domains}
+        for domain in domains:
+            self.running[domain] += 1
+            self.peak[domain] = max(self.peak[domain], self.running[domain])
+        try:
+            for file, item_domains in items:
+                for domain in item_domains:
+                    await asyncio.sleep(self.delay)
+                    result = SniffingResult(file, domain)
+                    if file.endswith(".py"):
+                        result.add_issue({"type": "docstring"})
+                    yield file, domain, result
+                    if self.gate is not None:
+                        await self.gate.wait()
+        finally:
+            for domain in domains:
+                self.running[domain] -= 1
+
+def create_orchestrator(tmp_path, concurrency, batch_size, result_cache=False):
+    configs = {"alpha": {}, "beta": {}}
+    registry = PluginRegistry(plugins={"alpha": NullSniffer, "beta": NullSniffer})
+    orchestrator = test_orchestrator.TestOrchestrator({
+        "domains": configs,
+        "global": {"parallel_jobs": 4},
+        "mcp": {
+            "orchestration": {
+                "domain_concurrency": concurrency,
+                "result_cache": {"enabled": result_cache, "path": ":memory:"},
+                "job_history": {"path": str(tmp_path / "history")}
+            }
+        }
+    })
+    orchestrator.sniffers = LazySniffers(configs, registry)
+    orchestrator._setup_domain_limits(concurrency)
+    orchestrator.executor = RecordingExecutor(orchestrator.sniffers, batch_size)
+    return orchestrator
+
+def make_files(tmp_path, count):
+    files = []
+    for i in range(count):
+        path = tmp_path / f"file_{i}.py"
+        path.write_text("x = 1\n")
+        files.append(str(path))
+    return files
+
+class TestBatchedSniffing:
+    def test_domains_share_one_executor_call(self, tmp_path):
+        """Test that files and their domains are sent to the executor in batches"""
+        orchestrator = create_orchestrator(tmp_path, 4, batch_size=2)
+        files = make_files(tmp_path, 5)
+
+        response = asyncio.run(orchestrator.run_tests(files, fix=False))
+
+        assert response["status"] == "completed"
+        assert len(orchestrator.executor.calls) == 3
+        assert orchestrator.executor.calls[0] == [
+            (files[0], ["alpha", "beta"]),
+            (files[1], ["alpha", "beta"])
+        ]
+        assert all(set(response["results"][file]) == {"alpha", "beta"} for file in files)
+
+    def test_domain_limit(self, tmp_path):
+        """Test that batches respect the concurrency limit of each domain"""
+        orchestrator = create_orchestrator(tmp_path, {"alpha": 1, "beta": 2}, batch_size=1)
+        files = make_files(tmp_path, 6)
+
+        async def run():
+            return await asyncio.gather(
+                orchestrator.run_tests(files, domains=["alpha", "beta"], fix=False),
+                orchestrator.run_tests(files, domains=["beta"], fix=False)
+            )
+
+        responses = asyncio.run(run())
+
+        assert [response["status"] for response in responses] == ["completed", "completed"]
+        assert orchestrator.executor.peak["alpha"] == 1
+        assert orchestrator.executor.peak["beta"] == 2
+        assert orchestrator.domain_in_flight == {"alpha": 0, "beta": 0}
+
+    def test_results_stream_before_batch_finishes(self, tmp_path):
+        """Test that results reach the callback while their batch still runs"""
+        orchestrator = create_orchestrator(tmp_path, 4, batch_size=8)
+        orchestrator.executor.gate = asyncio.Event()
+        files = make_files(tmp_path, 3)
+        received = []
+
+        async def on_result(file, domain, data):
+            received.append((file, domain))
+
+        async def run():
+            job = asyncio.ensure_future(
+                orchestrator.run_tests(files, fix=False, on_result=on_result)
+            )
+            while not received:
+                await asyncio.sleep(0.01)
+            assert not job.done()
+            assert len(orchestrator.executor.calls) == 1
+            streamed = list(received)
+            orchestrator.executor.gate.set()
+            return streamed, await job
+
+        streamed, response = asyncio.run(run())
+
+        assert streamed == [(files[0], "alpha")]
+        assert response["results"] == {"files": 3, "results": 6, "issues": 6}
+
+    def test_cache_is_keyed_by_path(self, tmp_path):
+        """Test that identical content under another suffix is not served from the cache"""
+        orchestrator = create_orchestrator(tmp_path, 4, batch_size=1, result_cache=True)
+        source, text = tmp_path / "a.py", tmp_path / "a.txt"
+        source.write_text("x = 1\n")
+        text.write_text("x = 1\n")
+
+        async def run():
+            first = await orchestrator.run_tests([str(source)], domains=["alpha"], fix=False)
+            second = await orchestrator.run_tests([str(text)], domains=["alpha"], fix=False)
+            third = await orchestrator.run_tests([str(source)], domains=["alpha"], fix=False)
+            return first, second, third
+
+        first, second, third = asyncio.run(run())
+
+        assert first["results"][str(source)]["alpha"]["issues"]
+        assert not second["results"][str(text)]["alpha"]["issues"]
+        assert third["results"][str(source)]["alpha"]["issues"]
+        assert len(orchestrator.executor.calls) == 2
+
+class TestOrchestrationConfig:
+    def test_shipped_config_takes_effect(self, tmp_path, monkeypatch):
+        """Test that the orchestration section of the shipped configuration is read"""
+        config_path = Path(test_orchestrator.__file__).parents[2] / "config" / "sniffing_config.yaml"
+        with open(config_path) as f:
+            config = yaml.safe_load(f)
+        monkeypatch.chdir(tmp_path)
+
+        orchestrator = test_orchestrator.TestOrchestrator(config)
+        try:
+            shipped = config["mcp"]["orchestration"]
+            assert orchestrator.completed_jobs.max_age == shipped["job_history"]["max_age"]
+            assert orchestrator.file_locks.timeout == shipped["file_locks"]["timeout"]
+            assert orchestrator.pipeline_queue_size == shipped["pipeline_queue_size"]
+        finally:
+            asyncio.run(orchestrator.cleanup())
+
+    def test_top_level_section(self):
+        """Test that a top-level orchestration section is still read"""
+        assert test_orchestrator.orchestration_config({"orchestration": {"a": 1}}) == {"a": 1}
+        assert test_orchestrator.orchestration_config({"mcp": {"orchestration": {"b": 2}}}) == {"b": 2}
+        assert test_orchestrator.orchestration_config({}) == {}
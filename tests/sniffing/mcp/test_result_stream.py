@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+import pytest
+
+from sniffing.mcp.server.result_stream import (
+    InvalidCursor,
+    ResultStream,
+    format_ndjson,
+    format_sse
+)
+
+def read_all(stream, cursor=0):
+    async def run():
+        return [item async for item in stream.read(cursor)]
+    return asyncio.run(run())
+
+class TestResultStream:
+    def test_resume_from_cursor(self, tmp_path):
+        """Test that reading from a cursor returns only later events"""
+        stream = ResultStream("job", tmp_path / "job.ndjson")
+
+        async def fill():
+            first = await stream.append({"file": "a.py"})
+            await stream.append({"file": "b.py"})
+            await stream.close({"type": "end"})
+            return first
+
+        first = asyncio.run(fill())
+        events = read_all(stream)
+        assert [json.loads(line) for _, line in events] == [
+            {"file": "a.py"}, {"file": "b.py"}, {"type": "end"}
+        ]
+        assert events[0][0] == first
+
+        resumed = read_all(stream, first)
+        assert [json.loads(line) for _, line in resumed] == [
+            {"file": "b.py"}, {"type": "end"}
+        ]
+
+    def test_invalid_cursor(self, tmp_path):
+        """Test that cursors must point at an event boundary"""
+        stream = ResultStream("job", tmp_path / "job.ndjson")
+        asyncio.run(stream.close({"file": "a.py"}))
+
+        with pytest.raises(InvalidCursor):
+            stream.validate_cursor(3)
+        with pytest.raises(InvalidCursor):
+            stream.validate_cursor(stream.size + 1)
+
+    def test_follows_until_closed(self, tmp_path):
+        """Test that readers receive events appended while they wait"""
+        stream = ResultStream("job", tmp_path / "job.ndjson")
+
+        async def run():
+            reader = asyncio.ensure_future(
+                asyncio.wait_for(_collect(stream), timeout=5)
+            )
+            await asyncio.sleep(0.01)
+            await stream.append({"file": "a.py"})
+            await asyncio.sleep(0.01)
+            await stream.close({"type": "end"})
+            return await reader
+
+        events = asyncio.run(run())
+        assert [json.loads(line) for _, line in events] == [
+            {"file": "a.py"}, {"type": "end"}
+        ]
+
+    def test_formats_carry_cursor(self):
+        """Test that NDJSON and SSE output include the resume cursor"""
+        line = b'{"file": "a.py"}'
+        assert json.loads(format_ndjson(17, line)) == {"cursor": 17, "file": "a.py"}
+        assert format_sse(17, line) == b'id: 17\ndata: {"file": "a.py"}\n\n'
+
+async def _collect(stream):
+    return [item async for item in stream.read()]
@@ -0,0 +1,59 @@
+"""Tests for the cache engine."""
+
+import time
+import pytest
+from app.core.cache import CacheEngine, estimate_size
+
+@pytest.fixture
+def cache():
+    """Create a cache holding at most two entries."""
+    return CacheEngine(max_entries=2, max_bytes=1024, default_ttl=None)
+
+def test_lru_eviction(cache):
+    """Test that the least recently used entry is evicted."""
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    # "b" is now the least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get_many(["a", "c"]) == {"a": 1, "c": 3}
+    assert cache.evictions == 1
+
+def test_byte_cap(cache):
+    """Test that entries are evicted to stay under the byte cap."""
+    value = "x" * 400
+    cache.set("a", value)
+    cache.set("b", value)
+    cache.set("c", value)
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.bytes == estimate_size("b", value) + estimate_size("c", value)
+
+    with pytest.raises(ValueError):
+        cache.set("d", "x" * 2000)
+
+def test_ttl_expiry(cache):
+    """Test that expired entries are dropped on read and by purging."""
+    cache.set("a", 1, ttl=0.05)
+    cache.set("b", 2, ttl=0.05)
+    cache.set("b", 2, ttl=60)
+    time.sleep(0.1)
+    assert cache.purge_expired() == 1
+    assert cache.get("b") == 2
+
+    cache.set("c", 3, ttl=0.05)
+    time.sleep(0.1)
+    assert cache.get("c") is None
+    assert cache.expirations == 2
+
+def test_bulk_operations(cache):
+    """Test bulk set, get and delete."""
+    cache.set_many({"a": None, "b": 2})
+    assert cache.get_many(["a", "b", "c"]) == {"a": None, "b": 2}
+    assert cache.delete_many(["a", "c"]) == 1
+    metrics = cache.get_metrics()
+    assert metrics["entries"] == 1
+    assert metrics["hits"] == 2
+    assert metrics["misses"] == 1
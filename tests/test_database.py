@@ -0,0 +1,77 @@
+"""Tests for the async database layer."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.core import database
+from app.core.config import settings
+from app.core.database import (
+    create_async_database,
+    dispose_async_engine,
+    get_async_database_url,
+    get_async_db,
+    pool_options
+)
+
+def test_async_database_url():
+    """Test that synchronous URLs are mapped to async drivers."""
+    assert get_async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert get_async_database_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert get_async_database_url("sqlite+aiosqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+
+def test_pool_options():
+    """Test that file databases are pooled and in-memory ones are not."""
+    assert pool_options("sqlite://") == {}
+    assert pool_options("sqlite:///:memory:") == {}
+    options = pool_options("sqlite:///./app.db")
+    assert options["pool_size"] == settings.DB_POOL_SIZE
+    assert options["pool_pre_ping"] is True
+
+def test_get_async_db(tmp_path, monkeypatch):
+    """Test that request sessions commit, roll back on errors and are disposed."""
+    monkeypatch.setattr(
+        database,
+        "AsyncSessionLocal",
+        create_async_database(f"sqlite:///{tmp_path / 'app.db'}")
+    )
+
+    async def names():
+        async with database.get_async_sessionmaker()() as db:
+            rows = await db.execute(text("SELECT name FROM users ORDER BY name"))
+            return [row[0] for row in rows]
+
+    async def run():
+        async with database.get_async_engine().begin() as conn:
+            await conn.execute(text("CREATE TABLE users (name TEXT PRIMARY KEY)"))
+
+        # A request that commits
+        sessions = get_async_db()
+        db = await sessions.__anext__()
+        await db.execute(text("INSERT INTO users VALUES ('alice')"))
+        await db.commit()
+        await sessions.aclose()
+
+        # A request that fails before committing
+        sessions = get_async_db()
+        db = await sessions.__anext__()
+        await db.execute(text("INSERT INTO users VALUES ('bob')"))
+        rollback = db.rollback
+        rollbacks = []
+
+        async def record_rollback():
+            rollbacks.append(db.in_transaction())
+            await rollback()
+
+        db.rollback = record_rollback
+        with pytest.raises(ValueError):
+            await sessions.athrow(ValueError("request failed"))
+        assert rollbacks == [True]
+
+        committed = await names()
+        await dispose_async_engine()
+        return committed
+
+    assert asyncio.run(run()) == ["alice"]
+    assert database.AsyncSessionLocal is None
@@ -0,0 +1,50 @@
+"""Tests for the password hashing pool."""
+
+import asyncio
+import time
+import pytest
+from app.core.password_pool import PasswordHashPool, PoolSaturated
+
+@pytest.fixture
+def pool():
+    """Create a pool with one worker and one queue slot."""
+    pool = PasswordHashPool(workers=1, max_queue=1)
+    yield pool
+    pool.shutdown()
+
+def test_saturated_pool_sheds_load(pool):
+    """Test that calls beyond capacity are rejected instead of queued."""
+    async def run():
+        return await asyncio.gather(
+            *(pool.run("hash", time.sleep, 0.2) for _ in range(3)),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert sum(isinstance(result, PoolSaturated) for result in results) == 1
+    assert pool.completed == 2
+    assert pool.rejected == 1
+    assert pool.in_flight == 0
+
+def test_queue_wait_is_separated_from_work(pool):
+    """Test that metrics split time waiting for a worker from time working."""
+    async def run():
+        await asyncio.gather(pool.run("hash", time.sleep, 0.2), pool.run("hash", time.sleep, 0.2))
+
+    asyncio.run(run())
+    metrics = pool.get_metrics()
+    assert metrics["mean_work_seconds"] >= 0.2
+    # The second call waited for the first
+    assert metrics["max_queue_wait_seconds"] >= 0.15
+
+def test_event_loop_stays_responsive(pool):
+    """Test that hashing does not block other coroutines."""
+    async def run():
+        work = asyncio.ensure_future(pool.run("hash", time.sleep, 0.3))
+        start = time.monotonic()
+        await asyncio.sleep(0.01)
+        latency = time.monotonic() - start
+        await work
+        return latency
+
+    assert asyncio.run(run()) < 0.2
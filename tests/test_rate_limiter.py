@@ -0,0 +1,95 @@
+"""Tests for the sliding-window rate limiter."""
+
+import asyncio
+import sqlite3
+
+import pytest
+from common.rate_limiter import (
+    MemoryRateLimitStore,
+    RateLimiter,
+    RateLimitStore,
+    SQLiteRateLimitStore,
+    slide_window
+)
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Create a rate limit store of each backend."""
+    if request.param == "sqlite":
+        return SQLiteRateLimitStore(str(tmp_path / "rate_limits.db"), max_keys=8, prune_every=1)
+    return MemoryRateLimitStore(max_keys=8, shards=2)
+
+def test_limit_within_window(store):
+    """Test that requests over the limit are rejected until the window slides."""
+    limiter = RateLimiter(3, 60, store)
+    results = [limiter.hit("1.2.3.4", now=1.0 + i) for i in range(4)]
+    assert [result.allowed for result in results] == [True, True, True, False]
+    assert results[2].remaining == 0
+    assert results[3].headers()["Retry-After"]
+
+    # Other clients and namespaces have their own windows
+    assert limiter.hit("5.6.7.8", now=5.0).allowed
+    assert RateLimiter(3, 60, store, namespace="auth").hit("1.2.3.4", now=5.0).allowed
+
+    # Two windows later the previous window no longer counts
+    assert limiter.hit("1.2.3.4", now=121.0).allowed
+
+def test_previous_window_is_weighted():
+    """Test that the previous window counts in proportion to its overlap."""
+    # A quarter into the next window, 75% of the previous 10 requests count
+    state, allowed, estimate = slide_window((0.0, 10, 0), 75.0, 60, 10)
+    assert allowed
+    assert state == (60.0, 1, 10)
+    assert estimate == pytest.approx(10 * 0.75 + 1)
+
+    # Just after the boundary almost all of them still count
+    _, allowed, _ = slide_window((0.0, 10, 0), 65.0, 60, 10)
+    assert not allowed
+
+def test_memory_is_bounded(store):
+    """Test that a spray of unique clients cannot grow the store past its cap."""
+    limiter = RateLimiter(10, 60, store)
+    for i in range(100):
+        limiter.hit(f"10.0.0.{i}", now=1.0 + i / 1000)
+    assert store.size() <= 8
+    assert store.evictions >= 92
+
+    # Recently seen clients are kept
+    assert limiter.hit("10.0.0.99", now=2.0).remaining == 8
+
+def test_hit_async(store):
+    """Test that async hits count against the same window."""
+    limiter = RateLimiter(2, 60, store)
+
+    async def run():
+        return [(await limiter.hit_async("1.2.3.4", now=1.0 + i)).allowed for i in range(3)]
+
+    assert asyncio.run(run()) == [True, True, False]
+
+def test_sqlite_fails_open_when_locked(tmp_path):
+    """Test that a locked database allows requests instead of stalling them."""
+    path = tmp_path / "rate_limits.db"
+    store = SQLiteRateLimitStore(str(path), timeout=0.01)
+    limiter = RateLimiter(1, 60, store)
+
+    other = sqlite3.connect(str(path), isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        assert limiter.hit("1.2.3.4", now=1.0).allowed
+        assert limiter.hit("1.2.3.4", now=2.0).allowed
+        assert store.failures == 2
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+
+    assert limiter.hit("1.2.3.4", now=3.0).allowed
+    assert not limiter.hit("1.2.3.4", now=4.0).allowed
+
+def test_store_interface_is_enforced():
+    """Test that a store missing part of the interface cannot be constructed."""
+    class HitOnlyStore(RateLimitStore):
+        def hit(self, key, window, limit, now):
+            pass
+
+    with pytest.raises(TypeError):
+        HitOnlyStore()
@@ -0,0 +1,43 @@
+"""Tests for the verified-token cache."""
+
+import time
+import pytest
+from app.core.key_rotation import KeyRotation
+from app.core.token_cache import TokenCache
+
+@pytest.fixture
+def token_cache():
+    """Create a token cache cleared by key rotations."""
+    cache = TokenCache(max_entries=2, max_ttl=60)
+    KeyRotation.add_rotation_listener(cache.clear)
+    yield cache
+    KeyRotation.remove_rotation_listener(cache.clear)
+
+def test_cached_payload(token_cache):
+    """Test that verified payloads are returned until evicted."""
+    token_cache.put("a", {"sub": "1"})
+    token_cache.put("b", {"sub": "2"})
+    assert token_cache.get("a") == {"sub": "1"}
+
+    # "b" is now the least recently used
+    token_cache.put("c", {"sub": "3"})
+    assert token_cache.get("b") is None
+    assert token_cache.get("a") == {"sub": "1"}
+    assert token_cache.evictions == 1
+
+    token_cache.invalidate("a")
+    assert token_cache.get("a") is None
+
+def test_expired_token_is_not_served(token_cache):
+    """Test that a cached token is dropped at its exp."""
+    token_cache.put("expired", {"sub": "1", "exp": time.time() - 1})
+    token_cache.put("valid", {"sub": "2", "exp": time.time() + 3600})
+    assert token_cache.get("expired") is None
+    assert token_cache.get("valid") == {"sub": "2", "exp": pytest.approx(time.time() + 3600, abs=5)}
+
+def test_key_rotation_clears_cache(token_cache, tmp_path):
+    """Test that rotating a key drops every cached verification."""
+    token_cache.put("a", {"sub": "1"})
+    KeyRotation(str(tmp_path / "keys.json")).rotate_key("jwt")
+    assert token_cache.get("a") is None
+    assert token_cache.invalidations == 1